@@ -4,24 +4,24 @@
 import logging
 from typing import List, Dict
 from datetime import datetime
+from .scheduler import CaseHistory
 from .test_executor import TestExecutor
 from .result_manager import ResultManager
 from src.config.yx_config import YxConfig
+from src.utils.logging_config import setup_logging, get_log_stats, stop_logging
+from src.utils.driver.webdriver_manager import get_startup_stats
 
 def main():
     """主程序入口"""
-    # 配置日志
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    # 配置日志（异步队列输出）
+    setup_logging()
     
     logger = logging.getLogger(__name__)
     logger.info("开始执行自动化测试...")
     
     # 初始化测试执行器和结果管理器
-    test_executor = TestExecutor()
     result_manager = ResultManager()
+    test_executor = TestExecutor(history=CaseHistory.from_result_dir(result_manager.output_dir))
     
     # 示例测试用例数据
     test_cases = [
@@ -52,6 +52,9 @@ def main():
         
     finally:
         logger.info("自动化测试执行完成")
+        logger.info(f"浏览器会话启动统计: {get_startup_stats()}")
+        logger.info(f"日志统计: {get_log_stats()}")
+        stop_logging()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""套件用例的操作声明
+
+每个用例可以声明要执行的操作（actions），例如::
+
+    {'id': 'TEST_001', 'actions': ['auto_type', 'result', 'executor'],
+     'data': {'auto_type': '是', 'result': 'PASS', 'test_user': '张三'}}
+
+未声明时只标记自动化类型。操作按所需的页面上下文拆分成步骤，
+执行器把同一上下文的步骤放在一起执行，
+浏览器在整组步骤期间停留在同一个页面。
+"""
+
+import csv
+from typing import Dict, List, Tuple, Union
+
+from src.core.test_case.case_manager import CASE_LIBRARY, PAGE_CONTEXTS, TEST_PLAN
+
+AUTO_TYPE = 'auto_type'
+RESULT = 'result'
+EXECUTOR = 'executor'
+
+# 操作所需的页面上下文
+ACTION_CONTEXTS = {
+    AUTO_TYPE: CASE_LIBRARY,
+    RESULT: TEST_PLAN,
+    EXECUTOR: TEST_PLAN
+}
+
+DEFAULT_ACTIONS = [AUTO_TYPE]
+
+
+def parse_actions(test_case: Dict) -> List[str]:
+    """解析并校验用例声明的操作
+
+    Args:
+        test_case: 测试用例字典，actions 可以是列表或逗号分隔的字符串
+
+    Returns:
+        去重后的操作列表
+
+    Raises:
+        ValueError: 操作未知或缺少操作需要的数据
+    """
+    declared: Union[str, List[str], None] = test_case.get('actions')
+    if not declared:
+        return list(DEFAULT_ACTIONS)
+    if isinstance(declared, str):
+        declared = declared.split(',')
+    actions = []
+    for action in (a.strip() for a in declared):
+        if action not in ACTION_CONTEXTS:
+            raise ValueError(f"未知的操作: {action}，可选值: {', '.join(ACTION_CONTEXTS)}")
+        if action not in actions:
+            actions.append(action)
+
+    data = test_case.get('data', {})
+    if RESULT in actions and not data.get('result'):
+        raise ValueError("标记测试结果需要 data.result")
+    if EXECUTOR in actions and not data.get('test_user'):
+        raise ValueError("设置执行人需要 data.test_user")
+    return actions
+
+
+def split_by_context(test_case: Dict) -> List[Tuple[str, Dict]]:
+    """按页面上下文把用例拆分成步骤
+
+    Args:
+        test_case: 测试用例字典
+
+    Returns:
+        按 PAGE_CONTEXTS 顺序排列的 (上下文, 步骤) 列表，
+        步骤是带 context 和 actions 的用例字典
+    """
+    actions = parse_actions(test_case)
+    steps = []
+    for context in PAGE_CONTEXTS:
+        context_actions = [a for a in actions if ACTION_CONTEXTS[a] == context]
+        if context_actions:
+            steps.append((context, dict(test_case, actions=context_actions, context=context)))
+    return steps
+
+
+def run_actions(case_manager, step: Dict) -> None:
+    """在当前页面上下文中执行一个步骤的操作
+
+    同时声明标记结果和设置执行人时，在一次筛选中完成。
+
+    Args:
+        case_manager: 测试用例管理器
+        step: split_by_context 生成的步骤
+    """
+    case_id = step.get('id')
+    data = step.get('data', {})
+    actions = step.get('actions') or DEFAULT_ACTIONS
+    if AUTO_TYPE in actions:
+        case_manager.mark_auto_type(case_id, data.get('auto_type', '是'))
+    if RESULT in actions:
+        test_user = data.get('test_user') if EXECUTOR in actions else None
+        case_manager.mark_test_result(case_id, data['result'], test_user)
+    elif EXECUTOR in actions:
+        case_manager.set_test_executor(case_id, data['test_user'])
+
+
+# CSV列名（支持中文表头）到用例字段的映射
+CSV_COLUMNS = {
+    'id': ('id', 'case_id', '用例编号', '测试用例编号'),
+    'actions': ('actions', '操作'),
+    AUTO_TYPE: ('auto_type', '自动化类型', '是否自动化'),
+    RESULT: ('result', '测试结果', '执行结果'),
+    'test_user': ('test_user', '执行人', '测试执行人')
+}
+
+
+def cases_from_csv(path: str) -> List[Dict]:
+    """从标注CSV读取测试用例
+
+    未提供操作列时，按行中有值的列推断操作：
+    自动化类型列对应 auto_type，测试结果列对应 result，
+    执行人列对应 executor。
+
+    Args:
+        path: CSV文件路径，支持带BOM的UTF-8
+
+    Returns:
+        测试用例列表
+
+    Raises:
+        ValueError: 缺少用例编号列
+    """
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        columns = {}
+        for field_name, aliases in CSV_COLUMNS.items():
+            for header in reader.fieldnames or []:
+                if header.strip() in aliases:
+                    columns[field_name] = header
+                    break
+        if 'id' not in columns:
+            raise ValueError(f"{path} 缺少用例编号列，"
+                             f"可用列名: {', '.join(CSV_COLUMNS['id'])}")
+
+        test_cases = []
+        for row in reader:
+            values = {name: (row.get(header) or '').strip() for name, header in columns.items()}
+            if not values['id']:
+                continue
+            data = {name: values[name] for name in (AUTO_TYPE, RESULT, 'test_user')
+                    if values.get(name)}
+            inferred = ((AUTO_TYPE, AUTO_TYPE), (RESULT, RESULT), (EXECUTOR, 'test_user'))
+            actions = values.get('actions') or [
+                action for action, name in inferred if name in data
+            ]
+            test_cases.append({'id': values['id'], 'actions': actions, 'data': data})
+        return test_cases
@@ -0,0 +1,469 @@
+"""自动化守护进程
+
+常驻进程保持已登录的浏览器会话，通过本地HTTP接口接收任务并排队执行，
+任务进度以NDJSON流的形式返回，
+避免每个任务重新导入依赖、启动浏览器和登录。
+
+接口:
+    POST /jobs                  提交任务，返回 {"job_id": ...}
+    GET  /jobs/<id>             查询任务状态和结果
+    GET  /jobs/<id>/events      流式返回任务事件（每行一个JSON），
+                                任务结束后关闭连接
+    GET  /health                守护进程状态
+
+使用示例:
+    python -m src.core.automation.daemon serve --port 8765
+    python -m src.core.automation.daemon submit --csv 自动化类型标注.csv
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from src.core.automation.actions import cases_from_csv
+from src.core.automation.result_manager import ResultManager
+from src.core.automation.scheduler import CaseHistory
+from src.core.automation.test_executor import TestExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+# 保留的已结束任务数，更早结束的任务连同事件和结果一起丢弃
+DEFAULT_MAX_FINISHED_JOBS = 100
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def _load_suite(payload: Dict) -> List[Dict]:
+    cases = payload.get('cases')
+    if not isinstance(cases, list):
+        raise ValueError("suite 任务需要 cases 列表")
+    return cases
+
+
+def _load_csv(payload: Dict) -> List[Dict]:
+    if not payload.get('path'):
+        raise ValueError("csv 任务需要 path")
+    return cases_from_csv(payload['path'])
+
+
+# 任务类型到用例加载函数的映射
+JOB_KINDS: Dict[str, Callable[[Dict], List[Dict]]] = {
+    'suite': _load_suite,
+    'csv': _load_csv
+}
+
+
+class Job:
+    """一个排队执行的任务，事件列表线程安全"""
+
+    def __init__(self, kind: str, payload: Dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.payload = payload
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.results: List[Dict] = []
+        self.error: Optional[str] = None
+        self.events: List[Dict] = []
+        self._changed = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    def emit(self, event: str, state: Optional[str] = None, **fields) -> None:
+        """追加一个事件并唤醒等待中的订阅者
+
+        Args:
+            event: 事件名称
+            state: 同时更新的任务状态，与事件一起原子地生效
+        """
+        with self._changed:
+            if state is not None:
+                self.state = state
+            self.events.append(dict(fields, event=event, job_id=self.id, seq=len(self.events),
+                                    time=time.time()))
+            self._changed.notify_all()
+
+    def follow(self, start: int = 0, timeout: Optional[float] = None) -> Iterator[Dict]:
+        """从第 start 个事件开始依次返回事件，任务结束后停止
+
+        Args:
+            start: 起始事件序号
+            timeout: 等待新事件的最长时间（秒），超时后停止
+        """
+        index = start
+        while True:
+            with self._changed:
+                if index >= len(self.events) and not self.finished:
+                    if not self._changed.wait(timeout):
+                        return
+                pending = self.events[index:]
+                finished = self.finished
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= len(self.events):
+                return
+
+    def to_dict(self, with_results: bool = True) -> Dict:
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error
+        }
+        if with_results:
+            data['results'] = self.results
+        return data
+
+
+class AutomationDaemon:
+    """常驻的任务执行器
+
+    任务按提交顺序在一个执行线程中依次运行，
+    所有任务共用执行器中保持登录的浏览器会话。
+    已结束的任务只保留最近的 max_finished_jobs 个，
+    结果已由 result_manager 保存。
+
+    Args:
+        executor: 测试执行器，默认创建 keep_sessions=True 的执行器
+        result_manager: 结果管理器，每个任务完成后保存套件结果
+        host: 监听地址，默认仅本机
+        port: 监听端口，0表示随机端口
+        warm_up: 启动时是否预先启动浏览器并登录
+        max_finished_jobs: 保留的已结束任务数
+    """
+
+    def __init__(self, executor: Optional[TestExecutor] = None,
+                 result_manager: Optional[ResultManager] = None,
+                 host: str = '127.0.0.1', port: int = DEFAULT_PORT, warm_up: bool = True,
+                 max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS):
+        self.result_manager = result_manager or ResultManager()
+        self.executor = executor or TestExecutor(
+            history=CaseHistory.from_result_dir(self.result_manager.output_dir),
+            keep_sessions=True
+        )
+        self.executor.keep_sessions = True
+        self.warm_up = warm_up
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: Dict[str, Job] = {}
+        self._jobs_lock = threading.Lock()
+        self._queue: 'queue.Queue[Optional[Job]]' = queue.Queue()
+        self._runner: Optional[threading.Thread] = None
+        handler = type('BoundDaemonHandler', (DaemonHandler,), {'daemon': self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._server_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def submit(self, kind: str, payload: Dict) -> Job:
+        """提交任务
+
+        Raises:
+            ValueError: 任务类型未知或参数不合法
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"未知的任务类型: {kind}，可选值: {', '.join(JOB_KINDS)}")
+        workers = payload.get('workers')
+        valid = isinstance(workers, int) and not isinstance(workers, bool) and workers >= 1
+        if workers is not None and not valid:
+            raise ValueError(f"workers 必须是正整数: {workers!r}")
+        job = Job(kind, payload)
+        with self._jobs_lock:
+            self.jobs[job.id] = job
+        job.emit('queued', position=self._queue.qsize())
+        self._queue.put(job)
+        logger.info(f"任务 {job.id}（{kind}）已加入队列")
+        return job
+
+    def start(self) -> 'AutomationDaemon':
+        """启动执行线程和HTTP服务"""
+        self._runner = threading.Thread(target=self._run_jobs, name='daemon-runner', daemon=True)
+        self._runner.start()
+        self._server_thread = threading.Thread(target=self.httpd.serve_forever, name='daemon-http',
+                                               daemon=True)
+        self._server_thread.start()
+        logger.info(f"自动化守护进程已启动: {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """停止服务，等待当前任务结束后关闭浏览器会话"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._queue.put(None)
+        if self._runner:
+            self._runner.join()
+            self._runner = None
+        if self._server_thread:
+            self._server_thread.join()
+            self._server_thread = None
+        logger.info("自动化守护进程已停止")
+
+    def health(self) -> Dict:
+        with self._jobs_lock:
+            states = [job.state for job in self.jobs.values()]
+        return {
+            'url': self.url,
+            'queued': states.count(QUEUED),
+            'running': states.count(RUNNING),
+            'finished': len(states) - states.count(QUEUED) - states.count(RUNNING),
+            'session_alive': self.executor.has_live_session()
+        }
+
+    def _run_jobs(self) -> None:
+        try:
+            if self.warm_up:
+                try:
+                    self.executor.warm_up()
+                except Exception as e:
+                    # 预热失败不影响服务，第一个任务会重新建立会话
+                    logger.error(f"预热浏览器会话失败: {str(e)}")
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                self._run_job(job)
+                self._prune_jobs()
+        finally:
+            self.executor.cleanup()
+
+    def _run_job(self, job: Job) -> None:
+        job.started_at = time.time()
+        job.emit('started', state=RUNNING, wait_seconds=round(job.started_at - job.submitted_at, 3))
+        try:
+            test_cases = JOB_KINDS[job.kind](job.payload)
+            job.emit('loaded', cases=len(test_cases))
+            done = itertools.count(1)
+            job.results = self.executor.execute_test_suite(
+                test_cases,
+                workers=job.payload.get('workers'),
+                progress=lambda result: job.emit('step', done=next(done), result=result)
+            )
+            self.result_manager.save_suite_results(job.results)
+            report = self.executor.schedule_report
+            job.finished_at = time.time()
+            job.emit('finished', state=DONE, results=job.results,
+                     schedule=report.to_dict() if report else None)
+        except Exception as e:
+            logger.exception(f"任务 {job.id} 执行失败")
+            job.error = str(e)
+            job.finished_at = time.time()
+            job.emit('failed', state=FAILED, error=job.error)
+
+    def _prune_jobs(self) -> None:
+        """丢弃超出保留数量的最早结束的任务"""
+        with self._jobs_lock:
+            finished = sorted((job for job in self.jobs.values() if job.finished),
+                              key=lambda job: job.finished_at)
+            for job in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+                del self.jobs[job.id]
+
+    def __enter__(self) -> 'AutomationDaemon':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    """守护进程的HTTP接口"""
+
+    daemon: AutomationDaemon = None
+
+    def log_message(self, format, *args):
+        logger.debug("daemon %s - %s", self.address_string(), format % args)
+
+    def _send_json(self, payload, status: int = 200) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _job(self, job_id: str) -> Optional[Job]:
+        job = self.daemon.jobs.get(job_id)
+        if job is None:
+            self._send_json({'error': 'job not found'}, 404)
+        return job
+
+    def do_GET(self):
+        parts = [p for p in self.path.split('?', 1)[0].split('/') if p]
+        if parts == ['health']:
+            self._send_json(self.daemon.health())
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = self._job(parts[1])
+            if job:
+                self._send_json(job.to_dict())
+        elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'events':
+            job = self._job(parts[1])
+            if job:
+                self._stream(job)
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0].rstrip('/') != '/jobs':
+            self._send_json({'error': 'not found'}, 404)
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            request = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+            if not isinstance(request, dict):
+                raise ValueError("请求体必须是JSON对象")
+            job = self.daemon.submit(request.get('kind', 'suite'), request)
+        except ValueError as e:
+            self._send_json({'error': str(e)}, 400)
+            return
+        self._send_json({'job_id': job.id, 'state': job.state}, 202)
+
+    def _stream(self, job: Job) -> None:
+        """以NDJSON逐行返回事件，任务结束后关闭连接"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event in job.follow():
+                self.wfile.write((json.dumps(event, ensure_ascii=False) + '\n').encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug(f"任务 {job.id} 的事件订阅者已断开")
+
+
+class DaemonClient:
+    """守护进程客户端
+
+    Args:
+        url: 守护进程地址
+        timeout: 普通请求的超时时间（秒）
+    """
+
+    def __init__(self, url: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: float = 10.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[Dict] = None) -> Dict:
+        data = None
+        if payload is not None:
+            data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        request = Request(f"{self.url}{path}", data=data, method=method,
+                          headers={'Content-Type': 'application/json'})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode('utf-8'))
+        except HTTPError as e:
+            detail = json.loads(e.read().decode('utf-8') or '{}').get('error', e.reason)
+            raise ValueError(f"守护进程返回 {e.code}: {detail}") from None
+
+    def submit(self, kind: str, **payload) -> str:
+        """提交任务，返回任务ID"""
+        return self._request('POST', '/jobs', dict(payload, kind=kind))['job_id']
+
+    def status(self, job_id: str) -> Dict:
+        """查询任务状态和结果"""
+        return self._request('GET', f'/jobs/{job_id}')
+
+    def health(self) -> Dict:
+        return self._request('GET', '/health')
+
+    def events(self, job_id: str) -> Iterator[Dict]:
+        """流式读取任务事件，任务结束后停止"""
+        with urlopen(f"{self.url}/jobs/{job_id}/events") as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line.decode('utf-8'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='云效自动化守护进程')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help='启动守护进程')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=int(os.getenv('DAEMON_PORT', DEFAULT_PORT)))
+    serve.add_argument('--no-warm-up', action='store_true',
+                       help='不预先启动浏览器并登录')
+    serve.add_argument('--max-finished-jobs', type=int, default=DEFAULT_MAX_FINISHED_JOBS,
+                       help='保留的已结束任务数')
+
+    submit = subparsers.add_parser('submit', help='提交任务并输出进度')
+    default_url = f"http://127.0.0.1:{os.getenv('DAEMON_PORT', DEFAULT_PORT)}"
+    submit.add_argument('--url', default=default_url)
+    source = submit.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', help='标注CSV文件')
+    source.add_argument('--cases', help='JSON格式的用例列表文件')
+    submit.add_argument('--workers', type=int, help='并行的浏览器会话数')
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        from src.utils.logging_config import setup_logging, stop_logging
+        setup_logging()
+        daemon = AutomationDaemon(host=args.host, port=args.port, warm_up=not args.no_warm_up,
+                                  max_finished_jobs=args.max_finished_jobs).start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.stop()
+            stop_logging()
+        return 0
+
+    client = DaemonClient(args.url)
+    if args.csv:
+        job_id = client.submit('csv', path=os.path.abspath(args.csv), workers=args.workers)
+    else:
+        with open(args.cases, 'r', encoding='utf-8') as f:
+            job_id = client.submit('suite', cases=json.load(f), workers=args.workers)
+    failed = False
+    for event in client.events(job_id):
+        if event['event'] == 'step':
+            result = event['result']
+            print(f"[{event['done']}] {result['case_id']} "
+                  f"{result.get('context', '')} {result['status']}")
+        elif event['event'] == 'failed':
+            failed = True
+            print(f"任务 {job_id} 失败: {event['error']}")
+        elif event['event'] == 'finished':
+            results = event['results']
+            passed = sum(1 for r in results if r['status'] == 'passed')
+            failed = passed < len(results)
+            print(f"任务 {job_id} 完成: {passed}/{len(results)} 个用例通过")
+        else:
+            print(f"任务 {job_id} {event['event']}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
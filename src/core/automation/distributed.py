@@ -0,0 +1,647 @@
+"""多机分布式执行
+
+协调端把套件切分成批次写入共享的任务存储，
+各台机器上的工作进程租用批次、定期发送心跳续租并回报结果；
+工作进程失联导致租约过期的批次会重新排队。
+
+任务存储有两种形式：
+    - SQLiteJobStore: 放在共享存储上的SQLite文件，各工作进程直接读写
+    - CoordinatorServer + RemoteJobStore: 协调端持有SQLite文件，
+      通过TCP（每行一个JSON）提供同样的接口
+
+租约时间基于各进程的系统时钟，多台机器需要保持时间同步。
+协调端没有认证，默认只监听本机；
+需要其他机器连接时用 --host 指定内网地址。
+
+使用示例:
+    python -m src.core.automation.distributed coordinator --store output/jobs.db \
+        --host 10.0.0.5 --port 8766
+    python -m src.core.automation.distributed worker --coordinator 10.0.0.5:8766
+    python -m src.core.automation.distributed submit --coordinator 10.0.0.5:8766 \
+        --cases cases.json --wait
+"""
+
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.automation.scheduler import CaseHistory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COORDINATOR_PORT = 8766
+
+# 批次状态
+QUEUED = 'queued'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    suite_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    cases TEXT NOT NULL,
+    indices TEXT NOT NULL,
+    state TEXT NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    results TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batches_state ON batches (state, created_at, seq);
+CREATE INDEX IF NOT EXISTS idx_batches_suite ON batches (suite_id, seq);
+"""
+
+
+@dataclass
+class Batch:
+    """工作进程租到的一个批次"""
+    id: str
+    suite_id: str
+    seq: int
+    cases: List[Dict]
+    attempts: int
+    lease_seconds: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class SQLiteJobStore:
+    """基于SQLite文件的任务存储
+
+    可被多个进程（包括共享存储上的多台机器）同时使用。
+
+    每次操作使用独立连接，写操作在 BEGIN IMMEDIATE 事务中完成，
+    依靠SQLite文件锁互斥。
+
+    Args:
+        path: SQLite文件路径
+        lease_seconds: 租约时长（秒），工作进程需要在此时间内发送心跳
+        max_attempts: 一个批次最多被租用的次数，超过后标记为失败
+        clock: 计时函数，默认 time.time
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 60.0, max_attempts: int = 3,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], object]):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = func(conn)
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+            return result
+        finally:
+            conn.close()
+
+    def enqueue(self, batches: List[List[Tuple[int, Dict]]], suite_id: Optional[str] = None) -> str:
+        """写入一个套件的批次
+
+        Args:
+            batches: 批次列表，每个批次是 (用例在套件中的序号, 用例) 列表
+            suite_id: 套件ID，默认自动生成
+
+        Returns:
+            套件ID
+        """
+        suite_id = suite_id or uuid.uuid4().hex[:12]
+        now = self.clock()
+
+        def insert(conn):
+            for seq, batch in enumerate(batches):
+                conn.execute(
+                    'INSERT INTO batches '
+                    '(id, suite_id, seq, cases, indices, state, created_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (f"{suite_id}-{seq}", suite_id, seq,
+                     json.dumps([case for _, case in batch], ensure_ascii=False),
+                     json.dumps([index for index, _ in batch]), QUEUED, now, now)
+                )
+
+        self._transaction(insert)
+        logger.info(f"套件 {suite_id} 已写入 {len(batches)} 个批次")
+        return suite_id
+
+    def _expire(self, conn: sqlite3.Connection, now: float) -> int:
+        """把租约过期的批次重新排队，超过最大租用次数的标记为失败"""
+        cursor = conn.execute(
+            'UPDATE batches SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+            'worker = NULL, lease_expires = NULL, updated_at = ?, '
+            "error = '租约过期: ' || IFNULL(worker, '') "
+            'WHERE state = ? AND lease_expires < ?',
+            (self.max_attempts, FAILED, QUEUED, now, LEASED, now)
+        )
+        if cursor.rowcount:
+            logger.warning(f"{cursor.rowcount} 个批次租约过期，已重新排队")
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        """把租约过期的批次重新排队，返回处理的批次数"""
+        return self._transaction(lambda conn: self._expire(conn, self.clock()))
+
+    def lease(self, worker_id: str) -> Optional[Batch]:
+        """租用最早排队的批次
+
+        Args:
+            worker_id: 工作进程标识
+
+        Returns:
+            租到的批次，没有排队的批次时返回None
+        """
+        def take(conn):
+            now = self.clock()
+            self._expire(conn, now)
+            row = conn.execute(
+                'SELECT id, suite_id, seq, cases, attempts FROM batches WHERE state = ? '
+                'ORDER BY created_at, seq LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE batches SET state = ?, worker = ?, lease_expires = ?, '
+                'attempts = attempts + 1, updated_at = ? WHERE id = ?',
+                (LEASED, worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            return Batch(row['id'], row['suite_id'], row['seq'], json.loads(row['cases']),
+                         row['attempts'] + 1, self.lease_seconds)
+
+        return self._transaction(take)
+
+    def heartbeat(self, batch_id: str, worker_id: str) -> bool:
+        """续租
+
+        Returns:
+            是否仍持有租约；租约已过期并被重新分配时返回False
+        """
+        def renew(conn):
+            now = self.clock()
+            return conn.execute(
+                'UPDATE batches SET lease_expires = ?, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND state = ?',
+                (now + self.lease_seconds, now, batch_id, worker_id, LEASED)
+            ).rowcount == 1
+
+        return self._transaction(renew)
+
+    def complete(self, batch_id: str, worker_id: str, results: List[Dict]) -> bool:
+        """回报批次结果
+
+        Returns:
+            是否被接受；租约已转给其他工作进程时返回False
+        """
+        def finish(conn):
+            return conn.execute(
+                'UPDATE batches SET state = ?, results = ?, lease_expires = NULL, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND state = ?',
+                (DONE, json.dumps(results, ensure_ascii=False), self.clock(),
+                 batch_id, worker_id, LEASED)
+            ).rowcount == 1
+
+        return self._transaction(finish)
+
+    def fail(self, batch_id: str, worker_id: str, error: str) -> bool:
+        """工作进程无法执行批次时归还租约
+
+        批次重新排队，超过最大租用次数后标记为失败。
+        """
+        def release(conn):
+            return conn.execute(
+                'UPDATE batches SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+                'worker = NULL, lease_expires = NULL, error = ?, updated_at = ? '
+                'WHERE id = ? AND worker = ? AND state = ?',
+                (self.max_attempts, FAILED, QUEUED, error, self.clock(),
+                 batch_id, worker_id, LEASED)
+            ).rowcount == 1
+
+        return self._transaction(release)
+
+    def pending(self) -> int:
+        """排队中和租用中的批次数"""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                'SELECT COUNT(*) FROM batches WHERE state IN (?, ?)', (QUEUED, LEASED)
+            ).fetchone()[0]
+
+    def suite_status(self, suite_id: str) -> Dict[str, int]:
+        """套件中各状态的批次数
+
+        先处理过期的租约：所有工作进程都失联时没有人再调用 lease()，
+        等待套件的一方仍能看到批次重新排队或失败，
+        而不是一直处于租用中。
+        """
+        def count(conn):
+            self._expire(conn, self.clock())
+            return conn.execute(
+                'SELECT state, COUNT(*) AS count FROM batches WHERE suite_id = ? GROUP BY state',
+                (suite_id,)
+            ).fetchall()
+
+        rows = self._transaction(count)
+        status = {state: 0 for state in (QUEUED, LEASED, DONE, FAILED)}
+        status.update({row['state']: row['count'] for row in rows})
+        return status
+
+    def suite_results(self, suite_id: str) -> List[Dict]:
+        """按用例在套件中的顺序返回已结束批次的结果
+
+        失败批次中的用例记为失败。
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                'SELECT cases, indices, state, results, error FROM batches '
+                'WHERE suite_id = ? AND state IN (?, ?)', (suite_id, DONE, FAILED)
+            ).fetchall()
+        ordered = []
+        for row in rows:
+            indices = json.loads(row['indices'])
+            if row['state'] == DONE:
+                results = json.loads(row['results'])
+            else:
+                results = [{
+                    'case_id': case.get('id'),
+                    'status': 'failed',
+                    'start_time': None,
+                    'end_time': None,
+                    'error_message': f"批次执行失败: {row['error']}"
+                } for case in json.loads(row['cases'])]
+            ordered.extend(zip(indices, results))
+        return [result for _, result in sorted(ordered, key=lambda item: item[0])]
+
+
+# 可以通过TCP调用的任务存储方法
+REMOTE_OPERATIONS = ('enqueue', 'lease', 'heartbeat', 'complete', 'fail', 'requeue_expired',
+                     'pending', 'suite_status', 'suite_results')
+
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    """每行一个JSON请求 {"op": ..., "args": {...}}，每行一个JSON响应"""
+
+    store: SQLiteJobStore = None
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line.decode('utf-8'))
+                op = request.get('op')
+                if op not in REMOTE_OPERATIONS:
+                    raise ValueError(f"未知的操作: {op}")
+                result = getattr(self.store, op)(**request.get('args', {}))
+                if isinstance(result, Batch):
+                    result = result.to_dict()
+                response = {'ok': True, 'result': result}
+            except Exception as e:
+                logger.error(f"处理协调请求失败: {str(e)}")
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class CoordinatorServer:
+    """通过TCP提供任务存储的协调端，在后台线程中运行
+
+    Args:
+        store: 协调端本地的任务存储
+        host: 监听地址，协调端没有认证，默认只监听本机
+        port: 监听端口，0表示随机端口
+    """
+
+    def __init__(self, store: SQLiteJobStore, host: str = '127.0.0.1',
+                 port: int = DEFAULT_COORDINATOR_PORT):
+        self.store = store
+        handler = type('BoundCoordinatorHandler', (_CoordinatorHandler,), {'store': store})
+        self.server = socketserver.ThreadingTCPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> 'CoordinatorServer':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='coordinator',
+                                        daemon=True)
+        self._thread.start()
+        logger.info(f"协调端已启动: {self.address}")
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        logger.info("协调端已停止")
+
+    def __enter__(self) -> 'CoordinatorServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+class RemoteJobStore:
+    """协调端任务存储的TCP客户端，接口与 SQLiteJobStore 相同
+
+    Args:
+        address: 协调端地址，形如 "host:port"
+        timeout: 请求超时时间（秒）
+    """
+
+    def __init__(self, address: str, timeout: float = 30.0):
+        host, _, port = address.rpartition(':')
+        self.host = host or '127.0.0.1'
+        self.port = int(port)
+        self.timeout = timeout
+
+    def _call(self, op: str, **args):
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            request = json.dumps({'op': op, 'args': args}, ensure_ascii=False) + '\n'
+            conn.sendall(request.encode('utf-8'))
+            with conn.makefile('rb') as reader:
+                line = reader.readline()
+        if not line:
+            raise ConnectionError(f"协调端 {self.host}:{self.port} 关闭了连接")
+        response = json.loads(line.decode('utf-8'))
+        if not response.get('ok'):
+            raise RuntimeError(f"协调端返回错误: {response.get('error')}")
+        return response['result']
+
+    def enqueue(self, batches: List[List[Tuple[int, Dict]]], suite_id: Optional[str] = None) -> str:
+        return self._call('enqueue', batches=batches, suite_id=suite_id)
+
+    def lease(self, worker_id: str) -> Optional[Batch]:
+        result = self._call('lease', worker_id=worker_id)
+        return Batch(**result) if result else None
+
+    def heartbeat(self, batch_id: str, worker_id: str) -> bool:
+        return self._call('heartbeat', batch_id=batch_id, worker_id=worker_id)
+
+    def complete(self, batch_id: str, worker_id: str, results: List[Dict]) -> bool:
+        return self._call('complete', batch_id=batch_id, worker_id=worker_id, results=results)
+
+    def fail(self, batch_id: str, worker_id: str, error: str) -> bool:
+        return self._call('fail', batch_id=batch_id, worker_id=worker_id, error=error)
+
+    def requeue_expired(self) -> int:
+        return self._call('requeue_expired')
+
+    def pending(self) -> int:
+        return self._call('pending')
+
+    def suite_status(self, suite_id: str) -> Dict[str, int]:
+        return self._call('suite_status', suite_id=suite_id)
+
+    def suite_results(self, suite_id: str) -> List[Dict]:
+        return self._call('suite_results', suite_id=suite_id)
+
+
+def open_store(store: Optional[str] = None, coordinator: Optional[str] = None, **kwargs):
+    """按参数打开任务存储：协调端地址优先，否则使用SQLite文件"""
+    if coordinator:
+        return RemoteJobStore(coordinator)
+    return SQLiteJobStore(store or os.getenv('JOB_STORE', 'output/jobs.db'), **kwargs)
+
+
+def submit_suite(store, test_cases: List[Dict], batch_size: int = 10,
+                 history: Optional[CaseHistory] = None, suite_id: Optional[str] = None) -> str:
+    """把套件切分成批次写入任务存储
+
+    用例按历史耗时从长到短排列后切分，长用例所在的批次先被租用，
+    减少拖尾。
+
+    Args:
+        store: 任务存储
+        test_cases: 测试用例列表
+        batch_size: 每个批次的用例数
+        history: 用例历史耗时
+        suite_id: 套件ID，默认自动生成
+
+    Returns:
+        套件ID
+    """
+    history = history or CaseHistory()
+    indexed = sorted(enumerate(test_cases),
+                     key=lambda item: -history.expected(item[1].get('id'))[0])
+    batch_size = max(1, batch_size)
+    batches = [indexed[i:i + batch_size] for i in range(0, len(indexed), batch_size)]
+    return store.enqueue(batches, suite_id)
+
+
+def wait_for_suite(store, suite_id: str, poll_interval: float = 2.0,
+                   timeout: Optional[float] = None) -> List[Dict]:
+    """等待套件的所有批次结束并返回结果
+
+    Raises:
+        TimeoutError: 超过 timeout 仍有未结束的批次
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        status = store.suite_status(suite_id)
+        if not status[QUEUED] and not status[LEASED]:
+            return store.suite_results(suite_id)
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"套件 {suite_id} 未在 {timeout}s 内完成: {status}")
+        time.sleep(poll_interval)
+
+
+class DistributedWorker:
+    """租用批次并在本机浏览器会话中执行的工作进程
+
+    Args:
+        store: 任务存储（SQLiteJobStore 或 RemoteJobStore）
+        executor: 测试执行器，默认保持会话以便在批次之间复用登录状态
+        worker_id: 工作进程标识，默认 "主机名-进程号"
+        poll_interval: 没有可租用批次时的轮询间隔（秒）
+    """
+
+    def __init__(self, store, executor=None, worker_id: Optional[str] = None,
+                 poll_interval: float = 2.0):
+        self.store = store
+        if executor is None:
+            from src.core.automation.test_executor import TestExecutor
+            executor = TestExecutor(keep_sessions=True)
+        self.executor = executor
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        self.completed = 0
+
+    def run_once(self) -> bool:
+        """租用并执行一个批次
+
+        Returns:
+            是否租到了批次
+        """
+        batch = self.store.lease(self.worker_id)
+        if batch is None:
+            return False
+        logger.info(f"工作进程 {self.worker_id} 租用批次 {batch.id}"
+                    f"（{len(batch.cases)} 个用例，第 {batch.attempts} 次）")
+
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def keep_alive():
+            # 每个租约周期内续租三次，容忍偶发的网络抖动
+            while not stop.wait(batch.lease_seconds / 3):
+                try:
+                    if not self.store.heartbeat(batch.id, self.worker_id):
+                        lost.set()
+                        logger.warning(f"批次 {batch.id} 的租约已失效，结果将被丢弃")
+                        return
+                except Exception as e:
+                    logger.warning(f"批次 {batch.id} 续租失败: {str(e)}")
+
+        heartbeat = threading.Thread(target=keep_alive, name=f'heartbeat-{batch.id}', daemon=True)
+        heartbeat.start()
+        try:
+            results = self.executor.execute_test_suite(batch.cases)
+        except Exception as e:
+            stop.set()
+            logger.error(f"批次 {batch.id} 执行失败: {str(e)}")
+            self.store.fail(batch.id, self.worker_id, str(e))
+            return True
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if lost.is_set() or not self.store.complete(batch.id, self.worker_id, results):
+            logger.warning(f"批次 {batch.id} 已被重新分配，丢弃本次结果")
+        else:
+            self.completed += 1
+            logger.info(f"批次 {batch.id} 已完成")
+        return True
+
+    def run(self, max_batches: Optional[int] = None, exit_when_idle: bool = False) -> int:
+        """循环租用批次直到没有剩余工作
+
+        Args:
+            max_batches: 最多执行的批次数
+            exit_when_idle: 所有批次都已结束（没有排队或租用中的批次）时退出
+
+        Returns:
+            成功回报的批次数
+        """
+        handled = 0
+        try:
+            while max_batches is None or handled < max_batches:
+                if self.run_once():
+                    handled += 1
+                elif exit_when_idle and not self.store.pending():
+                    break
+                else:
+                    time.sleep(self.poll_interval)
+        finally:
+            self.executor.cleanup()
+        return self.completed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='云效自动化分布式执行')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_store_arguments(sub):
+        sub.add_argument('--store',
+                         help='共享的SQLite任务存储文件，默认读取 JOB_STORE')
+        sub.add_argument('--coordinator',
+                         help='协调端地址 host:port，指定后不直接访问SQLite文件')
+        sub.add_argument('--lease-seconds', type=float,
+                         default=float(os.getenv('LEASE_SECONDS', '60')))
+
+    coordinator = subparsers.add_parser('coordinator', help='启动TCP协调端')
+    add_store_arguments(coordinator)
+    coordinator.add_argument('--host', default='127.0.0.1',
+                             help='监听地址，协调端没有认证，'
+                                  '其他机器连接时指定内网地址')
+    coordinator.add_argument('--port', type=int, default=DEFAULT_COORDINATOR_PORT)
+
+    worker = subparsers.add_parser('worker', help='启动工作进程')
+    add_store_arguments(worker)
+    worker.add_argument('--exit-when-idle', action='store_true', help='所有批次结束后退出')
+
+    submit = subparsers.add_parser('submit', help='提交套件')
+    add_store_arguments(submit)
+    submit.add_argument('--cases', required=True, help='JSON格式的用例列表文件')
+    submit.add_argument('--batch-size', type=int, default=10)
+    submit.add_argument('--wait', action='store_true', help='等待套件完成并输出结果')
+    submit.add_argument('--timeout', type=float, help='等待套件完成的最长时间（秒）')
+    submit.add_argument('--results-dir', default='output/test_results',
+                        help='历史结果目录，用于按历史耗时排序用例，'
+                             '等待完成后结果也保存在这里')
+
+    args = parser.parse_args(argv)
+    from src.utils.logging_config import setup_logging, stop_logging
+    setup_logging()
+    try:
+        if args.command == 'coordinator':
+            store = SQLiteJobStore(args.store or os.getenv('JOB_STORE', 'output/jobs.db'),
+                                   lease_seconds=args.lease_seconds)
+            server = CoordinatorServer(store, args.host, args.port).start()
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                server.stop()
+            return 0
+
+        store = open_store(args.store, args.coordinator, lease_seconds=args.lease_seconds)
+        if args.command == 'worker':
+            DistributedWorker(store).run(exit_when_idle=args.exit_when_idle)
+            return 0
+
+        with open(args.cases, 'r', encoding='utf-8') as f:
+            test_cases = json.load(f)
+        from src.core.automation.result_manager import ResultManager
+        result_manager = ResultManager(args.results_dir)
+        suite_id = submit_suite(store, test_cases, args.batch_size,
+                                history=CaseHistory.from_result_dir(result_manager.output_dir))
+        print(suite_id)
+        if args.wait:
+            results = wait_for_suite(store, suite_id, timeout=args.timeout)
+            result_manager.save_suite_results(results)
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+            return 0 if all(r['status'] == 'passed' for r in results) else 1
+        return 0
+    finally:
+        stop_logging()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
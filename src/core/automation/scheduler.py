@@ -0,0 +1,318 @@
+"""基于历史耗时的用例调度
+
+按用例的历史耗时（结果中的 start_time / end_time）预估执行时间，
+以最长预计时间优先（LPT）的顺序把用例分配给各个工作线程；
+运行中空闲的工作线程从剩余工作量最多的工作线程窃取用例，
+平衡预估不准造成的拖尾。用例可以带有阶段（phase），
+前一阶段的用例全部分发后才开始分发下一阶段。
+"""
+
+import glob
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from src.core.test_case.case_manager import CASE_LIBRARY
+
+logger = logging.getLogger(__name__)
+
+
+def history_key(case: Dict) -> str:
+    """用例或结果对应的历史耗时键
+
+    键为用例ID，用例库以外的页面上下文加上 @上下文 后缀。
+    """
+    case_id = case.get('case_id') or case.get('id')
+    context = case.get('context')
+    if context and context != CASE_LIBRARY:
+        return f"{case_id}@{context}"
+    return case_id
+
+
+def result_duration(result: Dict) -> Optional[float]:
+    """从测试结果的 start_time / end_time 计算耗时（秒），无法解析时返回None"""
+    try:
+        start = datetime.fromisoformat(result['start_time'])
+        end = datetime.fromisoformat(result['end_time'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    seconds = (end - start).total_seconds()
+    return seconds if seconds >= 0 else None
+
+
+class CaseHistory:
+    """用例历史耗时
+
+    Args:
+        default_duration: 没有任何历史记录时使用的预估耗时（秒）
+        window: 每个用例保留的最近耗时数量，预估取其中位数
+    """
+
+    def __init__(self, default_duration: float = 60.0, window: int = 5):
+        self.default_duration = default_duration
+        self.window = window
+        self._durations: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_result_dir(cls, result_dir: str, **kwargs) -> 'CaseHistory':
+        """从 ResultManager 保存的套件结果文件加载历史耗时
+
+        Args:
+            result_dir: 结果目录，读取其中的 test_suite_*.json
+
+        Returns:
+            历史耗时，目录不存在时为空
+        """
+        history = cls(**kwargs)
+        for path in sorted(glob.glob(os.path.join(result_dir, 'test_suite_*.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    results = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"读取历史结果失败 {path}: {str(e)}")
+                continue
+            if isinstance(results, list):
+                history.add_results(results)
+        return history
+
+    def __len__(self) -> int:
+        return len(self._durations)
+
+    def record(self, case_id: str, seconds: float) -> None:
+        """记录一次用例耗时"""
+        with self._lock:
+            self._durations.setdefault(case_id, deque(maxlen=self.window)).append(seconds)
+
+    def add_results(self, results: Iterable[Dict]) -> None:
+        """记录一批测试结果的耗时，包含多个步骤（steps）的按步骤记录"""
+        for result in results:
+            for step in result.get('steps') or [result]:
+                seconds = result_duration(step)
+                if seconds is not None and step.get('case_id'):
+                    self.record(history_key(step), seconds)
+
+    def fallback(self) -> float:
+        """未知用例的预估耗时
+
+        取已知用例预估耗时的中位数，没有历史时取默认值。
+        """
+        with self._lock:
+            known = [statistics.median(d) for d in self._durations.values()]
+        return statistics.median(known) if known else self.default_duration
+
+    def expected(self, case_id: str) -> Tuple[float, bool]:
+        """预估用例耗时
+
+        Returns:
+            (预估耗时, 是否有该用例的历史记录)
+        """
+        with self._lock:
+            durations = self._durations.get(case_id)
+            if durations:
+                return statistics.median(durations), True
+        return self.fallback(), False
+
+    def plan(self, test_cases: List[Dict], workers: int) -> 'SuitePlan':
+        """按最长预计时间优先把用例分配给工作线程
+
+        每个用例分给当前预计负载最小的工作线程；
+        只有一个工作线程时保持原顺序。带 phase 的用例按阶段先后排列。
+
+        Args:
+            test_cases: 测试用例列表，可带 phase（阶段序号）
+                和 context（页面上下文）
+            workers: 工作线程数
+
+        Returns:
+            调度计划
+        """
+        workers = max(1, workers)
+        items = []
+        for index, test_case in enumerate(test_cases):
+            expected, known = self.expected(history_key(test_case))
+            phase = test_case.get('phase', 0)
+            items.append(ScheduledCase(index, test_case, expected, known, phase))
+
+        plan = SuitePlan([[] for _ in range(workers)], [0.0] * workers)
+        if workers > 1:
+            items.sort(key=lambda item: (item.phase, -item.expected, item.index))
+        else:
+            items.sort(key=lambda item: (item.phase, item.index))
+        for item in items:
+            worker = min(range(workers), key=lambda w: (plan.loads[w], w))
+            plan.assignments[worker].append(item)
+            plan.loads[worker] += item.expected
+        return plan
+
+
+@dataclass
+class ScheduledCase:
+    """调度中的一个用例"""
+    index: int
+    case: Dict
+    expected: float
+    known: bool
+    phase: int = 0
+
+    @property
+    def case_id(self) -> str:
+        return self.case.get('id')
+
+
+@dataclass
+class SuitePlan:
+    """调度计划
+
+    Attributes:
+        assignments: 每个工作线程分到的用例，按执行顺序排列
+        loads: 每个工作线程的预计负载（秒）
+    """
+    assignments: List[List[ScheduledCase]]
+    loads: List[float]
+
+    @property
+    def workers(self) -> int:
+        return len(self.assignments)
+
+    @property
+    def predicted_makespan(self) -> float:
+        return max(self.loads) if self.loads else 0.0
+
+
+@dataclass
+class ScheduleReport:
+    """调度结果：预计与实际的完成时间"""
+    workers: int
+    cases: int
+    unknown_cases: int
+    steals: int
+    predicted_makespan: float
+    actual_makespan: float
+    predicted_loads: List[float] = field(default_factory=list)
+    actual_loads: List[float] = field(default_factory=list)
+
+    def describe(self) -> str:
+        loads = '，'.join(
+            f"#{i} {p:.1f}s/{a:.1f}s"
+            for i, (p, a) in enumerate(zip(self.predicted_loads, self.actual_loads))
+        )
+        return (
+            f"{self.workers} 个工作线程执行 {self.cases} 个用例"
+            f"（{self.unknown_cases} 个无历史耗时），"
+            f"预计完成时间 {self.predicted_makespan:.1f}s，"
+            f"实际 {self.actual_makespan:.1f}s，"
+            f"窃取 {self.steals} 次；各线程预计/实际负载: {loads}"
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'cases': self.cases,
+            'unknown_cases': self.unknown_cases,
+            'steals': self.steals,
+            'predicted_makespan': round(self.predicted_makespan, 3),
+            'actual_makespan': round(self.actual_makespan, 3),
+            'predicted_loads': [round(v, 3) for v in self.predicted_loads],
+            'actual_loads': [round(v, 3) for v in self.actual_loads]
+        }
+
+
+class WorkStealingQueue:
+    """按调度计划分发用例的工作队列，线程安全
+
+    工作线程先执行自己队列中的用例；自己的队列为空时，
+    从剩余预计工作量最多的工作线程的队首窃取一个用例
+    （即对方下一个要开始的、预计最长的用例），
+    让空闲线程尽早接手长用例。
+    当前阶段还有未分发的用例时，不会开始下一阶段。
+
+    Args:
+        plan: 调度计划
+        clock: 计时函数
+    """
+
+    def __init__(self, plan: SuitePlan, clock: Callable[[], float] = time.monotonic):
+        self.plan = plan
+        self.clock = clock
+        self.steals = 0
+        self._queues = [deque(items) for items in plan.assignments]
+        self._results: Dict[int, Dict] = {}
+        self._busy = [0.0] * plan.workers
+        self._started: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self._start = clock()
+        self._end: Optional[float] = None
+
+    def take(self, worker: int) -> Optional[ScheduledCase]:
+        """取出工作线程要执行的下一个用例，所有队列为空时返回None"""
+        with self._lock:
+            pending = [w for w in range(len(self._queues)) if self._queues[w]]
+            if not pending:
+                return None
+            # 各队列按阶段排序，队首就是该队列最早的阶段
+            phase = min(self._queues[w][0].phase for w in pending)
+            queue = self._queues[worker]
+            if queue and queue[0].phase == phase:
+                item = queue.popleft()
+            else:
+                candidates = [w for w in pending if self._queues[w][0].phase == phase]
+                victim = max(candidates,
+                             key=lambda w: (self._remaining(w, phase), len(self._queues[w])))
+                item = self._queues[victim].popleft()
+                self.steals += 1
+                logger.debug(f"工作线程 #{worker} 从 #{victim} 窃取用例 {item.case_id}")
+            self._started[item.index] = self.clock()
+            return item
+
+    def finish(self, worker: int, item: ScheduledCase, result: Dict) -> None:
+        """记录用例结果"""
+        with self._lock:
+            now = self.clock()
+            self._busy[worker] += now - self._started.pop(item.index, now)
+            self._results[item.index] = result
+            self._end = now
+
+    def has_pending(self) -> bool:
+        """是否还有未分发的用例"""
+        with self._lock:
+            return any(self._queues)
+
+    def drain(self) -> List[ScheduledCase]:
+        """取出所有未执行的用例（例如所有工作线程都启动失败时）"""
+        with self._lock:
+            items = [item for queue in self._queues for item in queue]
+            for queue in self._queues:
+                queue.clear()
+            return sorted(items, key=lambda item: item.index)
+
+    def results(self) -> List[Dict]:
+        """按用例原始顺序返回已完成用例的结果"""
+        with self._lock:
+            return [self._results[index] for index in sorted(self._results)]
+
+    def report(self) -> ScheduleReport:
+        """生成预计与实际完成时间的对比"""
+        with self._lock:
+            end = self._end if self._end is not None else self.clock()
+            items = [item for items in self.plan.assignments for item in items]
+            return ScheduleReport(
+                workers=self.plan.workers,
+                cases=len(items),
+                unknown_cases=sum(1 for item in items if not item.known),
+                steals=self.steals,
+                predicted_makespan=self.plan.predicted_makespan,
+                actual_makespan=end - self._start,
+                predicted_loads=list(self.plan.loads),
+                actual_loads=list(self._busy)
+            )
+
+    def _remaining(self, worker: int, phase: int) -> float:
+        return sum(item.expected for item in self._queues[worker] if item.phase == phase)
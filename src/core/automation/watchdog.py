@@ -0,0 +1,180 @@
+"""用例执行看门狗
+
+为每个用例设置时间预算。超时后在执行用例的线程中抛出 CaseTimeoutError
+中止用例，并记录当时卡住的步骤；浏览器命令阻塞无法中止时，
+强制中断会话，由执行器回收会话后继续，
+不必等待每一层嵌套的等待超时。
+"""
+
+import ctypes
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+# 定位卡住步骤时关注的模块
+STEP_MODULES = ('src.core.test_case.case_manager', 'src.core.login.login')
+
+
+class CaseTimeoutError(BaseException):
+    """用例执行超出时间预算
+
+    继承 BaseException，避免被用例代码中的 ``except Exception`` 重试逻辑吞掉。
+    """
+
+
+def _raise_in_thread(thread_id: int, exc_type: Optional[type]) -> bool:
+    """在指定线程中异步抛出异常，exc_type 为None时清除尚未送达的异常"""
+    exc = ctypes.py_object(exc_type) if exc_type is not None else None
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), exc) == 1
+
+
+def describe_step(thread_id: int, modules: Iterable[str] = STEP_MODULES) -> Optional[str]:
+    """获取线程当前所在的步骤
+
+    Args:
+        thread_id: 执行用例的线程ID
+        modules: 步骤所在的模块，优先返回这些模块中最内层的函数
+
+    Returns:
+        形如 "_input_case_id (case_manager.py:360)" 的步骤描述，线程已结束时返回None
+    """
+    frame = sys._current_frames().get(thread_id)
+    innermost = frame
+    modules = tuple(modules)
+    while frame is not None:
+        if frame.f_globals.get('__name__') in modules:
+            break
+        frame = frame.f_back
+    frame = frame or innermost
+    if frame is None:
+        return None
+    filename = frame.f_code.co_filename.replace('\\', '/').rsplit('/', 1)[-1]
+    return f"{frame.f_code.co_name} ({filename}:{frame.f_lineno})"
+
+
+class CaseWatch:
+    """单个用例的看门狗，作为上下文管理器包裹用例执行
+
+    超出预算后在用例线程中抛出 CaseTimeoutError，并记录当时所在的步骤；
+    如果用例线程在宽限期内仍未退出
+    （通常阻塞在无响应的浏览器调用上），
+    调用 on_unresponsive 强制中断浏览器，并把会话标记为无响应。
+    """
+
+    def __init__(self, case_id: str, budget: float, grace: float,
+                 on_unresponsive: Optional[Callable[[], None]] = None,
+                 poll_interval: float = 0.5):
+        self.logger = logging.getLogger(__name__)
+        self.case_id = case_id
+        self.budget = budget
+        self.grace = grace
+        self.on_unresponsive = on_unresponsive
+        self.poll_interval = poll_interval
+        self.expired = False
+        self.unresponsive = False
+        self.step: Optional[str] = None
+        self.elapsed: Optional[float] = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread_id: Optional[int] = None
+        self._timer: Optional[threading.Thread] = None
+        self._start: Optional[float] = None
+
+    def __enter__(self) -> 'CaseWatch':
+        self._thread_id = threading.get_ident()
+        self._start = time.monotonic()
+        if self.budget and self.budget > 0:
+            self._timer = threading.Thread(target=self._run, name=f'case-watchdog-{self.case_id}',
+                                           daemon=True)
+            self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        try:
+            self._finish()
+        except CaseTimeoutError:
+            # 超时异常恰好在退出时送达
+            self._finish()
+            if exc_type is None:
+                raise
+        return False
+
+    def _finish(self) -> None:
+        with self._lock:
+            if not self._done.is_set():
+                self._done.set()
+                self.elapsed = time.monotonic() - self._start
+                if self.expired:
+                    # 用例已自行结束，清除可能尚未送达的超时异常
+                    _raise_in_thread(self._thread_id, None)
+
+    def _interrupt(self) -> bool:
+        """向用例线程抛出超时异常，用例已结束时返回False"""
+        with self._lock:
+            if self._done.is_set():
+                return False
+            _raise_in_thread(self._thread_id, CaseTimeoutError)
+            return True
+
+    def _run(self) -> None:
+        if self._done.wait(self.budget):
+            return
+        with self._lock:
+            if self._done.is_set():
+                return
+            self.expired = True
+            self.step = describe_step(self._thread_id)
+        self.logger.warning(f"用例 {self.case_id} 超出时间预算 {self.budget:.0f}s，"
+                            f"卡在步骤: {self.step}")
+
+        # 用例代码中的裸 except 可能吞掉超时异常，宽限期内持续重新抛出
+        deadline = time.monotonic() + self.grace
+        while self._interrupt():
+            if self._done.wait(self.poll_interval):
+                return
+            if time.monotonic() >= deadline:
+                break
+
+        if self._done.is_set():
+            return
+        self.unresponsive = True
+        self.logger.error(f"用例 {self.case_id} 在宽限期 {self.grace:.0f}s 内未能中止，"
+                          f"浏览器会话无响应")
+        if self.on_unresponsive:
+            try:
+                self.on_unresponsive()
+            except Exception as e:
+                self.logger.error(f"强制中断浏览器会话失败: {str(e)}")
+        # 阻塞的浏览器调用返回后，超时异常才能送达
+        while self._interrupt():
+            if self._done.wait(self.poll_interval):
+                return
+
+
+class CaseWatchdog:
+    """用例时间预算看门狗
+
+    Args:
+        budget: 单个用例的时间预算（秒），0表示不限制
+        grace: 抛出超时异常后等待用例中止的宽限期（秒）
+    """
+
+    def __init__(self, budget: float, grace: float = 10.0):
+        self.budget = budget
+        self.grace = grace
+
+    def watch(self, case_id: str,
+              on_unresponsive: Optional[Callable[[], None]] = None) -> CaseWatch:
+        """为一个用例创建看门狗
+
+        Args:
+            case_id: 用例ID
+            on_unresponsive: 浏览器无响应时在看门狗线程中调用，
+                用于强制中断阻塞的浏览器调用
+
+        Returns:
+            用于包裹用例执行的上下文管理器
+        """
+        return CaseWatch(case_id, self.budget, self.grace, on_unresponsive)
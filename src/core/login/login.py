@@ -50,7 +50,6 @@ class LoginManager:
                     
             self.logger.info("正在导航到登录页面...")
             self.driver.get(self.config.url)
-            self.driver.maximize_window()
             
             # 防检测
             try:
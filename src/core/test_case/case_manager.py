@@ -16,25 +16,117 @@ import re
 import openpyxl
 from openpyxl import Workbook
 import logging
+import os
+import weakref
+from functools import wraps
 from src.config.yx_config import YxConfig
+from src.utils.driver.cdp import CDPError, devtools_for
+
+# 已完成登录的driver及其登录耗时，driver被回收后自动移除
+_authenticated_drivers = weakref.WeakKeyDictionary()
+
+# 页面上下文：用例库中标记自动化类型，
+# 测试计划中标记测试结果和执行人
+CASE_LIBRARY = 'case_library'
+TEST_PLAN = 'test_plan'
+PAGE_CONTEXTS = (CASE_LIBRARY, TEST_PLAN)
+
+def on_page(context):
+    """页面操作装饰器，调用前确保已登录并位于指定的页面上下文"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            self.ensure_logged_in()
+            self.ensure_page_context(context)
+            return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 class TestCaseManager:
     """测试用例管理类，处理用例相关的所有功能"""
 
-    def __init__(self, driver):
+    def __init__(self, driver, base_url="https://devops.aliyun.com", test_plan_url=None,
+                 devtools=None, driver_manager=None):
         """初始化测试用例管理类
         
         Args:
             driver: WebDriver实例
+            base_url: 云效站点根地址，基准测试时可指向本地Mock服务
+            test_plan_url: 测试计划页面地址，默认读取 YUNXIAO_TEST_PLAN_URL，
+                未配置时使用用例页面
+            devtools: DevTools直连通道，用于元素判断、
+                输入用例编号和点击过滤；默认在 CDP_DIRECT 开启时
+                连接driver的调试地址，不可用时使用Selenium
+            driver_manager: 创建driver的WebDriver管理器；
+                登录时浏览器窗口关闭会通过它重建会话，
+                未提供时直接抛出异常，由调用方处理
         """
         self.driver = driver
+        self.driver_manager = driver_manager
+        cdp_direct = os.getenv('CDP_DIRECT', '').strip().lower() in ('1', 'true', 'yes', 'on')
+        if devtools is None and cdp_direct:
+            devtools = devtools_for(driver)
+        self.devtools = devtools
+        self.base_url = base_url.rstrip('/')
+        self.page_urls = {
+            CASE_LIBRARY: f"{self.base_url}/testcase",
+            TEST_PLAN: (test_plan_url or os.getenv('YUNXIAO_TEST_PLAN_URL')
+                        or f"{self.base_url}/testcase")
+        }
+        self.page_context = None  # 当前所在的页面上下文，未知时为None
+        self.page_switches = 0  # 切换页面上下文的次数
         self.element_existance = False
         self.element_exist = False
         self.logger = logging.getLogger(__name__)
         self.wait = WebDriverWait(self.driver, 30)  # 创建一个全局的WebDriverWait对象
         self.max_retries = 3  # 最大重试次数
+        # 本实例执行登录的耗时，复用已有登录状态时为None
+        self.login_seconds = None
         
-        # 导航到登录页面
+    @property
+    def is_logged_in(self):
+        """当前driver是否已经完成登录"""
+        return self.driver in _authenticated_drivers
+        
+    def ensure_logged_in(self):
+        """确保当前driver已登录
+        
+        登录延迟到第一个需要操作页面的方法调用时才执行；
+        同一个driver上已经登录过的状态会被后续创建的管理器复用。
+        """
+        if self.is_logged_in:
+            return
+        self.login()
+        
+    def invalidate_login(self):
+        """清除当前driver的登录状态，下一次页面操作前会重新登录"""
+        _authenticated_drivers.pop(self.driver, None)
+        self.page_context = None
+        
+    def ensure_page_context(self, context):
+        """确保浏览器位于指定的页面上下文，不在时导航过去
+        
+        Args:
+            context: 页面上下文（CASE_LIBRARY 或 TEST_PLAN）
+        """
+        if self.page_context == context:
+            return
+        url = self.page_urls[context]
+        self.logger.info(f"切换页面上下文 {self.page_context} -> {context}: {url}")
+        self.driver.get(url)
+        self.wait.until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "main, .test-case-list, [data-spm-click*='testcase']"))
+        )
+        self.page_context = context
+        self.page_switches += 1
+        
+    def login(self):
+        """登录云效并导航到测试用例页面，失败时重试
+        
+        登录作为独立阶段计时，耗时记录在 login_seconds 中。
+        """
+        start_time = time.perf_counter()
         retry_count = 0
         while retry_count < self.max_retries:
             try:
@@ -45,11 +137,16 @@ class TestCaseManager:
                 self.logger.warning(f"浏览器窗口已关闭，正在重试 ({retry_count}/{self.max_retries})")
                 if retry_count >= self.max_retries:
                     raise Exception(f"登录失败，超过最大重试次数: {str(e)}")
-                # 重新创建浏览器窗口
-                self.driver.quit()
-                from src.utils.driver.webdriver_manager import WebDriverManager
-                self.driver = WebDriverManager().get_driver()
+                if self.driver_manager is None:
+                    # 无法替调用方重建浏览器，由持有driver的一方回收会话
+                    raise
+                # 通过持有会话的管理器重新创建浏览器，
+                # 新会话仍由它跟踪和关闭
+                reason = "登录时浏览器窗口已关闭"
+                self.driver = self.driver_manager.recycle_driver(reason)
                 self.wait = WebDriverWait(self.driver, 30)
+                if self.devtools is not None:
+                    self.devtools = devtools_for(self.driver)
             except WebDriverException as e:
                 retry_count += 1
                 self.logger.warning(f"WebDriver异常，正在重试 ({retry_count}/{self.max_retries})")
@@ -57,10 +154,16 @@ class TestCaseManager:
                     raise Exception(f"登录失败，超过最大重试次数: {str(e)}")
                 time.sleep(2)  # 短暂等待后重试
                 
+        self.login_seconds = time.perf_counter() - start_time
+        _authenticated_drivers[self.driver] = self.login_seconds
+        # 登录后停留在用例页面
+        self.page_context = CASE_LIBRARY
+        self.logger.info(f"登录阶段耗时 {self.login_seconds:.2f}s")
+                
     def _perform_login(self):
         """执行登录操作"""
         self.logger.info("正在导航到云效登录页面...")
-        self.driver.get("https://devops.aliyun.com/")
+        self.driver.get(f"{self.base_url}/")
         
         # 等待页面加载完成
         self.wait.until(
@@ -68,9 +171,6 @@ class TestCaseManager:
         )
         self.logger.info("页面加载完成")
         
-        # 确保窗口最大化
-        self.driver.maximize_window()
-        
         # 等待并点击登录按钮
         login_button = None
         login_button_selectors = [
@@ -212,7 +312,7 @@ class TestCaseManager:
         
         # 导航到测试用例页面
         self.logger.info("正在导航到测试用例页面...")
-        self.driver.get("https://devops.aliyun.com/testcase")
+        self.driver.get(f"{self.base_url}/testcase")
         
         # 等待测试用例页面加载
         self.wait.until(
@@ -227,13 +327,16 @@ class TestCaseManager:
         Returns:
             bool: 是否存在用例
         """
-        try:
-            self.driver.find_element(By.XPATH, '//*[text()="暂无内容"]')
-            print('未找到用例')
-            self.element_existance = True
-        except:
-            print('有用例')
-            self.element_existance = False
+        found = self._via_devtools(
+            lambda channel: channel.xpath_exists('//*[text()="暂无内容"]'))
+        if found is None:
+            try:
+                self.driver.find_element(By.XPATH, '//*[text()="暂无内容"]')
+                found = True
+            except:
+                found = False
+        print('未找到用例' if found else '有用例')
+        self.element_existance = found
         return self.element_existance
 
     def get_element_exist(self, xpath):
@@ -245,15 +348,57 @@ class TestCaseManager:
         Returns:
             bool: 元素是否存在
         """
-        try:
-            self.driver.find_element(By.XPATH, xpath)
-            print('有元素')
-            self.element_exist = True
-        except:
-            print('无元素')
-            self.element_exist = False
+        found = self._via_devtools(lambda channel: channel.xpath_exists(xpath))
+        if found is None:
+            try:
+                self.driver.find_element(By.XPATH, xpath)
+                found = True
+            except:
+                found = False
+        print('有元素' if found else '无元素')
+        self.element_exist = found
         return self.element_exist
 
+    def _via_devtools(self, operation):
+        """通过DevTools直连执行操作
+        
+        Args:
+            operation: 接收DevTools通道的函数
+            
+        Returns:
+            操作的返回值；没有通道或通道出错时返回None，
+            调用方改用Selenium。通道出错后本管理器不再使用它。
+            操作正常完成但没有找到元素时不应改用Selenium再等待一次
+        """
+        if self.devtools is None:
+            return None
+        try:
+            return operation(self.devtools)
+        except (CDPError, OSError, ValueError) as e:
+            self.logger.warning(f"DevTools直连操作失败，改用WebDriver接口: {str(e)}")
+            self.devtools = None
+            return None
+
+    def _replace_input_via_devtools(self, xpath, text):
+        """通过DevTools等待输入框出现并替换其内容
+        
+        Returns:
+            是否完成输入；没有可用的DevTools通道时返回False，
+            调用方改用Selenium
+            
+        Raises:
+            TimeoutException: 输入框在30秒内没有出现
+        """
+        typed = self._via_devtools(
+            lambda channel: channel.wait_for_xpath(xpath, 30) and channel.replace_text(xpath, text)
+        )
+        if typed is None:
+            return False
+        if not typed:
+            raise TimeoutException(f"等待输入框超时: {xpath}")
+        time.sleep(0.5)
+        return True
+
     def _wait_for_page_load(self):
         """等待页面加载完成"""
         self.driver.implicitly_wait(20)  # 增加隐式等待时间
@@ -316,6 +461,10 @@ class TestCaseManager:
 
     def _input_case_id(self, case_id):
         """输入用例ID"""
+        xpath = '//*[contains(text(), "测试用例编号")]/../../..//input'
+        if self._replace_input_via_devtools(xpath, case_id):
+            self.logger.info("通过DevTools输入用例编号")
+            return
         try:
             case_input = self.wait.until(
                 EC.presence_of_element_located((By.XPATH, '//*[contains(text(), "测试用例编号")]/../../..//input'))
@@ -334,9 +483,21 @@ class TestCaseManager:
 
     def _click_filter_submit(self):
         """点击过滤按钮"""
+        xpath = '//*[text()="过滤"]/./.. | //*[contains(@class, "filter-submit")]'
+        clicked = self._via_devtools(lambda channel: channel.wait_for_xpath(xpath, 30, visible=True)
+                                     and channel.click_xpath(xpath))
+        if clicked is not None:
+            # DevTools通道可用时它的结果就是最终结果，
+            # 不再用Selenium等待第二个30秒
+            if not clicked:
+                self.logger.error("点击过滤按钮失败: 等待过滤按钮超时")
+                raise TimeoutException(f"等待过滤按钮超时: {xpath}")
+            self.logger.info("通过DevTools点击过滤按钮")
+            time.sleep(2)
+            return
         try:
             filter_submit = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, '//*[text()="过滤"]/./.. | //*[contains(@class, "filter-submit")]'))
+                EC.element_to_be_clickable((By.XPATH, xpath))
             )
             filter_submit.click()
             self.logger.info("点击过滤按钮")
@@ -388,6 +549,7 @@ class TestCaseManager:
                 
             time.sleep(1.5)
 
+    @on_page(CASE_LIBRARY)
     def mark_auto_type(self, case_id, case_type):
         """标记用例自动化类型
         
@@ -429,6 +591,9 @@ class TestCaseManager:
 
     def _input_case_id_for_result(self, case_id):
         """输入用例ID进行结果标记"""
+        xpath = '//*[text()="测试用例编号"]/./../../span/input'
+        if self._replace_input_via_devtools(xpath, case_id):
+            return
         case_input = self.wait.until(
             EC.presence_of_element_located((By.XPATH, '//*[text()="测试用例编号"]/./../../span/input'))
         )
@@ -476,6 +641,7 @@ class TestCaseManager:
                 self.driver.find_element(By.XPATH, '//*[text()="暂缓"]').click()
             time.sleep(0.5)
 
+    @on_page(TEST_PLAN)
     def mark_test_result(self, case_id, result, test_user=None):
         """标记测试结果
         
@@ -494,6 +660,22 @@ class TestCaseManager:
             if test_user:
                 self._set_test_user(test_user)
 
+    @on_page(TEST_PLAN)
+    def set_test_executor(self, case_id, test_user):
+        """设置用例的测试执行人，不修改测试结果
+        
+        Args:
+            case_id: 用例ID
+            test_user: 测试执行人
+        """
+        self._wait_for_filter_button()
+        self._input_case_id_for_result(case_id)
+        self._click_filter_submit()
+        self._wait_for_results_list()
+
+        if not self.get_element_existance():
+            self._set_test_user(test_user)
+
     def _set_test_user(self, test_user):
         """设置测试执行人
         
@@ -0,0 +1,194 @@
+"""浏览器健康监控
+
+长时间运行的云效单页应用会不断累积JS堆和DOM节点，操作随之变慢。
+监控器在用例之间通过 DevTools 的 Performance.getMetrics 采样浏览器指标，
+超过阈值或单个会话处理的用例数达到上限时给出回收原因，
+由 WebDriverManager 重建会话。
+"""
+
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+@dataclass
+class HealthThresholds:
+    """会话回收阈值，取0表示不限制
+
+    Attributes:
+        max_js_heap_mb: JS堆已用大小上限（MB）
+        max_nodes: DOM节点数上限
+        max_layout_count: 会话累计布局次数上限
+        max_cases: 单个会话处理的用例数上限
+        check_interval: 两次采样之间的最小间隔（秒），0表示每个用例后都采样
+    """
+    max_js_heap_mb: float = 512.0
+    max_nodes: int = 200000
+    max_layout_count: int = 0
+    max_cases: int = 200
+    check_interval: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> 'HealthThresholds':
+        """从环境变量读取阈值（BROWSER_MAX_HEAP_MB、BROWSER_MAX_NODES、
+        BROWSER_MAX_LAYOUT_COUNT、BROWSER_MAX_CASES、BROWSER_HEALTH_INTERVAL）"""
+        defaults = cls()
+        return cls(
+            max_js_heap_mb=float(os.getenv('BROWSER_MAX_HEAP_MB', defaults.max_js_heap_mb)),
+            max_nodes=int(os.getenv('BROWSER_MAX_NODES', defaults.max_nodes)),
+            max_layout_count=int(os.getenv('BROWSER_MAX_LAYOUT_COUNT', defaults.max_layout_count)),
+            max_cases=int(os.getenv('BROWSER_MAX_CASES', defaults.max_cases)),
+            check_interval=float(os.getenv('BROWSER_HEALTH_INTERVAL', defaults.check_interval))
+        )
+
+
+@dataclass
+class BrowserMetrics:
+    """一次采样得到的浏览器指标"""
+    js_heap_used: float = 0.0
+    js_heap_total: float = 0.0
+    nodes: int = 0
+    layout_count: int = 0
+    documents: int = 0
+    listeners: int = 0
+
+    @classmethod
+    def from_cdp(cls, result: Dict) -> 'BrowserMetrics':
+        """解析 Performance.getMetrics 的返回值"""
+        values = {m.get('name'): m.get('value', 0) for m in result.get('metrics', [])}
+        return cls(
+            js_heap_used=float(values.get('JSHeapUsedSize', 0)),
+            js_heap_total=float(values.get('JSHeapTotalSize', 0)),
+            nodes=int(values.get('Nodes', 0)),
+            layout_count=int(values.get('LayoutCount', 0)),
+            documents=int(values.get('Documents', 0)),
+            listeners=int(values.get('JSEventListeners', 0))
+        )
+
+    @property
+    def js_heap_used_mb(self) -> float:
+        return self.js_heap_used / MB
+
+    def describe(self) -> str:
+        return (
+            f"JS堆 {self.js_heap_used_mb:.1f}MB/{self.js_heap_total / MB:.1f}MB，"
+            f"DOM节点 {self.nodes}，布局次数 {self.layout_count}，"
+            f"文档 {self.documents}，事件监听 {self.listeners}"
+        )
+
+
+@dataclass
+class RecycleEvent:
+    """一次会话回收记录"""
+    reason: str
+    cases: int
+    metrics: Optional[BrowserMetrics]
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        if self.metrics is not None:
+            data['metrics']['js_heap_used_mb'] = round(self.metrics.js_heap_used_mb, 1)
+        return data
+
+
+class BrowserHealthMonitor:
+    """单个WebDriverManager的会话健康监控
+
+    Args:
+        thresholds: 回收阈值
+        clock: 计时函数，默认 time.monotonic
+    """
+
+    def __init__(self, thresholds: Optional[HealthThresholds] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.thresholds = thresholds or HealthThresholds()
+        self.clock = clock
+        self.recycles: List[RecycleEvent] = []
+        self._driver = None
+        self.reset()
+
+    def reset(self, driver=None) -> None:
+        """开始监控一个新会话"""
+        self._driver = driver
+        self.cases = 0
+        self.last_metrics: Optional[BrowserMetrics] = None
+        self._last_sample: Optional[float] = None
+        self._performance_enabled = False
+        self._unsupported = False
+
+    def sample(self, driver) -> Optional[BrowserMetrics]:
+        """采集一次浏览器指标
+
+        Returns:
+            指标；驱动不支持DevTools命令时返回None
+        """
+        if self._unsupported:
+            return None
+        try:
+            if not self._performance_enabled:
+                driver.execute_cdp_cmd('Performance.enable', {'timeDomain': 'timeTicks'})
+                self._performance_enabled = True
+            metrics = BrowserMetrics.from_cdp(driver.execute_cdp_cmd('Performance.getMetrics', {}))
+        except (WebDriverException, AttributeError) as e:
+            self._unsupported = True
+            logger.warning(f"无法采集浏览器指标，"
+                           f"健康监控仅按用例数回收: {str(e)}")
+            return None
+        self.last_metrics = metrics
+        self._last_sample = self.clock()
+        logger.debug(f"浏览器指标: {metrics.describe()}")
+        return metrics
+
+    def check(self, metrics: BrowserMetrics) -> Optional[str]:
+        """判断指标是否超过阈值
+
+        Returns:
+            超限原因，未超限时返回None
+        """
+        t = self.thresholds
+        if t.max_js_heap_mb and metrics.js_heap_used_mb >= t.max_js_heap_mb:
+            return f"JS堆 {metrics.js_heap_used_mb:.1f}MB 超过阈值 {t.max_js_heap_mb:.0f}MB"
+        if t.max_nodes and metrics.nodes >= t.max_nodes:
+            return f"DOM节点数 {metrics.nodes} 超过阈值 {t.max_nodes}"
+        if t.max_layout_count and metrics.layout_count >= t.max_layout_count:
+            return f"布局次数 {metrics.layout_count} 超过阈值 {t.max_layout_count}"
+        return None
+
+    def record_case(self, driver) -> Optional[str]:
+        """记录当前会话完成一个用例，并按需采样
+
+        Args:
+            driver: 当前会话的WebDriver实例
+
+        Returns:
+            需要回收会话时返回原因，否则返回None
+        """
+        if driver is not self._driver:
+            self.reset(driver)
+        self.cases += 1
+
+        due = (self._last_sample is None
+               or self.clock() - self._last_sample >= self.thresholds.check_interval)
+        if due:
+            metrics = self.sample(driver)
+            reason = self.check(metrics) if metrics is not None else None
+            if reason:
+                return reason
+        if self.thresholds.max_cases and self.cases >= self.thresholds.max_cases:
+            return (f"会话已处理 {self.cases} 个用例，"
+                    f"达到上限 {self.thresholds.max_cases}")
+        return None
+
+    def record_recycle(self, reason: str) -> RecycleEvent:
+        """记录一次回收，返回回收记录"""
+        event = RecycleEvent(reason=reason, cases=self.cases, metrics=self.last_metrics)
+        self.recycles.append(event)
+        return event
@@ -0,0 +1,378 @@
+"""直连Chrome DevTools协议的通道
+
+WebDriver的每个命令都要经过chromedriver的HTTP接口转发，
+在浏览器本身的耗时之外多一次往返。chromedriver启动的Chrome开放了调试端口
+（会话能力中的goog:chromeOptions.debuggerAddress），
+这里通过该端口直接建立到当前页面的DevTools WebSocket连接，
+供用例管理器的高频操作（脚本求值、DOM查询、输入事件）使用。
+其余操作仍然走标准的Selenium接口。
+
+WebSocket只实现了DevTools需要的部分
+（客户端文本帧、分片、ping/pong、关闭），不引入额外依赖。
+
+使用示例:
+    >>> channel = devtools_for(driver)
+    >>> if channel is not None and channel.xpath_exists('//*[text()="暂无内容"]'):
+    ...     print('没有匹配的用例')
+"""
+
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+_WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+# 帧类型
+_CONTINUATION = 0x0
+_TEXT = 0x1
+_CLOSE = 0x8
+_PING = 0x9
+_PONG = 0xA
+
+# 按XPath取第一个匹配节点的脚本片段
+_XPATH_NODE = ('document.evaluate({xpath}, document, null, '
+               'XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue')
+
+
+class CDPError(Exception):
+    """DevTools连接失败、命令返回错误或页面脚本抛出异常"""
+
+
+def _mask(payload: bytes, key: bytes) -> bytes:
+    """按RFC 6455对客户端帧的负载做掩码"""
+    if not payload:
+        return payload
+    size = len(payload)
+    repeated = (key * (size // 4 + 1))[:size]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(size, 'big')
+
+
+class WebSocketConnection:
+    """最小化的WebSocket客户端
+
+    Args:
+        url: ws:// 地址
+        timeout: 连接和读取超时（秒）
+
+    Raises:
+        CDPError: 握手失败
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        parsed = urlparse(url)
+        if parsed.scheme != 'ws':
+            raise CDPError(f"不支持的WebSocket地址: {url}")
+        host, port = parsed.hostname, parsed.port or 80
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buffer = b''
+
+        key = base64.b64encode(os.urandom(16)).decode('ascii')
+        self.sock.sendall((
+            f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+            f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        ).encode('ascii'))
+        while b'\r\n\r\n' not in self._buffer:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                self.sock.close()
+                raise CDPError(f"WebSocket握手被关闭: {url}")
+            self._buffer += chunk
+        head, self._buffer = self._buffer.split(b'\r\n\r\n', 1)
+        lines = head.decode('latin-1').split('\r\n')
+        headers = {k.strip().lower(): v.strip()
+                   for k, _, v in (line.partition(':') for line in lines[1:])}
+        digest = hashlib.sha1((key + _WEBSOCKET_GUID).encode('ascii')).digest()
+        accept = base64.b64encode(digest).decode('ascii')
+        if ' 101 ' not in f"{lines[0]} " or headers.get('sec-websocket-accept') != accept:
+            self.sock.close()
+            raise CDPError(f"WebSocket握手失败: {lines[0]}")
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self._buffer)))
+            if not chunk:
+                raise CDPError("DevTools连接已关闭")
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        size = len(payload)
+        header = bytes([0x80 | opcode])
+        if size < 126:
+            header += bytes([0x80 | size])
+        elif size < 1 << 16:
+            header += bytes([0x80 | 126]) + struct.pack('!H', size)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack('!Q', size)
+        key = os.urandom(4)
+        self.sock.sendall(header + key + _mask(payload, key))
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(_TEXT, text.encode('utf-8'))
+
+    def recv_text(self) -> str:
+        """读取一条完整的文本消息，自动回应ping"""
+        message = b''
+        while True:
+            first, second = self._read_exact(2)
+            opcode = first & 0x0F
+            size = second & 0x7F
+            if size == 126:
+                size = struct.unpack('!H', self._read_exact(2))[0]
+            elif size == 127:
+                size = struct.unpack('!Q', self._read_exact(8))[0]
+            key = self._read_exact(4) if second & 0x80 else None
+            payload = self._read_exact(size)
+            if key:
+                payload = _mask(payload, key)
+            if opcode == _PING:
+                self._send_frame(_PONG, payload)
+                continue
+            if opcode == _PONG:
+                continue
+            if opcode == _CLOSE:
+                raise CDPError("DevTools连接已被浏览器关闭")
+            if opcode in (_TEXT, _CONTINUATION):
+                message += payload
+                if first & 0x80:
+                    return message.decode('utf-8')
+
+    def close(self) -> None:
+        try:
+            self._send_frame(_CLOSE, struct.pack('!H', 1000))
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class DevToolsChannel:
+    """到单个页面的DevTools连接，线程安全
+
+    Args:
+        websocket_url: 页面的 webSocketDebuggerUrl
+        timeout: 命令超时时间（秒）
+    """
+
+    def __init__(self, websocket_url: str, timeout: float = 10.0):
+        self.websocket_url = websocket_url
+        self._ws = WebSocketConnection(websocket_url, timeout)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.commands = 0
+        self.events = deque(maxlen=100)  # 命令之间收到的事件，只保留最近的
+
+    @classmethod
+    def attach(cls, driver, timeout: float = 10.0) -> Optional['DevToolsChannel']:
+        """连接到driver当前窗口对应的页面
+
+        Args:
+            driver: chromedriver启动的WebDriver实例
+            timeout: 连接和命令超时时间（秒）
+
+        Returns:
+            DevTools通道；会话没有开放调试地址时返回None
+
+        Raises:
+            CDPError: 调试地址不可访问或找不到页面
+        """
+        capabilities = getattr(driver, 'capabilities', None) or {}
+        address = capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+        if not address:
+            logger.debug("会话没有 goog:chromeOptions.debuggerAddress，"
+                         "不使用DevTools直连")
+            return None
+        try:
+            with urlopen(f"http://{address}/json/list", timeout=timeout) as response:
+                targets = json.loads(response.read().decode('utf-8'))
+        except (OSError, ValueError) as e:
+            raise CDPError(f"无法读取调试地址 {address} 的页面列表: {str(e)}")
+        pages = [t for t in targets if t.get('type') == 'page' and t.get('webSocketDebuggerUrl')]
+        # chromedriver的窗口句柄就是DevTools的页面ID
+        try:
+            handle = driver.current_window_handle
+        except WebDriverException as e:
+            raise CDPError(f"无法获取当前窗口句柄: {str(e)}")
+        target = next((t for t in pages if t.get('id') == handle), pages[0] if pages else None)
+        if target is None:
+            raise CDPError(f"调试地址 {address} 上没有可连接的页面")
+        try:
+            channel = cls(target['webSocketDebuggerUrl'], timeout)
+        except OSError as e:
+            raise CDPError(f"连接DevTools失败: {str(e)}")
+        logger.info(f"已建立DevTools直连: {target['webSocketDebuggerUrl']}")
+        return channel
+
+    def send(self, method: str, params: Optional[Dict] = None) -> Dict:
+        """发送DevTools命令并等待结果
+
+        Raises:
+            CDPError: 命令返回错误或连接断开
+        """
+        with self._lock:
+            command_id = next(self._ids)
+            message = {'id': command_id, 'method': method, 'params': params or {}}
+            self._ws.send_text(json.dumps(message))
+            self.commands += 1
+            while True:
+                message = json.loads(self._ws.recv_text())
+                if message.get('id') == command_id:
+                    break
+                self.events.append(message)
+        if 'error' in message:
+            raise CDPError(f"{method} 失败: {message['error'].get('message')}")
+        return message.get('result', {})
+
+    def evaluate(self, expression: str, await_promise: bool = False) -> Any:
+        """在页面中执行脚本并按值返回结果
+
+        Raises:
+            CDPError: 脚本抛出异常
+        """
+        result = self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': await_promise
+        })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            description = details.get('exception', {}).get('description') or details.get('text')
+            raise CDPError(f"脚本执行异常: {description}")
+        return result.get('result', {}).get('value')
+
+    def _probe(self, xpath: str, visible: bool) -> bool:
+        node = _XPATH_NODE.format(xpath=json.dumps(xpath))
+        if not visible:
+            return bool(self.evaluate(f"{node} !== null"))
+        return bool(self.evaluate(
+            f"(() => {{ const n = {node}; if (!n) return false;"
+            f" const r = n.getBoundingClientRect();"
+            f" return r.width > 0 && r.height > 0; }})()"
+        ))
+
+    def xpath_exists(self, xpath: str) -> bool:
+        """页面中是否存在匹配XPath的节点，不等待"""
+        return self._probe(xpath, False)
+
+    def wait_for_xpath(self, xpath: str, timeout: float = 30.0, visible: bool = False,
+                       interval: float = 0.1) -> bool:
+        """等待匹配XPath的节点出现
+
+        Args:
+            xpath: XPath表达式
+            timeout: 最长等待时间（秒）
+            visible: 是否要求节点有尺寸（可点击）
+            interval: 轮询间隔（秒）
+
+        Returns:
+            是否在超时前出现
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self._probe(xpath, visible):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+
+    def click_xpath(self, xpath: str) -> bool:
+        """把节点滚动到可见区域中央，并在其中心分发鼠标按下和抬起事件
+
+        Returns:
+            是否找到可点击的节点
+        """
+        node = _XPATH_NODE.format(xpath=json.dumps(xpath))
+        point = self.evaluate(
+            f"(() => {{ const n = {node}; if (!n) return null;"
+            f" n.scrollIntoView({{block: 'center', inline: 'center'}});"
+            f" const r = n.getBoundingClientRect();"
+            f" return {{x: r.left + r.width / 2, y: r.top + r.height / 2,"
+            f" width: r.width, height: r.height}}; }})()"
+        )
+        if not point or not point['width'] or not point['height']:
+            return False
+        buttons = (('mouseMoved', 'none'), ('mousePressed', 'left'), ('mouseReleased', 'left'))
+        for event, button in buttons:
+            self.send('Input.dispatchMouseEvent', {
+                'type': event, 'x': point['x'], 'y': point['y'], 'button': button, 'clickCount': 1
+            })
+        return True
+
+    def replace_text(self, xpath: str, text: str) -> bool:
+        """聚焦输入框、清空原有内容并输入文本
+
+        文本通过 Input.insertText 输入，页面收到与键盘输入相同的 input 事件。
+
+        Returns:
+            是否找到输入框
+        """
+        node = _XPATH_NODE.format(xpath=json.dumps(xpath))
+        found = self.evaluate(
+            f"(() => {{ const n = {node}; if (!n) return false;"
+            f" n.focus(); if (n.select) n.select(); return true; }})()"
+        )
+        if not found:
+            return False
+        for event in ('keyDown', 'keyUp'):
+            self.send('Input.dispatchKeyEvent', {
+                'type': event, 'key': 'Delete', 'code': 'Delete', 'windowsVirtualKeyCode': 46
+            })
+        if text:
+            self.send('Input.insertText', {'text': text})
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._ws.close()
+
+
+# 每个driver的DevTools通道；连接失败的driver记为None，不再重试
+_channels = weakref.WeakKeyDictionary()
+_channels_lock = threading.Lock()
+
+
+def devtools_for(driver) -> Optional[DevToolsChannel]:
+    """获取driver的DevTools通道，首次调用时建立连接
+
+    Returns:
+        DevTools通道；会话不支持或连接失败时返回None，调用方回退到Selenium
+    """
+    with _channels_lock:
+        if driver in _channels:
+            return _channels[driver]
+        try:
+            channel = DevToolsChannel.attach(driver)
+        except CDPError as e:
+            logger.warning(f"DevTools直连不可用，使用WebDriver接口: {str(e)}")
+            channel = None
+        _channels[driver] = channel
+        return channel
+
+
+def close_devtools(driver) -> None:
+    """关闭driver的DevTools通道（会话关闭或回收前调用）"""
+    with _channels_lock:
+        channel = _channels.pop(driver, None)
+    if channel is not None:
+        try:
+            channel.close()
+        except OSError:
+            pass
@@ -0,0 +1,203 @@
+"""浏览器用户数据目录模板
+
+维护一个“黄金”Chrome用户数据目录
+（已登录的Cookie、本地存储和预热好的HTTP缓存），
+每个新会话从模板快速克隆出独立的临时目录：
+优先使用写时复制（reflink），文件系统不支持时普通复制。
+Chrome 会原地改写缓存、SQLite 和 LevelDB 文件，
+因此克隆出的文件不能和模板共享（不使用硬链接）。
+"""
+
+import errno
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Linux FICLONE ioctl，btrfs/xfs 等文件系统上实现写时复制
+FICLONE = 0x40049409
+
+# 会话运行时的锁文件和无需保留的目录
+SKIP_NAMES = {
+    'SingletonLock', 'SingletonSocket', 'SingletonCookie', 'lockfile', 'RunningChromeVersion'
+}
+SKIP_DIRS = {'Crashpad', 'BrowserMetrics', 'ShaderCache', 'GrShaderCache', 'GraphiteDawnCache'}
+
+# 每个模板路径一把锁：各个 WebDriverConfig 各自创建 ProfileTemplate 实例，
+# 模板替换和克隆必须在同一路径上互斥
+_template_locks: Dict[str, threading.Lock] = {}
+_template_locks_guard = threading.Lock()
+
+
+def _template_lock(template_dir: str) -> threading.Lock:
+    """获取模板路径对应的进程内共享锁"""
+    with _template_locks_guard:
+        return _template_locks.setdefault(template_dir, threading.Lock())
+
+
+@dataclass
+class CloneStats:
+    """一次克隆的统计信息"""
+    files: int = 0
+    reflinked: int = 0
+    copied: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """尝试以写时复制方式克隆文件
+
+    Returns:
+        是否成功；文件系统不支持时返回False
+    """
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError as e:
+            if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EBADF):
+                return False
+            raise
+    shutil.copystat(src, dst)
+    return True
+
+
+class ProfileTemplate:
+    """浏览器用户数据目录模板
+
+    使用示例:
+        >>> template = ProfileTemplate('output/profile_template')
+        >>> session_dir = template.clone()
+        >>> ...  # 以 --user-data-dir=session_dir 启动Chrome
+        >>> template.refresh_from(session_dir)
+        >>> template.discard(session_dir)
+    """
+
+    def __init__(self, template_dir: str):
+        self.template_dir = os.path.abspath(template_dir)
+        # 会话目录和模板放在同一文件系统上，reflink 才能生效
+        self.session_root = f"{self.template_dir}-sessions"
+        self._lock = _template_lock(self.template_dir)
+        self._reflink_supported: Optional[bool] = None
+
+    def exists(self) -> bool:
+        """模板是否已经建立"""
+        return os.path.isdir(self.template_dir) and bool(os.listdir(self.template_dir))
+
+    def _clone_file(self, src: str, dst: str, stats: CloneStats) -> None:
+        if self._reflink_supported is not False:
+            if _reflink(src, dst):
+                self._reflink_supported = True
+                stats.reflinked += 1
+                return
+            self._reflink_supported = False
+        shutil.copy2(src, dst)
+        stats.copied += 1
+
+    def _copy_tree(self, src_root: str, dst_root: str) -> CloneStats:
+        stats = CloneStats()
+        start = time.perf_counter()
+        for root, dirs, files in os.walk(src_root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            rel = os.path.relpath(root, src_root)
+            target = dst_root if rel == '.' else os.path.join(dst_root, rel)
+            os.makedirs(target, exist_ok=True)
+            for name in files:
+                if name in SKIP_NAMES:
+                    continue
+                src = os.path.join(root, name)
+                if os.path.islink(src):
+                    continue
+                stats.files += 1
+                try:
+                    self._clone_file(src, os.path.join(target, name), stats)
+                except OSError as e:
+                    stats.skipped += 1
+                    logger.debug(f"跳过无法复制的文件 {src}: {str(e)}")
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    def clone(self) -> str:
+        """从模板克隆一个会话专用的用户数据目录
+
+        模板不存在时返回一个空的临时目录。
+
+        Returns:
+            新建的用户数据目录路径
+        """
+        os.makedirs(self.session_root, exist_ok=True)
+        session_dir = tempfile.mkdtemp(prefix='yx-profile-', dir=self.session_root)
+        if not self.exists():
+            logger.info(f"浏览器模板目录不存在，"
+                        f"使用空白用户数据目录: {session_dir}")
+            return session_dir
+        with self._lock:
+            stats = self._copy_tree(self.template_dir, session_dir)
+        logger.info(
+            f"已从模板克隆用户数据目录 {session_dir}: {stats.files} 个文件，"
+            f"reflink {stats.reflinked}，复制 {stats.copied}，耗时 {stats.seconds:.2f}s"
+        )
+        if stats.skipped:
+            logger.warning(f"克隆用户数据目录时跳过了 {stats.skipped} 个"
+                           f"无法复制的文件: {session_dir}")
+        return session_dir
+
+    def refresh_from(self, session_dir: str) -> bool:
+        """用会话结束后的用户数据目录更新模板
+
+        先写入临时目录再整体替换，避免其他会话克隆到不完整的模板。
+
+        Args:
+            session_dir: 已关闭浏览器的用户数据目录
+
+        Returns:
+            是否更新成功
+        """
+        parent = os.path.dirname(self.template_dir)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.profile-staging-', dir=parent)
+        try:
+            stats = self._copy_tree(session_dir, staging)
+            with self._lock:
+                retired = None
+                if os.path.exists(self.template_dir):
+                    retired = f"{staging}-old"
+                    os.rename(self.template_dir, retired)
+                os.rename(staging, self.template_dir)
+            if retired:
+                shutil.rmtree(retired, ignore_errors=True)
+            logger.info(
+                f"浏览器模板已更新: {self.template_dir}（{stats.files} 个文件）"
+            )
+            return True
+        except OSError as e:
+            logger.error(f"更新浏览器模板失败: {str(e)}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+    @staticmethod
+    def discard(session_dir: str, attempts: int = 3) -> None:
+        """删除会话的用户数据目录
+
+        浏览器退出后文件可能短暂被占用，删除失败时稍后重试。
+
+        Args:
+            session_dir: 用户数据目录
+            attempts: 最大尝试次数
+        """
+        for attempt in range(attempts):
+            shutil.rmtree(session_dir, ignore_errors=True)
+            if not os.path.exists(session_dir):
+                return
+            time.sleep(0.5 * (attempt + 1))
+        logger.warning(f"无法删除用户数据目录: {session_dir}")
@@ -0,0 +1,457 @@
+"""浏览器资源管理
+
+并行浏览器会话数受内存和CPU限制，会话过多时Chrome互相争抢资源，
+所有会话都会变慢。这里根据可用内存和CPU核数估算初始会话数，
+执行过程中按用例实际耗时与预计耗时之比和系统负载增减会话数；
+并清理本工具启动、崩溃会话遗留的chrome/chromedriver孤儿进程。
+
+系统信息从 /proc 读取，非Linux系统上内存视为不限制，
+孤儿进程清理不生效。
+"""
+
+import json
+import logging
+import os
+import signal
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CHROME_PROCESSES = ('chrome', 'google-chrome', 'chromium', 'chromium-browser', 'headless_shell')
+
+
+@dataclass
+class SystemSnapshot:
+    """一次采样得到的系统资源"""
+    available_mb: Optional[float]
+    cpu_count: int
+    load_avg: float
+
+    @property
+    def load_per_core(self) -> float:
+        return self.load_avg / max(1, self.cpu_count)
+
+
+def read_system(proc_root: str = '/proc') -> SystemSnapshot:
+    """读取可用内存、CPU核数和1分钟平均负载"""
+    available_mb = None
+    try:
+        with open(os.path.join(proc_root, 'meminfo'), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    available_mb = int(line.split()[1]) / 1024
+                    break
+    except OSError:
+        pass
+    try:
+        load_avg = os.getloadavg()[0]
+    except (AttributeError, OSError):
+        load_avg = 0.0
+    return SystemSnapshot(available_mb, os.cpu_count() or 1, load_avg)
+
+
+@dataclass
+class ResourceBudget:
+    """每个浏览器会话的资源预算和扩缩容阈值
+
+    Attributes:
+        max_workers: 会话数上限，0表示使用CPU核数
+        min_workers: 会话数下限
+        mb_per_browser: 每个Chrome会话占用的内存（MB）
+        cores_per_browser: 每个Chrome会话占用的CPU核数
+        reserve_mb: 为系统和其他进程保留的内存（MB）
+        high_load: 每核平均负载超过此值时减少会话
+        low_load: 每核平均负载低于此值时才允许增加会话
+        max_slowdown: 用例耗时比相对基准放大超过此倍数时减少会话
+        cooldown: 两次调整之间的最小间隔（秒）
+    """
+    max_workers: int = 0
+    min_workers: int = 1
+    mb_per_browser: float = 600.0
+    cores_per_browser: float = 1.0
+    reserve_mb: float = 1024.0
+    high_load: float = 1.5
+    low_load: float = 0.8
+    max_slowdown: float = 1.5
+    cooldown: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> 'ResourceBudget':
+        """从环境变量读取预算
+
+        读取 SUITE_MAX_WORKERS、BROWSER_MEMORY_MB、BROWSER_CPU_CORES、
+        MEMORY_RESERVE_MB 和 AUTOSCALE_COOLDOWN。
+        """
+        defaults = cls()
+        return cls(
+            max_workers=int(os.getenv('SUITE_MAX_WORKERS', defaults.max_workers)),
+            mb_per_browser=float(os.getenv('BROWSER_MEMORY_MB', defaults.mb_per_browser)),
+            cores_per_browser=float(os.getenv('BROWSER_CPU_CORES', defaults.cores_per_browser)),
+            reserve_mb=float(os.getenv('MEMORY_RESERVE_MB', defaults.reserve_mb)),
+            cooldown=float(os.getenv('AUTOSCALE_COOLDOWN', defaults.cooldown))
+        )
+
+    def limit(self, snapshot: SystemSnapshot) -> int:
+        """会话数上限"""
+        return max(self.min_workers, self.max_workers or snapshot.cpu_count)
+
+    def fit(self, snapshot: SystemSnapshot) -> int:
+        """按当前可用内存和CPU核数估算的会话数"""
+        slots = int(snapshot.cpu_count // self.cores_per_browser)
+        if snapshot.available_mb is not None:
+            spare_mb = snapshot.available_mb - self.reserve_mb
+            slots = min(slots, int(spare_mb // self.mb_per_browser))
+        return max(self.min_workers, min(self.limit(snapshot), slots))
+
+
+@dataclass
+class ScalingEvent:
+    """一次会话数调整记录"""
+    workers: int
+    reason: str
+
+
+class WorkerAutoscaler:
+    """根据系统资源和用例耗时调整并行会话数，线程安全
+
+    每个用例结束后记录实际耗时与预计耗时之比，
+    取最近 window 个的中位数；调整后的第一个完整窗口作为基准。
+    耗时比相对基准明显放大、平均负载过高或可用内存低于保留值时
+    减少一个会话；负载较低、耗时正常且内存足够再启动一个Chrome时
+    增加一个会话。
+
+    Args:
+        budget: 资源预算
+        sampler: 系统资源采样函数
+        window: 计算耗时比的用例数
+        clock: 计时函数，默认 time.monotonic
+    """
+
+    def __init__(self, budget: Optional[ResourceBudget] = None,
+                 sampler: Callable[[], SystemSnapshot] = read_system,
+                 window: int = 5, clock: Callable[[], float] = time.monotonic):
+        self.budget = budget or ResourceBudget()
+        self.sampler = sampler
+        self.window = window
+        self.clock = clock
+        self.events: List[ScalingEvent] = []
+        self._ratios = deque(maxlen=window)
+        self._baseline: Optional[float] = None
+        self._last_change = clock()
+        self._lock = threading.Lock()
+
+    def initial_workers(self, limit: Optional[int] = None) -> int:
+        """按当前资源估算的初始会话数
+
+        Args:
+            limit: 额外的上限，例如套件的用例数
+        """
+        snapshot = self.sampler()
+        workers = self.budget.fit(snapshot)
+        if limit is not None:
+            workers = max(1, min(workers, limit))
+        logger.info(
+            f"初始并行会话数 {workers}（可用内存 {snapshot.available_mb or 0:.0f}MB，"
+            f"{snapshot.cpu_count} 核，负载 {snapshot.load_avg:.2f}）"
+        )
+        self._record_event(workers, '按可用内存和CPU核数估算')
+        return workers
+
+    def max_workers(self) -> int:
+        """会话数上限"""
+        return self.budget.limit(self.sampler())
+
+    def record(self, observed: Optional[float], expected: float) -> None:
+        """记录一个用例的实际耗时和预计耗时"""
+        if observed is None or expected <= 0:
+            return
+        with self._lock:
+            self._ratios.append(observed / expected)
+            if self._baseline is None and len(self._ratios) == self.window:
+                self._baseline = statistics.median(self._ratios)
+
+    def slowdown(self) -> Optional[float]:
+        """最近用例耗时比相对基准的倍数，数据不足时返回None"""
+        with self._lock:
+            if self._baseline is None or len(self._ratios) < self.window:
+                return None
+            return statistics.median(self._ratios) / max(self._baseline, 1e-6)
+
+    def decide(self, current: int, limit: Optional[int] = None) -> int:
+        """给出当前应有的会话数
+
+        Args:
+            current: 当前活跃的会话数
+            limit: 额外的上限，例如剩余的用例槽位
+
+        Returns:
+            目标会话数，与 current 最多相差1
+        """
+        if self.clock() - self._last_change < self.budget.cooldown:
+            return current
+        snapshot = self.sampler()
+        slowdown = self.slowdown()
+        budget = self.budget
+        upper = budget.limit(snapshot) if limit is None else min(budget.limit(snapshot), limit)
+
+        reason = None
+        target = current
+        if current > budget.min_workers:
+            if snapshot.available_mb is not None and snapshot.available_mb < budget.reserve_mb:
+                target = current - 1
+                reason = f"可用内存 {snapshot.available_mb:.0f}MB 低于保留值"
+            elif snapshot.load_per_core > budget.high_load:
+                target, reason = current - 1, f"每核负载 {snapshot.load_per_core:.2f} 过高"
+            elif slowdown is not None and slowdown > budget.max_slowdown:
+                target, reason = current - 1, f"用例耗时放大到基准的 {slowdown:.2f} 倍"
+        if reason is None and current < upper:
+            memory_ok = (snapshot.available_mb is None
+                         or snapshot.available_mb - budget.reserve_mb >= budget.mb_per_browser)
+            cpu_ok = (current + 1) * budget.cores_per_browser <= snapshot.cpu_count
+            load_ok = snapshot.load_per_core < budget.low_load and (slowdown or 1.0) <= 1.2
+            if memory_ok and cpu_ok and load_ok:
+                target = current + 1
+                reason = f"资源充足（每核负载 {snapshot.load_per_core:.2f}）"
+
+        if reason is not None:
+            logger.info(f"并行会话数 {current} -> {target}: {reason}")
+            self._record_event(target, reason)
+            with self._lock:
+                # 会话数变化后重新建立耗时基准
+                self._ratios.clear()
+                self._baseline = None
+        return target
+
+    def _record_event(self, workers: int, reason: str) -> None:
+        self.events.append(ScalingEvent(workers, reason))
+        self._last_change = self.clock()
+
+
+def _read_process(proc_root: str, pid: int):
+    """读取进程的名称、父进程号、属主和命令行，进程已退出时返回None"""
+    base = os.path.join(proc_root, str(pid))
+    try:
+        with open(os.path.join(base, 'stat'), 'r', encoding='utf-8', errors='replace') as f:
+            stat = f.read()
+        with open(os.path.join(base, 'cmdline'), 'rb') as f:
+            cmdline = f.read().replace(b'\0', b' ').decode('utf-8', errors='replace')
+        uid = os.stat(base).st_uid
+    except OSError:
+        return None
+    # 进程名在括号内，可能包含空格
+    name = stat[stat.index('(') + 1:stat.rindex(')')]
+    ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+    return name, ppid, uid, cmdline
+
+
+def find_browser_pid(capabilities: Dict, proc_root: str = '/proc') -> Optional[int]:
+    """查找会话对应的Chrome主进程
+
+    按会话能力中的用户数据目录（chrome.userDataDir）
+    和调试端口（goog:chromeOptions.debuggerAddress）匹配Chrome主进程的命令行。
+
+    Args:
+        capabilities: WebDriver会话的能力
+        proc_root: proc文件系统路径
+
+    Returns:
+        Chrome主进程号，无法确定时返回None
+    """
+    user_data_dir = (capabilities.get('chrome') or {}).get('userDataDir')
+    address = (capabilities.get('goog:chromeOptions') or {}).get('debuggerAddress') or ''
+    port = address.rpartition(':')[2]
+    markers = []
+    if user_data_dir:
+        markers.append(f'--user-data-dir={user_data_dir} ')
+    if port.isdigit() and port != '0':
+        markers.append(f'--remote-debugging-port={port} ')
+    if not markers or not os.path.isdir(proc_root):
+        return None
+    for entry in os.listdir(proc_root):
+        if not entry.isdigit():
+            continue
+        info = _read_process(proc_root, int(entry))
+        if info is None:
+            continue
+        name, _, _, cmdline = info
+        is_main = name in CHROME_PROCESSES and '--type=' not in cmdline
+        if is_main and any(m in cmdline + ' ' for m in markers):
+            return int(entry)
+    return None
+
+
+def _start_time(proc_root: str, pid: int) -> Optional[int]:
+    """进程的启动时间（/proc/<pid>/stat 第22项）
+
+    用于识别被复用的进程号，进程不存在时返回None。
+    """
+    try:
+        path = os.path.join(proc_root, str(pid), 'stat')
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            stat = f.read()
+    except OSError:
+        return None
+    fields = stat[stat.rindex(')') + 2:].split()
+    # 括号后从第3项（state）开始，starttime 是第22项
+    return int(fields[19]) if len(fields) > 19 else 0
+
+
+class ProcessRegistry:
+    """记录本进程启动的chromedriver和Chrome进程
+
+    每个Python进程把自己启动的进程号、启动时间以及记录的父进程
+    写入目录下以自身进程号命名的文件。
+    只有记录过的进程才可能被清理：记录的父进程（chromedriver对应本进程，
+    Chrome对应它的chromedriver）已经退出而进程仍在运行时，
+    视为崩溃会话遗留的孤儿。
+    其他仍在运行的Python进程记录的进程不受影响，
+    用户或其他工具打开的浏览器从不被清理。
+
+    Args:
+        directory: 记录文件目录，默认读取 BROWSER_PID_DIR，
+            未设置时使用临时目录
+        proc_root: proc文件系统路径
+        owner: 本进程号
+    """
+
+    def __init__(self, directory: Optional[str] = None, proc_root: str = '/proc',
+                 owner: Optional[int] = None):
+        uid = os.getuid() if hasattr(os, 'getuid') else 0
+        self.directory = directory or os.getenv('BROWSER_PID_DIR') or os.path.join(
+            tempfile.gettempdir(), f'yunxiao-browsers-{uid}')
+        self.proc_root = proc_root
+        self._owner = owner
+        self._lock = threading.Lock()
+
+    @property
+    def owner(self) -> int:
+        # 未指定时按调用时的进程号，fork 出的子进程记录到自己的文件中
+        return self._owner or os.getpid()
+
+    def _path(self, owner: int) -> str:
+        return os.path.join(self.directory, f'{owner}.json')
+
+    def _load(self, path: str) -> Dict:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, owner: int, data: Dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.browsers.', dir=self.directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._path(owner))
+
+    def _alive(self, pid: int, start: Optional[int]) -> bool:
+        current = _start_time(self.proc_root, pid)
+        return current is not None and (start is None or current == start)
+
+    def track(self, pid: int, parent: Optional[int] = None) -> None:
+        """记录本进程启动的进程
+
+        Args:
+            pid: chromedriver或Chrome主进程号
+            parent: 记录的父进程，默认为本进程
+        """
+        if not os.path.isdir(self.proc_root):
+            return
+        parent = parent or self.owner
+        with self._lock:
+            data = self._load(self._path(self.owner))
+            processes = {key: entry for key, entry in (data.get('processes') or {}).items()
+                         if self._alive(int(key), entry.get('start'))}
+            processes[str(pid)] = {
+                'start': _start_time(self.proc_root, pid),
+                'parent': parent,
+                'parent_start': _start_time(self.proc_root, parent)
+            }
+            try:
+                self._save(self.owner, {'owner_start': _start_time(self.proc_root, self.owner),
+                                        'processes': processes})
+            except OSError as e:
+                logger.debug(f"记录浏览器进程失败: {str(e)}")
+
+    def orphans(self, exclude: Iterable[int] = ()) -> List[int]:
+        """查找记录过的、父进程已退出的进程，并清理无存活进程的记录"""
+        if not os.path.isdir(self.proc_root) or not os.path.isdir(self.directory):
+            return []
+        excluded = set(exclude) | {self.owner}
+        orphans = set()
+        with self._lock:
+            for filename in os.listdir(self.directory):
+                owner, ext = os.path.splitext(filename)
+                if ext != '.json' or not owner.isdigit():
+                    continue
+                path = os.path.join(self.directory, filename)
+                data = self._load(path)
+                owner_alive = self._alive(int(owner), data.get('owner_start'))
+                if owner_alive and int(owner) != self.owner:
+                    # 其他仍在运行的进程的会话
+                    continue
+                alive = {int(key): entry for key, entry in (data.get('processes') or {}).items()
+                         if self._alive(int(key), entry.get('start'))}
+                for pid, entry in alive.items():
+                    parent_alive = self._alive(entry.get('parent'), entry.get('parent_start'))
+                    if not owner_alive or not parent_alive:
+                        orphans.add(pid)
+                if not owner_alive and not alive:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+        return sorted(orphans - excluded)
+
+
+process_registry = ProcessRegistry()
+
+
+def find_orphan_browsers(exclude: Iterable[int] = (),
+                         registry: Optional[ProcessRegistry] = None) -> List[int]:
+    """查找崩溃会话遗留的chrome/chromedriver进程
+
+    只考虑 ProcessRegistry 中记录过的进程：
+    记录的父进程已退出（chromedriver被中止后留下的Chrome，
+    或已退出的Python进程启动的chromedriver和Chrome）时视为孤儿。
+
+    Args:
+        exclude: 不处理的进程号
+        registry: 进程记录，默认使用全局记录
+
+    Returns:
+        孤儿进程号列表
+    """
+    return (registry or process_registry).orphans(exclude)
+
+
+def reap_orphan_browsers(exclude: Iterable[int] = (), kill: Callable[[int, int], None] = os.kill,
+                         registry: Optional[ProcessRegistry] = None) -> List[int]:
+    """结束崩溃会话遗留的chrome/chromedriver进程
+
+    Args:
+        exclude: 不处理的进程号
+        kill: 发送信号的函数
+        registry: 进程记录，默认使用全局记录
+
+    Returns:
+        已结束的进程号列表
+    """
+    reaped = []
+    for pid in find_orphan_browsers(exclude, registry):
+        try:
+            kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            reaped.append(pid)
+        except OSError as e:
+            logger.debug(f"结束进程 {pid} 失败: {str(e)}")
+    if reaped:
+        logger.warning(f"已清理 {len(reaped)} 个遗留的浏览器进程: {reaped}")
+    return reaped
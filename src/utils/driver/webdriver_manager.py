@@ -1,33 +1,365 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common import utils
+from selenium.common.exceptions import WebDriverException
+from dotenv import load_dotenv
+import atexit
 import logging
+import os
+import signal
+import threading
+import time
+from .browser_health import BrowserHealthMonitor, HealthThresholds
+from .cdp import close_devtools
+from .profile_template import ProfileTemplate
+from .resources import find_browser_pid, process_registry
+
+# 加载环境变量
+load_dotenv()
+
+DEFAULT_CHROME_PATH = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
+DEFAULT_CHROMEDRIVER_PATH = "C:\\Program Files\\Google\\Chrome\\Application\\chromedriver.exe"
+
+# 浏览器配置档：default 为完整的有界面浏览器，performance 为无头精简浏览器
+PROFILE_DEFAULT = 'default'
+PROFILE_PERFORMANCE = 'performance'
+PROFILES = (PROFILE_DEFAULT, PROFILE_PERFORMANCE)
+PAGE_LOAD_STRATEGIES = ('normal', 'eager', 'none')
+
+# 精简模式下通过DevTools屏蔽的请求：图片、字体和统计脚本
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*google-analytics.com*', '*googletagmanager.com*', '*hm.baidu.com*',
+    '*log.mmstat.com*', '*arms-retcode*', '*/alilog/*', '*aplus*.js*'
+]
+
+# 精简模式下注入的样式，关闭CSS动画和过渡
+DISABLE_ANIMATIONS_SCRIPT = """
+(function () {
+  var css = '*, *::before, *::after { animation: none !important; transition: none !important; ' +
+            'animation-duration: 0s !important; transition-duration: 0s !important; ' +
+            'scroll-behavior: auto !important; caret-color: auto !important; }';
+  function inject() {
+    var style = document.createElement('style');
+    style.setAttribute('data-yx-lean', '1');
+    style.textContent = css;
+    (document.head || document.documentElement).appendChild(style);
+  }
+  if (document.documentElement) { inject(); }
+  else { document.addEventListener('DOMContentLoaded', inject); }
+})();
+"""
+
+
+def _env_flag(name: str, default: bool = False) -> bool:
+    """读取布尔型环境变量"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _parse_window_size(value: str) -> Tuple[int, int]:
+    """解析 "宽,高" 格式的窗口尺寸"""
+    width, height = value.lower().replace('x', ',').split(',')
+    return int(width), int(height)
+
 
 class WebDriverConfig:
-    """WebDriver配置类"""
-    def __init__(self, url: str = "https://devops.aliyun.com/", chrome_path: str = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"):
+    """WebDriver配置类
+
+    浏览器配置档、无头模式、窗口尺寸、页面加载策略和chromedriver服务复用
+    均可通过参数或环境变量（BROWSER_PROFILE、HEADLESS_MODE、WINDOW_SIZE、
+    PAGE_LOAD_STRATEGY、REUSE_DRIVER_SERVICE、DRIVER_SERVICE_POOL_SIZE、
+    PROFILE_TEMPLATE_DIR、PROFILE_TEMPLATE_REFRESH）选择，参数优先于环境变量。
+    会话回收阈值见 HealthThresholds.from_env。
+    """
+    def __init__(self, url: str = "https://devops.aliyun.com/", chrome_path: Optional[str] = None,
+                 chromedriver_path: Optional[str] = None, profile: Optional[str] = None,
+                 headless: Optional[bool] = None, window_size: Optional[Tuple[int, int]] = None,
+                 page_load_strategy: Optional[str] = None, reuse_service: Optional[bool] = None,
+                 service_pool_size: Optional[int] = None,
+                 profile_template_dir: Optional[str] = None,
+                 refresh_template: Optional[bool] = None,
+                 health_thresholds: Optional[HealthThresholds] = None):
         self.url = url
-        self.chrome_path = chrome_path
+        self.chrome_path = chrome_path or os.getenv('CHROME_PATH', DEFAULT_CHROME_PATH)
+        self.chromedriver_path = (chromedriver_path
+                                  or os.getenv('CHROMEDRIVER_PATH', DEFAULT_CHROMEDRIVER_PATH))
+
+        self.profile = (profile or os.getenv('BROWSER_PROFILE', PROFILE_DEFAULT)).lower()
+        if self.profile not in PROFILES:
+            raise ValueError(f"Unsupported browser profile: {self.profile}")
+        self.lean = self.profile == PROFILE_PERFORMANCE
+
+        # 精简模式总是无头运行
+        if headless is None:
+            headless = _env_flag('HEADLESS_MODE')
+        self.headless = headless or self.lean
+
+        self.window_size = window_size or _parse_window_size(os.getenv('WINDOW_SIZE', '1920,1080'))
+
+        strategy = (page_load_strategy or os.getenv('PAGE_LOAD_STRATEGY')
+                    or ('eager' if self.lean else 'normal'))
+        if strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Unsupported page load strategy: {strategy}")
+        self.page_load_strategy = strategy
+
+        self.blocked_urls: List[str] = list(BLOCKED_URL_PATTERNS) if self.lean else []
+
+        # 复用长驻的chromedriver服务，新会话通过keep-alive连接挂到已有服务上
+        if reuse_service is None:
+            reuse_service = _env_flag('REUSE_DRIVER_SERVICE', True)
+        self.reuse_service = reuse_service
+        pool_size = service_pool_size or int(os.getenv('DRIVER_SERVICE_POOL_SIZE', '1'))
+        self.service_pool_size = max(1, pool_size)
+
+        # 用户数据目录模板：每个会话从模板克隆，
+        # 保留登录状态和预热的HTTP缓存
+        template_dir = profile_template_dir or os.getenv('PROFILE_TEMPLATE_DIR')
+        self.profile_template = ProfileTemplate(template_dir) if template_dir else None
+        if refresh_template is None:
+            refresh_template = _env_flag('PROFILE_TEMPLATE_REFRESH')
+        self.refresh_template = refresh_template
+
+        # 浏览器指标或用例数超限时回收会话
+        self.health_thresholds = health_thresholds or HealthThresholds.from_env()
+
         self.options = self._setup_options()
-        
+
     def _setup_options(self):
         options = Options()
-        options.binary_location = self.chrome_path
+        if os.path.exists(self.chrome_path):
+            options.binary_location = self.chrome_path
         options.add_argument("--disable-blink-features=AutomationControlled")
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_experimental_option('excludeSwitches', ['enable-automation', 'enable-logging'])
         options.add_experimental_option('useAutomationExtension', False)
+        options.page_load_strategy = self.page_load_strategy
+
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+
+        if self.lean:
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-component-extensions-with-background-pages")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--disable-sync")
+            options.add_argument("--mute-audio")
+            options.add_argument("--no-first-run")
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.default_content_setting_values.notifications': 2
+            })
+        return options
+
+    def session_options(self, user_data_dir: Optional[str] = None) -> Options:
+        """获取单个会话使用的Chrome选项
+
+        Args:
+            user_data_dir: 会话专用的用户数据目录
+
+        Returns:
+            未指定用户数据目录时返回共享的选项，
+            否则返回附加了该目录的新选项
+        """
+        if not user_data_dir:
+            return self.options
+        options = self._setup_options()
+        options.add_argument(f"--user-data-dir={user_data_dir}")
         return options
 
+    def create_service(self) -> Service:
+        """创建chromedriver服务，驱动路径不存在时交由Selenium Manager解析"""
+        if os.path.exists(self.chromedriver_path):
+            service = Service(self.chromedriver_path)
+        else:
+            service = Service()
+        if os.name == 'nt':
+            service.creation_flags = 0x08000000  # 禁止显示命令行窗口
+        return service
+
+    def apply_profile(self, driver: webdriver.Chrome) -> None:
+        """在新建的会话上应用配置档中需要DevTools完成的部分
+
+        Args:
+            driver: 刚创建的WebDriver实例
+        """
+        if not self.headless:
+            driver.maximize_window()
+        if not self.lean:
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': DISABLE_ANIMATIONS_SCRIPT
+            })
+            driver.execute_cdp_cmd('Emulation.setEmulatedMedia', {
+                'features': [{'name': 'prefers-reduced-motion', 'value': 'reduce'}]
+            })
+        except WebDriverException as e:
+            logging.getLogger(__name__).warning(f'Failed to apply lean browser profile: {str(e)}')
+
+class SharedChromeService(Service):
+    """可被多个会话复用的chromedriver服务
+
+    Chrome 会在创建会话时调用 start()、在 quit() 时调用 stop()。
+    这里 start() 只在进程未运行时才真正启动，stop() 不关闭进程，
+    进程由 shutdown() 统一关闭。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.process = None
+        self.process_starts = 0
+        self._start_lock = threading.Lock()
+
+    def is_running(self) -> bool:
+        """服务进程是否在运行"""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        with self._start_lock:
+            if self.is_running():
+                return
+            if self.process is not None:
+                # 进程意外退出，换一个端口重新启动
+                self.port = utils.free_port()
+            super().start()
+            self.process_starts += 1
+
+    def stop(self) -> None:
+        """会话结束时保留服务进程"""
+
+    def shutdown(self) -> None:
+        """关闭服务进程"""
+        with self._start_lock:
+            if self.process is not None:
+                super().stop()
+                self.process = None
+
+
+class StartupStats:
+    """会话启动耗时统计，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空统计数据"""
+        with self._lock:
+            self.cold: List[float] = []
+            self.warm: List[float] = []
+
+    def record(self, seconds: float, reused: bool) -> None:
+        with self._lock:
+            (self.warm if reused else self.cold).append(seconds)
+
+    def snapshot(self) -> Dict:
+        """获取统计快照
+
+        Returns:
+            冷启动（新建chromedriver进程）与热启动（复用已有服务）的
+            会话数和平均耗时
+        """
+        with self._lock:
+            return {
+                'sessions': len(self.cold) + len(self.warm),
+                'cold_starts': len(self.cold),
+                'warm_starts': len(self.warm),
+                'avg_cold_seconds': sum(self.cold) / len(self.cold) if self.cold else 0.0,
+                'avg_warm_seconds': sum(self.warm) / len(self.warm) if self.warm else 0.0
+            }
+
+
+class ChromeDriverServicePool:
+    """长驻chromedriver服务池
+
+    按驱动路径维护少量共享服务，新会话轮询分配到各服务上。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._services: Dict[str, List[SharedChromeService]] = {}
+        self._next: Dict[str, int] = {}
+
+    def acquire(self, config: 'WebDriverConfig') -> SharedChromeService:
+        """为新会话分配一个共享服务
+
+        Args:
+            config: WebDriver配置
+
+        Returns:
+            共享的chromedriver服务（可能尚未启动，由会话创建时启动）
+        """
+        path = config.chromedriver_path if os.path.exists(config.chromedriver_path) else None
+        key = path or '<selenium-manager>'
+        with self._lock:
+            services = self._services.setdefault(key, [])
+            index = self._next.get(key, 0) % config.service_pool_size
+            self._next[key] = index + 1
+            if index >= len(services):
+                service = SharedChromeService(path) if path else SharedChromeService()
+                if os.name == 'nt':
+                    service.creation_flags = 0x08000000  # 禁止显示命令行窗口
+                services.append(service)
+            return services[index]
+
+    def process_starts(self) -> int:
+        """所有共享服务累计启动chromedriver进程的次数"""
+        with self._lock:
+            return sum(s.process_starts for services in self._services.values() for s in services)
+
+    def shutdown(self) -> None:
+        """关闭所有共享服务"""
+        with self._lock:
+            services = [s for group in self._services.values() for s in group]
+            self._services.clear()
+            self._next.clear()
+        for service in services:
+            try:
+                service.shutdown()
+            except Exception:
+                pass
+
+
+service_pool = ChromeDriverServicePool()
+startup_stats = StartupStats()
+atexit.register(service_pool.shutdown)
+
+
+def get_startup_stats() -> Dict:
+    """获取会话启动耗时统计
+
+    Returns:
+        启动统计快照，另含chromedriver进程启动次数
+    """
+    stats = startup_stats.snapshot()
+    stats['driver_process_starts'] = service_pool.process_starts()
+    return stats
+
+
 class WebDriverManager:
     """浏览器驱动管理器，负责管理WebDriver实例"""
     
-    def __init__(self):
+    def __init__(self, config: Optional[WebDriverConfig] = None):
         self.logger = logging.getLogger(__name__)
+        self.config = config or WebDriverConfig()
         self.driver: Optional[webdriver.Chrome] = None
+        self.startup_seconds: Optional[float] = None
+        self.user_data_dir: Optional[str] = None
+        self.browser_pid: Optional[int] = None
+        self.health = BrowserHealthMonitor(self.config.health_thresholds)
         
     def init_driver(self) -> webdriver.Chrome:
         """初始化Chrome WebDriver
@@ -36,44 +368,152 @@ class WebDriverManager:
             WebDriver实例
         """
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-automation', 'enable-logging'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            service = Service("C:\\Program Files\\Google\\Chrome\\Application\\chromedriver.exe")
-            service.creation_flags = 0x08000000  # 禁止显示命令行窗口
-            
+            start = time.perf_counter()
+            if self.config.reuse_service:
+                service = service_pool.acquire(self.config)
+                reused = service.is_running()
+            else:
+                service = self.config.create_service()
+                reused = False
+                
+            template = self.config.profile_template
+            if template is not None:
+                self.user_data_dir = template.clone()
+                
             self.driver = webdriver.Chrome(
                 service=service,
-                options=chrome_options
+                options=self.config.session_options(self.user_data_dir),
+                keep_alive=True
             )
+            self.browser_pid = find_browser_pid(getattr(self.driver, 'capabilities', None) or {})
+            self._track_processes(service)
+            self.config.apply_profile(self.driver)
+            self.health.reset(self.driver)
+            self.startup_seconds = time.perf_counter() - start
+            startup_stats.record(self.startup_seconds, reused)
             
-            self.logger.info('Chrome WebDriver initialized successfully')
+            self.logger.info(
+                f'Chrome WebDriver initialized successfully in {self.startup_seconds:.2f}s '
+                f'(profile={self.config.profile}, headless={self.config.headless}, '
+                f'page_load_strategy={self.config.page_load_strategy}, service_reused={reused})'
+            )
             return self.driver
             
         except Exception as e:
             self.logger.error(f'Failed to initialize Chrome WebDriver: {str(e)}')
+            self._release_user_data_dir(refresh=False)
             raise
             
     def quit_driver(self) -> None:
         """关闭并清理WebDriver实例"""
         if self.driver:
+            close_devtools(self.driver)
             try:
                 self.driver.quit()
                 self.driver = None
+                self.browser_pid = None
                 self.logger.info('Chrome WebDriver closed successfully')
                 
             except Exception as e:
                 self.logger.error(f'Failed to close Chrome WebDriver: {str(e)}')
                 
+        self._release_user_data_dir(refresh=True)
+        
+    def after_case(self) -> bool:
+        """记录当前会话完成一个用例，浏览器指标或用例数超限时回收会话
+        
+        Returns:
+            是否回收了会话；回收后 self.driver 为新的实例，需要重新登录
+        """
+        if not self.driver:
+            return False
+        reason = self.health.record_case(self.driver)
+        if not reason:
+            return False
+        self.recycle_driver(reason)
+        return True
+        
+    def recycle_driver(self, reason: str) -> webdriver.Chrome:
+        """关闭当前会话并创建新会话
+        
+        Args:
+            reason: 回收原因，连同触发时的浏览器指标一起记录到日志
+            
+        Returns:
+            新的WebDriver实例
+        """
+        event = self.health.record_recycle(reason)
+        metrics = event.metrics.describe() if event.metrics else '未采集'
+        self.logger.warning(
+            f'Recycling browser session: {reason}; cases={event.cases}; metrics: {metrics}'
+        )
+        self.quit_driver()
+        return self.init_driver()
+        
+    def _track_processes(self, service: Service) -> None:
+        """记录本会话的chromedriver和Chrome进程，供孤儿进程清理识别"""
+        process = getattr(service, 'process', None)
+        driver_pid = getattr(process, 'pid', None)
+        if isinstance(driver_pid, int):
+            process_registry.track(driver_pid)
+        if self.browser_pid is not None:
+            parent = driver_pid if isinstance(driver_pid, int) else None
+            process_registry.track(self.browser_pid, parent=parent)
+            
+    def abort_driver(self) -> None:
+        """强制中断无响应的会话
+        
+        结束当前会话的Chrome主进程，
+        chromedriver随即使阻塞在该会话命令上的调用返回错误。
+        共享的chromedriver服务和挂在它上面的其他会话不受影响。
+        会话独占服务且找不到Chrome进程时结束chromedriver进程；
+        之后应调用 recycle_driver 重建会话。
+        """
+        if self.browser_pid is not None:
+            self.logger.warning(f'Aborting unresponsive browser session '
+                                f'(chrome pid={self.browser_pid})')
+            try:
+                os.kill(self.browser_pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+            except OSError as e:
+                self.logger.error(f'Failed to kill chrome: {str(e)}')
+            self.browser_pid = None
+            return
+            
+        service = getattr(self.driver, 'service', None)
+        if isinstance(service, SharedChromeService):
+            self.logger.error('Cannot abort unresponsive session: '
+                              'chrome process unknown and chromedriver is shared')
+            return
+        process = getattr(service, 'process', None)
+        if process is None or process.poll() is not None:
+            return
+        self.logger.warning(f'Aborting unresponsive browser session '
+                            f'(chromedriver pid={process.pid})')
+        try:
+            process.kill()
+        except OSError as e:
+            self.logger.error(f'Failed to kill chromedriver: {str(e)}')
+            
+    def _release_user_data_dir(self, refresh: bool) -> None:
+        """删除会话的用户数据目录，必要时先用它更新模板
+        
+        Args:
+            refresh: 是否允许用该目录更新模板
+                （模板尚不存在或配置要求刷新时）
+        """
+        if not self.user_data_dir:
+            return
+        template = self.config.profile_template
+        if refresh and template is not None and (
+                self.config.refresh_template or not template.exists()):
+            template.refresh_from(self.user_data_dir)
+        ProfileTemplate.discard(self.user_data_dir)
+        self.user_data_dir = None
+        
     def __enter__(self) -> webdriver.Chrome:
         """支持with语句的上下文管理"""
         return self.init_driver()
         
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         """退出时自动清理资源"""
-        self.quit_driver()
\ No newline at end of file
+        self.quit_driver()
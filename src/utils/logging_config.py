@@ -1,46 +1,277 @@
 import os
+import copy
+import json
+import queue
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+import contextvars
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
-def setup_logging():
-    """配置日志系统"""
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s'
+
+# 当前用例的关联ID，由 case_context 设置，经 CorrelationIdFilter 写入日志记录
+_correlation_id: contextvars.ContextVar[str] = contextvars.ContextVar('correlation_id', default='-')
+_case_id: contextvars.ContextVar[str] = contextvars.ContextVar('case_id', default='-')
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class LogStats:
+    """日志量统计，线程安全"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空统计数据"""
+        with self._lock:
+            self.records = 0
+            self.bytes = 0
+            self.dropped = 0
+            self.by_level: Dict[str, int] = {}
+
+    def add_record(self, level: str) -> None:
+        with self._lock:
+            self.records += 1
+            self.by_level[level] = self.by_level.get(level, 0) + 1
+
+    def add_bytes(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
+
+    def add_dropped(self) -> None:
+        with self._lock:
+            self.dropped += 1
+
+    def snapshot(self) -> Dict:
+        """获取统计快照
+
+        Returns:
+            包含记录数、写入字节数、丢弃数和各级别记录数的字典
+        """
+        with self._lock:
+            return {
+                'records': self.records,
+                'bytes': self.bytes,
+                'dropped': self.dropped,
+                'by_level': dict(self.by_level)
+            }
+
+
+log_stats = LogStats()
+
+
+class CorrelationIdFilter(logging.Filter):
+    """为日志记录附加当前用例的关联ID
+
+    必须挂在生产者一侧（QueueHandler），
+    这样上下文变量在记录入队前就被读取。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'correlation_id'):
+            record.correlation_id = _correlation_id.get()
+        if not hasattr(record, 'case_id'):
+            record.case_id = _case_id.get()
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """结构化JSON行格式化器，每条日志输出为一行JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'case_id': getattr(record, 'case_id', '-'),
+            'correlation_id': getattr(record, 'correlation_id', '-'),
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _CountingQueueHandler(QueueHandler):
+    """统计入队记录数，队列已满时丢弃记录而不阻塞调用线程
+
+    入队的记录保留格式化后的异常堆栈（exc_text），
+    而不是像 QueueHandler 默认那样把它拼进 message，
+    后台线程中的格式化器可以把堆栈作为单独的字段输出。
+    """
+
+    _traceback_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        traceback = record.exc_text
+        if record.exc_info and not traceback:
+            traceback = self._traceback_formatter.formatException(record.exc_info)
+        # 复制记录，不影响同一记录的其他处理器；
+        # exc_info 中的回溯对象不可序列化，只保留文本
+        record = copy.copy(record)
+        record.message = record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = traceback
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            log_stats.add_record(record.levelname)
+        except queue.Full:
+            log_stats.add_dropped()
+
+
+class _MeteredRotatingFileHandler(RotatingFileHandler):
+    """统计实际写入文件的字节数
+
+    RotatingFileHandler 在轮转检查和写入时会各格式化一次同一条记录，
+    这里缓存最近一条记录的格式化结果，避免重复格式化和重复计数。
+    """
+
+    _last_record: Optional[logging.LogRecord] = None
+    _last_message = ''
+
+    def format(self, record: logging.LogRecord) -> str:
+        if record is self._last_record:
+            return self._last_message
+        msg = super().format(record)
+        self._last_record = record
+        self._last_message = msg
+        log_stats.add_bytes(len(msg.encode('utf-8')) + len(self.terminator))
+        return msg
+
+
+@contextmanager
+def case_context(case_id: str) -> Iterator[str]:
+    """在上下文中为当前用例生成并绑定关联ID
+
+    Args:
+        case_id: 测试用例ID
+
+    Yields:
+        本次执行的关联ID
+    """
+    correlation_id = f"{case_id}-{uuid.uuid4().hex[:8]}"
+    case_token = _case_id.set(case_id)
+    correlation_token = _correlation_id.set(correlation_id)
+    try:
+        yield correlation_id
+    finally:
+        _correlation_id.reset(correlation_token)
+        _case_id.reset(case_token)
+
+
+def get_correlation_id() -> str:
+    """获取当前上下文的关联ID"""
+    return _correlation_id.get()
+
+
+def get_log_stats() -> Dict:
+    """获取日志量统计
+
+    Returns:
+        日志统计快照
+    """
+    return log_stats.snapshot()
+
+
+def stop_logging() -> None:
+    """停止后台日志线程并刷新队列中剩余的记录"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+
+
+def setup_logging(log_format: Optional[str] = None, queue_size: Optional[int] = None):
+    """配置日志系统
+
+    文件和控制台处理器运行在后台 QueueListener 线程中，
+    调用线程只负责入队，不会因磁盘写入或日志轮转而阻塞。
+    重复调用会先停止之前的监听线程。
+
+    Args:
+        log_format: 日志格式（text/json），默认读取环境变量 LOG_FORMAT
+        queue_size: 日志队列容量，0表示不限，默认读取环境变量 LOG_QUEUE_SIZE
+
+    Returns:
+        根日志记录器
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
     # 创建日志目录
     log_file = os.getenv('LOG_FILE', 'output/automation.log')
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    
+    os.makedirs(os.path.dirname(log_file) or '.', exist_ok=True)
+
     # 设置日志级别
     log_level = os.getenv('LOG_LEVEL', 'INFO')
-    
+    log_format = (log_format or os.getenv('LOG_FORMAT', 'text')).lower()
+    if queue_size is None:
+        queue_size = int(os.getenv('LOG_QUEUE_SIZE', '0'))
+
     # 创建格式化器
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
+    if log_format == 'json':
+        file_formatter: logging.Formatter = JsonLinesFormatter()
+    else:
+        file_formatter = logging.Formatter(TEXT_FORMAT)
+    console_formatter = logging.Formatter(TEXT_FORMAT)
+
     # 创建文件处理器
-    file_handler = RotatingFileHandler(
+    file_handler = _MeteredRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
         encoding='utf-8'
     )
-    file_handler.setFormatter(formatter)
-    
+    file_handler.setFormatter(file_formatter)
+
     # 创建控制台处理器
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    
+    console_handler.setFormatter(console_formatter)
+
+    # 通过队列把实际输出交给后台线程
+    log_queue: queue.Queue = queue.Queue(queue_size)
+    _queue_handler = _CountingQueueHandler(log_queue)
+    _queue_handler.addFilter(CorrelationIdFilter())
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+
     # 配置根日志记录器
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, log_level))
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-    
+    root_logger.addHandler(_queue_handler)
+
     # 设置第三方库的日志级别
     logging.getLogger('selenium').setLevel(logging.WARNING)
     logging.getLogger('urllib3').setLevel(logging.WARNING)
-    
-    return root_logger 
\ No newline at end of file
+
+    return root_logger
+
+
+atexit.register(stop_logging)
@@ -1,6 +1,10 @@
 import pytest
+from selenium.webdriver.support import wait as selenium_wait
+from src.core.test_case import case_manager
 from src.utils.driver.webdriver_manager import WebDriverManager
 from src.config.yx_config import YxConfig
+from tools.yunxiao_mock.fake_driver import FakeWebDriver, FakeYunxiaoSite, VirtualClock
+from tools.yunxiao_mock.server import MockConfig
 
 @pytest.fixture(scope="session")
 def config():
@@ -16,23 +20,34 @@ def driver():
     manager.quit_driver()
 
 @pytest.fixture(scope="function")
-def mock_driver():
+def virtual_clock(monkeypatch):
+    """提供虚拟时钟，替换用例管理器和WebDriverWait的time模块"""
+    clock = VirtualClock()
+    monkeypatch.setattr(case_manager, "time", clock)
+    monkeypatch.setattr(selenium_wait, "time", clock)
+    return clock
+
+@pytest.fixture(scope="function")
+def fake_site():
+    """提供内存中的云效站点数据"""
+    return FakeYunxiaoSite(MockConfig(seed=0))
+
+@pytest.fixture(scope="function")
+def mock_driver(virtual_clock, fake_site):
     """提供模拟的WebDriver实例，用于单元测试"""
-    class MockDriver:
-        def __init__(self):
-            self.current_url = None
-            self.page_source = ""
-            
-        def get(self, url):
-            self.current_url = url
-            
-        def quit(self):
-            pass
-            
-        def find_element(self, by, value):
-            return None
-            
-        def implicitly_wait(self, time):
-            pass
-    
-    return MockDriver() 
\ No newline at end of file
+    driver = FakeWebDriver(fake_site, virtual_clock)
+    yield driver
+    driver.quit()
+
+@pytest.fixture(scope="function")
+def fake_browser(monkeypatch, virtual_clock, fake_site):
+    """让WebDriverManager创建内存版WebDriver，返回已创建的driver列表"""
+    drivers = []
+
+    def init_driver(manager):
+        manager.driver = FakeWebDriver(fake_site, virtual_clock)
+        drivers.append(manager.driver)
+        return manager.driver
+
+    monkeypatch.setattr(WebDriverManager, "init_driver", init_driver)
+    return drivers
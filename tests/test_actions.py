@@ -0,0 +1,81 @@
+import pytest
+from src.core.automation.actions import cases_from_csv, parse_actions, run_actions, split_by_context
+
+class RecordingManager:
+    """记录调用的测试用例管理器替身"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name,) + args)
+
+@pytest.mark.unit
+class TestCaseActions:
+    """测试用例操作声明"""
+
+    def test_default_action(self):
+        """测试未声明操作时只标记自动化类型"""
+        assert parse_actions({"id": "TEST_001"}) == ["auto_type"]
+
+    def test_parse_string_and_deduplicate(self):
+        """测试逗号分隔的操作声明"""
+        test_case = {"id": "TEST_001", "actions": "result, auto_type,result",
+                     "data": {"result": "PASS"}}
+        assert parse_actions(test_case) == ["result", "auto_type"]
+
+    @pytest.mark.parametrize("test_case, message", [
+        ({"id": "TEST_001", "actions": ["delete"]}, "未知的操作"),
+        ({"id": "TEST_001", "actions": ["result"]}, "data.result"),
+        ({"id": "TEST_001", "actions": ["executor"], "data": {"result": "PASS"}}, "data.test_user")
+    ])
+    def test_invalid_actions(self, test_case, message):
+        """测试未知操作或缺少数据时报错"""
+        with pytest.raises(ValueError, match=message):
+            parse_actions(test_case)
+
+    def test_split_by_context(self):
+        """测试按页面上下文拆分步骤"""
+        test_case = {"id": "TEST_001", "actions": ["executor", "auto_type"],
+                     "data": {"test_user": "tester"}}
+        steps = split_by_context(test_case)
+        assert [(context, step["actions"]) for context, step in steps] == [
+            ("case_library", ["auto_type"]),
+            ("test_plan", ["executor"])
+        ]
+        assert "context" not in test_case
+
+    def test_result_and_executor_share_filter(self):
+        """测试同时标记结果和设置执行人时只筛选一次"""
+        manager = RecordingManager()
+        run_actions(manager, {"id": "TEST_001", "actions": ["result", "executor"],
+                              "data": {"result": "PASS", "test_user": "tester"}})
+        run_actions(manager, {"id": "TEST_002", "actions": ["executor"],
+                              "data": {"test_user": "tester"}})
+        assert manager.calls == [
+            ("mark_test_result", "TEST_001", "PASS", "tester"),
+            ("set_test_executor", "TEST_002", "tester")
+        ]
+
+    def test_cases_from_csv(self, tmp_path):
+        """测试从中文表头的标注CSV读取用例并推断操作"""
+        path = tmp_path / "自动化结果标注.csv"
+        path.write_text(
+            "用例编号,自动化类型,测试结果,执行人\n"
+            "TEST_001,是,,\n"
+            "TEST_002,,PASS,张三\n"
+            ",,,\n",
+            encoding="utf-8-sig"
+        )
+        assert cases_from_csv(str(path)) == [
+            {"id": "TEST_001", "actions": ["auto_type"], "data": {"auto_type": "是"}},
+            {"id": "TEST_002", "actions": ["result", "executor"],
+             "data": {"result": "PASS", "test_user": "张三"}}
+        ]
+
+    def test_csv_without_id_column(self, tmp_path):
+        """测试缺少用例编号列时报错"""
+        path = tmp_path / "cases.csv"
+        path.write_text("name\nfoo\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="用例编号"):
+            cases_from_csv(str(path))
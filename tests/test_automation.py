@@ -1,20 +1,39 @@
 import unittest
+from unittest import mock
 from datetime import datetime
-import os
+import shutil
+import tempfile
+from selenium.webdriver.support import wait as selenium_wait
 from src.core.automation.test_executor import TestExecutor
 from src.core.automation.result_manager import ResultManager
+from src.core.test_case import case_manager
+from src.utils.driver.webdriver_manager import WebDriverManager
+from tools.yunxiao_mock.fake_driver import FakeWebDriver, FakeYunxiaoSite, VirtualClock
 
 class TestAutomationCore(unittest.TestCase):
     def setUp(self):
+        # 使用内存版WebDriver和虚拟时钟，不启动浏览器
+        clock = VirtualClock()
+        site = FakeYunxiaoSite()
+
+        def init_driver(manager):
+            manager.driver = FakeWebDriver(site, clock)
+            return manager.driver
+
+        for patcher in (mock.patch.object(case_manager, 'time', clock),
+                        mock.patch.object(selenium_wait, 'time', clock),
+                        mock.patch.object(WebDriverManager, 'init_driver', init_driver)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # 每个测试使用独立的输出目录，支持 pytest-xdist 并行执行
+        self.output_dir = tempfile.mkdtemp(prefix='test_output_')
         self.test_executor = TestExecutor()
-        self.result_manager = ResultManager(output_dir='tests/test_output')
+        self.result_manager = ResultManager(output_dir=self.output_dir)
         
     def tearDown(self):
         # 清理测试输出目录
-        if os.path.exists('tests/test_output'):
-            for file in os.listdir('tests/test_output'):
-                os.remove(os.path.join('tests/test_output', file))
-            os.rmdir('tests/test_output')
+        shutil.rmtree(self.output_dir, ignore_errors=True)
             
     def test_execute_single_test(self):
         """测试单个测试用例执行"""
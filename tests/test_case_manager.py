@@ -5,10 +5,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException, 
     NoSuchElementException,
+    NoSuchWindowException,
     ElementClickInterceptedException,
     WebDriverException
 )
 from src.core.test_case.case_manager import TestCaseManager
+from src.utils.driver.cdp import CDPError
+from tools.yunxiao_mock import FakeDevToolsChannel, FakeWebDriver
 from src.utils.helpers import wait_for_condition
 
 @pytest.mark.unit
@@ -35,7 +38,8 @@ class TestCaseManagerUnit:
         """测试标记自动化类型成功"""
         try:
             manager = TestCaseManager(mock_driver)
-            manager.mark_auto_type("TEST-001", "是")
+            manager.mark_auto_type("TEST_001", "是")
+            assert mock_driver.site.state.get_case("TEST_001")["auto_type"] == "是"
         except WebDriverException as e:
             pytest.fail(f"标记自动化类型失败: {str(e)}")
 
@@ -43,8 +47,10 @@ class TestCaseManagerUnit:
         """测试标记自动化类型失败"""
         try:
             manager = TestCaseManager(mock_driver)
-            with pytest.raises(NoSuchElementException):
-                manager.mark_auto_type("INVALID-001", "是")
+            manager.mark_auto_type("INVALID-001", "是")
+            # 筛选结果为空时不做任何标记
+            assert manager.get_element_existance() is True
+            assert all(case["auto_type"] == "否" for case in mock_driver.site.state.find_cases(""))
         except WebDriverException as e:
             pytest.fail(f"测试标记自动化类型失败场景失败: {str(e)}")
 
@@ -52,7 +58,8 @@ class TestCaseManagerUnit:
         """测试标记测试结果成功"""
         try:
             manager = TestCaseManager(mock_driver)
-            manager.mark_test_result("TEST-001", "PASS")
+            manager.mark_test_result("TEST_001", "PASS")
+            assert mock_driver.site.state.get_case("TEST_001")["status"] == "已通过"
         except WebDriverException as e:
             pytest.fail(f"标记测试结果失败: {str(e)}")
 
@@ -60,16 +67,22 @@ class TestCaseManagerUnit:
         """测试标记测试结果失败"""
         try:
             manager = TestCaseManager(mock_driver)
-            with pytest.raises(NoSuchElementException):
-                manager.mark_test_result("INVALID-001", "PASS")
+            manager.mark_test_result("INVALID-001", "PASS")
+            # 筛选结果为空时不做任何标记
+            assert manager.get_element_existance() is True
+            cases = mock_driver.site.state.find_cases("")
+            assert all(case["status"] == "待测试" for case in cases)
         except WebDriverException as e:
             pytest.fail(f"测试标记测试结果失败场景失败: {str(e)}")
 
     def test_set_test_user_success(self, mock_driver):
         """测试设置测试执行人成功"""
         try:
+            mock_driver.site.state.members.append("tester")
             manager = TestCaseManager(mock_driver)
+            manager.ensure_logged_in()
             manager._set_test_user("tester")
+            assert mock_driver.site.state.get_case("TEST_001")["executor"] == "tester"
         except WebDriverException as e:
             pytest.fail(f"设置测试执行人失败: {str(e)}")
 
@@ -77,8 +90,11 @@ class TestCaseManagerUnit:
         """测试设置测试执行人失败"""
         try:
             manager = TestCaseManager(mock_driver)
-            with pytest.raises(NoSuchElementException):
-                manager._set_test_user("invalid_user")
+            manager.ensure_logged_in()
+            # 搜索不到的执行人不会被设置，选择框被关闭
+            manager._set_test_user("invalid_user")
+            assert mock_driver.site.state.get_case("TEST_001")["executor"] == "admin"
+            assert not mock_driver.find_elements(By.XPATH, '//*[@placeholder="请输入关键字"]')
         except WebDriverException as e:
             pytest.fail(f"测试设置测试执行人失败场景失败: {str(e)}")
 
@@ -107,6 +123,128 @@ class TestCaseManagerUnit:
         
         assert manager.get_element_exist(test_xpath) is False
 
+    def test_initialization_is_lazy(self, mock_driver, monkeypatch):
+        """测试构造时不登录，首次页面操作时才登录"""
+        logins = []
+        monkeypatch.setattr(TestCaseManager, "_perform_login", lambda self: logins.append(self))
+        monkeypatch.setattr(TestCaseManager, "_wait_for_page_load", lambda self: None)
+        monkeypatch.setattr(TestCaseManager, "_find_and_click_filter_button", lambda self: None)
+        monkeypatch.setattr(TestCaseManager, "_input_case_id", lambda self, case_id: None)
+        monkeypatch.setattr(TestCaseManager, "_click_filter_submit", lambda self: None)
+        monkeypatch.setattr(TestCaseManager, "_select_case_and_set_type",
+                            lambda self, case_type: None)
+
+        manager = TestCaseManager(mock_driver)
+        assert logins == []
+        assert mock_driver.history == []
+        assert not manager.is_logged_in
+
+        manager.mark_auto_type("TEST-001", "是")
+        manager.mark_auto_type("TEST-002", "是")
+        assert logins == [manager]
+        assert manager.is_logged_in
+        assert manager.login_seconds is not None
+
+    def test_login_shared_by_driver(self, mock_driver, monkeypatch):
+        """测试同一driver上的后续管理器复用登录状态"""
+        logins = []
+        monkeypatch.setattr(TestCaseManager, "_perform_login", lambda self: logins.append(self))
+
+        first = TestCaseManager(mock_driver)
+        first.ensure_logged_in()
+        second = TestCaseManager(mock_driver)
+        second.ensure_logged_in()
+        assert len(logins) == 1
+        assert second.is_logged_in
+        assert second.login_seconds is None
+
+        second.invalidate_login()
+        assert not first.is_logged_in
+        first.ensure_logged_in()
+        assert len(logins) == 2
+
+    def test_login_retry_recycles_owned_session(self, mock_driver, fake_site, virtual_clock,
+                                                monkeypatch):
+        """测试登录时窗口关闭通过管理器重建浏览器，否则直接抛出"""
+        attempts = []
+
+        def perform_login(self):
+            attempts.append(self.driver)
+            if len(attempts) == 1:
+                raise NoSuchWindowException("窗口已关闭")
+
+        monkeypatch.setattr(TestCaseManager, "_perform_login", perform_login)
+
+        class StubDriverManager:
+            def __init__(self):
+                self.recycled = []
+
+            def recycle_driver(self, reason):
+                self.recycled.append(reason)
+                return new_driver
+
+        new_driver = FakeWebDriver(fake_site, virtual_clock)
+        driver_manager = StubDriverManager()
+        manager = TestCaseManager(mock_driver, driver_manager=driver_manager)
+        manager.ensure_logged_in()
+        assert len(driver_manager.recycled) == 1
+        assert attempts == [mock_driver, new_driver]
+        assert manager.driver is new_driver and manager.is_logged_in
+
+        attempts.clear()
+        with pytest.raises(NoSuchWindowException):
+            TestCaseManager(mock_driver).login()
+        assert attempts == [mock_driver]
+
+    def test_hot_path_via_devtools(self, mock_driver):
+        """测试配置DevTools通道时，元素判断、输入和点击过滤走直连"""
+        channel = FakeDevToolsChannel(mock_driver)
+        manager = TestCaseManager(mock_driver, devtools=channel)
+        manager.mark_auto_type("TEST_001", "是")
+        manager.mark_test_result("TEST_002", "FAIL")
+        assert mock_driver.site.state.get_case("TEST_001")["auto_type"] == "是"
+        assert mock_driver.site.state.get_case("TEST_002")["status"] == "未通过"
+        operations = [operation for operation, _ in channel.commands]
+        assert operations.count("replace_text") == 2
+        assert operations.count("click_xpath") == 2
+        assert operations.count("xpath_exists") == 2
+
+    def test_devtools_failure_falls_back(self, mock_driver):
+        """测试DevTools通道出错时改用Selenium完成操作"""
+        class BrokenChannel(FakeDevToolsChannel):
+            def replace_text(self, xpath, text):
+                raise CDPError("DevTools连接已关闭")
+
+        manager = TestCaseManager(mock_driver, devtools=BrokenChannel(mock_driver))
+        manager.mark_auto_type("TEST_001", "是")
+        assert manager.devtools is None
+        assert mock_driver.site.state.get_case("TEST_001")["auto_type"] == "是"
+
+    def test_devtools_miss_not_waited_twice(self, mock_driver):
+        """测试DevTools等待元素超时后直接报错，不再用Selenium等待第二次"""
+        class MissingChannel(FakeDevToolsChannel):
+            def wait_for_xpath(self, xpath, timeout=30.0, visible=False, interval=0.1):
+                self.commands.append(('wait_for_xpath', xpath))
+                self.driver.clock.advance(timeout)
+                return False
+
+        channel = MissingChannel(mock_driver)
+        manager = TestCaseManager(mock_driver, devtools=channel)
+        for operation in (lambda: manager._input_case_id("TEST_001"), manager._click_filter_submit):
+            start = mock_driver.clock.now
+            with pytest.raises(TimeoutException):
+                operation()
+            assert mock_driver.clock.now - start == pytest.approx(30)
+        assert manager.devtools is channel
+
+    def test_devtools_disabled_by_default(self, mock_driver, monkeypatch):
+        """测试未开启 CDP_DIRECT 时不连接DevTools"""
+        monkeypatch.delenv("CDP_DIRECT", raising=False)
+        assert TestCaseManager(mock_driver).devtools is None
+        monkeypatch.setenv("CDP_DIRECT", "true")
+        # 内存版driver没有调试地址，回退到Selenium
+        assert TestCaseManager(mock_driver).devtools is None
+
 @pytest.mark.integration
 @pytest.mark.case_management
 class TestCaseManagerIntegration:
@@ -128,6 +266,7 @@ class TestCaseManagerIntegration:
         """测试初始化和登录流程"""
         try:
             manager = TestCaseManager(driver)
+            manager.ensure_logged_in()
             
             # 验证是否成功导航到测试用例页面
             assert "testcase" in driver.current_url.lower()
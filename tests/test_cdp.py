@@ -0,0 +1,211 @@
+import base64
+import hashlib
+import json
+import socketserver
+import struct
+import threading
+import pytest
+from selenium.common.exceptions import NoSuchWindowException
+from src.utils.driver.cdp import CDPError, DevToolsChannel, close_devtools, devtools_for
+
+PAGE_ID = "PAGE-1"
+
+def _read_frame(rfile):
+    first, second = rfile.read(2)
+    size = second & 0x7F
+    if size == 126:
+        size = struct.unpack("!H", rfile.read(2))[0]
+    elif size == 127:
+        size = struct.unpack("!Q", rfile.read(8))[0]
+    key = rfile.read(4)
+    payload = bytes(b ^ key[i % 4] for i, b in enumerate(rfile.read(size)))
+    return first & 0x0F, payload
+
+def _frame(opcode, payload, fin=True):
+    size = len(payload)
+    if size < 126:
+        header = bytes([size])
+    elif size < 1 << 16:
+        header = bytes([126]) + struct.pack("!H", size)
+    else:
+        header = bytes([127]) + struct.pack("!Q", size)
+    return bytes([(0x80 if fin else 0) | opcode]) + header + payload
+
+class FakeDevToolsServer:
+    """提供 /json/list 和页面WebSocket的DevTools替身"""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.received = []
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lines = []
+                while True:
+                    line = self.rfile.readline().decode("latin-1").strip()
+                    if not line:
+                        break
+                    lines.append(line)
+                path = lines[0].split()[1]
+                headers = {k.lower(): v.strip()
+                           for k, _, v in (l.partition(":") for l in lines[1:])}
+                if path == "/json/list":
+                    page_url = f"ws://{server.address}/devtools/page/{PAGE_ID}"
+                    body = json.dumps([
+                        {"id": "WORKER", "type": "service_worker",
+                         "webSocketDebuggerUrl": "ws://unused"},
+                        {"id": PAGE_ID, "type": "page", "webSocketDebuggerUrl": page_url}
+                    ]).encode()
+                    self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                                     + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                    return
+                key = headers["sec-websocket-key"] + "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+                accept = base64.b64encode(hashlib.sha1(key.encode()).digest())
+                self.wfile.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                                 b"Connection: Upgrade\r\nSec-WebSocket-Accept: "
+                                 + accept + b"\r\n\r\n")
+                while True:
+                    opcode, payload = _read_frame(self.rfile)
+                    if opcode == 0x8:
+                        return
+                    if opcode == 0xA:
+                        server.received.append({"pong": payload.decode()})
+                        continue
+                    message = json.loads(payload)
+                    server.received.append(message)
+                    for frame in server.respond(message):
+                        self.wfile.write(frame)
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.address = "%s:%d" % self.server.server_address
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+def _reply(message, result=None, **extra):
+    reply = dict({"id": message["id"], "result": result or {}}, **extra)
+    return _frame(0x1, json.dumps(reply).encode())
+
+def _respond(message):
+    method = message["method"]
+    if method == "Runtime.evaluate":
+        expression = message["params"]["expression"]
+        if "throw" in expression:
+            details = {"text": "Uncaught", "exception": {"description": "Error: boom"}}
+            return [_reply(message, {"result": {"type": "object"}, "exceptionDetails": details})]
+        if "getBoundingClientRect" in expression and "scrollIntoView" in expression:
+            value = {"x": 50, "y": 20, "width": 100, "height": 40}
+        elif "big" in expression:
+            value = "x" * 70000
+        else:
+            value = True
+        # 先推送一个事件和ping，再分两帧返回结果
+        result = {"result": {"type": "object", "value": value}}
+        body = json.dumps({"id": message["id"], "result": result}).encode()
+        return [
+            _frame(0x1, json.dumps({"method": "Page.loadEventFired", "params": {}}).encode()),
+            _frame(0x9, b"hb"),
+            _frame(0x1, body[:10], fin=False),
+            _frame(0x0, body[10:])
+        ]
+    if method == "Bad.method":
+        error = {"id": message["id"], "error": {"message": "method not found"}}
+        return [_frame(0x1, json.dumps(error).encode())]
+    return [_reply(message)]
+
+class FakeDriver:
+    def __init__(self, address):
+        self.capabilities = {"goog:chromeOptions": {"debuggerAddress": address}}
+        self.current_window_handle = PAGE_ID
+
+@pytest.mark.unit
+class TestDevToolsChannel:
+    """测试DevTools直连通道"""
+
+    @pytest.fixture
+    def server(self):
+        server = FakeDevToolsServer(_respond)
+        yield server
+        server.close()
+
+    @pytest.fixture
+    def channel(self, server):
+        channel = DevToolsChannel.attach(FakeDriver(server.address), timeout=5)
+        yield channel
+        channel.close()
+
+    def test_attach_to_current_window(self, channel):
+        """测试通过调试地址连接到当前窗口对应的页面"""
+        assert channel.websocket_url.endswith(f"/devtools/page/{PAGE_ID}")
+
+    def test_evaluate(self, server, channel):
+        """测试脚本求值，命令之间的事件被缓存，ping被回应"""
+        xpath = '//*[text()="暂无内容"]'
+        assert channel.xpath_exists(xpath) is True
+        assert server.received[0]["params"]["returnByValue"] is True
+        expression = server.received[0]["params"]["expression"]
+        assert f"document.evaluate({json.dumps(xpath)}" in expression
+        assert channel.events[-1]["method"] == "Page.loadEventFired"
+        assert len(channel.evaluate("big")) == 70000
+        assert {"pong": "hb"} in server.received
+        assert channel.commands == 2
+
+    def test_errors(self, channel):
+        """测试脚本异常和命令错误转换为CDPError"""
+        with pytest.raises(CDPError, match="boom"):
+            channel.evaluate("throw new Error('boom')")
+        with pytest.raises(CDPError, match="method not found"):
+            channel.send("Bad.method")
+        assert channel.evaluate("1") is True
+
+    def test_input_dispatch(self, server, channel):
+        """测试点击和输入通过Input域分发"""
+        assert channel.click_xpath("//button")
+        assert channel.replace_text("//input", "TEST_001")
+        commands = [m for m in server.received if "method" in m]
+        methods = [(m["method"], m["params"].get("type")) for m in commands]
+        assert methods == [
+            ("Runtime.evaluate", None),
+            ("Input.dispatchMouseEvent", "mouseMoved"),
+            ("Input.dispatchMouseEvent", "mousePressed"),
+            ("Input.dispatchMouseEvent", "mouseReleased"),
+            ("Runtime.evaluate", None),
+            ("Input.dispatchKeyEvent", "keyDown"),
+            ("Input.dispatchKeyEvent", "keyUp"),
+            ("Input.insertText", None)
+        ]
+        assert commands[1]["params"]["x"] == 50
+        assert commands[-1]["params"]["text"] == "TEST_001"
+
+    def test_devtools_for(self, server):
+        """测试按driver缓存通道，没有调试地址或地址不可用时返回None"""
+        driver = FakeDriver(server.address)
+        channel = devtools_for(driver)
+        assert channel is not None and devtools_for(driver) is channel
+        close_devtools(driver)
+        assert devtools_for(driver) is not channel
+        close_devtools(driver)
+
+        no_address = FakeDriver(None)
+        assert devtools_for(no_address) is None
+        unreachable = FakeDriver("127.0.0.1:1")
+        assert devtools_for(unreachable) is None
+
+    def test_devtools_for_closed_window(self, server):
+        """测试当前窗口已关闭时回退到WebDriver接口而不是抛出异常"""
+        class ClosedWindowDriver(FakeDriver):
+            @property
+            def current_window_handle(self):
+                raise NoSuchWindowException("no such window")
+
+            @current_window_handle.setter
+            def current_window_handle(self, value):
+                pass
+
+        driver = ClosedWindowDriver(server.address)
+        assert devtools_for(driver) is None
+        close_devtools(driver)
@@ -0,0 +1,660 @@
+import ast
+import json
+import io
+import os
+import subprocess
+import sys
+import pytest
+from tools.code_quality_checker.code_quality_checker.analyzers import (
+    ComplexityAnalyzer, DocumentationAnalyzer, MetricsAnalyzer, NamingAnalyzer, PerformanceAnalyzer,
+    SeleniumLatencyAnalyzer, TreeVisitor, run_visitors
+)
+from tools.code_quality_checker.code_quality_checker.analyzers.complexity.strategies import (
+    BooleanOperationComplexity, ComplexityDetail, ComplexityResult, ComplexityStrategy,
+    ControlFlowComplexity
+)
+from tools.code_quality_checker.code_quality_checker import __main__ as cli
+from tools.code_quality_checker.code_quality_checker.baseline import Baseline, issue_fingerprint
+from tools.code_quality_checker.code_quality_checker.benchmark import AnalyzerSet
+from tools.code_quality_checker.code_quality_checker.checker import CodeQualityChecker, FileAnalysis
+from tools.code_quality_checker.code_quality_checker.config import QualityConfig
+from tools.code_quality_checker.code_quality_checker.file_iterator import (
+    ExcludeMatcher, FileIterator
+)
+from tools.code_quality_checker.code_quality_checker.latency import rank_latency
+from tools.code_quality_checker.code_quality_checker.report import create_report_writer
+from tools.code_quality_checker.code_quality_checker.watch import (
+    InotifyWatcher, PollingWatcher, WatchSession
+)
+
+SAMPLE = '''
+import os
+
+class badClass:
+    def Method(self, a, b):
+        if a and b and a:
+            for i in range(3):
+                BadVar = i
+        try:
+            pass
+        except ValueError:
+            while a or b or a or b:
+                break
+
+def good_function():
+    """有文档"""
+    x = 1
+    return x
+'''
+
+class CountingStrategy(ComplexityStrategy):
+    """只实现 calculate_complexity 的旧式策略"""
+
+    def calculate_complexity(self, node):
+        count = sum(1 for child in ast.walk(node) if isinstance(child, ast.Return))
+        return ComplexityResult(count, [ComplexityDetail("Return", 1, "-")] * count)
+
+@pytest.fixture
+def project(tmp_path):
+    """包含若干Python文件的临时项目"""
+    root = tmp_path / "project"
+    for index in range(12):
+        package = root / f"pkg{index % 3}"
+        package.mkdir(parents=True, exist_ok=True)
+        source = SAMPLE.replace("badClass", f"bad{index}")
+        (package / f"module{index}.py").write_text(source, encoding="utf-8")
+    (root / "pkg0" / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"exclude_patterns": ["venv/*"]}), encoding="utf-8")
+    return root, str(config)
+
+@pytest.mark.unit
+class TestSharedTraversal:
+    """测试各分析器共用一次语法树遍历"""
+
+    def test_fused_matches_separate(self):
+        """测试单次遍历和逐个遍历的结果一致"""
+        tree = ast.parse(SAMPLE)
+        analyzers = AnalyzerSet()
+        metrics, complexity, naming, documentation = analyzers.fused(tree, SAMPLE)
+        assert [metrics, complexity, naming, documentation] == analyzers.separate(tree, SAMPLE)
+        assert complexity.score == 7
+        assert [d.type for d in complexity.details] == ["If", "For", "ExceptHandler", "While",
+                                                       "BooleanOperation", "BooleanOperation"]
+        assert naming.issues == ["类名 'badClass' 不符合命名规范",
+                                 "函数名 'Method' 不符合命名规范",
+                                 "变量名 'BadVar' 不符合命名规范"]
+        assert documentation.missing_docs == ["模块缺少文档字符串",
+                                              "类 'badClass' 缺少文档字符串",
+                                              "函数 'Method' 缺少文档字符串"]
+        assert (metrics.num_classes, metrics.num_functions) == (1, 2)
+
+    def test_analyze_api_unchanged(self):
+        """测试各分析器的 analyze 接口与单次遍历结果一致"""
+        tree = ast.parse(SAMPLE)
+        strategies = [ControlFlowComplexity(), BooleanOperationComplexity()]
+        expected = ComplexityAnalyzer(strategies).analyze(tree)
+        assert sum(s.calculate_complexity(tree).score for s in strategies) == expected.score
+        results = run_visitors(tree, [MetricsAnalyzer().visitor(tree, SAMPLE),
+                                      NamingAnalyzer().visitor(tree),
+                                      DocumentationAnalyzer().visitor(tree)])
+        assert results == [MetricsAnalyzer().analyze(tree, SAMPLE), NamingAnalyzer().analyze(tree),
+                           DocumentationAnalyzer().analyze(tree)]
+
+    def test_legacy_strategy(self):
+        """测试未声明节点类型的策略仍按整棵树计算"""
+        tree = ast.parse(SAMPLE)
+        result = ComplexityAnalyzer([ControlFlowComplexity(), CountingStrategy()]).analyze(tree)
+        assert result.score == 5
+        assert result.details[-1].type == "Return"
+
+    def test_strategy_contract_enforced(self):
+        """测试策略未声明节点类型也未实现计算方法时在定义时报错"""
+        with pytest.raises(TypeError, match="calculate_complexity"):
+            class EmptyStrategy(ComplexityStrategy):
+                pass
+        with pytest.raises(TypeError, match="score_node"):
+            class UnscoredStrategy(ComplexityStrategy):
+                node_types = (ast.If,)
+
+    def test_dispatch_by_subclass(self):
+        """测试访问者按节点类型及其子类分发，顺序与 ast.walk 相同"""
+        class StatementVisitor(TreeVisitor):
+            node_types = (ast.stmt,)
+
+            def __init__(self):
+                self.seen = []
+
+            def visit_node(self, node):
+                self.seen.append(type(node).__name__)
+
+            def result(self):
+                return self.seen
+
+        tree = ast.parse(SAMPLE)
+        expected = [type(n).__name__ for n in ast.walk(tree) if isinstance(n, ast.stmt)]
+        assert run_visitors(tree, [StatementVisitor()]) == [expected]
+
+@pytest.mark.unit
+class TestParallelCheck:
+    """测试多进程分析"""
+
+    def test_parallel_report_identical(self, project):
+        """测试多进程分析的报告与逐个分析完全相同"""
+        root, config = project
+        serial = CodeQualityChecker(str(root), config)
+        parallel = CodeQualityChecker(str(root), config, jobs=2)
+        result = serial.check_project()
+        assert result.total_files == 13
+        assert any("broken.py" in issue for issue in result.issues)
+        for fmt in ("text", "json"):
+            assert parallel.generate_report(fmt) == serial.generate_report(fmt)
+
+    def test_parallel_uses_checker_settings(self, project):
+        """测试工作进程使用与主进程相同的阈值"""
+        root, config = project
+        checker = CodeQualityChecker(str(root), config, jobs=2)
+        checker.max_complexity = 5
+        issues = checker.check_project().issues
+        assert sum("High complexity" in issue for issue in issues) == 12 * 6
+
+@pytest.mark.unit
+class TestAnalysisCache:
+    """测试增量分析缓存"""
+
+    def _checker(self, project, tmp_path, **kwargs):
+        root, config = project
+        cache_path = str(tmp_path / ".code-quality-cache")
+        return CodeQualityChecker(str(root), config, cache_path=cache_path, **kwargs)
+
+    def test_unchanged_files_hit(self, project, tmp_path):
+        """测试第二次运行全部命中，报告与不使用缓存时相同"""
+        root, config = project
+        first = self._checker(project, tmp_path).check_project()
+        assert first.cache_hit_rate == 0.0
+        second = self._checker(project, tmp_path).check_project()
+        assert second.cache_hit_rate == 1.0
+        assert second.issues == first.issues and second.file_metrics == first.file_metrics
+        expected = CodeQualityChecker(str(root), config).generate_report("json")
+        assert self._checker(project, tmp_path).generate_report("json") == expected
+
+    def test_changed_files_reanalyzed(self, project, tmp_path, monkeypatch):
+        """测试只重新分析内容变化的文件，只改修改时间时按哈希命中"""
+        root, _ = project
+        self._checker(project, tmp_path).check_project()
+        touched = root / "pkg1" / "module1.py"
+        os.utime(touched, ns=(0, 0))
+        edited = root / "pkg2" / "module2.py"
+        edited.write_text("def fine():\n    \"\"\"有文档\"\"\"\n", encoding="utf-8")
+        (root / "pkg0" / "module0.py").unlink()
+
+        checker = self._checker(project, tmp_path)
+        analyzed = []
+        original = checker.summarize_file
+        monkeypatch.setattr(checker, "summarize_file",
+                            lambda rel, path: analyzed.append(rel) or original(rel, path))
+        report = checker.check_project()
+        assert analyzed == [os.path.join("pkg2", "module2.py")]
+        assert report.cache_hit_rate == pytest.approx(11 / 12)
+        assert report.file_metrics[os.path.join("pkg2", "module2.py")]["lines"] == 2
+
+        data = json.loads((tmp_path / ".code-quality-cache").read_text(encoding="utf-8"))
+        assert os.path.join("pkg0", "module0.py") not in data["entries"]
+
+    def test_settings_invalidate(self, project, tmp_path):
+        """测试阈值变化时缓存失效"""
+        self._checker(project, tmp_path).check_project()
+        checker = self._checker(project, tmp_path)
+        checker.max_complexity = 5
+        report = checker.check_project()
+        assert report.cache_hit_rate == 0.0
+        assert any("High complexity" in issue for issue in report.issues)
+
+    def test_parallel_with_cache(self, project, tmp_path):
+        """测试部分命中时多进程分析的结果按文件顺序合并"""
+        root, config = project
+        self._checker(project, tmp_path).check_project()
+        (root / "pkg1" / "module4.py").write_text("x = 1\n", encoding="utf-8")
+        (root / "pkg2" / "module8.py").write_text("y = 2\n", encoding="utf-8")
+        report = self._checker(project, tmp_path, jobs=2).generate_report("text")
+        assert report == CodeQualityChecker(str(root), config).generate_report("text")
+
+@pytest.mark.unit
+class TestFileDiscovery:
+    """测试文件发现和排除规则"""
+
+    def test_exclude_matcher(self):
+        """测试默认排除规则按glob语义匹配文件和目录"""
+        matcher = ExcludeMatcher(QualityConfig().exclude_patterns)
+        assert matcher.match_dir("venv") and matcher.match_dir(".git")
+        assert matcher.match_dir("pkg.egg-info")
+        assert matcher.match("tests/test_a.py") and matcher.match(".github/x.py")
+        assert not matcher.match("src/main.py") and not matcher.match("src/tests/a.py")
+        matcher = ExcludeMatcher(["**/.*", "**/node_modules/**", "**/setup.py", "docs"])
+        assert matcher.match_dir("node_modules") and matcher.match_dir("web/node_modules")
+        assert matcher.match("a/.cache/x.py") and matcher.match("setup.py")
+        assert matcher.match("docs/conf.py")
+        assert not matcher.match("src/module.py") and not ExcludeMatcher([]).match("a.py")
+
+    def test_prune_excluded_dirs(self, tmp_path, monkeypatch):
+        """测试被排除的目录不会被打开"""
+        for directory in ("src/pkg", "venv/lib/site", ".git/hooks", "src/node_modules/dep"):
+            (tmp_path / directory).mkdir(parents=True)
+            (tmp_path / directory / "mod.py").write_text("x = 1\n", encoding="utf-8")
+        (tmp_path / "src" / "main.py").write_text("x = 1\n", encoding="utf-8")
+        (tmp_path / "README.md").write_text("", encoding="utf-8")
+
+        scanned = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scanned.append(path) or real_scandir(path))
+        iterator = FileIterator(str(tmp_path), ["venv/*", ".*", "**/node_modules/**"])
+        files = [rel for rel, _ in iterator.iter_python_files()]
+        assert files == [os.path.join("src", "main.py"), os.path.join("src", "pkg", "mod.py")]
+        scanned_dirs = sorted(os.path.relpath(path, tmp_path) for path in scanned)
+        assert scanned_dirs == [".", "src", os.path.join("src", "pkg")]
+        assert iterator.should_exclude(tmp_path / "venv")
+        assert not iterator.should_exclude(tmp_path / "src")
+
+    def test_default_config_finds_files(self, tmp_path):
+        """测试默认配置只排除隐藏目录，不会排除全部文件"""
+        (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / ".hidden" / "skip.py").write_text("x = 1\n", encoding="utf-8")
+        assert CodeQualityChecker(str(tmp_path)).check_project().total_files == 1
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+@pytest.fixture
+def git_project(tmp_path):
+    """在功能分支上有提交和未提交修改的Git仓库
+
+    检查根目录为子目录 app。
+    """
+    repo = tmp_path / "repo"
+    app = repo / "app"
+    app.mkdir(parents=True)
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "dev@example.com")
+    _git(repo, "config", "user.name", "dev")
+    for name in ("keep.py", "old_name.py", "edited.py", "removed.py", "staged.py"):
+        (app / name).write_text(f"# {name}\n" + "value = 1\n" * 20, encoding="utf-8")
+    (repo / "outside.py").write_text("x = 1\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "base")
+    _git(repo, "checkout", "-q", "-b", "feature")
+    _git(repo, "mv", "app/old_name.py", "app/new_name.py")
+    (app / "edited.py").write_text("value = 2\n", encoding="utf-8")
+    (app / "removed.py").unlink()
+    (repo / "outside.py").write_text("x = 2\n", encoding="utf-8")
+    (app / "notes.txt").write_text("", encoding="utf-8")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "feature")
+    (app / "staged.py").write_text("value = 3\n", encoding="utf-8")
+    _git(repo, "add", "app/staged.py")
+    (app / "untracked.py").write_text("value = 4\n", encoding="utf-8")
+    return app
+
+@pytest.mark.unit
+class TestChangedFiles:
+    """测试基于git diff的变更文件发现"""
+
+    def test_changed_since_base(self, git_project):
+        """测试分支变更加工作区修改，跟踪重命名，忽略已删除的文件"""
+        iterator = FileIterator(str(git_project), [])
+        assert iterator.get_git_changed_files(base="main") == [
+            "edited.py", "new_name.py", "staged.py", "untracked.py"]
+        assert iterator.renames == {"new_name.py": "old_name.py"}
+        assert iterator.get_git_changed_files(base="HEAD") == ["staged.py", "untracked.py"]
+
+    def test_changed_by_days(self, git_project):
+        """测试按天数时，历史不足则与空树比较"""
+        iterator = FileIterator(str(git_project), ["keep*"])
+        files = [rel for rel, _ in iterator.iter_python_files(days=30)]
+        assert files == ["edited.py", "new_name.py", "staged.py", "untracked.py"]
+
+    def test_not_a_repository(self, tmp_path):
+        """测试不在Git仓库中时返回空列表"""
+        (tmp_path / "a.py").write_text("x = 1\n", encoding="utf-8")
+        assert list(FileIterator(str(tmp_path), []).iter_python_files(base="main")) == []
+
+    def test_cli_changed_only(self, git_project, monkeypatch, capsys):
+        """测试命令行 --base、--format 和 --exclude 参数"""
+        monkeypatch.setattr(sys, "argv", ["code-quality-check", str(git_project), "--base", "main",
+                                          "--format", "json", "--exclude", "untracked.py",
+                                          "--no-cache"])
+        cli.main()
+        report = json.loads(capsys.readouterr().out)
+        paths = [record["path"] for record in report["files"]]
+        assert paths == ["edited.py", "new_name.py", "staged.py"]
+
+@pytest.mark.unit
+class TestReportWriters:
+    """测试流式报告输出"""
+
+    def test_json_and_ndjson(self, project):
+        """测试JSON和NDJSON报告逐文件输出，汇总与 check_project 一致"""
+        root, config = project
+        checker = CodeQualityChecker(str(root), config)
+        expected = checker.check_project()
+
+        stream = io.StringIO()
+        summary = checker.write_report(create_report_writer("json", stream))
+        document = json.loads(stream.getvalue())
+        assert [record["path"] for record in document["files"]] == [
+            rel for rel, _ in checker.file_iterator.iter_python_files()]
+        assert document["summary"] == summary
+        assert summary["total_files"] == expected.total_files
+        assert summary["issue_count"] == len(expected.issues) and summary["error_count"] == 1
+        assert summary["avg_complexity"] == expected.avg_complexity
+
+        stream = io.StringIO()
+        checker.write_report(create_report_writer("ndjson", stream))
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [record["type"] for record in records] == ["file"] * 13 + ["summary"]
+        assert [issue for record in records[:-1] for issue in record["issues"]] == expected.issues
+
+    def test_results_streamed_before_run_ends(self, project, monkeypatch):
+        """测试每个文件的结果在下一个文件分析之前已经写出"""
+        root, config = project
+        checker = CodeQualityChecker(str(root), config)
+        stream = io.StringIO()
+        written = []
+        original = checker.summarize_file
+        def summarize_file(rel, path):
+            written.append(stream.getvalue().count("\n"))
+            return original(rel, path)
+
+        monkeypatch.setattr(checker, "summarize_file", summarize_file)
+        checker.write_report(create_report_writer("ndjson", stream))
+        assert written == list(range(13))
+
+    @pytest.mark.parametrize("fmt", ["text", "html"])
+    def test_summary_written_last(self, project, fmt):
+        """测试文本和HTML报告的汇总位于文件结果之后"""
+        root, config = project
+        stream = io.StringIO()
+        CodeQualityChecker(str(root), config).write_report(create_report_writer(fmt, stream))
+        output = stream.getvalue()
+        assert output.index("module11.py") < output.index("Project Overview")
+        assert output.index("Project Overview") < output.index("Total files: 13")
+        assert "Documentation coverage: 25%" in output
+
+    def test_unknown_format(self):
+        """测试不支持的格式"""
+        with pytest.raises(ValueError):
+            create_report_writer("xml", io.StringIO())
+
+@pytest.mark.unit
+class TestWatchMode:
+    """测试监视模式的增量更新"""
+
+    def test_incremental_update(self, project):
+        """测试只重新分析变化的文件，汇总与重新扫描的结果一致"""
+        root, config = project
+        checker = CodeQualityChecker(str(root), config)
+        stream = io.StringIO()
+        session = WatchSession(checker, stream)
+        session.start()
+
+        documented = "def fine():\n    \"\"\"有文档\"\"\"\n"
+        (root / "pkg1" / "module1.py").write_text(documented, encoding="utf-8")
+        (root / "pkg0" / "module3.py").unlink()
+        (root / "pkg3").mkdir()
+        (root / "pkg3" / "added.py").write_text("class badName:\n    pass\n", encoding="utf-8")
+        (root / "pkg3" / "notes.txt").write_text("", encoding="utf-8")
+        deltas = session.update({"pkg1/module1.py", "pkg0/module3.py", "pkg3"})
+        assert deltas[os.path.join("pkg1", "module1.py")] == (0, 3)
+        assert deltas[os.path.join("pkg0", "module3.py")] == (0, 3)
+        assert deltas[os.path.join("pkg3", "added.py")] == (2, 0)
+        output = stream.getvalue()
+        added = "  + pkg3/added.py: 类名 'badName' 不符合命名规范"
+        assert added in output.replace(os.sep, "/")
+
+        fresh = checker.check_project()
+        summary = session.summary.as_dict()
+        assert summary["total_files"] == fresh.total_files == 13
+        assert summary["issue_count"] == len(fresh.issues)
+        assert summary["avg_complexity"] == pytest.approx(fresh.avg_complexity)
+        assert session.update({"pkg0/missing.py"}) == {}
+
+    def test_polling_watcher(self, project):
+        """测试轮询监视器发现修改、新增和删除"""
+        root, config = project
+        watcher = PollingWatcher(CodeQualityChecker(str(root), config).file_iterator)
+        assert watcher.poll(0) == set()
+        os.utime(root / "pkg1" / "module1.py", ns=(1, 1))
+        (root / "pkg0" / "new.py").write_text("x = 1\n", encoding="utf-8")
+        (root / "pkg2" / "module2.py").unlink()
+        assert watcher.poll(0) == {os.path.join("pkg1", "module1.py"),
+                                   os.path.join("pkg0", "new.py"),
+                                   os.path.join("pkg2", "module2.py")}
+
+    def test_inotify_watcher(self, project):
+        """测试inotify监视器报告文件和新建目录中的文件，忽略排除的目录"""
+        root, _ = project
+        checker = CodeQualityChecker(str(root), exclude_patterns=["venv/*"])
+        try:
+            watcher = InotifyWatcher(str(root), checker.file_iterator.matcher)
+        except OSError:
+            pytest.skip("inotify 不可用")
+        try:
+            (root / "pkg1" / "module1.py").write_text("x = 2\n", encoding="utf-8")
+            (root / "venv").mkdir()
+            (root / "venv" / "lib.py").write_text("x = 1\n", encoding="utf-8")
+            (root / "README.md").write_text("", encoding="utf-8")
+            assert watcher.poll(2) == {"pkg1/module1.py"}
+            (root / "pkg4").mkdir()
+            (root / "pkg4" / "new.py").write_text("x = 1\n", encoding="utf-8")
+            changed = watcher.poll(2)
+            while more := watcher.poll(0.2):
+                changed |= more
+            assert changed == {"pkg4", "pkg4/new.py"}
+        finally:
+            watcher.close()
+
+@pytest.mark.unit
+class TestBaseline:
+    """测试问题基线"""
+
+    def test_only_new_issues(self, project, tmp_path):
+        """测试基线中已有的问题被忽略，代码移动后仍能匹配"""
+        root, config = project
+        baseline_path = str(tmp_path / "baseline.json")
+        checker = CodeQualityChecker(str(root), config)
+        checker.max_complexity = 1
+        baseline = checker.write_baseline(baseline_path)
+        assert baseline.issue_count == len(checker.check_project().issues)
+
+        module = root / "pkg1" / "module1.py"
+        shifted = "import sys\n\n\n" + module.read_text(encoding="utf-8").replace(
+            "BadVar = i", "BadVar = i\n                OtherBad = i")
+        module.write_text(shifted, encoding="utf-8")
+        checker = CodeQualityChecker(str(root), config, baseline_path=baseline_path)
+        checker.max_complexity = 1
+        report = checker.check_project()
+        module_path = os.path.join('pkg1', 'module1.py')
+        assert report.issues == [f"{module_path}: 变量名 'OtherBad' 不符合命名规范"]
+        assert checker.baseline.suppressed == baseline.issue_count
+
+    def test_duplicate_and_renamed(self):
+        """测试相同指纹按次数抵消，重命名的文件按旧路径匹配"""
+        naming = issue_fingerprint("naming", "变量名 'X' 不符合命名规范")
+        old = FileAnalysis("old.py", issues=["a"], fingerprints=[naming])
+        baseline = Baseline.from_results([old])
+        analysis = FileAnalysis("new.py", issues=["a", "a"], fingerprints=[naming, naming])
+        assert baseline.filter(analysis).issues == ["a", "a"]
+        assert baseline.filter(analysis, "old.py").issues == ["a"]
+        broken = FileAnalysis("broken.py", error="invalid syntax (<unknown>, line 3)")
+        baseline = Baseline.from_results([broken])
+        moved = FileAnalysis("broken.py", error="invalid syntax (<unknown>, line 7)")
+        assert baseline.filter(moved) is None
+
+    def test_baselined_error_not_counted(self, project, tmp_path):
+        """测试基线中已有的解析错误不计入文件数和平均复杂度"""
+        root, config = project
+        baseline_path = str(tmp_path / "baseline.json")
+        CodeQualityChecker(str(root), config).write_baseline(baseline_path)
+        checker = CodeQualityChecker(str(root), config, baseline_path=baseline_path)
+        report = checker.check_project()
+        assert report.issues == []
+        assert report.total_files == len(report.file_metrics) == 12
+        complexity = sum(metrics["complexity"] for metrics in report.file_metrics.values())
+        assert report.avg_complexity == complexity / 12
+
+    def test_large_baseline(self, tmp_path):
+        """测试十万个问题的基线的生成、保存、加载和比较"""
+        analyses = [
+            FileAnalysis(f"pkg/module{index}.py", issues=[f"issue {n}" for n in range(100)],
+                         fingerprints=[issue_fingerprint("naming", f"{index}:{n}")
+                                       for n in range(100)])
+            for index in range(1000)
+        ]
+        path = str(tmp_path / "baseline.json")
+        Baseline.from_results(analyses).save(path)
+        baseline = Baseline.load(path)
+        assert baseline.issue_count == 100000
+        assert all(not baseline.filter(analysis).issues for analysis in analyses)
+        assert baseline.suppressed == 100000
+
+HOT_LOOP = '''
+import json
+import re
+import time
+
+def parse(line):
+    return re.match(r"\\d+", line)
+
+def run(items, names):
+    seen = []
+    out = ""
+    for item in items:
+        time.sleep(1)
+        if item in seen:
+            seen.append(item)
+        out += f"{item},"
+        parse(item)
+        with open(item, "w") as f:
+            json.dump({}, f)
+    return [n for n in names if re.search("a", n)]
+
+def nested(items):
+    for item in items:
+        def later():
+            time.sleep(1)
+    time.sleep(1)
+    return "x" in list(items)
+'''
+
+@pytest.mark.unit
+class TestPerformanceAnalyzer:
+    """测试热循环性能反模式分析"""
+
+    def test_findings(self):
+        """测试各规则的严重程度和位置，循环外和嵌套函数中不报告"""
+        findings = PerformanceAnalyzer().analyze(ast.parse(HOT_LOOP)).findings
+        assert [(f.rule, f.severity, f.location) for f in findings] == [
+            ("regex-in-loop", "low", "line 7"),
+            ("sleep-in-loop", "high", "line 13"),
+            ("list-membership-in-loop", "medium", "line 14"),
+            ("string-concat-in-loop", "low", "line 16"),
+            ("io-in-loop", "medium", "line 18"),
+            ("io-in-loop", "medium", "line 19"),
+            ("regex-in-loop", "low", "line 20"),
+        ]
+
+    def test_shared_traversal(self):
+        """测试在共享遍历中的结果与单独分析相同"""
+        tree = ast.parse(HOT_LOOP)
+        analyzer = PerformanceAnalyzer()
+        fused = run_visitors(tree, [NamingAnalyzer().visitor(tree), analyzer.visitor(tree)])[1]
+        assert fused == analyzer.analyze(tree)
+
+    def test_checker_issues(self, tmp_path):
+        """测试检查器报告性能问题并计算指纹"""
+        path = tmp_path / "hot.py"
+        path.write_text(HOT_LOOP, encoding="utf-8")
+        analysis = CodeQualityChecker(str(tmp_path)).summarize_file("hot.py", str(path))
+        sleep = "hot.py: [high] 循环中调用 time.sleep，每次迭代固定等待 at line 13"
+        assert sleep in analysis.issues
+        assert sum(fp.startswith("performance:") for fp in analysis.fingerprints) == 7
+        assert len(analysis.fingerprints) == len(analysis.issues)
+
+BROWSER = '''
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+
+class Page:
+    def __init__(self, driver):
+        self.driver = driver
+        self.wait = WebDriverWait(driver, 30)
+
+    def open_filter(self):
+        self.driver.implicitly_wait(10)
+        selectors = ["//button", "/html/body/div[2]/button", "//span"]
+        for selector in selectors:
+            try:
+                self.wait.until(lambda d: d.find_element("xpath", selector))
+                break
+            except Exception:
+                continue
+        for _ in range(3):
+            time.sleep(0.5)
+
+    def exists(self):
+        try:
+            self.driver.find_element("xpath", "/html/body/main")
+            return True
+        except:
+            return False
+'''
+
+@pytest.mark.unit
+class TestSeleniumLatency:
+    """测试 Selenium 延迟分析"""
+
+    def test_findings_and_latency(self):
+        """测试各规则的位置和最坏情况延迟估算"""
+        findings = SeleniumLatencyAnalyzer().analyze(ast.parse(BROWSER)).findings
+        assert [(f.rule, f.line, f.latency) for f in findings] == [
+            ("mixed-waits", 11, 10.0),
+            ("absolute-xpath", 12, 0.0),
+            ("fallback-selector-loop", 13, 3 * (30.0 + 10.0)),
+            ("fixed-sleep", 20, 0.5),
+            ("bare-except-wait", 23, 10.0),
+            ("absolute-xpath", 24, 10.0),
+        ]
+        assert findings[0].function == "Page.open_filter"
+
+    def test_ranking(self, tmp_path):
+        """测试函数按延迟排序，被外层问题覆盖的延迟不重复计算"""
+        result = SeleniumLatencyAnalyzer().analyze(ast.parse(BROWSER))
+        assert [(f.function, f.latency) for f in result.functions] == [
+            ("Page.open_filter", 130.5), ("Page.exists", 10.0)
+        ]
+        (tmp_path / "page.py").write_text(BROWSER, encoding="utf-8")
+        plain = "import time\nfor i in range(3):\n    time.sleep(1)\n"
+        (tmp_path / "plain.py").write_text(plain, encoding="utf-8")
+        ranking = rank_latency([str(tmp_path)])
+        assert [item.function for item in ranking] == ["Page.open_filter", "Page.exists"]
+
+    def test_sleep_reported_once(self, tmp_path):
+        """测试循环中的固定等待只由延迟分析报告一次"""
+        path = tmp_path / "page.py"
+        path.write_text(BROWSER, encoding="utf-8")
+        analysis = CodeQualityChecker(str(tmp_path)).summarize_file("page.py", str(path))
+        sleeps = [issue for issue in analysis.issues if "time.sleep" in issue]
+        assert sleeps == ["page.py: [high] 循环中固定等待 time.sleep(0.5)，"
+                          "每次迭代都会等待 at line 20"]
+        assert not any(fp.startswith("performance:") for fp in analysis.fingerprints)
+        assert len(analysis.fingerprints) == len(analysis.issues)
+
+    def test_case_manager(self):
+        """测试对 case_manager.py 的分析，登录中的串行备选选择器排在最前"""
+        path = os.path.join(os.path.dirname(__file__), "..", "src", "core", "test_case",
+                            "case_manager.py")
+        ranking = rank_latency([path])
+        assert ranking[0].function == "TestCaseManager._perform_login"
+        rules = {finding.rule for item in ranking for finding in item.findings}
+        assert rules == {"fixed-sleep", "mixed-waits", "fallback-selector-loop",
+                         "absolute-xpath", "bare-except-wait"}
@@ -0,0 +1,93 @@
+import json
+import pytest
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from src.core.automation.daemon import AutomationDaemon, DaemonClient
+from src.core.automation.result_manager import ResultManager
+from src.core.automation.test_executor import TestExecutor
+from tools.yunxiao_mock.fake_driver import BASE_URL
+
+@pytest.mark.unit
+class TestAutomationDaemon:
+    """测试自动化守护进程"""
+
+    @pytest.fixture
+    def daemon(self, fake_browser, tmp_path):
+        """在随机端口启动使用内存浏览器的守护进程"""
+        daemon = AutomationDaemon(
+            executor=TestExecutor(),
+            result_manager=ResultManager(str(tmp_path / "results")),
+            port=0,
+            max_finished_jobs=1
+        ).start()
+        yield daemon
+        daemon.stop()
+
+    @pytest.fixture
+    def client(self, daemon):
+        return DaemonClient(daemon.url)
+
+    def test_jobs_share_warm_session(self, daemon, client, fake_browser, fake_site, tmp_path):
+        """测试多个任务复用同一个已登录的浏览器会话，并流式返回进度"""
+        first = client.submit("suite", cases=[{"id": "TEST_001", "data": {"auto_type": "是"}}])
+        events = list(client.events(first))
+        assert [e["event"] for e in events] == ["queued", "started", "loaded", "step", "finished"]
+        assert events[3]["result"]["case_id"] == "TEST_001"
+
+        second = client.submit("suite", cases=[
+            {"id": "TEST_002", "actions": ["result"], "data": {"result": "PASS"}}
+        ])
+        events = list(client.events(second))
+        assert events[-1]["event"] == "finished"
+        assert events[1]["wait_seconds"] < 1
+        assert client.status(second)["results"][0]["status"] == "passed"
+
+        assert fake_site.state.get_case("TEST_001")["auto_type"] == "是"
+        assert fake_site.state.get_case("TEST_002")["status"] == "已通过"
+        assert len(fake_browser) == 1
+        assert not fake_browser[0].quit_called
+        assert fake_browser[0].history.count(f"{BASE_URL}/") == 1
+        assert client.health()["session_alive"]
+
+        daemon.stop()
+        assert fake_browser[0].quit_called
+        assert list((tmp_path / "results").glob("test_suite_*.json"))
+
+    def test_csv_job(self, client, fake_site, tmp_path):
+        """测试从标注CSV创建任务"""
+        path = tmp_path / "自动化类型标注.csv"
+        path.write_text("用例编号,自动化类型\nTEST_003,是\n", encoding="utf-8-sig")
+        job_id = client.submit("csv", path=str(path))
+        events = list(client.events(job_id))
+        assert events[-1]["event"] == "finished"
+        assert fake_site.state.get_case("TEST_003")["auto_type"] == "是"
+
+    def test_job_errors(self, client):
+        """测试未知任务类型被拒绝，用例加载失败的任务标记为失败"""
+        with pytest.raises(ValueError, match="400"):
+            client.submit("export")
+        job_id = client.submit("csv", path="missing.csv")
+        events = list(client.events(job_id))
+        assert events[-1]["event"] == "failed"
+        assert client.status(job_id)["state"] == "failed"
+
+    def test_invalid_requests_rejected(self, daemon):
+        """测试请求体不是JSON对象或 workers 不是正整数时返回400"""
+        for body in (b'[1]', b'"suite"', b'{"kind": "suite", "cases": [], "workers": "2"}',
+                     b'{"kind": "suite", "cases": [], "workers": 0}', b'{bad json'):
+            request = Request(f"{daemon.url}/jobs", data=body, method="POST",
+                              headers={"Content-Type": "application/json"})
+            with pytest.raises(HTTPError) as error:
+                urlopen(request, timeout=5)
+            assert error.value.code == 400
+            assert json.loads(error.value.read().decode("utf-8"))["error"]
+        assert daemon.jobs == {}
+
+    def test_finished_jobs_pruned(self, daemon, client):
+        """测试只保留最近结束的任务，避免常驻进程的内存无限增长"""
+        first = client.submit("suite", cases=[{"id": "TEST_001", "data": {"auto_type": "是"}}])
+        list(client.events(first))
+        second = client.submit("suite", cases=[{"id": "TEST_002", "data": {"auto_type": "是"}}])
+        list(client.events(second))
+        daemon.stop()
+        assert list(daemon.jobs) == [second]
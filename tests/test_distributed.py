@@ -0,0 +1,212 @@
+import json
+import multiprocessing
+import os
+import time
+import sqlite3
+import pytest
+from src.core.automation.distributed import (
+    CoordinatorServer, DistributedWorker, RemoteJobStore, SQLiteJobStore, main, submit_suite,
+    wait_for_suite
+)
+from src.core.automation.scheduler import CaseHistory
+
+def _cases(*case_ids):
+    return [{"id": case_id, "data": {"auto_type": "是"}} for case_id in case_ids]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class StubExecutor:
+    """不启动浏览器、直接返回通过结果的执行器"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.cleaned = False
+
+    def execute_test_suite(self, test_cases):
+        self.batches.append([case["id"] for case in test_cases])
+        time.sleep(self.delay)
+        return [{"case_id": case["id"], "status": "passed", "worker": os.getpid()}
+                for case in test_cases]
+
+    def cleanup(self):
+        self.cleaned = True
+
+def _run_worker(path, lease_seconds):
+    store = SQLiteJobStore(path, lease_seconds=lease_seconds)
+    DistributedWorker(store, StubExecutor(delay=0.05), poll_interval=0.05).run(exit_when_idle=True)
+
+def _lease_and_die(path, lease_seconds):
+    # 模拟租到批次后失联的工作进程
+    SQLiteJobStore(path, lease_seconds=lease_seconds).lease("dead-worker")
+    os._exit(0)
+
+@pytest.mark.unit
+class TestSQLiteJobStore:
+    """测试共享SQLite任务存储"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def store(self, tmp_path, clock):
+        return SQLiteJobStore(str(tmp_path / "jobs.db"), lease_seconds=30, max_attempts=2,
+                              clock=clock)
+
+    def test_lease_and_complete(self, store):
+        """测试批次按提交顺序租用，结果按用例原顺序返回"""
+        suite_id = submit_suite(store, _cases("A", "B", "C"), batch_size=2)
+        first = store.lease("w1")
+        second = store.lease("w2")
+        assert [c["id"] for c in first.cases] == ["A", "B"]
+        assert [c["id"] for c in second.cases] == ["C"]
+        assert store.lease("w3") is None
+
+        assert store.complete(second.id, "w2", [{"case_id": "C", "status": "passed"}])
+        assert not store.complete(first.id, "w2", [])
+        assert store.complete(first.id, "w1", [{"case_id": "A", "status": "passed"},
+                                               {"case_id": "B", "status": "passed"}])
+        assert store.suite_status(suite_id)["done"] == 2
+        assert [r["case_id"] for r in store.suite_results(suite_id)] == ["A", "B", "C"]
+
+    def test_longest_cases_batched_first(self, store):
+        """测试历史耗时长的用例先被租用"""
+        history = CaseHistory()
+        history.record("C", 90)
+        history.record("A", 5)
+        submit_suite(store, _cases("A", "B", "C"), batch_size=1, history=history)
+        assert store.lease("w1").cases[0]["id"] == "C"
+
+    def test_expired_lease_requeued(self, store, clock):
+        """测试租约过期的批次重新分配，原工作进程的结果被拒绝"""
+        suite_id = submit_suite(store, _cases("A"), batch_size=1)
+        batch = store.lease("w1")
+        clock.now += 20
+        assert store.heartbeat(batch.id, "w1")
+        clock.now += 20
+        assert store.lease("w2") is None
+
+        clock.now += 31
+        retry = store.lease("w2")
+        assert (retry.id, retry.attempts) == (batch.id, 2)
+        assert not store.heartbeat(batch.id, "w1")
+        assert not store.complete(batch.id, "w1", [{"case_id": "A", "status": "passed"}])
+        assert store.complete(retry.id, "w2", [{"case_id": "A", "status": "passed"}])
+        assert store.suite_results(suite_id)[0]["status"] == "passed"
+
+    def test_status_requeues_expired_lease(self, store, clock):
+        """测试所有工作进程失联时，查询套件状态也会处理过期的租约"""
+        suite_id = submit_suite(store, _cases("A", "B"), batch_size=1)
+        store.lease("w1")
+        store.fail(store.lease("w2").id, "w2", "浏览器启动失败")
+        store.lease("w3")
+        clock.now += 31
+        status = store.suite_status(suite_id)
+        assert (status["leased"], status["queued"], status["failed"]) == (0, 1, 1)
+
+    def test_read_connections_closed(self, store):
+        """测试只读查询用完连接后关闭"""
+        opened = []
+        connect = store._connect
+        store._connect = lambda: opened.append(connect()) or opened[-1]
+        store.pending()
+        store.suite_results("missing")
+        assert len(opened) == 2
+        for conn in opened:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+    def test_max_attempts(self, store, clock):
+        """测试超过最大租用次数的批次标记为失败"""
+        suite_id = submit_suite(store, _cases("A", "B"), batch_size=2)
+        batch = store.lease("w1")
+        assert store.fail(batch.id, "w1", "浏览器启动失败")
+        store.lease("w2")
+        clock.now += 31
+        assert store.requeue_expired() == 1
+        assert store.pending() == 0
+
+        results = store.suite_results(suite_id)
+        assert [r["case_id"] for r in results] == ["A", "B"]
+        assert all(r["status"] == "failed" and "租约过期" in r["error_message"]
+                   for r in results)
+
+@pytest.mark.unit
+class TestDistributedWorker:
+    """测试分布式工作进程"""
+
+    def test_worker_over_coordinator(self, tmp_path):
+        """测试工作进程通过TCP协调端租用批次并回报结果"""
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"), lease_seconds=5)
+        with CoordinatorServer(store, "127.0.0.1", 0) as server:
+            remote = RemoteJobStore(server.address)
+            suite_id = submit_suite(remote, _cases("A", "B", "C"), batch_size=2)
+            executor = StubExecutor()
+            assert DistributedWorker(remote, executor, worker_id="w1").run(exit_when_idle=True) == 2
+            assert executor.batches == [["A", "B"], ["C"]]
+            assert executor.cleaned
+            results = wait_for_suite(remote, suite_id, poll_interval=0.01)
+            assert [r["case_id"] for r in results] == ["A", "B", "C"]
+
+    def test_coordinator_listens_locally_by_default(self, tmp_path):
+        """测试协调端默认只监听本机"""
+        server = CoordinatorServer(SQLiteJobStore(str(tmp_path / "jobs.db")), port=0)
+        try:
+            assert server.address.startswith("127.0.0.1:")
+        finally:
+            server.server.server_close()
+
+    def test_submit_cli_orders_by_history(self, tmp_path, monkeypatch):
+        """测试命令行提交时加载历史结果，耗时长的用例先被租用"""
+        monkeypatch.setenv("LOG_FILE", str(tmp_path / "automation.log"))
+        results_dir = tmp_path / "results"
+        results_dir.mkdir()
+        (results_dir / "test_suite_20240101_000000.json").write_text(json.dumps([
+            {"case_id": "A", "start_time": "2024-01-01T00:00:00",
+             "end_time": "2024-01-01T00:00:05"},
+            {"case_id": "C", "start_time": "2024-01-01T00:00:00",
+             "end_time": "2024-01-01T00:01:30"},
+        ]), encoding="utf-8")
+        cases_file = tmp_path / "cases.json"
+        cases_file.write_text(json.dumps(_cases("A", "B", "C")), encoding="utf-8")
+        path = str(tmp_path / "jobs.db")
+
+        assert main(["submit", "--store", path, "--cases", str(cases_file), "--batch-size", "1",
+                     "--results-dir", str(results_dir)]) == 0
+        assert SQLiteJobStore(path).lease("w1").cases[0]["id"] == "C"
+
+    def test_heartbeat_keeps_long_batch(self, tmp_path):
+        """测试执行时间超过租约时长的批次靠心跳保持租约"""
+        store = SQLiteJobStore(str(tmp_path / "jobs.db"), lease_seconds=0.3)
+        suite_id = submit_suite(store, _cases("A"), batch_size=1)
+        worker = DistributedWorker(store, StubExecutor(delay=0.8), worker_id="w1")
+        assert worker.run_once()
+        assert worker.completed == 1
+        assert store.suite_status(suite_id)["done"] == 1
+
+    def test_worker_processes_recover_dead_worker(self, tmp_path):
+        """测试工作进程共享SQLite文件，失联进程的批次被其他进程接手"""
+        path = str(tmp_path / "jobs.db")
+        store = SQLiteJobStore(path, lease_seconds=0.5)
+        suite_id = submit_suite(store, _cases(*[f"TEST_{i:03d}" for i in range(12)]), batch_size=2)
+
+        context = multiprocessing.get_context("fork")
+        dead = context.Process(target=_lease_and_die, args=(path, 0.5))
+        dead.start()
+        dead.join(10)
+        workers = [context.Process(target=_run_worker, args=(path, 0.5)) for _ in range(3)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(30)
+            assert process.exitcode == 0
+
+        results = wait_for_suite(store, suite_id, poll_interval=0.05, timeout=5)
+        assert [r["case_id"] for r in results] == [f"TEST_{i:03d}" for i in range(12)]
+        assert all(r["status"] == "passed" for r in results)
@@ -1,10 +1,17 @@
+import threading
+import time
 import pytest
 from datetime import datetime
 from selenium.common.exceptions import WebDriverException
+from src.core.automation.scheduler import CaseHistory
 from src.core.automation.test_executor import TestExecutor
+from src.core.test_case.case_manager import TestCaseManager
+from src.utils.driver.resources import ResourceBudget, SystemSnapshot, WorkerAutoscaler
+from src.utils.driver.webdriver_manager import WebDriverManager
 from src.utils.helpers import wait_for_condition
 
 @pytest.mark.unit
+@pytest.mark.usefixtures("fake_browser")
 class TestExecutorUnit:
     """测试执行器单元测试"""
     
@@ -59,6 +66,216 @@ class TestExecutorUnit:
         assert all("case_id" in result for result in results)
         assert all("status" in result for result in results)
 
+    def test_execute_test_suite_marks_cases(self, fake_browser, fake_site):
+        """测试套件在同一个浏览器会话中完成所有用例的标记"""
+        executor = TestExecutor()
+        test_cases = [
+            {"id": "TEST_001", "data": {"auto_type": "是"}},
+            {"id": "TEST_002", "data": {"auto_type": "是"}},
+            {"id": "INVALID_TEST", "data": {"auto_type": "是"}}
+        ]
+
+        results = executor.execute_test_suite(test_cases)
+
+        assert [r["status"] for r in results] == ["passed", "passed", "passed"]
+        assert fake_site.state.get_case("TEST_001")["auto_type"] == "是"
+        assert fake_site.state.get_case("TEST_002")["auto_type"] == "是"
+        assert fake_site.state.get_case("TEST_003")["auto_type"] == "否"
+        assert len(fake_browser) == 1
+        assert fake_browser[0].quit_called
+
+    def test_case_timeout_continues_suite(self, fake_browser, fake_site, monkeypatch):
+        """测试用例超时后记录卡住的步骤，重新登录后继续执行下一个"""
+        input_case_id = TestCaseManager._input_case_id
+
+        def hang_on_first_case(self, case_id):
+            while case_id == "TEST_001":
+                time.sleep(0.01)
+            input_case_id(self, case_id)
+
+        monkeypatch.setattr(TestCaseManager, "_input_case_id", hang_on_first_case)
+        executor = TestExecutor(case_timeout=1, case_timeout_grace=1)
+        results = executor.execute_test_suite([
+            {"id": "TEST_001", "data": {"auto_type": "是"}},
+            {"id": "TEST_002", "data": {"auto_type": "是"}}
+        ])
+
+        assert [r["status"] for r in results] == ["timeout", "passed"]
+        assert results[0]["stuck_step"].startswith("mark_auto_type (case_manager.py:")
+        assert "卡在步骤 mark_auto_type" in results[0]["error_message"]
+        assert fake_site.state.get_case("TEST_002")["auto_type"] == "是"
+        assert len(fake_browser) == 1
+
+    def test_unresponsive_session_is_recycled(self, fake_browser, fake_site, monkeypatch):
+        """测试浏览器无响应时强制中断并回收会话"""
+        blocked = threading.Event()
+        input_case_id = TestCaseManager._input_case_id
+
+        def block_on_first_case(self, case_id):
+            if case_id == "TEST_001":
+                blocked.wait()
+            input_case_id(self, case_id)
+
+        monkeypatch.setattr(TestCaseManager, "_input_case_id", block_on_first_case)
+        monkeypatch.setattr(WebDriverManager, "abort_driver", lambda manager: blocked.set())
+        executor = TestExecutor(case_timeout=1, case_timeout_grace=0.2)
+        results = executor.execute_test_suite([
+            {"id": "TEST_001", "data": {"auto_type": "是"}},
+            {"id": "TEST_002", "data": {"auto_type": "是"}}
+        ])
+
+        assert [r["status"] for r in results] == ["timeout", "passed"]
+        assert len(fake_browser) == 2
+        assert fake_browser[0].quit_called
+        assert fake_site.state.get_case("TEST_002")["auto_type"] == "是"
+
+    def test_mixed_actions_grouped_by_page(self, fake_browser, fake_site):
+        """测试混合操作的套件按页面上下文分组，每个上下文只切换一次"""
+        fake_site.state.members.append("tester")
+        executor = TestExecutor()
+        results = executor.execute_test_suite([
+            {"id": "TEST_001", "data": {"auto_type": "是"}},
+            {"id": "TEST_002", "actions": ["result"], "data": {"result": "PASS"}},
+            {"id": "TEST_003", "actions": "auto_type,result,executor",
+             "data": {"auto_type": "是", "result": "FAIL", "test_user": "tester"}},
+            {"id": "TEST_004", "actions": ["executor"], "data": {}}
+        ])
+
+        assert [r["status"] for r in results] == ["passed", "passed", "passed", "failed"]
+        assert "test_user" in results[3]["error_message"]
+        assert [s["context"] for s in results[2]["steps"]] == ["case_library", "test_plan"]
+        assert results[2]["actions"] == ["auto_type", "result", "executor"]
+        assert fake_site.state.get_case("TEST_001")["auto_type"] == "是"
+        assert fake_site.state.get_case("TEST_002")["status"] == "已通过"
+        case = fake_site.state.get_case("TEST_003")
+        marks = (case["auto_type"], case["status"], case["executor"])
+        assert marks == ("是", "未通过", "tester")
+        # 登录后进入用例库一次，切换到测试计划一次
+        assert sum(url.endswith("/testcase") for url in fake_browser[0].history) == 2
+
+    def test_parallel_suite_schedule(self, fake_browser, monkeypatch):
+        """测试多个工作线程按历史耗时执行套件，结果保持原顺序"""
+        durations = {"TEST_001": 0.3, "TEST_002": 0.2, "TEST_003": 0.1, "TEST_004": 0.1}
+        history = CaseHistory()
+        for case_id, seconds in durations.items():
+            history.record(case_id, seconds)
+
+        def execute_case(executor, case_manager, test_case, watch=None):
+            start_time = datetime.now()
+            time.sleep(durations[test_case["id"]])
+            return {
+                "case_id": test_case["id"],
+                "status": "passed",
+                "start_time": start_time.isoformat(),
+                "end_time": datetime.now().isoformat(),
+                "error_message": None
+            }
+
+        monkeypatch.setattr(TestExecutor, "_execute_suite_case", execute_case)
+        executor = TestExecutor(workers=2, history=history)
+        test_cases = [{"id": case_id, "data": {}}
+                      for case_id in ("TEST_004", "TEST_003", "TEST_002", "TEST_001")]
+        results = executor.execute_test_suite(test_cases)
+
+        assert [r["case_id"] for r in results] == ["TEST_004", "TEST_003", "TEST_002", "TEST_001"]
+        assert len(fake_browser) == 2
+        assert all(driver.quit_called for driver in fake_browser)
+        report = executor.schedule_report
+        assert report.workers == 2
+        assert report.predicted_makespan == pytest.approx(0.4)
+        assert report.actual_makespan < sum(durations.values())
+
+    def test_autoscaled_suite(self, fake_browser, monkeypatch):
+        """测试按可用内存启动一个会话，内存释放后增加会话并窃取用例"""
+        snapshot = SystemSnapshot(available_mb=500, cpu_count=4, load_avg=0)
+
+        def execute_case(executor, case_manager, test_case, watch=None):
+            start_time = datetime.now()
+            time.sleep(0.05)
+            snapshot.available_mb = 4000
+            return {
+                "case_id": test_case["id"],
+                "status": "passed",
+                "start_time": start_time.isoformat(),
+                "end_time": datetime.now().isoformat(),
+                "error_message": None
+            }
+
+        monkeypatch.setattr(TestExecutor, "_execute_suite_case", execute_case)
+        budget = ResourceBudget(max_workers=3, mb_per_browser=500, reserve_mb=0, cooldown=0)
+        autoscaler = WorkerAutoscaler(budget, sampler=lambda: snapshot)
+        executor = TestExecutor(autoscaler=autoscaler)
+        assert executor.workers == 3
+        test_cases = [{"id": f"TEST_{i:03d}", "data": {}} for i in range(8)]
+        results = executor.execute_test_suite(test_cases)
+
+        assert [r["case_id"] for r in results] == [case["id"] for case in test_cases]
+        assert all(r["status"] == "passed" for r in results)
+        assert autoscaler.events[0].workers == 1
+        assert [event.workers for event in autoscaler.events[1:3]] == [2, 3]
+        assert len(fake_browser) == 3
+        assert all(driver.quit_called for driver in fake_browser)
+
+    def test_scaled_down_slot_not_restarted_during_teardown(self, fake_browser, monkeypatch):
+        """测试退出的工作线程关闭会话之前，它的槽位不会被重新启动"""
+        events = []
+        quit_driver = WebDriverManager.quit_driver
+        init_driver = WebDriverManager.init_driver
+
+        def slow_quit(manager):
+            torn_down = {id(manager), id(manager.driver)}
+            events.append(("quit", torn_down))
+            time.sleep(0.3)
+            quit_driver(manager)
+            events.append(("quit_done", torn_down))
+
+        def tracked_init(manager):
+            events.append(("use", {id(manager)}))
+            return init_driver(manager)
+
+        def execute_case(executor, case_manager, test_case, watch=None):
+            events.append(("use", {id(case_manager.driver)}))
+            start_time = datetime.now()
+            time.sleep(0.05)
+            return {"case_id": test_case["id"], "status": "passed",
+                    "start_time": start_time.isoformat(),
+                    "end_time": datetime.now().isoformat(), "error_message": None}
+
+        class StubAutoscaler:
+            """第一次调整减少一个会话，之后总是要求增加"""
+            def __init__(self):
+                self.decisions = 0
+
+            def max_workers(self):
+                return 2
+
+            def initial_workers(self, limit=None):
+                return 2
+
+            def record(self, observed, expected):
+                pass
+
+            def decide(self, current, limit=None):
+                self.decisions += 1
+                return current - 1 if self.decisions == 1 else current + 1
+
+        monkeypatch.setattr(WebDriverManager, "quit_driver", slow_quit)
+        monkeypatch.setattr(WebDriverManager, "init_driver", tracked_init)
+        monkeypatch.setattr(TestExecutor, "_execute_suite_case", execute_case)
+        executor = TestExecutor(autoscaler=StubAutoscaler())
+        suite = [{"id": f"TEST_{i:03d}", "data": {}} for i in range(8)]
+        results = executor.execute_test_suite(suite)
+
+        assert all(r["status"] == "passed" for r in results)
+        tearing_down = set()
+        for event, ids in events:
+            if event == "quit":
+                tearing_down |= ids
+            elif event == "quit_done":
+                tearing_down -= ids
+            else:
+                assert not ids & tearing_down
+
 @pytest.mark.integration
 class TestExecutorIntegration:
     """测试执行器集成测试"""
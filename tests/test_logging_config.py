@@ -0,0 +1,97 @@
+import json
+import logging
+import pytest
+from src.utils import logging_config
+from src.utils.logging_config import (
+    setup_logging,
+    stop_logging,
+    case_context,
+    get_correlation_id,
+    get_log_stats,
+    log_stats
+)
+
+@pytest.mark.unit
+class TestLoggingConfig:
+    """异步日志配置测试"""
+
+    @pytest.fixture(autouse=True)
+    def log_file(self, tmp_path, monkeypatch):
+        """每个测试使用独立的日志文件"""
+        path = tmp_path / "automation.log"
+        monkeypatch.setenv("LOG_FILE", str(path))
+        monkeypatch.setenv("LOG_LEVEL", "INFO")
+        log_stats.reset()
+        yield path
+        stop_logging()
+
+    def test_queue_handler_installed(self, log_file):
+        """测试根日志记录器只挂载队列处理器"""
+        root = setup_logging()
+        assert logging_config._queue_handler in root.handlers
+
+        # 重复调用不会重复挂载
+        setup_logging()
+        queue_handlers = [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+
+    def test_json_lines_with_correlation_id(self, log_file):
+        """测试JSON行格式携带用例关联ID"""
+        setup_logging(log_format='json')
+        logger = logging.getLogger("test.json")
+
+        with case_context("TEST_001") as correlation_id:
+            assert get_correlation_id() == correlation_id
+            logger.info("标记自动化类型")
+        logger.info("套件结束")
+        stop_logging()
+
+        entries = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+        assert entries[0]['message'] == "标记自动化类型"
+        assert entries[0]['case_id'] == "TEST_001"
+        assert entries[0]['correlation_id'] == correlation_id
+        assert entries[1]['correlation_id'] == '-'
+
+    def test_json_exception_through_queue(self, log_file):
+        """测试经过日志队列的异常堆栈作为单独字段输出，不混入message"""
+        setup_logging(log_format='json')
+        logger = logging.getLogger("test.exception")
+        try:
+            raise ValueError("元素不存在")
+        except ValueError:
+            logger.exception("用例 %s 执行失败", "TEST_001")
+        stop_logging()
+
+        entry = json.loads(log_file.read_text(encoding='utf-8').strip())
+        assert entry['message'] == "用例 TEST_001 执行失败"
+        assert entry['exc_info'].startswith("Traceback")
+        assert "ValueError: 元素不存在" in entry['exc_info']
+
+    def test_text_exception_through_queue(self, log_file):
+        """测试文本格式仍在消息后输出异常堆栈"""
+        setup_logging()
+        try:
+            raise ValueError("元素不存在")
+        except ValueError:
+            logging.getLogger("test.exception").exception("执行失败")
+        stop_logging()
+
+        content = log_file.read_text(encoding='utf-8')
+        assert "执行失败\nTraceback" in content
+        assert content.count("ValueError: 元素不存在") == 1
+
+    def test_log_stats(self, log_file):
+        """测试日志量统计"""
+        setup_logging()
+        logger = logging.getLogger("test.stats")
+        for i in range(5):
+            logger.info("message %d", i)
+        logger.warning("warn")
+        stop_logging()
+
+        stats = get_log_stats()
+        assert stats['records'] == 6
+        assert stats['by_level']['INFO'] == 5
+        assert stats['by_level']['WARNING'] == 1
+        assert stats['bytes'] == log_file.stat().st_size
+        assert stats['dropped'] == 0
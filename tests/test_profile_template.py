@@ -0,0 +1,114 @@
+import os
+import pytest
+from src.utils.driver import webdriver_manager
+from src.utils.driver.profile_template import ProfileTemplate
+from src.utils.driver.webdriver_manager import (
+    WebDriverManager, WebDriverConfig, ChromeDriverServicePool
+)
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+CACHE_ENTRY = os.path.join("Default", "Cache", "Cache_Data", "f_000001")
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.unit
+@pytest.mark.webdriver
+class TestProfileTemplate:
+    """测试浏览器用户数据目录模板"""
+
+    @pytest.fixture
+    def template(self, tmp_path):
+        """提供一个包含缓存、Cookie和锁文件的模板"""
+        template_dir = tmp_path / "profile_template"
+        _write(str(template_dir / "Default" / "Cookies"), "session=1")
+        _write(str(template_dir / "Default" / "Cache" / "Cache_Data" / "f_000001"), "bundle.js")
+        _write(str(template_dir / "SingletonLock"), "")
+        _write(str(template_dir / "Crashpad" / "report"), "")
+        return ProfileTemplate(str(template_dir))
+
+    def test_clone_copies_profile(self, template):
+        """测试克隆保留登录状态和缓存，跳过锁文件"""
+        session_dir = template.clone()
+        try:
+            assert _read(os.path.join(session_dir, "Default", "Cookies")) == "session=1"
+            assert _read(os.path.join(session_dir, CACHE_ENTRY)) == "bundle.js"
+            assert not os.path.exists(os.path.join(session_dir, "SingletonLock"))
+            assert not os.path.exists(os.path.join(session_dir, "Crashpad"))
+        finally:
+            template.discard(session_dir)
+        assert not os.path.exists(session_dir)
+
+    def test_clone_is_isolated(self, template):
+        """测试会话修改用户数据不会影响模板"""
+        session_dir = template.clone()
+        cookies = os.path.join(session_dir, "Default", "Cookies")
+        with open(cookies, 'w', encoding='utf-8') as f:
+            f.write("session=2")
+        assert _read(os.path.join(template.template_dir, "Default", "Cookies")) == "session=1"
+        template.discard(session_dir)
+
+    def test_cache_not_shared_with_template(self, template):
+        """测试Chrome原地改写缓存文件不会污染模板"""
+        session_dir = template.clone()
+        entry = os.path.join(session_dir, CACHE_ENTRY)
+        with open(entry, 'r+', encoding='utf-8') as f:
+            f.write("corrupt")
+        assert _read(os.path.join(template.template_dir, CACHE_ENTRY)) == "bundle.js"
+        template.discard(session_dir)
+
+    def test_lock_shared_per_path(self, template):
+        """测试同一模板路径的各个实例共用一把锁"""
+        other = ProfileTemplate(template.template_dir)
+        assert other._lock is template._lock
+        assert ProfileTemplate(template.template_dir + "-other")._lock is not template._lock
+
+    def test_clone_without_template(self, tmp_path):
+        """测试模板不存在时返回空目录"""
+        template = ProfileTemplate(str(tmp_path / "missing"))
+        session_dir = template.clone()
+        assert os.listdir(session_dir) == []
+        template.discard(session_dir)
+
+    def test_refresh_from_session(self, template, tmp_path):
+        """测试用会话目录整体替换模板"""
+        session_dir = str(tmp_path / "session")
+        _write(os.path.join(session_dir, "Default", "Cookies"), "session=3")
+        assert template.refresh_from(session_dir)
+        assert _read(os.path.join(template.template_dir, "Default", "Cookies")) == "session=3"
+        assert not os.path.exists(os.path.join(template.template_dir, "Default", "Cache"))
+
+    def test_manager_seeds_template(self, tmp_path, monkeypatch):
+        """测试管理器为会话克隆目录，退出时建立模板并清理目录"""
+        created = []
+
+        class FakeChrome:
+            def __init__(self, service, options, keep_alive):
+                self.arguments = options.arguments
+                created.append(self)
+
+            def quit(self):
+                flag = [a for a in self.arguments if a.startswith("--user-data-dir=")][0]
+                user_data_dir = flag.split("=", 1)[1]
+                _write(os.path.join(user_data_dir, "Default", "Cookies"), "session=login")
+
+        monkeypatch.setattr(webdriver_manager.webdriver, "Chrome", FakeChrome)
+        monkeypatch.setattr(webdriver_manager, "service_pool", ChromeDriverServicePool())
+
+        config = WebDriverConfig(profile_template_dir=str(tmp_path / "golden"), reuse_service=False)
+        config.apply_profile = lambda driver: None
+        manager = WebDriverManager(config)
+        manager.init_driver()
+        session_dir = manager.user_data_dir
+        assert f"--user-data-dir={session_dir}" in created[0].arguments
+        assert not any(a.startswith("--user-data-dir=") for a in config.options.arguments)
+
+        manager.quit_driver()
+        assert manager.user_data_dir is None
+        assert not os.path.exists(session_dir)
+        assert _read(str(tmp_path / "golden" / "Default" / "Cookies")) == "session=login"
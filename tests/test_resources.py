@@ -0,0 +1,163 @@
+import os
+import signal
+import pytest
+from src.utils.driver.resources import (
+    ProcessRegistry, ResourceBudget, SystemSnapshot, WorkerAutoscaler, find_orphan_browsers,
+    read_system, reap_orphan_browsers
+)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _write_process(proc_root, pid, name, ppid, cmdline=""):
+    directory = proc_root / str(pid)
+    directory.mkdir()
+    (directory / "stat").write_text(f"{pid} ({name}) S {ppid} {pid} {pid} 0 -1")
+    (directory / "cmdline").write_bytes(cmdline.replace(" ", "\0").encode())
+
+@pytest.mark.unit
+class TestResourceBudget:
+    """测试按内存和CPU估算会话数"""
+
+    def test_fit_by_memory_and_cpu(self):
+        """测试会话数取内存和CPU允许的较小值"""
+        budget = ResourceBudget(mb_per_browser=500, reserve_mb=1000)
+        assert budget.fit(SystemSnapshot(available_mb=3600, cpu_count=8, load_avg=0)) == 5
+        assert budget.fit(SystemSnapshot(available_mb=64000, cpu_count=4, load_avg=0)) == 4
+        assert budget.fit(SystemSnapshot(available_mb=800, cpu_count=4, load_avg=0)) == 1
+        assert ResourceBudget(max_workers=2).fit(SystemSnapshot(None, 16, 0)) == 2
+
+    def test_read_system(self, tmp_path):
+        """测试从meminfo读取可用内存"""
+        (tmp_path / "meminfo").write_text(
+            "MemTotal:       16384000 kB\nMemAvailable:    2048000 kB\n")
+        snapshot = read_system(str(tmp_path))
+        assert snapshot.available_mb == 2000
+        assert snapshot.cpu_count == (os.cpu_count() or 1)
+        assert read_system(str(tmp_path / "missing")).available_mb is None
+
+@pytest.mark.unit
+class TestWorkerAutoscaler:
+    """测试并行会话数自动调整"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def _autoscaler(self, clock, snapshots):
+        budget = ResourceBudget(mb_per_browser=500, reserve_mb=1000, cooldown=10)
+        return WorkerAutoscaler(budget, sampler=lambda: snapshots[-1], window=3, clock=clock)
+
+    def test_scale_up_when_idle(self, clock):
+        """测试负载低且内存充足时增加会话，调整之间有冷却时间"""
+        snapshots = [SystemSnapshot(available_mb=4000, cpu_count=4, load_avg=0.5)]
+        autoscaler = self._autoscaler(clock, snapshots)
+        assert autoscaler.initial_workers() == 4
+        assert autoscaler.initial_workers(limit=2) == 2
+        assert autoscaler.decide(2) == 2
+        clock.now = 10
+        assert autoscaler.decide(2) == 3
+        assert autoscaler.decide(3) == 3
+        clock.now = 20
+        assert autoscaler.decide(3, limit=3) == 3
+
+    def test_scale_down_on_load_and_memory(self, clock):
+        """测试负载过高或内存不足时减少会话"""
+        snapshots = [SystemSnapshot(available_mb=4000, cpu_count=4, load_avg=8)]
+        autoscaler = self._autoscaler(clock, snapshots)
+        clock.now = 10
+        assert autoscaler.decide(3) == 2
+        snapshots.append(SystemSnapshot(available_mb=900, cpu_count=4, load_avg=0))
+        clock.now = 20
+        assert autoscaler.decide(2) == 1
+        clock.now = 30
+        assert autoscaler.decide(1) == 1
+        assert "低于保留值" in autoscaler.events[-1].reason
+
+    def test_scale_down_on_slowdown(self, clock):
+        """测试用例耗时比相对基准放大时减少会话"""
+        snapshots = [SystemSnapshot(available_mb=1600, cpu_count=4, load_avg=1)]
+        autoscaler = self._autoscaler(clock, snapshots)
+        for observed in (10, 11, 9):
+            autoscaler.record(observed, 10)
+        assert autoscaler.slowdown() == 1.0
+        for observed in (20, 25, 22):
+            autoscaler.record(observed, 10)
+        assert autoscaler.slowdown() == pytest.approx(2.2)
+        clock.now = 10
+        assert autoscaler.decide(3) == 2
+        assert autoscaler.slowdown() is None
+
+@pytest.mark.unit
+class TestOrphanBrowsers:
+    """测试清理遗留的浏览器进程"""
+
+    @pytest.fixture
+    def proc_root(self, tmp_path):
+        proc_root = tmp_path / "proc"
+        proc_root.mkdir()
+        # 容器中以1号进程运行的本进程：
+        # python -> chromedriver -> chrome -> 渲染进程
+        _write_process(proc_root, 1, "python", 0)
+        _write_process(proc_root, 101, "chromedriver", 1, "chromedriver --port=9515")
+        _write_process(proc_root, 102, "chrome", 101,
+                       "chrome --test-type=webdriver --remote-debugging-port=0")
+        _write_process(proc_root, 103, "chrome", 102, "chrome --type=renderer")
+        # 已退出的Python进程（900）启动的chromedriver和Chrome
+        _write_process(proc_root, 201, "chromedriver", 1, "chromedriver --port=9516")
+        _write_process(proc_root, 202, "chrome", 201, "chrome --test-type=webdriver")
+        # chromedriver（301）被中止后留下的Chrome
+        _write_process(proc_root, 302, "chrome", 1, "chrome --remote-debugging-port=0")
+        # 用户或其他工具打开的浏览器
+        _write_process(proc_root, 402, "chrome", 1, "chrome --remote-debugging-port=9222")
+        _write_process(proc_root, 403, "chromedriver", 1, "chromedriver --port=9999")
+        # 另一个仍在运行的Python进程的会话
+        _write_process(proc_root, 600, "python", 1)
+        _write_process(proc_root, 601, "chromedriver", 600, "chromedriver --port=9517")
+        return proc_root
+
+    @pytest.fixture
+    def registry(self, proc_root, tmp_path):
+        directory = str(tmp_path / "pids")
+        registry = ProcessRegistry(directory, str(proc_root), owner=1)
+        registry.track(101)
+        registry.track(102, parent=101)
+        registry.track(302, parent=301)
+        dead_owner = ProcessRegistry(directory, str(proc_root), owner=900)
+        dead_owner.track(201)
+        dead_owner.track(202, parent=201)
+        ProcessRegistry(directory, str(proc_root), owner=600).track(601)
+        return registry
+
+    def test_find_orphans(self, registry, proc_root):
+        """测试只识别本工具记录过且父进程已退出的进程
+
+        1号进程的会话和未记录的浏览器不受影响。
+        """
+        assert find_orphan_browsers(registry=registry) == [201, 202, 302]
+        assert find_orphan_browsers(exclude=[302], registry=registry) == [201, 202]
+        other = ProcessRegistry(registry.directory, str(proc_root / "missing"), owner=1)
+        assert other.orphans() == []
+
+    def test_reap_orphans(self, registry, proc_root):
+        """测试结束孤儿进程，已退出的进程被忽略，记录文件随后被清理"""
+        killed = []
+
+        def kill(pid, sig):
+            if pid == 202:
+                raise ProcessLookupError(pid)
+            killed.append((pid, sig))
+
+        assert reap_orphan_browsers(kill=kill, registry=registry) == [201, 302]
+        assert killed == [(201, signal.SIGKILL), (302, signal.SIGKILL)]
+
+        for pid in (201, 202, 302):
+            for path in (proc_root / str(pid)).iterdir():
+                path.unlink()
+            (proc_root / str(pid)).rmdir()
+        assert registry.orphans() == []
+        assert sorted(os.listdir(registry.directory)) == ["1.json", "600.json"]
@@ -0,0 +1,134 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from src.core.automation.scheduler import CaseHistory, WorkStealingQueue, result_duration
+
+def _result(case_id, seconds, status="passed"):
+    start = datetime(2024, 1, 1, 10, 0, 0)
+    return {
+        "case_id": case_id,
+        "status": status,
+        "start_time": start.isoformat(),
+        "end_time": (start + timedelta(seconds=seconds)).isoformat(),
+        "error_message": None
+    }
+
+def _cases(*case_ids):
+    return [{"id": case_id, "data": {"auto_type": "是"}} for case_id in case_ids]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.mark.unit
+class TestCaseHistory:
+    """测试用例历史耗时"""
+
+    def test_result_duration(self):
+        """测试从结果的起止时间计算耗时"""
+        assert result_duration(_result("TEST_001", 12.5)) == 12.5
+        assert result_duration({"case_id": "TEST_001"}) is None
+
+    def test_expected_uses_median(self):
+        """测试预估耗时取最近几次的中位数"""
+        history = CaseHistory(window=3)
+        history.add_results([_result("TEST_001", s) for s in (100, 10, 12, 14)])
+        assert history.expected("TEST_001") == (12, True)
+
+    def test_unknown_case_fallback(self):
+        """测试无历史的用例使用已知用例的中位数或默认值"""
+        history = CaseHistory(default_duration=45)
+        assert history.expected("TEST_404") == (45, False)
+        history.add_results([_result("TEST_001", 10), _result("TEST_002", 20),
+                             _result("TEST_003", 90)])
+        assert history.expected("TEST_404") == (20, False)
+
+    def test_from_result_dir(self, tmp_path):
+        """测试从保存的套件结果加载历史耗时"""
+        with open(tmp_path / "test_suite_20240101_100000.json", "w", encoding="utf-8") as f:
+            json.dump([_result("TEST_001", 30), _result("TEST_002", 5)], f)
+        (tmp_path / "test_suite_20240102_100000.json").write_text("{broken", encoding="utf-8")
+
+        history = CaseHistory.from_result_dir(str(tmp_path))
+        assert len(history) == 2
+        assert history.expected("TEST_001") == (30, True)
+        assert len(CaseHistory.from_result_dir(str(tmp_path / "missing"))) == 0
+
+@pytest.mark.unit
+class TestSuitePlan:
+    """测试最长预计时间优先调度"""
+
+    @pytest.fixture
+    def history(self):
+        history = CaseHistory()
+        durations = [("A", 10), ("B", 8), ("C", 6), ("D", 5), ("E", 4)]
+        history.add_results([_result(c, s) for c, s in durations])
+        return history
+
+    def test_longest_first(self, history):
+        """测试用例按预计耗时从长到短分给负载最小的线程"""
+        plan = history.plan(_cases("E", "D", "C", "B", "A"), 2)
+        assignments = [[item.case_id for item in items] for items in plan.assignments]
+        assert assignments == [["A", "D"], ["B", "C", "E"]]
+        assert plan.loads == [15, 18]
+        assert plan.predicted_makespan == 18
+
+    def test_single_worker_keeps_order(self, history):
+        """测试单线程时保持用例原顺序"""
+        plan = history.plan(_cases("E", "A", "C"), 1)
+        assert [item.case_id for item in plan.assignments[0]] == ["E", "A", "C"]
+        assert plan.predicted_makespan == 20
+
+    def test_work_stealing(self, history):
+        """测试空闲线程从剩余工作量最多的线程窃取用例"""
+        clock = FakeClock()
+        queue = WorkStealingQueue(history.plan(_cases("A", "B", "C", "D", "E"), 2), clock)
+
+        a = queue.take(0)
+        b = queue.take(1)
+        clock.now = 8
+        queue.finish(1, b, _result("B", 8))
+        c = queue.take(1)
+        clock.now = 14
+        queue.finish(1, c, _result("C", 6))
+        e = queue.take(1)
+        clock.now = 18
+        queue.finish(1, e, _result("E", 4))
+        # 线程0仍卡在A上，线程1窃取D
+        d = queue.take(1)
+        assert (a.case_id, d.case_id) == ("A", "D")
+        assert queue.take(1) is None
+        clock.now = 23
+        queue.finish(1, d, _result("D", 5))
+        clock.now = 40
+        queue.finish(0, a, _result("A", 40))
+
+        assert [r["case_id"] for r in queue.results()] == ["A", "B", "C", "D", "E"]
+        report = queue.report()
+        assert report.steals == 1
+        assert report.predicted_makespan == 18
+        assert report.actual_makespan == 40
+        assert report.actual_loads == [40, 23]
+        assert "实际 40.0s" in report.describe()
+
+    def test_phases_run_in_order(self, history):
+        """测试前一阶段的用例分发完之前不开始下一阶段"""
+        history.record("A@test_plan", 20)
+        steps = [dict(case, phase=0) for case in _cases("B", "C", "D")]
+        steps.append({"id": "A", "context": "test_plan", "phase": 1})
+        plan = history.plan(steps, 2)
+        assignments = [[item.case_id for item in items] for items in plan.assignments]
+        assert assignments == [["B", "A"], ["C", "D"]]
+        queue = WorkStealingQueue(plan, FakeClock())
+
+        assert queue.take(0).case_id == "B"
+        # 线程0的队首是第二阶段的A，先窃取第一阶段剩余的C
+        assert queue.take(0).case_id == "C"
+        assert queue.steals == 1
+        assert queue.take(1).case_id == "D"
+        item = queue.take(0)
+        assert (item.case_id, item.expected, item.known) == ("A", 20, True)
+        assert queue.take(1) is None
@@ -0,0 +1,58 @@
+import threading
+import time
+import pytest
+from src.core.automation.watchdog import CaseTimeoutError, CaseWatch, CaseWatchdog
+
+def _busy_loop():
+    while True:
+        time.sleep(0.01)
+
+def _swallowing_loop():
+    swallowed = 0
+    while swallowed < 3:
+        try:
+            _busy_loop()
+        except:
+            swallowed += 1
+    _busy_loop()
+
+@pytest.mark.unit
+class TestCaseWatchdog:
+    """测试用例执行看门狗"""
+
+    def test_no_timeout(self):
+        """测试用例在预算内完成时不受影响"""
+        with CaseWatchdog(0.2, grace=0.2).watch("TEST_001") as watch:
+            pass
+        time.sleep(0.3)
+        assert not watch.expired
+        assert watch.elapsed < 0.2
+
+    def test_timeout_reports_step(self):
+        """测试超时后中止用例并记录卡住的步骤"""
+        start = time.monotonic()
+        with pytest.raises(CaseTimeoutError):
+            with CaseWatchdog(0.2, grace=1).watch("TEST_001") as watch:
+                _busy_loop()
+        assert time.monotonic() - start < 1
+        assert watch.expired
+        assert not watch.unresponsive
+        assert watch.step.startswith("_busy_loop (test_watchdog.py:")
+
+    def test_timeout_survives_bare_except(self):
+        """测试裸except吞掉超时异常后会再次抛出"""
+        with pytest.raises(CaseTimeoutError):
+            with CaseWatch("TEST_001", 0.1, grace=2, poll_interval=0.05) as watch:
+                _swallowing_loop()
+        assert watch.expired
+        assert not watch.unresponsive
+
+    def test_unresponsive_session_is_aborted(self):
+        """测试阻塞调用无法中止时调用 on_unresponsive"""
+        blocked = threading.Event()
+        with pytest.raises(CaseTimeoutError):
+            with CaseWatch("TEST_001", 0.1, grace=0.1, on_unresponsive=blocked.set,
+                           poll_interval=0.05) as watch:
+                blocked.wait()
+        assert watch.expired
+        assert watch.unresponsive
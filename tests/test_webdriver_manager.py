@@ -1,6 +1,16 @@
 import pytest
 from selenium import webdriver
-from src.utils.driver.webdriver_manager import WebDriverManager, WebDriverConfig
+from selenium.webdriver.common.service import Service
+from src.utils.driver import webdriver_manager
+from src.utils.driver.resources import ProcessRegistry, find_browser_pid
+from src.utils.driver.browser_health import BrowserHealthMonitor, BrowserMetrics, HealthThresholds
+from src.utils.driver.webdriver_manager import (
+    WebDriverManager,
+    WebDriverConfig,
+    ChromeDriverServicePool,
+    SharedChromeService,
+    get_startup_stats
+)
 
 @pytest.mark.unit
 @pytest.mark.webdriver
@@ -37,6 +47,286 @@ class TestWebDriverConfig:
         assert "excludeSwitches" in experimental
         assert "useAutomationExtension" in experimental
         assert experimental["useAutomationExtension"] is False
+        
+    def test_default_profile_not_headless(self, monkeypatch):
+        """测试默认配置档不启用无头模式"""
+        monkeypatch.delenv("HEADLESS_MODE", raising=False)
+        monkeypatch.delenv("BROWSER_PROFILE", raising=False)
+        config = WebDriverConfig()
+        assert config.profile == "default"
+        assert config.headless is False
+        assert "--headless=new" not in config.options.arguments
+        assert config.blocked_urls == []
+        
+    def test_headless_mode_from_env(self, monkeypatch):
+        """测试从环境变量读取无头模式"""
+        monkeypatch.setenv("HEADLESS_MODE", "true")
+        monkeypatch.setenv("WINDOW_SIZE", "1280,800")
+        config = WebDriverConfig()
+        assert config.headless is True
+        assert "--headless=new" in config.options.arguments
+        assert "--window-size=1280,800" in config.options.arguments
+        
+    def test_performance_profile(self, monkeypatch):
+        """测试性能配置档"""
+        monkeypatch.delenv("PAGE_LOAD_STRATEGY", raising=False)
+        config = WebDriverConfig(profile="performance", headless=False)
+        arguments = config.options.arguments
+        assert config.headless is True
+        assert "--headless=new" in arguments
+        assert "--disable-extensions" in arguments
+        assert "--blink-settings=imagesEnabled=false" in arguments
+        assert config.options.page_load_strategy == "eager"
+        assert "*.woff2" in config.blocked_urls
+        
+    def test_page_load_strategy(self):
+        """测试页面加载策略选择"""
+        config = WebDriverConfig(page_load_strategy="none")
+        assert config.options.page_load_strategy == "none"
+        with pytest.raises(ValueError):
+            WebDriverConfig(page_load_strategy="fast")
+        with pytest.raises(ValueError):
+            WebDriverConfig(profile="turbo")
+            
+    def test_apply_performance_profile(self):
+        """测试通过DevTools应用屏蔽规则和关闭动画"""
+        class FakeDriver:
+            def __init__(self):
+                self.commands = []
+                self.maximized = False
+                
+            def execute_cdp_cmd(self, cmd, params):
+                self.commands.append((cmd, params))
+                
+            def maximize_window(self):
+                self.maximized = True
+                
+        driver = FakeDriver()
+        config = WebDriverConfig(profile="performance")
+        config.apply_profile(driver)
+        
+        commands = dict(driver.commands)
+        assert commands["Network.setBlockedURLs"]["urls"] == config.blocked_urls
+        assert "animation: none" in commands["Page.addScriptToEvaluateOnNewDocument"]["source"]
+        assert driver.maximized is False
+
+@pytest.mark.unit
+@pytest.mark.webdriver
+class TestSharedDriverService:
+    """测试chromedriver服务复用"""
+    
+    @pytest.fixture(autouse=True)
+    def fake_service_process(self, monkeypatch):
+        """用假进程代替真实的chromedriver进程"""
+        class FakeProcess:
+            def __init__(self):
+                self.returncode = None
+                
+            def poll(self):
+                return self.returncode
+                
+        def fake_start(service):
+            service.process = FakeProcess()
+            
+        def fake_stop(service):
+            service.process.returncode = 0
+            
+        monkeypatch.setattr(Service, "start", fake_start)
+        monkeypatch.setattr(Service, "stop", fake_stop)
+        
+    def test_shared_service_starts_once(self):
+        """测试共享服务只启动一次，会话结束不关闭进程"""
+        service = SharedChromeService()
+        service.start()
+        service.start()
+        service.stop()
+        assert service.is_running()
+        assert service.process_starts == 1
+        
+        service.shutdown()
+        assert not service.is_running()
+        
+    def test_shared_service_restarts_dead_process(self):
+        """测试服务进程退出后自动重启"""
+        service = SharedChromeService()
+        service.start()
+        service.process.returncode = 1
+        service.start()
+        assert service.is_running()
+        assert service.process_starts == 2
+        
+    def test_pool_round_robin(self):
+        """测试服务池轮询分配"""
+        pool = ChromeDriverServicePool()
+        config = WebDriverConfig(service_pool_size=2)
+        services = [pool.acquire(config) for _ in range(4)]
+        assert services[0] is services[2]
+        assert services[1] is services[3]
+        assert services[0] is not services[1]
+        
+        for service in services:
+            service.start()
+        assert pool.process_starts() == 2
+        pool.shutdown()
+        assert not services[0].is_running()
+        
+    def test_sessions_reuse_service(self, monkeypatch):
+        """测试多个会话挂到同一个chromedriver服务上"""
+        created = []
+        
+        class FakeChrome:
+            def __init__(self, service, options, keep_alive):
+                service.start()
+                self.service = service
+                self.keep_alive = keep_alive
+                created.append(self)
+                
+            def quit(self):
+                self.service.stop()
+                
+        monkeypatch.setattr(webdriver_manager.webdriver, "Chrome", FakeChrome)
+        monkeypatch.setattr(webdriver_manager, "service_pool", ChromeDriverServicePool())
+        webdriver_manager.startup_stats.reset()
+        
+        config = WebDriverConfig(profile="performance", reuse_service=True)
+        config.apply_profile = lambda driver: None
+        for _ in range(3):
+            manager = WebDriverManager(config)
+            manager.init_driver()
+            assert manager.startup_seconds is not None
+            manager.quit_driver()
+            
+        assert created[0].service is created[2].service
+        assert all(driver.keep_alive for driver in created)
+        stats = get_startup_stats()
+        assert stats['sessions'] == 3
+        assert stats['cold_starts'] == 1
+        assert stats['warm_starts'] == 2
+        assert stats['driver_process_starts'] == 1
+
+    def test_abort_only_hung_session(self, monkeypatch, tmp_path):
+        """测试两个会话共用一个服务时，中断无响应会话只结束它的Chrome"""
+        for pid, user_data_dir in ((501, "/tmp/session-a"), (502, "/tmp/session-b")):
+            directory = tmp_path / str(pid)
+            directory.mkdir()
+            (directory / "stat").write_text(f"{pid} (chrome) S 500 {pid} {pid} 0 -1")
+            (directory / "cmdline").write_bytes(
+                f"chrome\0--test-type=webdriver\0--user-data-dir={user_data_dir}".encode())
+        user_data_dirs = iter(["/tmp/session-a", "/tmp/session-b"])
+        
+        class FakeChrome:
+            def __init__(self, service, options, keep_alive):
+                service.start()
+                self.service = service
+                self.capabilities = {"chrome": {"userDataDir": next(user_data_dirs)}}
+                
+        killed = []
+        monkeypatch.setattr(webdriver_manager.webdriver, "Chrome", FakeChrome)
+        monkeypatch.setattr(webdriver_manager, "service_pool", ChromeDriverServicePool())
+        monkeypatch.setattr(webdriver_manager, "find_browser_pid",
+                            lambda capabilities: find_browser_pid(capabilities, str(tmp_path)))
+        monkeypatch.setattr(webdriver_manager.os, "kill", lambda pid, sig: killed.append(pid))
+        monkeypatch.setattr(webdriver_manager, "process_registry",
+                            ProcessRegistry(str(tmp_path / "pids"), str(tmp_path)))
+        
+        config = WebDriverConfig(reuse_service=True, service_pool_size=1)
+        config.apply_profile = lambda driver: None
+        hung, healthy = WebDriverManager(config), WebDriverManager(config)
+        hung.init_driver()
+        healthy.init_driver()
+        assert hung.driver.service is healthy.driver.service
+        
+        hung.abort_driver()
+        assert killed == [501]
+        assert healthy.driver.service.is_running()
+        assert healthy.browser_pid == 502
+
+@pytest.mark.unit
+@pytest.mark.webdriver
+class TestBrowserHealth:
+    """测试浏览器健康监控和会话回收"""
+    
+    def _metrics(self, heap_mb=10, nodes=1000, layouts=10):
+        return {'metrics': [
+            {'name': 'JSHeapUsedSize', 'value': heap_mb * 1024 * 1024},
+            {'name': 'Nodes', 'value': nodes},
+            {'name': 'LayoutCount', 'value': layouts}
+        ]}
+        
+    def test_thresholds_from_env(self, monkeypatch):
+        """测试从环境变量读取阈值"""
+        monkeypatch.setenv("BROWSER_MAX_HEAP_MB", "256")
+        monkeypatch.setenv("BROWSER_MAX_CASES", "0")
+        thresholds = WebDriverConfig().health_thresholds
+        assert thresholds.max_js_heap_mb == 256
+        assert thresholds.max_cases == 0
+        
+    def test_check_thresholds(self):
+        """测试指标超过阈值时给出回收原因"""
+        thresholds = HealthThresholds(max_js_heap_mb=100, max_nodes=5000, max_layout_count=50)
+        monitor = BrowserHealthMonitor(thresholds)
+        assert monitor.check(BrowserMetrics.from_cdp(self._metrics())) is None
+        assert "JS堆" in monitor.check(BrowserMetrics.from_cdp(self._metrics(heap_mb=150)))
+        assert "DOM节点" in monitor.check(BrowserMetrics.from_cdp(self._metrics(nodes=6000)))
+        assert "布局" in monitor.check(BrowserMetrics.from_cdp(self._metrics(layouts=80)))
+        
+    def test_sampling_interval(self):
+        """测试按间隔采样并只启用一次Performance域"""
+        now = [0.0]
+        
+        class FakeDriver:
+            def __init__(self):
+                self.commands = []
+                
+            def execute_cdp_cmd(self, cmd, args):
+                self.commands.append(cmd)
+                return self._metrics() if cmd == 'Performance.getMetrics' else {}
+                
+        driver = FakeDriver()
+        driver._metrics = self._metrics
+        monitor = BrowserHealthMonitor(HealthThresholds(check_interval=10, max_cases=0),
+                                       clock=lambda: now[0])
+        for _ in range(3):
+            assert monitor.record_case(driver) is None
+        now[0] = 11
+        monitor.record_case(driver)
+        assert driver.commands == [
+            'Performance.enable', 'Performance.getMetrics', 'Performance.getMetrics'
+        ]
+        assert monitor.cases == 4
+        
+    def test_max_cases_without_devtools(self):
+        """测试驱动不支持DevTools时仍按用例数回收"""
+        monitor = BrowserHealthMonitor(HealthThresholds(max_cases=2, check_interval=0))
+        driver = object()
+        assert monitor.record_case(driver) is None
+        assert "上限" in monitor.record_case(driver)
+        
+    def test_recycle_restores_login(self, fake_browser, fake_site, monkeypatch, caplog):
+        """测试套件执行中回收会话后重新登录并继续执行"""
+        from src.core.automation.test_executor import TestExecutor
+        from src.core.test_case.case_manager import TestCaseManager
+        
+        monkeypatch.setenv("BROWSER_MAX_HEAP_MB", "9")
+        monkeypatch.setenv("BROWSER_HEALTH_INTERVAL", "0")
+        logins = []
+        perform_login = TestCaseManager._perform_login
+        monkeypatch.setattr(TestCaseManager, "_perform_login",
+                            lambda self: (logins.append(self.driver), perform_login(self)))
+        
+        test_cases = [{"id": f"TEST_00{i}", "data": {"auto_type": "是"}} for i in range(1, 4)]
+        with caplog.at_level("WARNING", logger=webdriver_manager.__name__):
+            results = TestExecutor().execute_test_suite(test_cases)
+            
+        assert [r["status"] for r in results] == ["passed"] * 3
+        assert all(fake_site.state.get_case(c["id"])["auto_type"] == "是" for c in test_cases)
+        # 每个用例后JS堆都超过9MB，前两个用例后各回收一次，
+        # 最后一个用例后不再回收
+        assert len(fake_browser) == 3
+        assert logins == fake_browser
+        assert all(driver.quit_called for driver in fake_browser)
+        assert "Recycling browser session" in caplog.text
+        assert "JS堆" in caplog.text
 
 @pytest.mark.integration
 @pytest.mark.webdriver
@@ -0,0 +1,150 @@
+import json
+import time
+import urllib.request
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from tools.yunxiao_mock import MockConfig, MockYunxiaoServer, dom
+from tools.yunxiao_mock.benchmark import percentile, StepTimer, summarize
+from tools.yunxiao_mock.fake_driver import FakeWebDriver, FakeYunxiaoSite, VirtualClock
+from tools.yunxiao_mock.server import SESSION_COOKIE
+
+@pytest.mark.unit
+class TestYunxiaoMock:
+    """Mock云效服务测试"""
+
+    @pytest.fixture
+    def server(self):
+        """提供无延迟的Mock服务"""
+        with MockYunxiaoServer(MockConfig(latency=0, jitter=0, case_count=3)) as server:
+            yield server
+
+    def _get(self, url, headers=None):
+        request = urllib.request.Request(url, headers=headers or {})
+        with urllib.request.urlopen(request) as resp:
+            return resp.read().decode('utf-8'), resp.headers
+
+    def test_login_sets_session(self, server):
+        """测试登录后可以访问用例库页面"""
+        data = 'fm-login-id=tester&fm-login-password=x'.encode('utf-8')
+        with urllib.request.urlopen(server.url + '/login/frame', data=data) as resp:
+            body = resp.read().decode('utf-8')
+            cookie = resp.headers['Set-Cookie'].split(';')[0]
+        assert 'user-info' in body
+
+        page, _ = self._get(server.url + '/testcase', {'Cookie': cookie})
+        assert '测试用例编号' in page
+        assert 'TEST_003' in page
+
+    def test_case_api(self, server):
+        """测试用例查询和更新接口"""
+        cases = json.loads(self._get(server.url + '/api/cases?id=TEST_002')[0])
+        assert [c['id'] for c in cases] == ['TEST_002']
+
+        request = urllib.request.Request(
+            server.url + '/api/cases/TEST_002',
+            data=json.dumps({'status': '已通过'}).encode('utf-8'),
+            method='POST'
+        )
+        with urllib.request.urlopen(request) as resp:
+            assert json.loads(resp.read())['status'] == '已通过'
+        assert server.state.get_case('TEST_002')['status'] == '已通过'
+
+    def test_static_bundle_cacheable(self, server):
+        """测试前端脚本可被浏览器缓存"""
+        _, headers = self._get(server.url + '/static/app.js')
+        assert 'max-age' in headers['Cache-Control']
+
+    def test_latency_injection(self):
+        """测试服务端延迟注入"""
+        with MockYunxiaoServer(MockConfig(latency=0.1, jitter=0.02, seed=1)) as server:
+            start = time.perf_counter()
+            self._get(server.url + '/api/members?q=')
+            assert time.perf_counter() - start >= 0.08
+
+@pytest.mark.unit
+class TestBenchmarkStats:
+    """基准测试统计测试"""
+
+    def test_percentile(self):
+        """测试百分位计算"""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 95.0
+        assert percentile([], 50) == 0.0
+
+    def test_step_timer(self):
+        """测试步骤计时"""
+        class Manager:
+            def step(self):
+                return 'done'
+
+        manager = Manager()
+        timer = StepTimer()
+        timer.instrument(manager, ['step', 'missing'])
+        assert manager.step() == 'done'
+        stats = summarize(timer.samples)
+        assert stats['step']['count'] == 1
+        assert 'missing' not in stats
+
+@pytest.mark.unit
+class TestFakeWebDriver:
+    """内存版WebDriver和DOM模型测试"""
+
+    def test_xpath_subset(self):
+        """测试用例管理器使用的XPath写法"""
+        document = dom.parse_html(
+            '<html><body><div id="a"><span>测试用例编号</span><p><input name="x"></p></div>'
+            '<div><button class="btn filter"><span>过滤</span></button></div></body></html>'
+        )
+        buttons = dom.xpath_select(document, '//*[text()="过滤"]/./..')
+        assert [n.tag for n in buttons] == ['button']
+        inputs = dom.xpath_select(document, '//*[contains(text(), "测试用例编号")]/..//input')
+        assert inputs[0].attrs['name'] == 'x'
+        assert dom.xpath_select(document, '/html/body/div[2]/button')[0].has_class('filter')
+        assert len(dom.xpath_select(document, '//span | //*[contains(@class, "filter")]')) == 3
+        assert dom.css_select(document, "div#a p > input[name^='x'], .missing")[0].tag == 'input'
+        with pytest.raises(dom.DomError):
+            dom.xpath_select(document, '//div[')
+
+    def test_virtual_clock(self):
+        """测试虚拟时钟按时间顺序执行回调"""
+        clock = VirtualClock()
+        fired = []
+        clock.call_later(2, lambda: fired.append(clock.monotonic()))
+        clock.call_later(1, lambda: fired.append(clock.monotonic()))
+        clock.sleep(1.5)
+        assert fired == [1]
+        clock.sleep(10)
+        assert fired == [1, 2]
+        assert clock.monotonic() == 11.5
+
+    def test_testcase_requires_login(self):
+        """测试未登录访问用例库会被重定向到首页"""
+        driver = FakeWebDriver()
+        driver.get('/testcase')
+        assert driver.current_url.endswith('/')
+        assert driver.find_elements(By.XPATH, "//a[contains(text(), '登录')]")
+
+    def test_implicit_wait_follows_async_updates(self):
+        """测试隐式等待推进虚拟时钟直到异步渲染完成"""
+        clock = VirtualClock()
+        site = FakeYunxiaoSite(MockConfig(latency=0.5, jitter=0, case_count=3))
+        driver = FakeWebDriver(site, clock)
+        token = site.state.login('tester')
+        driver.add_cookie({'name': SESSION_COOKIE, 'value': token})
+        driver.get('/testcase')
+
+        driver.find_element(By.CLASS_NAME, 'filter-button').click()
+        xpath = '//*[text()="测试用例编号"]/./../../span/input'
+        search = driver.find_element(By.XPATH, xpath)
+        search.send_keys('TEST_002')
+        search.send_keys(Keys.CONTROL, 'a')
+        search.send_keys(Keys.DELETE)
+        search.send_keys('TEST_999')
+        driver.find_element(By.CLASS_NAME, 'filter-submit').click()
+
+        driver.implicitly_wait(5)
+        start = clock.monotonic()
+        assert driver.find_element(By.XPATH, '//*[text()="暂无内容"]').text == '暂无内容'
+        assert clock.monotonic() - start == pytest.approx(0.5)
@@ -12,7 +12,7 @@
 使用示例:
     >>> from code_quality_checker import CodeQualityChecker
     >>> checker = CodeQualityChecker("path/to/project")
-    >>> report = checker.generate_report(changed_only=True)
+    >>> report = checker.generate_report(base="origin/main")
     >>> print(report)
 """
 
@@ -4,7 +4,10 @@ import argparse
 import logging
 import sys
 from pathlib import Path
+from .cache import DEFAULT_CACHE_NAME
 from .checker import CodeQualityChecker
+from .report import create_report_writer
+from .watch import WatchSession, create_watcher
 
 def setup_logging(verbose: bool = False):
     """配置日志系统
@@ -23,23 +26,66 @@ def main():
     parser.add_argument("path", help="要检查的项目路径")
     parser.add_argument("--changed-only", action="store_true", help="只检查变更的文件")
     parser.add_argument("--days", type=int, default=7, help="检查最近几天的变更（默认7天）")
+    parser.add_argument("--base", help="只检查相对该Git引用（如 origin/main）"
+                                       "变更的文件，包含未提交的修改")
     parser.add_argument("--report", help="输出报告的文件路径")
+    parser.add_argument("--format", choices=["text", "json", "ndjson", "html"], default="text",
+                        help="报告格式（默认text；ndjson每个文件一行，"
+                             "适合CI实时读取）")
+    parser.add_argument("--config", help="配置文件路径")
     parser.add_argument("--exclude", nargs="+", help="要排除的文件/目录模式")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="并行分析的进程数（默认1，0表示使用全部CPU）")
+    parser.add_argument("--cache",
+                        help=f"增量分析缓存文件路径"
+                             f"（默认为项目下的 {DEFAULT_CACHE_NAME}）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用增量分析缓存")
+    parser.add_argument("--baseline", help="问题基线文件，只报告基线之外的新问题")
+    parser.add_argument("--write-baseline", metavar="PATH",
+                        help="把当前全部问题保存为基线文件后退出")
+    parser.add_argument("--watch", action="store_true",
+                        help="常驻监视项目，文件变化后只重新分析变化的文件")
+    parser.add_argument("--poll-interval", type=float, default=1.0,
+                        help="监视模式下的等待/轮询间隔（秒）")
+    parser.add_argument("--polling", action="store_true",
+                        help="监视模式下强制使用轮询而不是inotify")
     parser.add_argument("-v", "--verbose", action="store_true", help="输出详细日志")
     
     args = parser.parse_args()
     setup_logging(args.verbose)
     
     try:
-        checker = CodeQualityChecker(args.path, args.exclude)
-        report = checker.generate_report(args.changed_only, args.days)
+        cache_path = None
+        if not args.no_cache:
+            cache_path = args.cache or str(Path(args.path) / DEFAULT_CACHE_NAME)
+        checker = CodeQualityChecker(args.path, args.config, jobs=args.jobs, cache_path=cache_path,
+                                     exclude_patterns=args.exclude, baseline_path=args.baseline)
+        if args.watch:
+            session = WatchSession(checker)
+            session.start()
+            session.run(create_watcher(checker, polling=args.polling), timeout=args.poll_interval)
+            return
+            
+        if args.base:
+            scope = {'base': args.base, 'changed_only': True}
+        elif args.changed_only:
+            scope = {'days': args.days, 'changed_only': True}
+        else:
+            scope = {}
         
+        if args.write_baseline:
+            baseline = checker.write_baseline(args.write_baseline, **scope)
+            print(f"基线已保存到: {args.write_baseline}"
+                  f"（{baseline.issue_count} 个问题）")
+            return
+            
+        # 每个文件分析完成后立即写出，汇总信息最后写出
         if args.report:
             with open(args.report, 'w', encoding='utf-8') as f:
-                f.write(report)
+                checker.write_report(create_report_writer(args.format, f), **scope)
             print(f"报告已保存到: {args.report}")
         else:
-            print(report)
+            checker.write_report(create_report_writer(args.format, sys.stdout), **scope)
             
     except Exception as e:
         logging.error(f"执行过程中出现错误: {str(e)}")
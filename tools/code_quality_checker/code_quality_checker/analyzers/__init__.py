@@ -5,6 +5,9 @@ from .complexity.analyzer import ComplexityAnalyzer
 from .naming.analyzer import NamingAnalyzer
 from .documentation.analyzer import DocumentationAnalyzer
 from .metrics.analyzer import MetricsAnalyzer
+from .performance.analyzer import PerformanceAnalyzer
+from .selenium_latency.analyzer import SeleniumLatencyAnalyzer
+from .traversal import TreeVisitor, DispatchTable, run_visitors
 
 __all__ = [
     'BaseAnalyzer',
@@ -14,4 +17,9 @@ __all__ = [
     'NamingAnalyzer',
     'DocumentationAnalyzer',
     'MetricsAnalyzer',
+    'PerformanceAnalyzer',
+    'SeleniumLatencyAnalyzer',
+    'TreeVisitor',
+    'DispatchTable',
+    'run_visitors',
 ] 
\ No newline at end of file
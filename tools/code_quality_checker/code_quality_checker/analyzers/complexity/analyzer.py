@@ -4,8 +4,43 @@ import ast
 from typing import List
 
 from ..base import BaseAnalyzer
+from ..traversal import TreeVisitor, run_visitors
 from .strategies import ComplexityResult, ComplexityStrategy
 
+
+class ComplexityVisitor(TreeVisitor):
+    """Feeds every complexity strategy from one traversal of a file."""
+
+    def __init__(self, strategies: List[ComplexityStrategy], tree: ast.AST):
+        """Initialize the visitor.
+        
+        Args:
+            strategies: Complexity calculation strategies to feed
+            tree: The AST being analyzed, for strategies without ``node_types``
+        """
+        self.strategies = strategies
+        self.tree = tree
+        self.details = [[] for _ in strategies]
+        self.node_types = tuple({t for strategy in strategies for t in strategy.node_types})
+
+    def visit_node(self, node: ast.AST) -> None:
+        for strategy, details in zip(self.strategies, self.details):
+            if strategy.node_types and isinstance(node, strategy.node_types):
+                detail = strategy.score_node(node)
+                if detail is not None:
+                    details.append(detail)
+
+    def result(self) -> ComplexityResult:
+        total = 0
+        details = []
+        for strategy, found in zip(self.strategies, self.details):
+            if not strategy.node_types:
+                found = strategy.calculate_complexity(self.tree).details
+            total += sum(detail.score for detail in found)
+            details.extend(found)
+        return ComplexityResult(score=total, details=details)
+
+
 class ComplexityAnalyzer(BaseAnalyzer):
     """Analyzer for code complexity."""
 
@@ -17,6 +52,17 @@ class ComplexityAnalyzer(BaseAnalyzer):
         """
         self.strategies = strategies or []
 
+    def visitor(self, node: ast.AST) -> ComplexityVisitor:
+        """Create the per-file visitor used by the shared traversal.
+        
+        Args:
+            node: The AST node that will be traversed
+        
+        Returns:
+            A visitor producing the same ComplexityResult as ``analyze``
+        """
+        return ComplexityVisitor(self.strategies, node)
+
     def analyze(self, node: ast.AST) -> ComplexityResult:
         """Analyze the AST node for code complexity.
         
@@ -26,12 +72,4 @@ class ComplexityAnalyzer(BaseAnalyzer):
         Returns:
             ComplexityResult containing the complexity score and details
         """
-        total = 0
-        details = []
-        
-        for strategy in self.strategies:
-            result = strategy.calculate_complexity(node)
-            total += result.score
-            details.extend(result.details)
-            
-        return ComplexityResult(score=total, details=details) 
\ No newline at end of file
+        return run_visitors(node, [self.visitor(node)])[0]
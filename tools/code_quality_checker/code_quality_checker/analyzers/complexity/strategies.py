@@ -1,9 +1,9 @@
 """Complexity calculation strategies."""
 
 import ast
-from abc import ABC, abstractmethod
+from abc import ABC
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, Type
 
 
 @dataclass
@@ -22,9 +22,39 @@ class ComplexityResult:
 
 
 class ComplexityStrategy(ABC):
-    """Base class for complexity calculation strategies."""
+    """Base class for complexity calculation strategies.
+    
+    Strategies declare the node types they score in ``node_types`` and implement
+    ``score_node``, so the analyzer can feed them from a single shared traversal.
+    Strategies that leave ``node_types`` empty must override
+    ``calculate_complexity`` and are run on the whole tree instead.
+    The contract is checked when a subclass is defined.
+    """
+    
+    node_types: Tuple[Type[ast.AST], ...] = ()
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        overrides_score = cls.score_node is not ComplexityStrategy.score_node
+        overrides_calculate = (cls.calculate_complexity
+                               is not ComplexityStrategy.calculate_complexity)
+        if cls.node_types and not (overrides_score or overrides_calculate):
+            raise TypeError(f"{cls.__name__} declares node_types but does not implement score_node")
+        if not cls.node_types and not overrides_calculate:
+            raise TypeError(f"{cls.__name__} must declare node_types and implement score_node, "
+                            f"or override calculate_complexity")
+    
+    def score_node(self, node: ast.AST) -> Optional[ComplexityDetail]:
+        """Score a single node of one of the declared ``node_types``.
+        
+        Args:
+            node: The AST node to score
+            
+        Returns:
+            ComplexityDetail for the node, or None if it adds no complexity
+        """
+        raise NotImplementedError
     
-    @abstractmethod
     def calculate_complexity(self, node: ast.AST) -> ComplexityResult:
         """Calculate complexity score for an AST node.
         
@@ -34,45 +64,40 @@ class ComplexityStrategy(ABC):
         Returns:
             ComplexityResult containing the complexity score and details
         """
-        pass
+        details = []
+        for child in ast.walk(node):
+            if isinstance(child, self.node_types):
+                detail = self.score_node(child)
+                if detail is not None:
+                    details.append(detail)
+        return ComplexityResult(score=sum(d.score for d in details), details=details)
 
 
 class ControlFlowComplexity(ComplexityStrategy):
     """Calculate complexity based on control flow statements."""
     
-    def calculate_complexity(self, node: ast.AST) -> ComplexityResult:
-        score = 0
-        details = []
-        
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.ExceptHandler)):
-                score += 1
-                details.append(ComplexityDetail(
-                    type=child.__class__.__name__,
-                    score=1,
-                    location=f"line {child.lineno}"
-                ))
-                
-        return ComplexityResult(score=score, details=details)
+    node_types = (ast.If, ast.While, ast.For, ast.ExceptHandler)
+    
+    def score_node(self, node: ast.AST) -> Optional[ComplexityDetail]:
+        return ComplexityDetail(
+            type=node.__class__.__name__,
+            score=1,
+            location=f"line {node.lineno}"
+        )
 
 
 class BooleanOperationComplexity(ComplexityStrategy):
     """Calculate complexity based on boolean operations."""
     
-    def calculate_complexity(self, node: ast.AST) -> ComplexityResult:
-        score = 0
-        details = []
-        
-        for child in ast.walk(node):
-            if isinstance(child, ast.BoolOp):
-                # Add 1 for each additional operand beyond 2
-                additional_score = len(child.values) - 2
-                if additional_score > 0:
-                    score += additional_score
-                    details.append(ComplexityDetail(
-                        type="BooleanOperation",
-                        score=additional_score,
-                        location=f"line {child.lineno}"
-                    ))
-                
-        return ComplexityResult(score=score, details=details) 
\ No newline at end of file
+    node_types = (ast.BoolOp,)
+    
+    def score_node(self, node: ast.AST) -> Optional[ComplexityDetail]:
+        # Add 1 for each additional operand beyond 2
+        additional_score = len(node.values) - 2
+        if additional_score <= 0:
+            return None
+        return ComplexityDetail(
+            type="BooleanOperation",
+            score=additional_score,
+            location=f"line {node.lineno}"
+        ) 
\ No newline at end of file
@@ -4,7 +4,9 @@
 """
 
 import ast
+from typing import List
 from ..base import BaseAnalyzer
+from ..traversal import TreeVisitor, run_visitors
 from .strategies import (
     DocumentationResult,
     ModuleDocumentation,
@@ -12,6 +14,47 @@ from .strategies import (
     FunctionDocumentation
 )
 
+class DocumentationVisitor(TreeVisitor):
+    """文档规范的节点访问者
+    
+    模块级文档在创建时检查，遍历中只检查类和函数。
+    
+    Args:
+        strategies: 节点类型到文档策略的映射
+        node: 将要遍历的AST节点
+    """
+    
+    def __init__(self, strategies: dict, node: ast.AST):
+        self.strategies = strategies
+        self.node_types = tuple(t for t in strategies if t is not ast.Module)
+        self.missing_docs: List[str] = []
+        self.total_nodes = 0
+        self.documented_nodes = 0
+        
+        # 首先检查模块级文档
+        if isinstance(node, ast.Module):
+            self.total_nodes += 1
+            if strategies[ast.Module].check(node):
+                self.documented_nodes += 1
+            else:
+                self.missing_docs.append("模块缺少文档字符串")
+                
+    def visit_node(self, node: ast.AST) -> None:
+        strategy = self.strategies.get(type(node))
+        if strategy is None or type(node) is ast.Module:  # 模块已经检查过了
+            return
+        self.total_nodes += 1
+        if strategy.check(node):
+            self.documented_nodes += 1
+        else:
+            name = node.name if hasattr(node, 'name') else '<anonymous>'
+            self.missing_docs.append(f"{strategy.get_type()} '{name}' 缺少文档字符串")
+            
+    def result(self) -> DocumentationResult:
+        coverage = ((self.documented_nodes / self.total_nodes * 100)
+                    if self.total_nodes > 0 else 100.0)
+        return DocumentationResult(coverage=coverage, missing_docs=self.missing_docs)
+
 class DocumentationAnalyzer(BaseAnalyzer):
     """文档规范分析器
     
@@ -26,6 +69,17 @@ class DocumentationAnalyzer(BaseAnalyzer):
             ast.FunctionDef: FunctionDocumentation()
         }
         
+    def visitor(self, node: ast.AST) -> DocumentationVisitor:
+        """创建单次遍历使用的访问者
+        
+        Args:
+            node: 将要遍历的AST节点
+            
+        Returns:
+            结果与 analyze 相同的访问者
+        """
+        return DocumentationVisitor(self.strategies, node)
+        
     def analyze(self, node: ast.AST) -> DocumentationResult:
         """分析文档规范
         
@@ -35,30 +89,4 @@ class DocumentationAnalyzer(BaseAnalyzer):
         Returns:
             文档规范分析结果
         """
-        missing_docs = []
-        total_nodes = 0
-        documented_nodes = 0
-        
-        # 首先检查模块级文档
-        if isinstance(node, ast.Module):
-            total_nodes += 1
-            if self.strategies[ast.Module].check(node):
-                documented_nodes += 1
-            else:
-                missing_docs.append("模块缺少文档字符串")
-        
-        # 遍历所有需要文档的节点
-        for child in ast.walk(node):
-            node_type = type(child)
-            if node_type in self.strategies and node_type != ast.Module:  # 模块已经检查过了
-                total_nodes += 1
-                strategy = self.strategies[node_type]
-                
-                if strategy.check(child):
-                    documented_nodes += 1
-                else:
-                    name = child.name if hasattr(child, 'name') else '<anonymous>'
-                    missing_docs.append(f"{strategy.get_type()} '{name}' 缺少文档字符串")
-                    
-        coverage = (documented_nodes / total_nodes * 100) if total_nodes > 0 else 100.0
-        return DocumentationResult(coverage=coverage, missing_docs=missing_docs) 
\ No newline at end of file
+        return run_visitors(node, [self.visitor(node)])[0]
@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from typing import List
 
 from ..base import BaseAnalyzer, AnalysisResult
+from ..traversal import TreeVisitor, run_visitors
 
 
 @dataclass
@@ -27,33 +28,65 @@ class MetricsResult(AnalysisResult):
     num_classes: int = 0
 
 
-class MetricsAnalyzer(BaseAnalyzer):
-    """Analyzer for collecting code metrics."""
+class MetricsVisitor(TreeVisitor):
+    """Counts functions and classes during the shared traversal."""
 
-    def analyze(self, node: ast.AST, code: str) -> MetricsResult:
-        """Analyze the AST and source code to collect metrics.
+    node_types = (ast.FunctionDef, ast.ClassDef)
+
+    def __init__(self, code: str):
+        """Initialize the visitor.
         
         Args:
-            node: The AST node to analyze
-            code: The source code string
-        
-        Returns:
-            MetricsResult containing the collected metrics
+            code: The source code string, used for the line metrics
         """
+        self.code = code
+        self.num_functions = 0
+        self.num_classes = 0
+
+    def visit_node(self, node: ast.AST) -> None:
+        if isinstance(node, ast.FunctionDef):
+            self.num_functions += 1
+        else:
+            self.num_classes += 1
+
+    def result(self) -> MetricsResult:
         result = MetricsResult()
         
         # Calculate line metrics
-        lines = code.splitlines()
+        lines = self.code.splitlines()
         result.total_lines = len(lines)
         result.blank_lines = sum(1 for line in lines if not line.strip())
         result.comment_lines = sum(1 for line in lines if line.strip().startswith('#'))
         result.code_lines = result.total_lines - result.blank_lines - result.comment_lines
         
-        # Count functions and classes
-        for node in ast.walk(node):
-            if isinstance(node, ast.FunctionDef):
-                result.num_functions += 1
-            elif isinstance(node, ast.ClassDef):
-                result.num_classes += 1
+        result.num_functions = self.num_functions
+        result.num_classes = self.num_classes
+        return result
+
+
+class MetricsAnalyzer(BaseAnalyzer):
+    """Analyzer for collecting code metrics."""
+
+    def visitor(self, node: ast.AST, code: str) -> MetricsVisitor:
+        """Create the per-file visitor used by the shared traversal.
         
-        return result 
\ No newline at end of file
+        Args:
+            node: The AST node that will be traversed
+            code: The source code string
+        
+        Returns:
+            A visitor producing the same MetricsResult as ``analyze``
+        """
+        return MetricsVisitor(code)
+
+    def analyze(self, node: ast.AST, code: str) -> MetricsResult:
+        """Analyze the AST and source code to collect metrics.
+        
+        Args:
+            node: The AST node to analyze
+            code: The source code string
+        
+        Returns:
+            MetricsResult containing the collected metrics
+        """
+        return run_visitors(node, [self.visitor(node, code)])[0]
@@ -4,14 +4,43 @@
 """
 
 import ast
+from typing import Dict, List
 from ..base import BaseAnalyzer
+from ..traversal import TreeVisitor, run_visitors
 from .strategies import (
     NamingResult,
     ClassNaming,
     FunctionNaming,
-    VariableNaming
+    VariableNaming,
+    NamingStrategy
 )
 
+class NamingVisitor(TreeVisitor):
+    """命名规范的节点访问者
+    
+    Args:
+        analyzer: 所属的命名规范分析器
+    """
+    
+    def __init__(self, analyzer: 'NamingAnalyzer'):
+        self.analyzer = analyzer
+        self.strategies: Dict[type, NamingStrategy] = analyzer.strategies
+        self.node_types = tuple(analyzer.strategies)
+        self.issues: List[str] = []
+        
+    def visit_node(self, node: ast.AST) -> None:
+        strategy = self.strategies.get(type(node))
+        if strategy is None:
+            return
+        name = node.name if hasattr(node, 'name') else \
+               node.id if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store) else None
+               
+        if name and not self.analyzer.is_special_name(name) and not strategy.check(name):
+            self.issues.append(f"{strategy.get_type()} '{name}' 不符合命名规范")
+            
+    def result(self) -> NamingResult:
+        return NamingResult(issues=self.issues)
+
 class NamingAnalyzer(BaseAnalyzer):
     """命名规范分析器
     
@@ -38,6 +67,17 @@ class NamingAnalyzer(BaseAnalyzer):
         return (name.startswith('__') and name.endswith('__')) or \
                (name.startswith('_') and not name.startswith('__'))
                
+    def visitor(self, node: ast.AST) -> NamingVisitor:
+        """创建单次遍历使用的访问者
+        
+        Args:
+            node: 将要遍历的AST节点
+            
+        Returns:
+            结果与 analyze 相同的访问者
+        """
+        return NamingVisitor(self)
+        
     def analyze(self, node: ast.AST) -> NamingResult:
         """分析命名规范
         
@@ -47,16 +87,4 @@ class NamingAnalyzer(BaseAnalyzer):
         Returns:
             命名规范分析结果
         """
-        issues = []
-        
-        for child in ast.walk(node):
-            node_type = type(child)
-            if node_type in self.strategies:
-                strategy = self.strategies[node_type]
-                name = child.name if hasattr(child, 'name') else \
-                       child.id if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store) else None
-                       
-                if name and not self.is_special_name(name) and not strategy.check(name):
-                    issues.append(f"{strategy.get_type()} '{name}' 不符合命名规范")
-                    
-        return NamingResult(issues=issues) 
\ No newline at end of file
+        return run_visitors(node, [self.visitor(node)])[0]
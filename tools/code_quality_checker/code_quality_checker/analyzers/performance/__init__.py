@@ -0,0 +1,12 @@
+"""Performance anti-pattern analysis package."""
+
+from .analyzer import PerformanceAnalyzer, default_strategies
+from .strategies import PerformanceStrategy, PerformanceResult, PerformanceFinding
+
+__all__ = [
+    'PerformanceAnalyzer',
+    'PerformanceStrategy',
+    'PerformanceResult',
+    'PerformanceFinding',
+    'default_strategies',
+]
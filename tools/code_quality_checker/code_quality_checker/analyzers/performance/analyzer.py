@@ -0,0 +1,106 @@
+"""Performance anti-pattern analyzer module."""
+
+import ast
+from typing import List
+
+from ..base import BaseAnalyzer
+from ..traversal import TreeVisitor, run_visitors
+from .strategies import (
+    FUNCTION_TYPES,
+    LOOP_TYPES,
+    FileIOInLoop,
+    ListMembershipInLoop,
+    PerformanceContext,
+    PerformanceResult,
+    PerformanceStrategy,
+    RegexLiteralInLoop,
+    SleepInLoop,
+    StringConcatInLoop,
+    call_name
+)
+
+
+def default_strategies() -> List[PerformanceStrategy]:
+    """The hot-loop anti-pattern strategies used by the checker."""
+    return [
+        SleepInLoop(),
+        RegexLiteralInLoop(),
+        FileIOInLoop(),
+        StringConcatInLoop(),
+        ListMembershipInLoop()
+    ]
+
+
+class PerformanceVisitor(TreeVisitor):
+    """Builds loop/function scopes and feeds every strategy from one traversal."""
+
+    context_class = PerformanceContext
+
+    def __init__(self, strategies: List[PerformanceStrategy]):
+        """Initialize the visitor.
+
+        Args:
+            strategies: Performance strategies to feed
+        """
+        self.strategies = strategies
+        self.context = self.context_class()
+        self.findings = []
+        self.node_types = tuple(
+            {t for strategy in strategies for t in strategy.node_types}
+            | set(LOOP_TYPES + FUNCTION_TYPES)
+        )
+
+    def visit_node(self, node: ast.AST) -> None:
+        context = self.context
+        if isinstance(node, LOOP_TYPES + FUNCTION_TYPES):
+            context.enter(node)
+        elif isinstance(node, ast.Call) and context.in_loop(node):
+            name = call_name(node)
+            if name:
+                context.called_in_loop.add(name.rpartition('.')[2])
+        for strategy in self.strategies:
+            if isinstance(node, strategy.node_types):
+                finding = strategy.check(node, context)
+                if finding is not None:
+                    self.findings.append(finding)
+
+    def result(self) -> PerformanceResult:
+        findings = list(self.findings)
+        for strategy in self.strategies:
+            findings.extend(strategy.finish(self.context))
+        findings.sort(key=lambda finding: (finding.line, finding.column, finding.rule))
+        return PerformanceResult(findings=findings)
+
+
+class PerformanceAnalyzer(BaseAnalyzer):
+    """Analyzer for performance anti-patterns in hot loops."""
+
+    def __init__(self, strategies: List[PerformanceStrategy] = None):
+        """Initialize the performance analyzer.
+
+        Args:
+            strategies: Strategies to run, defaults to ``default_strategies()``
+        """
+        self.strategies = default_strategies() if strategies is None else strategies
+
+    def visitor(self, node: ast.AST) -> PerformanceVisitor:
+        """Create the per-file visitor used by the shared traversal.
+
+        Args:
+            node: The AST node that will be traversed
+
+        Returns:
+            A visitor producing the same PerformanceResult as ``analyze``
+        """
+        return PerformanceVisitor(self.strategies)
+
+    def analyze(self, node: ast.AST) -> PerformanceResult:
+        """Analyze the AST node for performance anti-patterns.
+
+        Args:
+            node: The AST node to analyze
+
+        Returns:
+            PerformanceResult with findings ordered by location
+        """
+        return run_visitors(node, [self.visitor(node)])[0]
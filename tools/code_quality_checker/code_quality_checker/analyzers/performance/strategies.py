@@ -0,0 +1,307 @@
+"""Performance anti-pattern detection strategies."""
+
+import ast
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple, Type
+
+Position = Tuple[int, int]
+
+LOOP_TYPES = (ast.For, ast.AsyncFor, ast.While,
+              ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+FUNCTION_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+REGEX_FUNCTIONS = {'match', 'search', 'fullmatch', 'findall', 'finditer', 'sub', 'subn', 'split'}
+
+
+@dataclass
+class PerformanceFinding:
+    """A single performance anti-pattern occurrence."""
+    rule: str
+    severity: str
+    message: str
+    line: int
+    column: int = 0
+
+    @property
+    def location(self) -> str:
+        return f"line {self.line}"
+
+
+@dataclass
+class PerformanceResult:
+    """Result of performance analysis."""
+    findings: List[PerformanceFinding] = field(default_factory=list)
+
+
+def _start(node: ast.AST) -> Position:
+    return (node.lineno, node.col_offset)
+
+
+def _end(node: ast.AST) -> Position:
+    return (node.end_lineno, node.end_col_offset)
+
+
+def _span(first: ast.AST, last: ast.AST) -> Tuple[Position, Position]:
+    return (_start(first), _end(last))
+
+
+def call_name(node: ast.Call) -> str:
+    """Dotted name of the called object, e.g. ``time.sleep``; empty if not a plain name."""
+    parts = []
+    func = node.func
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return ''
+    parts.append(func.id)
+    return '.'.join(reversed(parts))
+
+
+class PerformanceContext:
+    """Loop and function scopes of one file, built during the shared traversal.
+
+    The traversal visits ancestors before descendants, so by the time a node
+    is checked every loop and function enclosing it has been registered.
+    Scopes are kept as source position spans and looked up by containment.
+    """
+
+    def __init__(self):
+        self.loop_spans: List[Tuple[Position, Position]] = []
+        self.function_spans: List[Tuple[Position, Position, str]] = []
+        self.called_in_loop: Set[str] = set()
+        self.deferred: Dict[str, list] = {}
+
+    def enter(self, node: ast.AST) -> None:
+        """Register a loop, comprehension or function scope."""
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            # The iterable is evaluated once; only the body repeats
+            self.loop_spans.append(_span(node.body[0], node.body[-1]))
+        elif isinstance(node, ast.While):
+            self.loop_spans.append(_span(node.test, node.body[-1]))
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp)):
+            self.loop_spans.append(_span(node.elt, node.elt))
+            self._enter_generators(node.generators)
+        elif isinstance(node, ast.DictComp):
+            self.loop_spans.append(_span(node.key, node.value))
+            self._enter_generators(node.generators)
+        elif isinstance(node, FUNCTION_TYPES):
+            name = getattr(node, 'name', '<lambda>')
+            self.function_spans.append((_start(node), _end(node), name))
+
+    def _enter_generators(self, generators: List[ast.comprehension]) -> None:
+        for index, generator in enumerate(generators):
+            if index > 0:
+                self.loop_spans.append(_span(generator.iter, generator.iter))
+            for condition in generator.ifs:
+                self.loop_spans.append(_span(condition, condition))
+
+    def enclosing_function(self, node: ast.AST) -> Optional[Tuple[Position, Position, str]]:
+        """Innermost function containing the node."""
+        start, end = _start(node), _end(node)
+        best = None
+        for span in self.function_spans:
+            if span[0] < start and end <= span[1] and (best is None or span[0] > best[0]):
+                best = span
+        return best
+
+    def in_loop(self, node: ast.AST) -> bool:
+        """Whether the node runs once per iteration of a loop in its own function."""
+        start, end = _start(node), _end(node)
+        function = self.enclosing_function(node)
+        for loop_start, loop_end in self.loop_spans:
+            if loop_start <= start and end <= loop_end:
+                if function is None or (function[0] < loop_start and loop_end <= function[1]):
+                    return True
+        return False
+
+    def defer(self, rule: str, item) -> None:
+        """Keep an item for a strategy to resolve once the whole file is known."""
+        self.deferred.setdefault(rule, []).append(item)
+
+
+class PerformanceStrategy(ABC):
+    """Base class for performance anti-pattern strategies.
+
+    Strategies declare the node types they inspect in ``node_types`` and are
+    fed from the shared traversal, like complexity strategies. Checks that
+    need the whole file (e.g. which functions are called in loops) defer
+    items on the context and report them from ``finish``.
+    """
+
+    rule: str = ''
+    severity: str = 'medium'
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    @abstractmethod
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        """Check a single node of one of the declared ``node_types``.
+
+        Args:
+            node: The AST node to check
+            context: Loop and function scopes of the file
+
+        Returns:
+            PerformanceFinding for the node, or None
+        """
+
+    def finish(self, context: PerformanceContext) -> List[PerformanceFinding]:
+        """Report findings that could only be decided after the traversal."""
+        return []
+
+    def finding(self, node: ast.AST, message: str,
+                severity: Optional[str] = None) -> PerformanceFinding:
+        return PerformanceFinding(
+            rule=self.rule,
+            severity=severity or self.severity,
+            message=message,
+            line=node.lineno,
+            column=node.col_offset
+        )
+
+
+class SleepInLoop(PerformanceStrategy):
+    """Fixed ``time.sleep`` inside a loop (polling instead of waiting on a condition)."""
+
+    rule = 'sleep-in-loop'
+    severity = 'high'
+    node_types = (ast.Call,)
+
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        if call_name(node) in ('time.sleep', 'sleep') and context.in_loop(node):
+            return self.finding(node, "循环中调用 time.sleep，每次迭代固定等待")
+        return None
+
+
+class RegexLiteralInLoop(PerformanceStrategy):
+    """``re.match`` and friends with a literal pattern.
+
+    Reported inside a loop, or inside a function that is called in a loop.
+    """
+
+    rule = 'regex-in-loop'
+    severity = 'low'
+    node_types = (ast.Call,)
+
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        name = call_name(node)
+        if not (name.startswith('re.') and name[3:] in REGEX_FUNCTIONS):
+            return None
+        pattern = node.args[0] if node.args else None
+        if not (isinstance(pattern, ast.Constant) and isinstance(pattern.value, (str, bytes))):
+            return None
+        if context.in_loop(node):
+            return self.finding(node, f"循环中使用字面量模式调用 {name}，"
+                                      f"应预先 re.compile")
+        function = context.enclosing_function(node)
+        if function is not None:
+            context.defer(self.rule, (node, name, function[2]))
+        return None
+
+    def finish(self, context: PerformanceContext) -> List[PerformanceFinding]:
+        return [
+            self.finding(node, f"{function} 在循环中被调用，"
+                               f"其中使用字面量模式调用 {name}，应预先 re.compile")
+            for node, name, function in context.deferred.get(self.rule, [])
+            if function in context.called_in_loop
+        ]
+
+
+class FileIOInLoop(PerformanceStrategy):
+    """``open()`` or ``json.dump`` repeated on every iteration."""
+
+    rule = 'io-in-loop'
+    severity = 'medium'
+    node_types = (ast.Call,)
+
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        name = call_name(node)
+        if name in ('open', 'io.open', 'json.dump') and context.in_loop(node):
+            return self.finding(node, f"循环中重复调用 {name}，"
+                                      f"应在循环外打开文件或批量写入")
+        return None
+
+
+def _is_stringish(node: ast.AST) -> bool:
+    """Whether an expression evidently produces a string."""
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, str)
+    if isinstance(node, ast.JoinedStr):
+        return True
+    if isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in ('str', 'repr'):
+            return True
+        return isinstance(node.func, ast.Attribute) and _is_stringish(node.func.value)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_stringish(node.left) or _is_stringish(node.right)
+    return False
+
+
+class StringConcatInLoop(PerformanceStrategy):
+    """Building a string with ``+=`` / ``s = s + ...`` inside a loop."""
+
+    rule = 'string-concat-in-loop'
+    severity = 'low'
+    node_types = (ast.AugAssign, ast.Assign)
+
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        if isinstance(node, ast.AugAssign):
+            concat = (isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name)
+                      and _is_stringish(node.value))
+        else:
+            concat = (
+                len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.BinOp) and isinstance(node.value.op, ast.Add)
+                and isinstance(node.value.left, ast.Name)
+                and node.value.left.id == node.targets[0].id
+                and _is_stringish(node.value.right)
+            )
+        if concat and context.in_loop(node):
+            return self.finding(node, "循环中拼接字符串，"
+                                      "应收集到列表后使用 str.join")
+        return None
+
+
+def _is_list_expression(node: ast.AST) -> bool:
+    if isinstance(node, (ast.List, ast.ListComp)):
+        return True
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'list'
+
+
+class ListMembershipInLoop(PerformanceStrategy):
+    """``in`` / ``not in`` tests against a list inside a loop (linear scan per iteration)."""
+
+    rule = 'list-membership-in-loop'
+    severity = 'medium'
+    node_types = (ast.Compare, ast.Assign, ast.AnnAssign)
+
+    def check(self, node: ast.AST, context: PerformanceContext) -> Optional[PerformanceFinding]:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            # Remember names bound to lists, per function
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            if node.value is not None and _is_list_expression(node.value):
+                function = context.enclosing_function(node)
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        context.defer('list-names', (function and function[2], target.id))
+            return None
+
+        for op, comparator in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)) or not context.in_loop(node):
+                continue
+            if isinstance(comparator, (ast.ListComp, ast.Call)) and _is_list_expression(comparator):
+                return self.finding(node, "循环中对新建的列表做成员测试，"
+                                          "应在循环外构建 set")
+            if isinstance(comparator, ast.Name):
+                function = context.enclosing_function(node)
+                context.defer(self.rule, (node, comparator.id, function and function[2]))
+        return None
+
+    def finish(self, context: PerformanceContext) -> List[PerformanceFinding]:
+        list_names = set(context.deferred.get('list-names', []))
+        return [
+            self.finding(node, f"循环中对列表 {name} 做成员测试，应改用 set")
+            for node, name, function in context.deferred.get(self.rule, [])
+            if (function, name) in list_names or (None, name) in list_names
+        ]
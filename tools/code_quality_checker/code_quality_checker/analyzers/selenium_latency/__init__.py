@@ -0,0 +1,20 @@
+"""Selenium latency analysis package."""
+
+from .analyzer import (
+    FunctionLatency,
+    LatencyResult,
+    SeleniumLatencyAnalyzer,
+    default_strategies,
+    rank_functions,
+)
+from .strategies import LatencyFinding, LatencyStrategy
+
+__all__ = [
+    'SeleniumLatencyAnalyzer',
+    'LatencyStrategy',
+    'LatencyResult',
+    'LatencyFinding',
+    'FunctionLatency',
+    'default_strategies',
+    'rank_functions',
+]
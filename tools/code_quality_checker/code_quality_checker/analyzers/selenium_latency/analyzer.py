@@ -0,0 +1,140 @@
+"""Selenium latency analyzer module."""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from ..base import BaseAnalyzer
+from ..performance.analyzer import PerformanceVisitor
+from ..traversal import run_visitors
+from .strategies import (
+    AbsoluteXPath,
+    BareExceptWait,
+    FallbackSelectorLoop,
+    FixedSleep,
+    LatencyContext,
+    LatencyFinding,
+    LatencyStrategy,
+    MixedWaits
+)
+
+# Findings whose cost is already included in an enclosing finding of these rules
+COVERING_RULES = ('fallback-selector-loop', 'bare-except-wait')
+COVERED_RULES = ('bare-except-wait', 'absolute-xpath')
+
+
+@dataclass
+class FunctionLatency:
+    """Worst-case latency added by the anti-patterns in one function."""
+    function: str
+    line: int
+    latency: float
+    findings: int
+
+
+@dataclass
+class LatencyResult:
+    """Result of Selenium latency analysis."""
+    findings: List[LatencyFinding] = field(default_factory=list)
+    # Offending functions, highest worst-case latency first
+    functions: List[FunctionLatency] = field(default_factory=list)
+
+
+def default_strategies() -> List[LatencyStrategy]:
+    """The Selenium latency strategies used by the checker."""
+    return [
+        FixedSleep(),
+        MixedWaits(),
+        FallbackSelectorLoop(),
+        AbsoluteXPath(),
+        BareExceptWait()
+    ]
+
+
+def rank_functions(findings: List[LatencyFinding]) -> List[FunctionLatency]:
+    """Sum the worst-case latency per function and rank the functions.
+
+    A bare ``except`` or absolute XPath nested inside a fallback loop or
+    another bare ``except`` is counted once, by the enclosing finding.
+
+    Args:
+        findings: Latency findings of one file
+
+    Returns:
+        FunctionLatency entries ordered by latency, then by line
+    """
+    totals: Dict[str, FunctionLatency] = {}
+    for finding in findings:
+        covered = finding.rule in COVERED_RULES and any(
+            other is not finding and other.rule in COVERING_RULES
+            and other.function == finding.function
+            and other.line <= finding.line and finding.end_line <= other.end_line
+            and other.latency > 0
+            and (other.line, other.end_line) != (finding.line, finding.end_line)
+            for other in findings
+        )
+        entry = totals.setdefault(finding.function,
+                                  FunctionLatency(finding.function, finding.line, 0.0, 0))
+        entry.line = min(entry.line, finding.line)
+        entry.findings += 1
+        if not covered:
+            entry.latency += finding.latency
+    return sorted(totals.values(), key=lambda entry: (-entry.latency, entry.line))
+
+
+class LatencyVisitor(PerformanceVisitor):
+    """Collects wait configuration and feeds the latency strategies in one traversal."""
+
+    context_class = LatencyContext
+
+    def __init__(self, strategies: List[LatencyStrategy]):
+        """Initialize the visitor.
+
+        Args:
+            strategies: Latency strategies to feed
+        """
+        super().__init__(strategies)
+        self.node_types = self.node_types + (ast.ClassDef, ast.Import, ast.ImportFrom,
+                                             ast.Assign, ast.Call, ast.For)
+
+    def visit_node(self, node: ast.AST) -> None:
+        self.context.observe(node)
+        super().visit_node(node)
+
+    def result(self) -> LatencyResult:
+        findings = super().result().findings
+        return LatencyResult(findings=findings, functions=rank_functions(findings))
+
+
+class SeleniumLatencyAnalyzer(BaseAnalyzer):
+    """Analyzer for waits and selectors that slow down Selenium automation."""
+
+    def __init__(self, strategies: List[LatencyStrategy] = None):
+        """Initialize the Selenium latency analyzer.
+
+        Args:
+            strategies: Strategies to run, defaults to ``default_strategies()``
+        """
+        self.strategies = default_strategies() if strategies is None else strategies
+
+    def visitor(self, node: ast.AST) -> LatencyVisitor:
+        """Create the per-file visitor used by the shared traversal.
+
+        Args:
+            node: The AST node that will be traversed
+
+        Returns:
+            A visitor producing the same LatencyResult as ``analyze``
+        """
+        return LatencyVisitor(self.strategies)
+
+    def analyze(self, node: ast.AST) -> LatencyResult:
+        """Analyze the AST node for Selenium latency anti-patterns.
+
+        Args:
+            node: The AST node to analyze
+
+        Returns:
+            LatencyResult with findings ordered by location and ranked functions
+        """
+        return run_visitors(node, [self.visitor(node)])[0]
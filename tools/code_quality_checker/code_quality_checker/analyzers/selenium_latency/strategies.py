@@ -0,0 +1,332 @@
+"""Selenium latency anti-pattern strategies.
+
+Each finding carries an estimate of the worst-case time it adds to a run,
+in seconds, derived from the literal timeouts found in the same file:
+``WebDriverWait(driver, N)`` for explicit waits, ``implicitly_wait(N)``
+for ``find_element`` calls and ``time.sleep(N)`` for fixed sleeps.
+"""
+
+import ast
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..performance.strategies import (
+    PerformanceContext,
+    PerformanceFinding,
+    PerformanceStrategy,
+    call_name
+)
+
+WAIT_METHODS = ('until', 'until_not')
+
+
+@dataclass
+class LatencyFinding(PerformanceFinding):
+    """A Selenium latency anti-pattern with its worst-case cost."""
+    function: str = '<module>'
+    latency: float = 0.0
+    end_line: int = 0
+
+
+def _number(node: Optional[ast.AST]) -> Optional[float]:
+    if (isinstance(node, ast.Constant) and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)):
+        return float(node.value)
+    return None
+
+
+def _argument(node: ast.Call, index: int, keyword: str) -> Optional[ast.AST]:
+    if len(node.args) > index:
+        return node.args[index]
+    for item in node.keywords:
+        if item.arg == keyword:
+            return item.value
+    return None
+
+
+def is_wait_call(node: ast.AST) -> bool:
+    """Whether the call blocks until an element appears (explicit wait or find_element)."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+        return False
+    return node.func.attr in WAIT_METHODS or node.func.attr.startswith('find_element')
+
+
+def wait_calls(statements: List[ast.stmt]) -> Iterator[ast.Call]:
+    """Blocking Selenium calls inside the given statements."""
+    for statement in statements:
+        for node in ast.walk(statement):
+            if is_wait_call(node):
+                yield node
+
+
+def _format_seconds(seconds: float) -> str:
+    return f"{seconds:g}s"
+
+
+class LatencyContext(PerformanceContext):
+    """Scopes plus the Selenium waits configured in one file."""
+
+    def __init__(self):
+        super().__init__()
+        self.class_spans: List[Tuple[Tuple[int, int], Tuple[int, int], str]] = []
+        self.selenium_used = False
+        self.explicit_waits = False
+        self.wait_timeouts: Dict[str, float] = {}
+        self.implicit_wait = 0.0
+        self.list_lengths: Dict[Tuple[Optional[str], str], int] = {}
+        self.blocking_calls: List[ast.Call] = []
+        self.for_loops: List[ast.For] = []
+
+    def observe(self, node: ast.AST) -> None:
+        """Record wait configuration, list literals and blocking calls."""
+        if isinstance(node, ast.ClassDef):
+            self.class_spans.append(((node.lineno, node.col_offset),
+                                     (node.end_lineno, node.end_col_offset), node.name))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            if isinstance(node, ast.ImportFrom):
+                names = [node.module or '']
+            else:
+                names = [alias.name for alias in node.names]
+            self.selenium_used = (self.selenium_used
+                                  or any(name.split('.')[0] == 'selenium' for name in names))
+        elif isinstance(node, ast.For):
+            self.for_loops.append(node)
+        elif isinstance(node, ast.Assign):
+            self._observe_assign(node)
+        elif isinstance(node, ast.Call):
+            name = call_name(node).rpartition('.')[2]
+            if name == 'WebDriverWait':
+                self.selenium_used = self.explicit_waits = True
+            elif name == 'implicitly_wait':
+                self.selenium_used = True
+                seconds = _number(_argument(node, 0, 'time_to_wait')) or 0.0
+                self.implicit_wait = max(self.implicit_wait, seconds)
+            if is_wait_call(node):
+                self.selenium_used = True
+                self.blocking_calls.append(node)
+
+    def _observe_assign(self, node: ast.Assign) -> None:
+        value = node.value
+        if isinstance(value, ast.Call) and call_name(value).rpartition('.')[2] == 'WebDriverWait':
+            timeout = _number(_argument(value, 1, 'timeout'))
+            if timeout is not None:
+                for target in node.targets:
+                    self.wait_timeouts[ast.unparse(target)] = timeout
+        elif isinstance(value, (ast.List, ast.Tuple)):
+            function = self.enclosing_function(node)
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    self.list_lengths[(function and function[2], target.id)] = len(value.elts)
+
+    def qualified_function(self, node: ast.AST) -> str:
+        """``Class.method`` (or plain function name) enclosing the node."""
+        function = self.enclosing_function(node)
+        if function is None:
+            return '<module>'
+        owner = None
+        for span in self.class_spans:
+            encloses = span[0] < function[0] and function[1] <= span[1]
+            if encloses and (owner is None or span[0] > owner[0]):
+                owner = span
+        return f"{owner[2]}.{function[2]}" if owner else function[2]
+
+    def call_timeout(self, node: ast.Call) -> float:
+        """Worst-case seconds a blocking call waits when the element never appears."""
+        if node.func.attr.startswith('find_element'):
+            return self.implicit_wait
+        owner = node.func.value
+        if isinstance(owner, ast.Call) and call_name(owner).rpartition('.')[2] == 'WebDriverWait':
+            return _number(_argument(owner, 1, 'timeout')) or 0.0
+        default = max(self.wait_timeouts.values(), default=0.0)
+        return self.wait_timeouts.get(ast.unparse(owner), default)
+
+    def iterations(self, loop: ast.For) -> Optional[int]:
+        """Iteration count of a loop over a literal list, or None when unknown."""
+        if isinstance(loop.iter, (ast.List, ast.Tuple)):
+            return len(loop.iter.elts)
+        if isinstance(loop.iter, ast.Name):
+            function = self.enclosing_function(loop)
+            name = function and function[2]
+            module_level = self.list_lengths.get((None, loop.iter.id))
+            return self.list_lengths.get((name, loop.iter.id), module_level)
+        return None
+
+
+def _contains(outer: ast.AST, inner: ast.AST) -> bool:
+    starts_after = (outer.lineno, outer.col_offset) <= (inner.lineno, inner.col_offset)
+    ends_before = ((inner.end_lineno, inner.end_col_offset)
+                   <= (outer.end_lineno, outer.end_col_offset))
+    return starts_after and ends_before
+
+
+class LatencyStrategy(PerformanceStrategy):
+    """Base class for Selenium latency strategies.
+
+    Timeouts may be configured anywhere in the file (typically in
+    ``__init__``), so strategies defer the nodes they care about and
+    estimate latency in ``finish``. Nothing is reported for files that
+    do not use Selenium.
+    """
+
+    node_types = (ast.Call,)
+
+    def check(self, node: ast.AST, context: LatencyContext) -> Optional[LatencyFinding]:
+        if self.matches(node):
+            context.defer(self.rule, node)
+        return None
+
+    def matches(self, node: ast.AST) -> bool:
+        """Whether the node is a candidate for this strategy."""
+        return True
+
+    def finish(self, context: LatencyContext) -> List[LatencyFinding]:
+        if not context.selenium_used:
+            return []
+        findings = []
+        for node in context.deferred.get(self.rule, []):
+            finding = self.estimate(node, context)
+            if finding is not None:
+                findings.append(finding)
+        return findings
+
+    def estimate(self, node: ast.AST, context: LatencyContext) -> Optional[LatencyFinding]:
+        """Build the finding for a deferred node, or None if it does not apply."""
+        raise NotImplementedError
+
+    def finding(self, node: ast.AST, message: str, severity: Optional[str] = None,
+                context: Optional[LatencyContext] = None, latency: float = 0.0) -> LatencyFinding:
+        return LatencyFinding(
+            rule=self.rule,
+            severity=severity or self.severity,
+            message=message,
+            line=node.lineno,
+            column=node.col_offset,
+            function=context.qualified_function(node) if context else '<module>',
+            latency=latency,
+            end_line=node.end_lineno
+        )
+
+
+class FixedSleep(LatencyStrategy):
+    """Fixed ``time.sleep`` between browser actions."""
+
+    rule = 'fixed-sleep'
+    severity = 'medium'
+
+    def matches(self, node: ast.AST) -> bool:
+        return call_name(node) in ('time.sleep', 'sleep')
+
+    def estimate(self, node: ast.Call, context: LatencyContext) -> LatencyFinding:
+        seconds = _number(_argument(node, 0, 'secs')) or 0.0
+        if not context.in_loop(node):
+            return self.finding(node, f"固定等待 time.sleep({seconds:g})，"
+                                      f"应改为等待页面条件",
+                                context=context, latency=seconds)
+        # Multiply by the iteration counts of enclosing loops over literal lists
+        repeat = 1
+        for loop in context.for_loops:
+            if _contains(loop, node) and node.lineno > loop.lineno:
+                repeat *= context.iterations(loop) or 1
+        return self.finding(node, f"循环中固定等待 time.sleep({seconds:g})，"
+                                  f"每次迭代都会等待",
+                            severity='high', context=context, latency=seconds * repeat)
+
+
+class MixedWaits(LatencyStrategy):
+    """``implicitly_wait`` in a file that also uses ``WebDriverWait``."""
+
+    rule = 'mixed-waits'
+    severity = 'high'
+
+    def matches(self, node: ast.AST) -> bool:
+        return call_name(node).rpartition('.')[2] == 'implicitly_wait'
+
+    def estimate(self, node: ast.Call, context: LatencyContext) -> Optional[LatencyFinding]:
+        seconds = _number(_argument(node, 0, 'time_to_wait')) or 0.0
+        if not context.explicit_waits or seconds <= 0:
+            return None
+        return self.finding(
+            node,
+            f"implicitly_wait({seconds:g}) 与 WebDriverWait 混用，"
+            f"显式等待超时时每次轮询可能再阻塞 {_format_seconds(seconds)}",
+            context=context, latency=seconds
+        )
+
+
+class FallbackSelectorLoop(LatencyStrategy):
+    """Serial loop over fallback selectors, each attempt waiting for the full timeout."""
+
+    rule = 'fallback-selector-loop'
+    severity = 'high'
+    node_types = (ast.For,)
+
+    def estimate(self, node: ast.For, context: LatencyContext) -> Optional[LatencyFinding]:
+        attempts = context.iterations(node)
+        if not attempts or attempts < 2:
+            return None
+        guarded = [call for statement in node.body if isinstance(statement, ast.Try)
+                   for call in wait_calls(statement.body)]
+        if not guarded:
+            return None
+        per_attempt = sum(context.call_timeout(call) for call in guarded)
+        latency = attempts * per_attempt
+        return self.finding(
+            node,
+            f"{attempts} 个备选选择器串行等待，"
+            f"每个最多 {_format_seconds(per_attempt)}，"
+            f"全部失败时共 {_format_seconds(latency)}",
+            severity='high' if latency >= 30 else 'medium', context=context, latency=latency
+        )
+
+
+class AbsoluteXPath(LatencyStrategy):
+    """Absolute ``/html/body/...`` XPaths, which break whenever the page layout shifts."""
+
+    rule = 'absolute-xpath'
+    severity = 'medium'
+    node_types = (ast.Constant,)
+
+    def matches(self, node: ast.AST) -> bool:
+        return isinstance(node.value, str) and node.value.strip().startswith('/html')
+
+    def estimate(self, node: ast.Constant, context: LatencyContext) -> LatencyFinding:
+        # A broken absolute path costs the full timeout of the call it is passed to
+        enclosing = [call for call in context.blocking_calls if _contains(call, node)]
+        latency = 0.0
+        if enclosing:
+            innermost = min(enclosing,
+                            key=lambda call: (call.end_lineno - call.lineno, -call.lineno))
+            latency = context.call_timeout(innermost)
+        path = node.value.strip()
+        shown = path if len(path) <= 48 else path[:45] + '...'
+        return self.finding(node, f"绝对 XPath '{shown}'，页面结构变化即失效",
+                            context=context, latency=latency)
+
+
+class BareExceptWait(LatencyStrategy):
+    """Bare ``except:`` around ``find_element`` or an explicit wait.
+
+    The handler silently swallows the timeout.
+    """
+
+    rule = 'bare-except-wait'
+    severity = 'high'
+    node_types = (ast.Try,)
+
+    def matches(self, node: ast.AST) -> bool:
+        return any(handler.type is None for handler in node.handlers)
+
+    def estimate(self, node: ast.Try, context: LatencyContext) -> Optional[LatencyFinding]:
+        calls = list(wait_calls(node.body))
+        if not calls:
+            return None
+        latency = sum(context.call_timeout(call) for call in calls)
+        finding = self.finding(
+            node,
+            f"裸 except 包裹 find_element/等待，"
+            f"超时被静默吞掉（最多 {_format_seconds(latency)}）",
+            context=context, latency=latency
+        )
+        # Only the try body is accounted for; waits in the handlers are reported on their own
+        finding.end_line = node.body[-1].end_lineno
+        return finding
@@ -0,0 +1,82 @@
+"""单次遍历的访问者分发模块
+
+各分析器不再各自完整遍历一次AST，而是为每个文件创建一个节点访问者，
+声明自己关心的节点类型；run_visitors 只遍历一次语法树，
+把每个节点分发给关心它的访问者。遍历顺序与 ast.walk 相同（广度优先），
+各分析器结果中问题的顺序保持不变。
+"""
+
+import ast
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+
+class TreeVisitor:
+    """单个文件的节点访问者
+
+    子类通过 node_types 声明关心的节点类型（包括其子类），
+    在 visit_node 中累积分析数据，遍历结束后由 result 给出分析结果。
+    """
+
+    node_types: Tuple[Type[ast.AST], ...] = ()
+
+    def visit_node(self, node: ast.AST) -> None:
+        """访问一个关心的节点
+
+        Args:
+            node: AST节点
+        """
+        raise NotImplementedError
+
+    def result(self) -> Any:
+        """遍历结束后返回分析结果"""
+        raise NotImplementedError
+
+
+class DispatchTable:
+    """节点类型到访问者方法的分发表
+
+    按节点的具体类型缓存匹配到的方法，每种类型只做一次 isinstance 判断。
+
+    Args:
+        visitors: 参与本次遍历的访问者
+    """
+
+    def __init__(self, visitors: Iterable[TreeVisitor]):
+        self.visitors = list(visitors)
+        self._cache: Dict[type, Tuple[Callable[[ast.AST], None], ...]] = {}
+
+    def handlers(self, node_type: type) -> Tuple[Callable[[ast.AST], None], ...]:
+        """返回关心该节点类型的访问者方法"""
+        handlers = self._cache.get(node_type)
+        if handlers is None:
+            handlers = tuple(
+                visitor.visit_node for visitor in self.visitors
+                if visitor.node_types and issubclass(node_type, visitor.node_types)
+            )
+            self._cache[node_type] = handlers
+        return handlers
+
+
+def run_visitors(tree: ast.AST, visitors: Iterable[TreeVisitor]) -> List[Any]:
+    """遍历一次语法树，驱动所有访问者
+
+    Args:
+        tree: AST根节点
+        visitors: 访问者列表
+
+    Returns:
+        与 visitors 顺序一致的分析结果列表
+    """
+    table = DispatchTable(visitors)
+    cache = table._cache
+    todo = deque([tree])
+    while todo:
+        node = todo.popleft()
+        todo.extend(ast.iter_child_nodes(node))
+        handlers = cache.get(type(node))
+        if handlers is None:
+            handlers = table.handlers(type(node))
+        for handler in handlers:
+            handler(node)
+    return [visitor.result() for visitor in table.visitors]
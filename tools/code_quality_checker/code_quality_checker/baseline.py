@@ -0,0 +1,151 @@
+"""问题基线模块
+
+为每个问题计算不依赖行号的指纹：规则、符号和规范化上下文的哈希，
+与文件路径一起组成基线的键。基线记录已有问题的指纹及出现次数，
+检查时只报告基线之外的新问题；代码上下移动不影响指纹。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import Counter
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASELINE_VERSION = 1
+
+_WHITESPACE = re.compile(r'\s+')
+_NUMBERS = re.compile(r'\d+')
+
+
+def normalize_context(text: str) -> str:
+    """规范化问题的上下文：去掉首尾空白并合并连续空白"""
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def issue_fingerprint(rule: str, symbol: str, context: str = '') -> str:
+    """计算文件内问题的指纹
+
+    Args:
+        rule: 规则名，如 complexity、naming、documentation、error
+        symbol: 问题涉及的符号或问题描述
+        context: 问题所在的源码上下文
+
+    Returns:
+        形如 ``rule:十六位哈希`` 的指纹
+    """
+    payload = '\0'.join((rule, symbol, normalize_context(context)))
+    return f"{rule}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+def error_fingerprint(error: str) -> str:
+    """分析错误的指纹，忽略错误信息中的行号和列号"""
+    return issue_fingerprint('error', _NUMBERS.sub('N', error))
+
+
+def analysis_fingerprints(analysis: Any) -> Tuple[str, ...]:
+    """返回文件分析结果中各问题的指纹，与 report.file_issues 的顺序一致"""
+    if analysis.error is not None:
+        return (error_fingerprint(analysis.error),)
+    return tuple(analysis.fingerprints)
+
+
+class Baseline:
+    """问题基线
+
+    按文件保存问题指纹的出现次数。
+    同一文件中相同指纹的问题（如同名变量多次赋值）按次数抵消。
+
+    Args:
+        files: 文件相对路径到 {指纹: 次数} 的映射
+    """
+
+    def __init__(self, files: Optional[Dict[str, Dict[str, int]]] = None):
+        self.files: Dict[str, Dict[str, int]] = files or {}
+        self.suppressed = 0
+
+    @classmethod
+    def from_results(cls, analyses: Iterable[Any]) -> 'Baseline':
+        """根据分析结果生成基线
+
+        Args:
+            analyses: 每个文件的分析结果（FileAnalysis）
+
+        Returns:
+            包含其中全部问题的基线
+        """
+        files = {}
+        for analysis in analyses:
+            counts = Counter(analysis_fingerprints(analysis))
+            if counts:
+                files[analysis.rel_path.replace(os.sep, '/')] = dict(counts)
+        return cls(files)
+
+    @classmethod
+    def load(cls, path: str) -> 'Baseline':
+        """从文件加载基线
+
+        Raises:
+            ValueError: 文件格式或版本不正确
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get('version') != BASELINE_VERSION:
+            raise ValueError(f"不支持的基线文件: {path}")
+        return cls(data.get('files') or {})
+
+    def save(self, path: str) -> None:
+        """保存基线，键按路径排序，便于在版本库中比较"""
+        directory = os.path.dirname(os.path.abspath(path))
+        files = {rel: dict(sorted(counts.items())) for rel, counts in sorted(self.files.items())}
+        data = {'version': BASELINE_VERSION, 'files': files}
+        fd, tmp_path = tempfile.mkstemp(prefix='.baseline.', dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, path)
+
+    @property
+    def issue_count(self) -> int:
+        """基线中的问题总数"""
+        return sum(sum(counts.values()) for counts in self.files.values())
+
+    def filter(self, analysis: Any, baseline_path: Optional[str] = None) -> Optional[Any]:
+        """去掉分析结果中基线已有的问题
+
+        Args:
+            analysis: 文件的分析结果
+            baseline_path: 文件在基线中的路径（文件被重命名时为旧路径），
+                默认与当前路径相同
+
+        Returns:
+            只包含新问题的分析结果；分析错误已在基线中时返回None，
+            该文件没有可用的指标，不计入结果
+        """
+        known = self.files.get((baseline_path or analysis.rel_path).replace(os.sep, '/'))
+        if not known:
+            return analysis
+        remaining = dict(known)
+        if analysis.error is not None:
+            fingerprint = error_fingerprint(analysis.error)
+            if remaining.get(fingerprint, 0) > 0:
+                self.suppressed += 1
+                return None
+            return analysis
+
+        issues = []
+        fingerprints = []
+        for issue, fingerprint in zip(analysis.issues, analysis.fingerprints):
+            if remaining.get(fingerprint, 0) > 0:
+                remaining[fingerprint] -= 1
+                self.suppressed += 1
+                continue
+            issues.append(issue)
+            fingerprints.append(fingerprint)
+        if len(issues) == len(analysis.issues):
+            return analysis
+        return replace(analysis, issues=issues, fingerprints=fingerprints)
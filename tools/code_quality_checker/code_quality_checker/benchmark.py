@@ -0,0 +1,218 @@
+"""AST遍历基准测试
+
+对比两种分析方式在同一批文件上的耗时：
+- 逐个遍历：每个复杂度策略以及命名、文档、
+  度量分析器各自完整遍历一次语法树
+- 单次遍历：所有分析器的访问者共用一次遍历
+
+解析只做一次，不计入耗时；同时校验两种方式的分析结果完全一致。
+
+使用示例:
+    python -m tools.code_quality_checker.code_quality_checker.benchmark
+    python -m tools.code_quality_checker.code_quality_checker.benchmark /path/to/project --repeat 5
+"""
+
+import argparse
+import ast
+import json
+import logging
+import os
+import sysconfig
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .analyzers.complexity import ComplexityAnalyzer
+from .analyzers.complexity.strategies import (
+    BooleanOperationComplexity,
+    ComplexityResult,
+    ControlFlowComplexity
+)
+from .analyzers.documentation import DocumentationAnalyzer
+from .analyzers.metrics import MetricsAnalyzer
+from .analyzers.naming import NamingAnalyzer
+from .analyzers.traversal import run_visitors
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BenchmarkResult:
+    """基准测试结果"""
+    files: int
+    nodes: int
+    repeat: int
+    separate_ms_per_file: float
+    fused_ms_per_file: float
+    speedup: float
+    identical: bool
+
+
+def load_corpus(root: str, limit: Optional[int] = None) -> List[Tuple[str, ast.AST, str]]:
+    """读取并解析目录下的Python文件
+
+    Args:
+        root: 根目录
+        limit: 最多读取的文件数
+
+    Returns:
+        (路径, 语法树, 源码) 列表，无法解析的文件被跳过
+    """
+    corpus = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for filename in sorted(filenames):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(dirpath, filename)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                corpus.append((path, ast.parse(content), content))
+            except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+                continue
+            if limit and len(corpus) >= limit:
+                return corpus
+    return corpus
+
+
+class AnalyzerSet:
+    """基准测试使用的分析器组合，与 CodeQualityChecker 相同"""
+
+    def __init__(self):
+        self.strategies = [ControlFlowComplexity(), BooleanOperationComplexity()]
+        self.complexity = ComplexityAnalyzer(self.strategies)
+        self.naming = NamingAnalyzer()
+        self.documentation = DocumentationAnalyzer()
+        self.metrics = MetricsAnalyzer()
+
+    def separate(self, tree: ast.AST, content: str) -> List[Any]:
+        """每个策略和分析器各自遍历一次语法树"""
+        score = 0
+        details = []
+        for strategy in self.strategies:
+            result = strategy.calculate_complexity(tree)
+            score += result.score
+            details.extend(result.details)
+        return [
+            self.metrics_separate(tree, content),
+            ComplexityResult(score=score, details=details),
+            self.naming_separate(tree),
+            self.documentation_separate(tree)
+        ]
+
+    def fused(self, tree: ast.AST, content: str) -> List[Any]:
+        """所有分析器共用一次遍历"""
+        return run_visitors(tree, [
+            self.metrics.visitor(tree, content),
+            self.complexity.visitor(tree),
+            self.naming.visitor(tree),
+            self.documentation.visitor(tree)
+        ])
+
+    def metrics_separate(self, tree: ast.AST, content: str) -> Any:
+        """按原实现用 ast.walk 统计函数和类"""
+        visitor = self.metrics.visitor(tree, content)
+        for node in ast.walk(tree):
+            if isinstance(node, visitor.node_types):
+                visitor.visit_node(node)
+        return visitor.result()
+
+    def naming_separate(self, tree: ast.AST) -> Any:
+        """按原实现用 ast.walk 检查命名"""
+        visitor = self.naming.visitor(tree)
+        for node in ast.walk(tree):
+            visitor.visit_node(node)
+        return visitor.result()
+
+    def documentation_separate(self, tree: ast.AST) -> Any:
+        """按原实现用 ast.walk 检查文档"""
+        visitor = self.documentation.visitor(tree)
+        for node in ast.walk(tree):
+            visitor.visit_node(node)
+        return visitor.result()
+
+
+def _time(function, corpus: List[Tuple[str, ast.AST, str]],
+          repeat: int) -> Tuple[float, List[List[Any]]]:
+    """多次运行取最快一轮的耗时（秒）"""
+    best = None
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [function(tree, content) for _, tree, content in corpus]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best or 0.0, results
+
+
+def run_benchmark(root: str, repeat: int = 3, limit: Optional[int] = None) -> BenchmarkResult:
+    """运行基准测试
+
+    Args:
+        root: 语料目录
+        repeat: 每种方式运行的轮数
+        limit: 最多使用的文件数
+
+    Returns:
+        基准测试结果
+    """
+    corpus = load_corpus(root, limit)
+    if not corpus:
+        raise ValueError(f"目录中没有可解析的Python文件: {root}")
+    analyzers = AnalyzerSet()
+    nodes = sum(sum(1 for _ in ast.walk(tree)) for _, tree, _ in corpus)
+    logger.info(f"语料: {len(corpus)} 个文件, {nodes} 个节点")
+
+    separate_time, separate_results = _time(analyzers.separate, corpus, repeat)
+    fused_time, fused_results = _time(analyzers.fused, corpus, repeat)
+    identical = separate_results == fused_results
+    if not identical:
+        for (path, _, _), expected, actual in zip(corpus, separate_results, fused_results):
+            if expected != actual:
+                logger.error(f"结果不一致: {path}")
+                break
+
+    return BenchmarkResult(
+        files=len(corpus),
+        nodes=nodes,
+        repeat=repeat,
+        separate_ms_per_file=separate_time * 1000 / len(corpus),
+        fused_ms_per_file=fused_time * 1000 / len(corpus),
+        speedup=separate_time / fused_time if fused_time else 0.0,
+        identical=identical
+    )
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """格式化基准测试结果"""
+    return "\n".join([
+        f"文件数: {result.files}  节点数: {result.nodes}  轮数: {result.repeat}",
+        f"逐个遍历: {result.separate_ms_per_file:.3f} ms/文件",
+        f"单次遍历: {result.fused_ms_per_file:.3f} ms/文件",
+        f"加速比: {result.speedup:.2f}x",
+        f"结果一致: {'是' if result.identical else '否'}"
+    ])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='AST遍历基准测试')
+    parser.add_argument('root', nargs='?', default=sysconfig.get_paths()['stdlib'],
+                        help='语料目录，默认使用Python标准库')
+    parser.add_argument('--repeat', type=int, default=3, help='每种方式运行的轮数')
+    parser.add_argument('--limit', type=int, help='最多使用的文件数')
+    parser.add_argument('--output', help='将结果保存为JSON文件')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    result = run_benchmark(args.root, args.repeat, args.limit)
+    print(format_result(result))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(asdict(result), f, ensure_ascii=False, indent=2)
+    return 0 if result.identical else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
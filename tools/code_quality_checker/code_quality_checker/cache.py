@@ -0,0 +1,165 @@
+"""增量分析缓存模块
+
+按文件内容哈希缓存每个文件的精简分析结果，
+未变化的文件不再重新解析和分析。缓存整体以指纹区分：
+分析器版本或相关配置变化时，旧缓存全部失效。
+文件大小和修改时间都未变时直接命中，不再计算哈希。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 分析逻辑或结果格式变化时递增，使已有缓存失效
+ANALYZER_VERSION = "4"
+
+DEFAULT_CACHE_NAME = ".code-quality-cache"
+
+
+def fingerprint(settings: Dict[str, Any]) -> str:
+    """计算缓存指纹
+
+    Args:
+        settings: 影响分析结果的配置
+
+    Returns:
+        包含分析器版本和配置的哈希值
+    """
+    payload = json.dumps({'version': ANALYZER_VERSION, 'settings': settings},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """计算文件内容的SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """文件分析结果缓存
+
+    缓存条目按相对路径保存文件大小、修改时间、内容哈希和分析结果。
+
+    Args:
+        path: 缓存文件路径
+        fingerprint: 分析器版本和配置的指纹，
+            与缓存文件中的不一致时丢弃旧条目
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """读取缓存文件，格式不符或指纹不同时从空缓存开始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"读取分析缓存 {self.path} 失败，将重新分析: {str(e)}")
+            return
+        if not isinstance(data, dict) or data.get('fingerprint') != self.fingerprint:
+            logger.info("分析器版本或配置已变化，分析缓存失效")
+            self._dirty = True
+            return
+        self.entries = data.get('entries') or {}
+
+    def lookup(self, rel_path: str, abs_path: str) -> Optional[Dict[str, Any]]:
+        """查找文件的缓存结果
+
+        Args:
+            rel_path: 相对项目根目录的路径
+            abs_path: 绝对路径
+
+        Returns:
+            缓存的分析结果字典，未命中时返回None
+        """
+        try:
+            stat = os.stat(abs_path)
+        except OSError:
+            self.misses += 1
+            return None
+        entry = self.entries.get(rel_path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            self.hits += 1
+            return entry['result']
+
+        try:
+            content_hash = hash_file(abs_path)
+        except OSError:
+            self.misses += 1
+            return None
+        if entry and entry['hash'] == content_hash:
+            # 内容未变，只是修改时间变了
+            entry['size'] = stat.st_size
+            entry['mtime_ns'] = stat.st_mtime_ns
+            self._dirty = True
+            self.hits += 1
+            return entry['result']
+
+        self.misses += 1
+        self._pending[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                   'hash': content_hash}
+        return None
+
+    def store(self, rel_path: str, result: Any) -> None:
+        """保存文件的分析结果，须在同一文件 lookup 未命中之后调用
+
+        Args:
+            rel_path: 相对项目根目录的路径
+            result: 分析结果（dataclass实例）
+        """
+        entry = self._pending.pop(rel_path, None)
+        if entry is None:
+            return
+        entry['result'] = asdict(result)
+        self.entries[rel_path] = entry
+        self._dirty = True
+
+    @property
+    def hit_rate(self) -> float:
+        """本次运行的缓存命中率（0-1）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self, root: Optional[str] = None) -> None:
+        """写回缓存文件，先写临时文件再替换，避免中断时留下损坏的缓存
+
+        Args:
+            root: 项目根目录，提供时清理已不存在的文件的条目
+        """
+        if root is not None:
+            stale = [rel for rel in self.entries if not os.path.exists(os.path.join(root, rel))]
+            for rel in stale:
+                del self.entries[rel]
+            self._dirty = self._dirty or bool(stale)
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        data = {'fingerprint': self.fingerprint, 'entries': self.entries}
+        try:
+            fd, tmp_path = tempfile.mkstemp(prefix='.code-quality-cache.', dir=directory)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"保存分析缓存 {self.path} 失败: {str(e)}")
@@ -10,27 +10,44 @@ This module provides tools for checking and maintaining code quality, focusing o
 """
 
 import ast
+import math
 import os
 import logging
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 
 from .analyzers.base import BaseAnalyzer
 from .analyzers.complexity import ComplexityAnalyzer
 from .analyzers.naming import NamingAnalyzer
 from .analyzers.documentation import DocumentationAnalyzer
 from .analyzers.metrics import MetricsAnalyzer
+from .analyzers.performance import PerformanceAnalyzer
+from .analyzers.selenium_latency import SeleniumLatencyAnalyzer
+from .analyzers.traversal import run_visitors
 from .analyzers.complexity.strategies import (
     ControlFlowComplexity,
     BooleanOperationComplexity
 )
 from .file_iterator import FileIterator
-from .report import ReportGenerator, create_report_generator
+from .report import ReportGenerator, ReportSummary, ReportWriter, create_report_generator
 from .config import ConfigManager
+from .cache import AnalysisCache, fingerprint
+from .baseline import Baseline, issue_fingerprint
 
 logger = logging.getLogger(__name__)
 
+# 并行分析时每个任务块最多包含的文件数
+MAX_CHUNK_SIZE = 50
+
+# 通用性能规则 -> 同一处代码上给出耗时估算的 Selenium 延迟规则，
+# 两者同时命中时只报告后者
+SUPERSEDED_BY_LATENCY = {'sleep-in-loop': 'fixed-sleep'}
+
+# 工作进程中的检查器，由进程池初始化函数设置
+_worker_checker: Optional['CodeQualityChecker'] = None
+
 @dataclass
 class CodeMetrics:
     """代码度量指标"""
@@ -60,6 +77,39 @@ class CodeQualityReport:
     avg_complexity: float
     issues: List[str]
     file_metrics: Dict[str, Dict]
+    cache_hit_rate: Optional[float] = None
+
+@dataclass
+class FileAnalysis:
+    """单个文件的精简分析结果
+    
+    只保留合并报告需要的数据，可以在进程之间传递。
+    """
+    rel_path: str
+    total_lines: int = 0
+    code_lines: int = 0
+    complexity: int = 0
+    doc_coverage: float = 0.0
+    issues: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    # 与 issues 一一对应的问题指纹，用于基线比较
+    fingerprints: List[str] = field(default_factory=list)
+
+def _source_line(lines: List[str], location: str) -> str:
+    """取出 "line N" 形式位置对应的源码行，作为问题指纹的上下文"""
+    _, _, number = location.rpartition(' ')
+    if number.isdigit() and 0 < int(number) <= len(lines):
+        return lines[int(number) - 1]
+    return ''
+
+def _init_worker(checker: 'CodeQualityChecker') -> None:
+    """进程池初始化函数，保存工作进程使用的检查器"""
+    global _worker_checker
+    _worker_checker = checker
+
+def _analyze_chunk(files: List[Tuple[str, str]]) -> List[FileAnalysis]:
+    """在工作进程中分析一块文件"""
+    return [_worker_checker.summarize_file(rel_path, abs_path) for rel_path, abs_path in files]
 
 class CodeQualityChecker:
     """代码质量检查器
@@ -67,17 +117,32 @@ class CodeQualityChecker:
     使用不同的分析器检查代码质量的各个方面。
     """
     
-    def __init__(self, project_root: str, config_path: Optional[str] = None):
+    def __init__(self, project_root: str, config_path: Optional[str] = None, jobs: int = 1,
+                 cache_path: Optional[str] = None, exclude_patterns: Optional[List[str]] = None,
+                 baseline_path: Optional[str] = None):
         """初始化代码质量检查器
         
         Args:
             project_root: 项目根目录
             config_path: 配置文件路径
+            jobs: 并行分析的进程数，1表示在当前进程中逐个分析，
+                0表示使用全部CPU
+            cache_path: 增量分析缓存文件路径，为None时不使用缓存
+            exclude_patterns: 要排除的文件模式，提供时覆盖配置中的排除模式
+            baseline_path: 问题基线文件路径，提供时只报告基线之外的新问题
         """
+        self.project_root = str(project_root)
+        self.last_cache_hit_rate: Optional[float] = None
+        self.baseline = Baseline.load(baseline_path) if baseline_path else None
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_path = cache_path
+        
         # 加载配置
         self.config_manager = ConfigManager()
         if config_path:
             self.config_manager.load_from_file(config_path)
+        if exclude_patterns:
+            self.config_manager.update_config(exclude_patterns=list(exclude_patterns))
         config = self.config_manager.get_config()
         
         # 初始化文件遍历器
@@ -91,6 +156,8 @@ class CodeQualityChecker:
         self.naming_analyzer = NamingAnalyzer()
         self.documentation_analyzer = DocumentationAnalyzer()
         self.metrics_analyzer = MetricsAnalyzer()
+        self.performance_analyzer = PerformanceAnalyzer()
+        self.latency_analyzer = SeleniumLatencyAnalyzer()
         
         # Analysis thresholds
         self.max_complexity = 10
@@ -113,12 +180,23 @@ class CodeQualityChecker:
             # 解析AST
             tree = ast.parse(content)
             
-            # 运行各个分析器
+            # 各分析器共用一次语法树遍历
+            metrics, complexity, naming, documentation, performance, latency = run_visitors(tree, [
+                self.metrics_analyzer.visitor(tree, content),
+                self.complexity_analyzer.visitor(tree),
+                self.naming_analyzer.visitor(tree),
+                self.documentation_analyzer.visitor(tree),
+                self.performance_analyzer.visitor(tree),
+                self.latency_analyzer.visitor(tree)
+            ])
             results = {}
-            results['metrics'] = self.metrics_analyzer.analyze(tree, content)
-            results['complexity'] = self.complexity_analyzer.analyze(tree)
-            results['naming'] = self.naming_analyzer.analyze(tree)
-            results['documentation'] = self.documentation_analyzer.analyze(tree)
+            results['metrics'] = metrics
+            results['complexity'] = complexity
+            results['naming'] = naming
+            results['documentation'] = documentation
+            results['performance'] = performance
+            results['latency'] = latency
+            results['source'] = content
             
             return results
             
@@ -126,11 +204,195 @@ class CodeQualityChecker:
             logger.error(f"分析文件 {file_path} 时发生错误: {str(e)}")
             return {'error': str(e)}
             
-    def check_project(self, days: Optional[int] = None) -> CodeQualityReport:
+    def summarize_file(self, rel_path: str, abs_path: str) -> FileAnalysis:
+        """分析单个文件并整理出报告需要的数据
+        
+        Args:
+            rel_path: 相对项目根目录的路径
+            abs_path: 绝对路径
+            
+        Returns:
+            文件的精简分析结果
+        """
+        file_results = self.analyze_file(Path(abs_path))
+        
+        if 'error' in file_results:
+            return FileAnalysis(rel_path=rel_path, error=file_results['error'])
+            
+        metrics = file_results['metrics']
+        complexity = file_results['complexity']
+        naming = file_results['naming']
+        documentation = file_results['documentation']
+        performance = file_results['performance']
+        latency = file_results['latency']
+        lines = file_results['source'].splitlines()
+        issues = []
+        fingerprints = []
+        
+        # Check complexity
+        if complexity.score > self.max_complexity:
+            for detail in complexity.details:
+                issues.append(
+                    f"{rel_path}: High complexity ({detail.score}) at {detail.location}"
+                )
+                source = _source_line(lines, detail.location)
+                fingerprints.append(issue_fingerprint('complexity', detail.type, source))
+        
+        # Check naming
+        for issue in naming.issues:
+            issues.append(f"{rel_path}: {issue}")
+            fingerprints.append(issue_fingerprint('naming', issue))
+        
+        # Check documentation
+        if documentation.coverage < self.min_doc_coverage:
+            issues.append(
+                f"{rel_path}: Low documentation coverage ({documentation.coverage:.0%})"
+            )
+            fingerprints.append(issue_fingerprint('documentation', 'coverage'))
+            
+        # Check performance anti-patterns
+        superseded = {(finding.rule, finding.line, finding.column)
+                      for finding in latency.findings}
+        for finding in performance.findings:
+            latency_rule = SUPERSEDED_BY_LATENCY.get(finding.rule)
+            if (latency_rule, finding.line, finding.column) in superseded:
+                continue
+            issues.append(f"{rel_path}: [{finding.severity}] {finding.message} "
+                          f"at {finding.location}")
+            source = _source_line(lines, finding.location)
+            fingerprints.append(issue_fingerprint('performance', finding.rule, source))
+            
+        # Check Selenium waits and selectors
+        for finding in latency.findings:
+            issues.append(f"{rel_path}: [{finding.severity}] {finding.message} "
+                          f"at {finding.location}")
+            source = _source_line(lines, finding.location)
+            fingerprints.append(issue_fingerprint('selenium', finding.rule, source))
+            
+        return FileAnalysis(
+            rel_path=rel_path,
+            total_lines=metrics.total_lines,
+            code_lines=metrics.code_lines,
+            complexity=complexity.score,
+            doc_coverage=documentation.coverage,
+            issues=issues,
+            fingerprints=fingerprints
+        )
+        
+    def analyze_files(self, files: List[Tuple[str, str]]) -> Iterator[FileAnalysis]:
+        """分析一批文件，结果顺序与输入顺序一致
+        
+        jobs 大于1时把文件分块交给进程池，工作进程只返回精简结果；
+        按块顺序取回结果，报告与逐个分析时完全相同。
+        
+        Args:
+            files: (相对路径, 绝对路径) 列表
+            
+        Yields:
+            每个文件的精简分析结果
+        """
+        if self.jobs <= 1 or len(files) < 2:
+            for rel_path, abs_path in files:
+                yield self.summarize_file(rel_path, abs_path)
+            return
+            
+        workers = min(self.jobs, len(files))
+        chunk_size = max(1, min(MAX_CHUNK_SIZE, math.ceil(len(files) / (workers * 4))))
+        chunks = [files[i:i + chunk_size] for i in range(0, len(files), chunk_size)]
+        logger.debug(f"使用 {workers} 个进程分析 {len(files)} 个文件，"
+                     f"共 {len(chunks)} 块")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            for results in pool.map(_analyze_chunk, chunks):
+                yield from results
+            
+    def cache_settings(self) -> Dict[str, Any]:
+        """返回影响分析结果、需要计入缓存指纹的配置"""
+        return {
+            'strategies': [type(strategy).__name__
+                           for strategy in self.complexity_analyzer.strategies],
+            'performance_strategies': [type(strategy).__name__
+                                       for strategy in self.performance_analyzer.strategies],
+            'latency_strategies': [type(strategy).__name__
+                                   for strategy in self.latency_analyzer.strategies],
+            'max_complexity': self.max_complexity,
+            'min_doc_coverage': self.min_doc_coverage,
+            'naming_conventions': self.config_manager.get_config().naming_conventions
+        }
+        
+    def iter_results(self, days: Optional[int] = None, base: Optional[str] = None,
+                     changed_only: bool = False,
+                     apply_baseline: bool = True) -> Iterator[FileAnalysis]:
+        """按文件顺序逐个产出分析结果
+        
+        缓存未命中的文件重新分析（jobs 大于1时使用进程池），
+        结果在产生后立即交给调用方。
+        设置了基线时去掉基线中已有的问题，
+        分析错误已在基线中的文件不产出。
+        遍历结束后保存缓存，并把命中率记录在 last_cache_hit_rate 中。
+        
+        Args:
+            days: 可选，只检查最近几天修改的文件
+            base: 可选，只检查相对该Git引用变更的文件（含未提交的修改）
+            changed_only: 只检查变更的文件，
+                未提供 days 和 base 时只检查未提交的修改
+            apply_baseline: 是否按基线过滤问题
+            
+        Yields:
+            每个文件的精简分析结果
+        """
+        self.last_cache_hit_rate = None
+        files = list(self.file_iterator.iter_python_files(days, base, changed_only))
+        full_run = not (changed_only or days or base is not None)
+        cache = None
+        if self.cache_path:
+            cache = AnalysisCache(self.cache_path, fingerprint(self.cache_settings()))
+        analyses: List[Optional[FileAnalysis]] = []
+        changed = []
+        for rel_path, abs_path in files:
+            cached = cache.lookup(rel_path, abs_path) if cache else None
+            if cached is None:
+                changed.append((rel_path, abs_path))
+                analyses.append(None)
+            else:
+                analyses.append(FileAnalysis(**cached))
+        fresh = self.analyze_files(changed)
+        
+        baseline = self.baseline if apply_baseline else None
+        if baseline:
+            baseline.suppressed = 0
+        renames = self.file_iterator.renames
+        for analysis in analyses:
+            if analysis is None:
+                analysis = next(fresh)
+                if cache:
+                    cache.store(analysis.rel_path, analysis)
+            if baseline:
+                old_path = renames.get(analysis.rel_path.replace(os.sep, '/'))
+                analysis = baseline.filter(analysis, old_path)
+                if analysis is None:
+                    continue
+            yield analysis
+        
+        if baseline:
+            logger.info(f"基线中已有的问题 {baseline.suppressed} 个已忽略")
+        
+        if cache:
+            cache.save(self.project_root if full_run else None)
+            self.last_cache_hit_rate = cache.hit_rate
+            logger.info(f"分析缓存命中 {cache.hits}/{cache.hits + cache.misses} 个文件 "
+                        f"({self.last_cache_hit_rate:.0%})")
+            
+    def check_project(self, days: Optional[int] = None, base: Optional[str] = None,
+                      changed_only: bool = False) -> CodeQualityReport:
         """检查整个项目
         
         Args:
             days: 可选，只检查最近几天修改的文件
+            base: 可选，只检查相对该Git引用变更的文件（含未提交的修改）
+            changed_only: 只检查变更的文件，
+                未提供 days 和 base 时只检查未提交的修改
             
         Returns:
             项目检查结果
@@ -142,49 +404,25 @@ class CodeQualityChecker:
         issues = []
         file_metrics = {}
         
-        # 遍历项目文件
-        for rel_path, abs_path in self.file_iterator.iter_python_files(days):
+        # 按文件顺序合并结果
+        for analysis in self.iter_results(days, base, changed_only):
             total_files += 1
             
-            # 分析文件
-            file_results = self.analyze_file(Path(abs_path))
-            
-            if 'error' in file_results:
-                issues.append(f"{rel_path}: {file_results['error']}")
+            if analysis.error is not None:
+                issues.append(f"{analysis.rel_path}: {analysis.error}")
                 continue
                 
-            # Record metrics
-            metrics = file_results['metrics']
-            total_lines += metrics.total_lines
-            total_code_lines += metrics.code_lines
-            
-            # Check complexity
-            complexity = file_results['complexity']
-            total_complexity += complexity.score
-            if complexity.score > self.max_complexity:
-                for detail in complexity.details:
-                    issues.append(
-                        f"{rel_path}: High complexity ({detail.score}) at {detail.location}"
-                    )
-            
-            # Check naming
-            naming = file_results['naming']
-            for issue in naming.issues:
-                issues.append(f"{rel_path}: {issue}")
-            
-            # Check documentation
-            documentation = file_results['documentation']
-            if documentation.coverage < self.min_doc_coverage:
-                issues.append(
-                    f"{rel_path}: Low documentation coverage ({documentation.coverage:.0%})"
-                )
+            total_lines += analysis.total_lines
+            total_code_lines += analysis.code_lines
+            total_complexity += analysis.complexity
+            issues.extend(analysis.issues)
             
             # Record file metrics
-            file_metrics[rel_path] = {
-                'lines': metrics.total_lines,
-                'code_lines': metrics.code_lines,
-                'complexity': complexity.score,
-                'doc_coverage': documentation.coverage
+            file_metrics[analysis.rel_path] = {
+                'lines': analysis.total_lines,
+                'code_lines': analysis.code_lines,
+                'complexity': analysis.complexity,
+                'doc_coverage': analysis.doc_coverage
             }
         
         return CodeQualityReport(
@@ -193,21 +431,68 @@ class CodeQualityChecker:
             code_lines=total_code_lines,
             avg_complexity=total_complexity / total_files if total_files > 0 else 0,
             issues=issues,
-            file_metrics=file_metrics
+            file_metrics=file_metrics,
+            cache_hit_rate=self.last_cache_hit_rate
         )
         
-    def generate_report(self, format: str = 'text', days: Optional[int] = None) -> str:
+    def write_baseline(self, path: str, days: Optional[int] = None, base: Optional[str] = None,
+                       changed_only: bool = False) -> Baseline:
+        """分析项目并把当前全部问题保存为基线
+        
+        Args:
+            path: 基线文件路径
+            days: 可选，只检查最近几天修改的文件
+            base: 可选，只检查相对该Git引用变更的文件
+            changed_only: 只检查变更的文件
+            
+        Returns:
+            生成的基线
+        """
+        results = self.iter_results(days, base, changed_only, apply_baseline=False)
+        baseline = Baseline.from_results(results)
+        baseline.save(path)
+        logger.info(f"基线已保存到 {path}，共 {baseline.issue_count} 个问题")
+        return baseline
+        
+    def write_report(self, writer: ReportWriter, days: Optional[int] = None,
+                     base: Optional[str] = None, changed_only: bool = False) -> Dict[str, Any]:
+        """边分析边输出报告，汇总信息最后写出
+        
+        不在内存中保留整个项目的结果，每个文件分析完成后立即写出。
+        
+        Args:
+            writer: 流式报告写入器
+            days: 可选，只检查最近几天修改的文件
+            base: 可选，只检查相对该Git引用变更的文件
+            changed_only: 只检查变更的文件
+            
+        Returns:
+            汇总信息
+        """
+        summary = ReportSummary()
+        writer.begin()
+        for analysis in self.iter_results(days, base, changed_only):
+            summary.add(analysis)
+            writer.write_file(analysis)
+        summary.cache_hit_rate = self.last_cache_hit_rate
+        writer.finish(summary.as_dict())
+        return summary.as_dict()
+        
+    def generate_report(self, format: str = 'text', days: Optional[int] = None,
+                        base: Optional[str] = None, changed_only: bool = False) -> str:
         """生成检查报告
         
         Args:
             format: 报告格式（text/json/html）
             days: 可选，只检查最近几天修改的文件
+            base: 可选，只检查相对该Git引用变更的文件
+            changed_only: 只检查变更的文件
             
         Returns:
             生成的报告
         """
         # 运行检查
-        results = self.check_project(days)
+        results = self.check_project(days, base, changed_only)
         
         # 创建报告生成器
         generator = create_report_generator(format)
@@ -1,11 +1,93 @@
 """File iteration utilities for code quality checking."""
 
+import fnmatch
+import logging
 import os
 import re
 import subprocess
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExcludeMatcher:
+    """Glob exclusion patterns compiled into a single regular expression.
+    
+    Paths are matched relative to the project root with ``/`` separators.
+    ``*`` and ``**`` match any characters including ``/``; a leading ``**/``
+    also matches at the root. A path is excluded when a pattern matches it or
+    one of its parent directories, and a directory is also excluded by
+    patterns of the form ``dir/*`` or ``dir/**`` so it can be pruned whole.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile the patterns.
+        
+        Args:
+            patterns: Glob patterns for files and directories to exclude
+        """
+        self.patterns = list(patterns)
+        path_patterns = []
+        dir_patterns = []
+        for pattern in self.patterns:
+            pattern = pattern.replace('\\', '/').rstrip('/')
+            variants = [pattern]
+            if pattern.startswith('**/'):
+                variants.append(pattern[3:])
+            for variant in variants:
+                path_patterns.append(variant)
+                for suffix in ('/**', '/*'):
+                    if variant.endswith(suffix):
+                        dir_patterns.append(variant[:-len(suffix)])
+                        break
+        self._path_regex = self._compile(path_patterns)
+        self._dir_regex = self._compile(path_patterns + dir_patterns)
+
+    @staticmethod
+    def _compile(patterns: List[str]) -> Optional['re.Pattern[str]']:
+        if not patterns:
+            return None
+        return re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in patterns))
+
+    def match_file(self, rel_path: str) -> bool:
+        """Check a file path whose parent directories were already checked.
+        
+        Args:
+            rel_path: Path relative to the project root, ``/`` separated
+            
+        Returns:
+            True if the file is excluded
+        """
+        return self._path_regex is not None and self._path_regex.match(rel_path) is not None
+
+    def match_dir(self, rel_path: str) -> bool:
+        """Check a directory whose parent directories were already checked.
+        
+        Args:
+            rel_path: Path relative to the project root, ``/`` separated
+            
+        Returns:
+            True if the directory and everything below it is excluded
+        """
+        return self._dir_regex is not None and self._dir_regex.match(rel_path) is not None
+
+    def match(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path, including all of its parent directories.
+        
+        Args:
+            rel_path: Path relative to the project root, ``/`` separated
+            is_dir: Whether the path is a directory
+            
+        Returns:
+            True if the path is excluded
+        """
+        parts = rel_path.split('/')
+        for index in range(1, len(parts)):
+            if self.match_dir('/'.join(parts[:index])):
+                return True
+        return self.match_dir(rel_path) if is_dir else self.match_file(rel_path)
 
 
 class FileIterator:
@@ -31,6 +113,9 @@ class FileIterator:
             '**/*.pyd',
             '**/setup.py'
         ]
+        self.matcher = ExcludeMatcher(self.exclude_patterns)
+        # New path -> old path for files renamed in the last changed-file query
+        self.renames: Dict[str, str] = {}
 
     def should_exclude(self, path: Path) -> bool:
         """Check if a path should be excluded based on patterns.
@@ -41,62 +126,158 @@ class FileIterator:
         Returns:
             True if the path should be excluded
         """
-        rel_path = str(path.relative_to(self.project_root))
-        return any(re.match(pattern.replace('*', '.*'), rel_path)
-                  for pattern in self.exclude_patterns)
+        rel_path = Path(path).relative_to(self.project_root).as_posix()
+        if rel_path == '.':
+            return False
+        return self.matcher.match(rel_path, is_dir=Path(path).is_dir())
+
+    def _git(self, *args: str) -> str:
+        """Run a git command in the project root and return its stdout."""
+        result = subprocess.run(
+            ['git', *args],
+            cwd=self.project_root,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout
 
-    def get_git_changed_files(self, days: int) -> List[str]:
-        """Get list of Python files changed in Git within specified days.
+    def _range_since(self, days: int) -> List[str]:
+        """Build the diff range covering commits of the last ``days`` days.
         
         Args:
             days: Number of days to look back
             
         Returns:
-            List of relative paths to changed Python files
+            ``[commit...HEAD]`` for the last commit before the cutoff, or
+            ``[empty_tree, HEAD]`` when all history is more recent
         """
         since_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        commit = self._git('rev-list', '-1', f'--before={since_date}', 'HEAD').strip()
+        if commit:
+            return [f'{commit}...HEAD']
+        return [self._git('hash-object', '-t', 'tree', os.devnull).strip(), 'HEAD']
+
+    def _parse_name_status(self, output: str) -> List[str]:
+        """Parse ``git diff --name-status -z`` output, tracking renames.
+        
+        Deleted files are dropped; renamed and copied files are reported under
+        their new path and recorded in ``self.renames``.
+        
+        Args:
+            output: NUL separated name-status output
+            
+        Returns:
+            Paths of added, modified, renamed or copied files
+        """
+        fields = output.split('\0')
+        paths = []
+        index = 0
+        while index < len(fields) and fields[index]:
+            status = fields[index]
+            if status[0] in 'RC':
+                old_path, new_path = fields[index + 1], fields[index + 2]
+                index += 3
+                if status[0] == 'R':
+                    self.renames[new_path] = old_path
+                paths.append(new_path)
+                continue
+            path = fields[index + 1]
+            index += 2
+            if status[0] != 'D':
+                paths.append(path)
+        return paths
+
+    def get_git_changed_files(self, days: Optional[int] = None,
+                              base: Optional[str] = None) -> List[str]:
+        """Get Python files changed since a base ref, plus uncommitted changes.
+        
+        Committed changes come from ``git diff --name-status -M base...HEAD``
+        (changes on this branch since it diverged from ``base``); staged,
+        unstaged and untracked files are added from the working tree. Paths
+        are relative to the project root and limited to it.
+        
+        Args:
+            days: Use the last commit before this many days ago as the base
+            base: Base ref to diff against, takes precedence over ``days``
+            
+        Returns:
+            Sorted relative paths (``/`` separated) to changed Python files
+        """
+        self.renames = {}
         try:
-            result = subprocess.run(
-                ['git', 'log', '--name-only', '--pretty=format:', f'--since={since_date}'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            changed_files = set(
-                line for line in result.stdout.splitlines()
-                if line and line.endswith('.py')
-            )
-            return list(changed_files)
-        except (subprocess.CalledProcessError, FileNotFoundError):
+            diff = ['diff', '--name-status', '-M', '-z', '--relative']
+            changed = []
+            if base is not None:
+                changed += self._parse_name_status(self._git(*diff, f'{base}...HEAD'))
+            elif days:
+                changed += self._parse_name_status(self._git(*diff, *self._range_since(days)))
+            changed += self._parse_name_status(self._git(*diff, 'HEAD'))
+            changed += self._git('ls-files', '--others', '--exclude-standard', '-z').split('\0')
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            logger.warning(f"获取Git变更文件失败: {e}")
             return []
+        return sorted({path for path in changed if path.endswith('.py')})
 
-    def iter_python_files(self, days: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+    def iter_python_files(self, days: Optional[int] = None,
+                          base: Optional[str] = None,
+                          changed_only: bool = False) -> Iterator[Tuple[str, str]]:
         """Iterate over Python files in the project.
         
+        In changed-only mode (``changed_only``, ``days`` or ``base`` given)
+        only the files reported by git are checked, without walking the tree.
+        
         Args:
             days: Optional number of days to limit to recently changed files
+            base: Optional base ref to limit to files changed since it
+            changed_only: Limit to changed files; without ``days`` or ``base``
+                only uncommitted changes are used
             
         Yields:
             Tuples of (relative_path, absolute_path) for each Python file
         """
-        changed_files = set(self.get_git_changed_files(days)) if days else None
+        if not (changed_only or days or base is not None):
+            yield from self._walk()
+            return
+            
+        for rel_posix in self.get_git_changed_files(days, base):
+            abs_path = os.path.join(str(self.project_root), *rel_posix.split('/'))
+            if not os.path.isfile(abs_path) or self.matcher.match(rel_posix):
+                continue
+            yield os.path.normpath(rel_posix), abs_path
+
+    def _walk(self) -> Iterator[Tuple[str, str]]:
+        """Walk the project with os.scandir, pruning excluded directories.
+        
+        Directory entries are classified with the stat data cached by
+        ``scandir``; excluded directories are never opened. Entries are
+        visited in name order so results are stable across file systems.
         
-        for root, _, files in os.walk(self.project_root):
-            root_path = Path(root)
-            if self.should_exclude(root_path):
+        Yields:
+            Tuples of (relative_path, absolute_path) for each Python file
+        """
+        stack = [(str(self.project_root), '')]
+        while stack:
+            directory, rel_dir = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError:
                 continue
                 
-            for file in files:
-                if not file.endswith('.py'):
-                    continue
-                    
-                file_path = root_path / file
-                if self.should_exclude(file_path):
-                    continue
-                    
-                rel_path = file_path.relative_to(self.project_root)
-                if changed_files is not None and str(rel_path) not in changed_files:
+            subdirs = []
+            for entry in entries:
+                rel_posix = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
                     continue
+                if is_dir:
+                    # Like os.walk, symlinked directories are not followed
+                    if not entry.is_symlink() and not self.matcher.match_dir(rel_posix):
+                        subdirs.append((entry.path, rel_posix))
+                elif entry.name.endswith('.py') and not self.matcher.match_file(rel_posix):
+                    yield os.path.normpath(rel_posix), entry.path
                     
-                yield str(rel_path), str(file_path) 
\ No newline at end of file
+            # Files of a directory come before its subdirectories
+            stack.extend(reversed(subdirs))
@@ -0,0 +1,114 @@
+"""Selenium 延迟排行
+
+分析 Selenium 自动化代码中的固定等待、隐式/显式等待混用、
+串行备选选择器、绝对 XPath 和包裹 find_element 的裸 except，
+估算每处在最坏情况下增加的等待时间，并按函数排序输出。
+
+使用示例:
+    python -m tools.code_quality_checker.code_quality_checker.latency \
+        src/core/test_case/case_manager.py
+    python -m tools.code_quality_checker.code_quality_checker.latency src --top 10 --details
+"""
+
+import argparse
+import ast
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional
+
+from .analyzers.selenium_latency import LatencyFinding, SeleniumLatencyAnalyzer
+from .file_iterator import FileIterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RankedFunction:
+    """排行中的一个函数"""
+    path: str
+    function: str
+    line: int
+    latency: float
+    findings: List[LatencyFinding]
+
+
+def _python_files(paths: Iterable[str]) -> List[str]:
+    """展开命令行给出的文件和目录"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(abs_path for _, abs_path in FileIterator(path).iter_python_files())
+        else:
+            files.append(path)
+    return files
+
+
+def rank_latency(paths: Iterable[str],
+                 analyzer: Optional[SeleniumLatencyAnalyzer] = None) -> List[RankedFunction]:
+    """分析文件并按最坏情况延迟对函数排序
+
+    Args:
+        paths: 文件或目录
+        analyzer: Selenium 延迟分析器，默认使用全部策略
+
+    Returns:
+        按延迟从高到低排序的函数列表
+    """
+    analyzer = analyzer or SeleniumLatencyAnalyzer()
+    ranking = []
+    for path in _python_files(paths):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError) as e:
+            logger.warning(f"跳过无法解析的文件 {path}: {str(e)}")
+            continue
+        result = analyzer.analyze(tree)
+        for entry in result.functions:
+            findings = [finding for finding in result.findings
+                        if finding.function == entry.function]
+            ranking.append(RankedFunction(path, entry.function, entry.line, entry.latency,
+                                          findings))
+    ranking.sort(key=lambda item: (-item.latency, item.path, item.line))
+    return ranking
+
+
+def format_ranking(ranking: List[RankedFunction], details: bool = False) -> str:
+    """格式化排行"""
+    if not ranking:
+        return "未发现 Selenium 延迟问题"
+    lines = []
+    for index, item in enumerate(ranking, 1):
+        lines.append(f"{index:>3}. {item.latency:>8.1f}s  {item.function}  "
+                     f"({item.path}:{item.line}, {len(item.findings)} 处)")
+        if details:
+            lines.extend(f"        [{finding.severity}] {finding.message} at {finding.location}"
+                         for finding in item.findings)
+    lines.append(f"合计最坏情况延迟: {sum(item.latency for item in ranking):.1f}s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description='Selenium 延迟排行')
+    parser.add_argument('paths', nargs='+', help='要分析的文件或目录')
+    parser.add_argument('--top', type=int, help='只显示延迟最高的N个函数')
+    parser.add_argument('--details', action='store_true', help='列出每个函数中的问题')
+    parser.add_argument('--output', help='将排行保存为JSON文件')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    ranking = rank_latency(args.paths)
+    if args.top:
+        ranking = ranking[:args.top]
+    print(format_ranking(ranking, args.details))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([asdict(item) for item in ranking], f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
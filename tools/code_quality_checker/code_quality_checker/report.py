@@ -1,7 +1,9 @@
 """Report generation for code quality analysis."""
 
+import html
+import json
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, TextIO
 
 
 class ReportGenerator(ABC):
@@ -157,4 +159,275 @@ def create_report_generator(format: str) -> ReportGenerator:
     if format not in generators:
         raise ValueError(f"Unsupported report format: {format}")
         
-    return generators[format]() 
\ No newline at end of file
+    return generators[format]() 
+
+
+class ReportSummary:
+    """Accumulates project totals while per-file results stream past."""
+
+    def __init__(self):
+        self.total_files = 0
+        self.total_lines = 0
+        self.code_lines = 0
+        self.total_complexity = 0
+        self.issue_count = 0
+        self.error_count = 0
+        self.cache_hit_rate: Optional[float] = None
+
+    def add(self, analysis: Any) -> None:
+        """Add one file's analysis result.
+        
+        Args:
+            analysis: Per-file result (``FileAnalysis``)
+        """
+        self.total_files += 1
+        self.issue_count += len(file_issues(analysis))
+        if analysis.error is not None:
+            self.error_count += 1
+            return
+        self.total_lines += analysis.total_lines
+        self.code_lines += analysis.code_lines
+        self.total_complexity += analysis.complexity
+
+    def remove(self, analysis: Any) -> None:
+        """Remove a previously added result, e.g. when a file changes or is deleted.
+        
+        Args:
+            analysis: Per-file result passed to ``add`` earlier
+        """
+        self.total_files -= 1
+        self.issue_count -= len(file_issues(analysis))
+        if analysis.error is not None:
+            self.error_count -= 1
+            return
+        self.total_lines -= analysis.total_lines
+        self.code_lines -= analysis.code_lines
+        self.total_complexity -= analysis.complexity
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the summary in report form."""
+        return {
+            'total_files': self.total_files,
+            'total_lines': self.total_lines,
+            'code_lines': self.code_lines,
+            'avg_complexity': (self.total_complexity / self.total_files
+                               if self.total_files > 0 else 0),
+            'issue_count': self.issue_count,
+            'error_count': self.error_count,
+            'cache_hit_rate': self.cache_hit_rate
+        }
+
+
+def file_issues(analysis: Any) -> List[str]:
+    """Issues reported for a file, including its analysis error if any."""
+    if analysis.error is not None:
+        return [f"{analysis.rel_path}: {analysis.error}"]
+    return analysis.issues
+
+
+def file_record(analysis: Any) -> Dict[str, Any]:
+    """Serializable per-file record used by the JSON based writers."""
+    record = {'path': analysis.rel_path}
+    if analysis.error is None:
+        record.update({
+            'lines': analysis.total_lines,
+            'code_lines': analysis.code_lines,
+            'complexity': analysis.complexity,
+            'doc_coverage': analysis.doc_coverage
+        })
+    else:
+        record['error'] = analysis.error
+    record['issues'] = file_issues(analysis)
+    return record
+
+
+class ReportWriter(ABC):
+    """Base class for streaming report writers.
+    
+    ``begin`` is called once, ``write_file`` for every file as soon as its
+    result is available, and ``finish`` with the aggregate summary at the end.
+    Output is flushed after each file so partial reports can be followed.
+    """
+
+    def __init__(self, stream: TextIO):
+        """Initialize the writer.
+        
+        Args:
+            stream: Text stream to write to (file or stdout)
+        """
+        self.stream = stream
+
+    def begin(self) -> None:
+        """Write the report header."""
+
+    @abstractmethod
+    def write_file(self, analysis: Any) -> None:
+        """Write one file's results.
+        
+        Args:
+            analysis: Per-file result (``FileAnalysis``)
+        """
+
+    @abstractmethod
+    def finish(self, summary: Dict[str, Any]) -> None:
+        """Write the aggregate summary.
+        
+        Args:
+            summary: Project totals from ``ReportSummary.as_dict``
+        """
+
+    def _write(self, text: str) -> None:
+        self.stream.write(text)
+
+    def _flush(self) -> None:
+        self.stream.flush()
+
+
+def _summary_lines(summary: Dict[str, Any]) -> List[str]:
+    lines = [
+        f"Total files: {summary['total_files']}",
+        f"Total lines: {summary['total_lines']}",
+        f"Code lines: {summary['code_lines']}",
+        f"Average complexity: {summary['avg_complexity']:.2f}",
+        f"Issues: {summary['issue_count']}"
+    ]
+    if summary.get('cache_hit_rate') is not None:
+        lines.append(f"Cache hit rate: {summary['cache_hit_rate']:.0%}")
+    return lines
+
+
+class TextReportWriter(ReportWriter):
+    """Stream text format reports."""
+
+    def begin(self) -> None:
+        self._write("Code Quality Report\n==================\n\nFile Analysis:\n-------------\n")
+        self._flush()
+
+    def write_file(self, analysis: Any) -> None:
+        lines = [f"\n{analysis.rel_path}:"]
+        if analysis.error is None:
+            lines.extend([
+                f"  Lines: {analysis.total_lines}",
+                f"  Code lines: {analysis.code_lines}",
+                f"  Complexity: {analysis.complexity}",
+                f"  Documentation coverage: {analysis.doc_coverage:.0f}%"
+            ])
+        lines.extend(f"  - {issue}" for issue in file_issues(analysis))
+        self._write("\n".join(lines) + "\n")
+        self._flush()
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        lines = ["", "Project Overview:", "-----------------"] + _summary_lines(summary)
+        self._write("\n".join(lines) + "\n")
+        self._flush()
+
+
+class JsonReportWriter(ReportWriter):
+    """Stream a JSON document: ``{"files": [...], "summary": {...}}``."""
+
+    def begin(self) -> None:
+        self._count = 0
+        self._write('{\n  "files": [')
+        self._flush()
+
+    def write_file(self, analysis: Any) -> None:
+        separator = ',' if self._count else ''
+        self._write(f"{separator}\n    {json.dumps(file_record(analysis), ensure_ascii=False)}")
+        self._count += 1
+        self._flush()
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        closing = "\n  ]" if self._count else "]"
+        self._write(f'{closing},\n  "summary": {json.dumps(summary, ensure_ascii=False)}\n}}\n')
+        self._flush()
+
+
+class NdjsonReportWriter(ReportWriter):
+    """Stream newline-delimited JSON: one ``file`` record per line, then a ``summary`` record."""
+
+    def write_file(self, analysis: Any) -> None:
+        record = dict({'type': 'file'}, **file_record(analysis))
+        self._write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._flush()
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        self._write(json.dumps(dict({'type': 'summary'}, **summary), ensure_ascii=False) + "\n")
+        self._flush()
+
+
+class HtmlReportWriter(ReportWriter):
+    """Stream HTML format reports."""
+
+    def begin(self) -> None:
+        self._write("\n".join([
+            "<!DOCTYPE html>",
+            "<html>",
+            "<head>",
+            '<meta charset="utf-8">',
+            "<title>Code Quality Report</title>",
+            "<style>",
+            "body { font-family: Arial, sans-serif; margin: 20px; }",
+            "h1, h2 { color: #333; }",
+            ".overview { background: #f5f5f5; padding: 15px; border-radius: 5px; }",
+            ".file { margin: 20px 0; padding: 10px; border: 1px solid #ddd; }",
+            ".issues { color: #d73a49; }",
+            "</style>",
+            "</head>",
+            "<body>",
+            "<h1>Code Quality Report</h1>",
+            "<h2>File Analysis</h2>"
+        ]) + "\n")
+        self._flush()
+
+    def write_file(self, analysis: Any) -> None:
+        parts = ['<div class="file">', f"<h3>{html.escape(analysis.rel_path)}</h3>"]
+        if analysis.error is None:
+            parts.extend([
+                "<ul>",
+                f"<li>Lines: {analysis.total_lines}</li>",
+                f"<li>Code lines: {analysis.code_lines}</li>",
+                f"<li>Complexity: {analysis.complexity}</li>",
+                f"<li>Documentation coverage: {analysis.doc_coverage:.0f}%</li>",
+                "</ul>"
+            ])
+        issues = file_issues(analysis)
+        if issues:
+            parts.append('<ul class="issues">')
+            parts.extend(f"<li>{html.escape(issue)}</li>" for issue in issues)
+            parts.append("</ul>")
+        parts.append("</div>")
+        self._write("\n".join(parts) + "\n")
+        self._flush()
+
+    def finish(self, summary: Dict[str, Any]) -> None:
+        parts = ['<div class="overview">', "<h2>Project Overview</h2>"]
+        parts.extend(f"<p>{line}</p>" for line in _summary_lines(summary))
+        parts.extend(["</div>", "</body>", "</html>"])
+        self._write("\n".join(parts) + "\n")
+        self._flush()
+
+
+def create_report_writer(format: str, stream: TextIO) -> ReportWriter:
+    """Create a streaming report writer for the specified format.
+    
+    Args:
+        format: Report format ('text', 'json', 'ndjson' or 'html')
+        stream: Text stream to write to
+        
+    Returns:
+        Appropriate report writer instance
+        
+    Raises:
+        ValueError: If format is not supported
+    """
+    writers = {
+        'text': TextReportWriter,
+        'json': JsonReportWriter,
+        'ndjson': NdjsonReportWriter,
+        'html': HtmlReportWriter
+    }
+    
+    if format not in writers:
+        raise ValueError(f"Unsupported report format: {format}")
+        
+    return writers[format](stream)
@@ -0,0 +1,352 @@
+"""监视模式模块
+
+常驻进程在内存中保存每个文件的分析结果。
+文件变化后只重新分析变化的文件，增量输出新增和消失的问题，
+并在不重新扫描的情况下更新项目汇总。
+Linux 上通过 inotify 监视目录，其他平台或 inotify 不可用时退回到轮询。
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, Optional, Set, TextIO, Tuple
+
+from .checker import CodeQualityChecker, FileAnalysis
+from .file_iterator import ExcludeMatcher, FileIterator
+from .report import ReportSummary, file_issues
+
+logger = logging.getLogger(__name__)
+
+# inotify 事件掩码
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# 表示需要全量比对的变化（如 inotify 事件队列溢出）
+RESCAN = ''
+
+# 收到第一个事件后继续收集事件的时间，
+# 合并编辑器一次保存产生的多个事件
+DEBOUNCE_SECONDS = 0.05
+
+
+class PollingWatcher:
+    """轮询文件大小和修改时间的监视器
+
+    Args:
+        file_iterator: 项目的文件遍历器，遍历时剪枝被排除的目录
+    """
+
+    def __init__(self, file_iterator: FileIterator):
+        self.file_iterator = file_iterator
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for rel_path, abs_path in self.file_iterator.iter_python_files():
+            try:
+                stat = os.stat(abs_path)
+            except OSError:
+                continue
+            snapshot[rel_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout: float) -> Set[str]:
+        """等待并返回变化的文件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            新增、修改或删除的文件的相对路径
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {rel for rel in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(rel) != self._snapshot.get(rel)}
+            self._snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(remaining, 0.2))
+
+    def close(self) -> None:
+        """释放资源"""
+
+
+class InotifyWatcher:
+    """基于 inotify 的目录监视器
+
+    为每个未被排除的目录添加监视，新建的目录会自动加入监视。
+
+    Args:
+        root: 项目根目录
+        matcher: 排除规则
+
+    Raises:
+        OSError: 当前平台不支持 inotify 或初始化失败
+    """
+
+    def __init__(self, root: str, matcher: ExcludeMatcher):
+        library = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("当前平台不支持 inotify")
+        self._libc = libc
+        self.root = str(root)
+        self.matcher = matcher
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self._dirs: Dict[int, str] = {}
+        self._add_tree('')
+
+    def _add_tree(self, rel_dir: str) -> Set[str]:
+        """监视目录及其未被排除的子目录
+
+        Returns:
+            目录中已经存在的Python文件
+        """
+        files = set()
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            path = os.path.join(self.root, current) if current else self.root
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                logger.debug(f"无法监视目录 {path}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._dirs[wd] = current
+            try:
+                with os.scandir(path) as it:
+                    for entry in it:
+                        rel = f"{current}/{entry.name}" if current else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self.matcher.match_dir(rel):
+                                stack.append(rel)
+                        elif entry.name.endswith('.py') and not self.matcher.match_file(rel):
+                            files.add(rel)
+            except OSError:
+                continue
+        return files
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None or not name:
+                continue
+            rel = f"{parent}/{name}" if parent else name
+            if mask & IN_ISDIR:
+                if self.matcher.match_dir(rel):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed |= self._add_tree(rel)
+                # 目录被删除或移走时，由调用方移除其下的文件
+                changed.add(rel)
+            elif name.endswith('.py') and not self.matcher.match_file(rel):
+                changed.add(rel)
+        return changed
+
+    def poll(self, timeout: float) -> Set[str]:
+        """等待并返回变化的路径
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            变化的文件或目录的相对路径（``/`` 分隔）
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = self._read_events()
+        # 合并同一次保存产生的多个事件
+        while select.select([self.fd], [], [], DEBOUNCE_SECONDS)[0]:
+            changed |= self._read_events()
+        return changed
+
+    def close(self) -> None:
+        """关闭 inotify 描述符"""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(checker: CodeQualityChecker, polling: bool = False):
+    """创建监视器，inotify 不可用时退回到轮询
+
+    Args:
+        checker: 代码质量检查器
+        polling: 强制使用轮询
+
+    Returns:
+        InotifyWatcher 或 PollingWatcher
+    """
+    iterator = checker.file_iterator
+    if not polling:
+        try:
+            return InotifyWatcher(str(iterator.project_root), iterator.matcher)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify 不可用，改为轮询: {str(e)}")
+    return PollingWatcher(iterator)
+
+
+class WatchSession:
+    """监视模式的会话
+
+    保存每个文件的分析结果和项目汇总，
+    文件变化时只重新分析变化的文件。
+
+    Args:
+        checker: 代码质量检查器
+        stream: 输出流，默认为标准输出
+    """
+
+    def __init__(self, checker: CodeQualityChecker, stream: Optional[TextIO] = None):
+        self.checker = checker
+        self.stream = stream or sys.stdout
+        self.root = str(checker.file_iterator.project_root)
+        self.results: Dict[str, FileAnalysis] = {}
+        self.summary = ReportSummary()
+
+    def start(self) -> None:
+        """完整分析一次项目，建立内存中的结果"""
+        for analysis in self.checker.iter_results():
+            self.results[analysis.rel_path] = analysis
+            self.summary.add(analysis)
+        self._print_summary("初始分析完成")
+
+    def _expand(self, changed: Iterable[str]) -> Set[str]:
+        """把变化的路径展开为需要更新的文件
+
+        目录的变化展开为目录下已知的文件和磁盘上现有的文件；
+        RESCAN 展开为全部文件。
+        """
+        files = set()
+        for rel_posix in changed:
+            if rel_posix == RESCAN:
+                files |= set(self.results)
+                files |= {rel for rel, _ in self.checker.file_iterator.iter_python_files()}
+                continue
+            rel = os.path.normpath(rel_posix)
+            if rel.endswith('.py'):
+                files.add(rel)
+            prefix = rel + os.sep
+            files |= {known for known in self.results if known.startswith(prefix)}
+            path = os.path.join(self.root, rel)
+            if os.path.isdir(path):
+                matcher = self.checker.file_iterator.matcher
+                for dirpath, dirnames, filenames in os.walk(path):
+                    rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+                    dirnames[:] = [d for d in dirnames if not matcher.match_dir(f"{rel_dir}/{d}")]
+                    files |= {os.path.normpath(f"{rel_dir}/{f}")
+                              for f in filenames if f.endswith('.py')}
+        return files
+
+    def update(self, changed: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+        """重新分析变化的文件并输出问题的变化
+
+        Args:
+            changed: 变化的路径（相对项目根目录）
+
+        Returns:
+            每个变化文件的 (新增问题数, 消失问题数)
+        """
+        matcher = self.checker.file_iterator.matcher
+        deltas = {}
+        for rel in sorted(self._expand(changed)):
+            path = os.path.join(self.root, rel)
+            old = self.results.pop(rel, None)
+            new = None
+            suppressed = False
+            if os.path.isfile(path) and not matcher.match(rel.replace(os.sep, '/')):
+                new = self.checker.summarize_file(rel, path)
+                if self.checker.baseline:
+                    new = self.checker.baseline.filter(new)
+                    # 基线中已有的分析错误：文件不计入结果
+                    suppressed = new is None
+            if old is None and new is None:
+                continue
+            old_issues = file_issues(old) if old else []
+            new_issues = file_issues(new) if new else []
+            if old is not None:
+                self.summary.remove(old)
+            if new is not None:
+                self.summary.add(new)
+                self.results[rel] = new
+
+            added = [issue for issue in new_issues if issue not in old_issues]
+            resolved = [issue for issue in old_issues if issue not in new_issues]
+            deltas[rel] = (len(added), len(resolved))
+            if new is None:
+                state = "已忽略基线中的分析错误" if suppressed else "已删除"
+            else:
+                state = "已新增" if old is None else "已更新"
+            lines = [f"{rel}: {state}，新增问题 {len(added)}，消失问题 {len(resolved)}"]
+            lines.extend(f"  + {issue}" for issue in added)
+            lines.extend(f"  - {issue}" for issue in resolved)
+            self.stream.write("\n".join(lines) + "\n")
+        if deltas:
+            self._print_summary(time.strftime('%H:%M:%S'))
+        return deltas
+
+    def _print_summary(self, label: str) -> None:
+        summary = self.summary.as_dict()
+        self.stream.write(
+            f"[{label}] 文件 {summary['total_files']}，代码行 {summary['code_lines']}，"
+            f"平均复杂度 {summary['avg_complexity']:.2f}，问题 {summary['issue_count']}\n"
+        )
+        self.stream.flush()
+
+    def run(self, watcher, timeout: float = 1.0, max_batches: Optional[int] = None) -> None:
+        """循环等待文件变化并更新结果，直到被中断
+
+        Args:
+            watcher: InotifyWatcher 或 PollingWatcher
+            timeout: 每次等待的最长时间（秒），轮询时即轮询间隔
+            max_batches: 处理指定批数的变化后返回，None表示一直运行
+        """
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                changed = watcher.poll(timeout)
+                if changed:
+                    started = time.perf_counter()
+                    deltas = self.update(changed)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    logger.debug(f"更新 {len(deltas)} 个文件耗时 {elapsed_ms:.1f} ms")
+                    batches += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
@@ -0,0 +1,24 @@
+"""Mock云效Web服务与端到端吞吐量基准测试
+
+提供一个与云效用例库页面结构一致的本地替身服务，
+用于在不访问生产环境的情况下驱动 TestCaseManager 并衡量性能；
+以及基于同一套页面模板的内存版WebDriver，供单元测试使用。
+
+使用示例:
+    >>> from tools.yunxiao_mock import MockYunxiaoServer, MockConfig
+    >>> with MockYunxiaoServer(MockConfig(latency=0.1, jitter=0.05)) as server:
+    ...     print(server.url)
+"""
+
+from .fake_driver import FakeDevToolsChannel, FakeWebDriver, FakeYunxiaoSite, VirtualClock
+from .server import MockConfig, MockYunxiaoServer, make_case_id
+
+__all__ = [
+    'FakeDevToolsChannel',
+    'FakeWebDriver',
+    'FakeYunxiaoSite',
+    'MockConfig',
+    'MockYunxiaoServer',
+    'VirtualClock',
+    'make_case_id'
+]
@@ -0,0 +1,35 @@
+"""Mock云效服务的命令行入口"""
+
+import argparse
+import logging
+import time
+
+from .server import MockConfig, MockYunxiaoServer
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mock云效Web服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.05, help="服务端延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="延迟抖动（秒）")
+    parser.add_argument("--cases", type=int, default=50, help="预置用例数量")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    config = MockConfig(latency=args.latency, jitter=args.jitter, case_count=args.cases)
+    with MockYunxiaoServer(config, host=args.host, port=args.port) as server:
+        print(f"Mock云效服务运行中: {server.url}  (Ctrl+C 退出)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
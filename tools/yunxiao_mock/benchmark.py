@@ -0,0 +1,255 @@
+"""端到端吞吐量基准测试
+
+启动Mock云效服务，用无头Chrome驱动真实的 TestCaseManager，
+统计每分钟处理的用例数以及各步骤的 p50/p95 耗时。
+
+使用示例:
+    python -m tools.yunxiao_mock.benchmark --cases 10 --latency 0.1 --jitter 0.05
+    python -m tools.yunxiao_mock.benchmark --actions auto_type,result --output output/bench.json
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+
+from .server import MockConfig, MockYunxiaoServer, make_case_id
+
+logger = logging.getLogger(__name__)
+
+# TestCaseManager 中参与计时的步骤
+STEPS = [
+    '_wait_for_page_load',
+    '_find_and_click_filter_button',
+    '_input_case_id',
+    '_click_filter_submit',
+    '_select_case_and_set_type',
+    '_wait_for_filter_button',
+    '_input_case_id_for_result',
+    '_wait_for_results_list',
+    '_select_test_result',
+    '_set_test_user',
+]
+
+ACTIONS = ('auto_type', 'result')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """按最近秩法计算百分位数
+
+    Args:
+        values: 样本
+        pct: 百分位（0-100）
+
+    Returns:
+        百分位数，样本为空时返回0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class StepTimer:
+    """记录被包装方法的每次调用耗时"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.samples[name].append(time.perf_counter() - start)
+        return timed
+
+    def instrument(self, manager, steps: List[str]) -> None:
+        """在实例上替换步骤方法为计时版本"""
+        for name in steps:
+            if hasattr(manager, name):
+                setattr(manager, name, self.wrap(name, getattr(manager, name)))
+
+
+@dataclass
+class BenchmarkReport:
+    """基准测试结果"""
+    cases: int
+    actions: List[str]
+    latency: float
+    jitter: float
+    login_seconds: float
+    total_seconds: float
+    failures: int
+    cases_per_minute: float
+    steps: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def create_headless_driver(chromedriver_path: Optional[str] = None, profile: str = 'performance'):
+    """创建用于基准测试的无头Chrome
+
+    Args:
+        chromedriver_path: chromedriver路径，为空时使用 WebDriverConfig 的默认解析
+        profile: 浏览器配置档（default/performance）
+
+    Returns:
+        WebDriver实例
+    """
+    from src.utils.driver.webdriver_manager import WebDriverConfig, WebDriverManager
+
+    config = WebDriverConfig(chromedriver_path=chromedriver_path, profile=profile, headless=True)
+    return WebDriverManager(config).init_driver()
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    """汇总每个步骤的耗时分布"""
+    return {
+        name: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'max': max(values),
+            'total': sum(values)
+        }
+        for name, values in samples.items() if values
+    }
+
+
+def run_benchmark(cases: int = 5, actions: Optional[List[str]] = None,
+                  config: Optional[MockConfig] = None, test_user: str = '测试用户',
+                  driver_factory: Optional[Callable] = None) -> BenchmarkReport:
+    """运行端到端基准测试
+
+    Args:
+        cases: 处理的用例数量
+        actions: 每个用例执行的操作（auto_type/result）
+        config: Mock服务配置
+        test_user: 标记结果时设置的执行人
+        driver_factory: 创建WebDriver的函数，默认创建无头Chrome
+
+    Returns:
+        基准测试结果
+    """
+    from src.core.test_case.case_manager import TestCaseManager
+
+    actions = actions or ['auto_type']
+    config = config or MockConfig()
+    config.case_count = max(config.case_count, cases)
+    if test_user not in config.members:
+        config.members.append(test_user)
+    driver_factory = driver_factory or create_headless_driver
+
+    timer = StepTimer()
+    failures = 0
+    with MockYunxiaoServer(config) as server:
+        driver = driver_factory()
+        try:
+            manager = TestCaseManager(driver, base_url=server.url)
+            manager.ensure_logged_in()
+            login_seconds = manager.login_seconds or 0.0
+            timer.instrument(manager, STEPS)
+
+            run_start = time.perf_counter()
+            for i in range(1, cases + 1):
+                case_id = make_case_id(i)
+                for action in actions:
+                    action_start = time.perf_counter()
+                    try:
+                        if action == 'auto_type':
+                            manager.mark_auto_type(case_id, '是')
+                        else:
+                            manager.mark_test_result(case_id, 'PASS', test_user)
+                    except Exception as e:
+                        failures += 1
+                        logger.error(f"用例 {case_id} 执行 {action} 失败: {str(e)}")
+                    timer.samples[f'action:{action}'].append(time.perf_counter() - action_start)
+            total_seconds = time.perf_counter() - run_start
+        finally:
+            driver.quit()
+
+    return BenchmarkReport(
+        cases=cases,
+        actions=list(actions),
+        latency=config.latency,
+        jitter=config.jitter,
+        login_seconds=login_seconds,
+        total_seconds=total_seconds,
+        failures=failures,
+        cases_per_minute=cases / total_seconds * 60 if total_seconds > 0 else 0.0,
+        steps=summarize(timer.samples)
+    )
+
+
+def format_report(report: BenchmarkReport) -> str:
+    """格式化基准测试结果为文本表格"""
+    lines = [
+        "Yunxiao Mock Benchmark",
+        "======================",
+        f"Cases: {report.cases}  Actions: {','.join(report.actions)}",
+        f"Server latency: {report.latency * 1000:.0f}ms ± {report.jitter * 1000:.0f}ms",
+        f"Login: {report.login_seconds:.2f}s",
+        f"Total: {report.total_seconds:.2f}s  Failures: {report.failures}",
+        f"Throughput: {report.cases_per_minute:.2f} cases/min",
+        "",
+        f"{'step':<32}{'count':>6}{'p50(s)':>10}{'p95(s)':>10}{'max(s)':>10}"
+    ]
+    for name, stats in report.steps.items():
+        lines.append(
+            f"{name:<32}{stats['count']:>6}"
+            f"{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['max']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="云效自动化端到端吞吐量基准测试")
+    parser.add_argument("--cases", type=int, default=5, help="处理的用例数量")
+    parser.add_argument("--actions", default="auto_type",
+                        help="每个用例执行的操作，逗号分隔（auto_type,result）")
+    parser.add_argument("--latency", type=float, default=0.05, help="服务端延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="延迟抖动（秒）")
+    parser.add_argument("--seed", type=int, default=None, help="延迟随机数种子")
+    parser.add_argument("--chromedriver", default=None, help="chromedriver路径")
+    parser.add_argument("--profile", default="performance", choices=["default", "performance"],
+                        help="浏览器配置档（默认 performance）")
+    parser.add_argument("--output", help="以JSON格式保存结果的文件路径")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出详细日志")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    actions = [a.strip() for a in args.actions.split(',') if a.strip()]
+    unknown = [a for a in actions if a not in ACTIONS]
+    if unknown:
+        parser.error(f"不支持的操作: {', '.join(unknown)}")
+
+    report = run_benchmark(
+        cases=args.cases,
+        actions=actions,
+        config=MockConfig(latency=args.latency, jitter=args.jitter, seed=args.seed),
+        driver_factory=lambda: create_headless_driver(args.chromedriver, args.profile)
+    )
+    print(format_report(report))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(asdict(report), f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
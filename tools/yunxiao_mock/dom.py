@@ -0,0 +1,617 @@
+"""内存DOM模型
+
+把 Mock 页面模板解析成轻量的节点树，并实现自动化代码用到的 XPath 1.0 与
+CSS 选择器子集，供 fake_driver 在不启动浏览器的情况下定位元素。
+
+支持的 XPath 子集:
+    绝对/相对路径、``//``、``.``、``..``、``*``、``|`` 并集、位置谓词 ``[n]``，
+    谓词中的 ``@attr``、``text()``、``.``、``=``/``!=``、``and``/``or``，
+    以及 ``contains()``、``starts-with()``、``normalize-space()`` 函数。
+
+支持的 CSS 子集:
+    标签、``#id``、``.class``、``[attr]``、``[attr=v]``、``[attr^=v]``、``[attr*=v]``、
+    ``[attr$=v]``、``[attr~=v]``、后代/子元素组合器和逗号分组。
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track',
+    'wbr'
+}
+
+# 不参与渲染的元素，其内部节点始终不可见
+HIDDEN_ELEMENTS = {'head', 'script', 'style', 'template', 'title', 'meta', 'link'}
+
+# 计算可见文本时按行分隔的块级元素
+BLOCK_ELEMENTS = {
+    'div', 'p', 'li', 'ul', 'ol', 'tr', 'table', 'tbody', 'thead', 'section', 'main',
+    'header', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'br'
+}
+
+
+class DomError(Exception):
+    """选择器无法解析"""
+
+
+class Node:
+    """DOM元素节点
+
+    子节点列表中的字符串表示文本节点。
+    """
+
+    def __init__(self, tag: str, attrs: Optional[Dict[str, str]] = None):
+        self.tag = tag
+        self.attrs: Dict[str, str] = dict(attrs or {})
+        self.children: List[Union['Node', str]] = []
+        self.parent: Optional['Node'] = None
+        self.listeners: Dict[str, List[Callable]] = {}
+        # iframe 加载的文档
+        self.content_document: Optional['Node'] = None
+
+    def __repr__(self) -> str:
+        attrs = ''.join(f' {k}="{v}"' for k, v in self.attrs.items())
+        return f"<{self.tag}{attrs}>"
+
+    # ---- 树操作 ----
+
+    def append(self, child: Union['Node', str]) -> Union['Node', str]:
+        if isinstance(child, Node):
+            child.detach()
+            child.parent = self
+        self.children.append(child)
+        return child
+
+    def insert(self, index: int, child: 'Node') -> 'Node':
+        child.detach()
+        child.parent = self
+        self.children.insert(index, child)
+        return child
+
+    def detach(self) -> None:
+        if self.parent is not None:
+            self.parent.children = [c for c in self.parent.children if c is not self]
+            self.parent = None
+
+    def replace_children(self, children: List[Union['Node', str]]) -> None:
+        for child in self.children:
+            if isinstance(child, Node):
+                child.parent = None
+        self.children = []
+        for child in children:
+            self.append(child)
+
+    def set_text(self, text: str) -> None:
+        self.replace_children([text])
+
+    @property
+    def root(self) -> 'Node':
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def element_children(self) -> List['Node']:
+        return [c for c in self.children if isinstance(c, Node)]
+
+    def iter(self) -> Iterator['Node']:
+        """按文档顺序遍历自身及所有后代元素"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.element_children()))
+
+    def ancestors(self) -> Iterator['Node']:
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def closest(self, predicate: Callable[['Node'], bool]) -> Optional['Node']:
+        if predicate(self):
+            return self
+        for node in self.ancestors():
+            if predicate(node):
+                return node
+        return None
+
+    # ---- 事件 ----
+
+    def add_listener(self, event_type: str, listener: Callable[['Event'], None]) -> None:
+        self.listeners.setdefault(event_type, []).append(listener)
+
+    def dispatch(self, event_type: str) -> 'Event':
+        """从自身开始向上冒泡派发事件"""
+        event = Event(event_type, self)
+        for node in [self, *self.ancestors()]:
+            for listener in list(node.listeners.get(event_type, [])):
+                listener(event)
+            if event.propagation_stopped:
+                break
+        return event
+
+    # ---- 属性与文本 ----
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get('class', '').split()
+
+    def has_class(self, name: str) -> bool:
+        return name in self.classes
+
+    def text_nodes(self) -> List[str]:
+        return [c for c in self.children if isinstance(c, str)]
+
+    def string_value(self) -> str:
+        """XPath 字符串值：所有后代文本节点的拼接"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            else:
+                stack.extend(reversed(node.children))
+        return ''.join(parts)
+
+    def is_displayed(self) -> bool:
+        for node in [self, *self.ancestors()]:
+            if node.tag in HIDDEN_ELEMENTS or 'hidden' in node.attrs:
+                return False
+            style = node.attrs.get('style', '').replace(' ', '')
+            if 'display:none' in style or 'visibility:hidden' in style:
+                return False
+        if self.tag == 'input' and self.attrs.get('type') == 'hidden':
+            return False
+        return True
+
+    def visible_text(self) -> str:
+        """近似浏览器的 innerText：忽略不可见元素，块级元素分行"""
+        if not self.is_displayed():
+            return ''
+        lines: List[str] = []
+        current: List[str] = []
+
+        def flush():
+            line = ' '.join(''.join(current).split())
+            if line:
+                lines.append(line)
+            current.clear()
+
+        def walk(node: Node):
+            for child in node.children:
+                if isinstance(child, str):
+                    current.append(child)
+                    continue
+                if child.tag in HIDDEN_ELEMENTS or not child.is_displayed():
+                    continue
+                block = child.tag in BLOCK_ELEMENTS
+                if block:
+                    flush()
+                elif child.tag in ('td', 'th'):
+                    current.append(' ')
+                walk(child)
+                if block:
+                    flush()
+
+        walk(self)
+        flush()
+        return '\n'.join(lines)
+
+
+class Event:
+    """DOM事件"""
+
+    def __init__(self, event_type: str, target: Node):
+        self.type = event_type
+        self.target = target
+        self.propagation_stopped = False
+
+    def stop_propagation(self) -> None:
+        self.propagation_stopped = True
+
+
+def document() -> Node:
+    """创建空文档节点"""
+    return Node('#document')
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.document = document()
+        self.current = self.document
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: v if v is not None else '' for k, v in attrs})
+        self.current.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.append(Node(tag, {k: v if v is not None else '' for k, v in attrs}))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.append(data)
+
+
+def parse_html(html: str) -> Node:
+    """把HTML解析为文档节点"""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.document
+
+
+def parse_fragment(html: str) -> List[Union[Node, str]]:
+    """把HTML片段解析为节点列表（用于模拟 innerHTML）"""
+    fragment = parse_html(html)
+    children = list(fragment.children)
+    fragment.replace_children([])
+    return children
+
+
+def document_order(root: Node, nodes: List[Node]) -> List[Node]:
+    """按文档顺序排列并去重"""
+    wanted = {id(n) for n in nodes}
+    if not wanted:
+        return []
+    return [n for n in root.iter() if id(n) in wanted]
+
+
+# ---------------------------------------------------------------------------
+# XPath
+# ---------------------------------------------------------------------------
+
+_XPATH_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<op>//|/|\.\.|\.|\||\[|\]|\(|\)|@|,|!=|=|\*)
+      | (?P<name>[A-Za-z_][\w\-]*(?:\(\))?)
+    )""", re.VERBOSE)
+
+
+def _tokenize_xpath(xpath: str) -> List[str]:
+    tokens = []
+    pos = 0
+    xpath = xpath.strip()
+    while pos < len(xpath):
+        match = _XPATH_TOKEN.match(xpath, pos)
+        if not match or match.end() == pos:
+            raise DomError(f"无法解析的XPath: {xpath!r}（位置 {pos}）")
+        tokens.append(match.group(match.lastgroup))
+        pos = match.end()
+        while pos < len(xpath) and xpath[pos].isspace():
+            pos += 1
+    return tokens
+
+
+class _XPathParser:
+    """把 XPath 子集解析为可执行的闭包"""
+
+    def __init__(self, xpath: str):
+        self.xpath = xpath
+        self.tokens = _tokenize_xpath(xpath)
+        self.pos = 0
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, expected: Optional[str] = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token != expected):
+            raise DomError(f"无法解析的XPath: {self.xpath!r}，"
+                           f"期望 {expected!r}，得到 {token!r}")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        expr = self.union()
+        if self.peek() is not None:
+            raise DomError(f"无法解析的XPath: {self.xpath!r}，多余的 {self.peek()!r}")
+        return expr
+
+    # 路径表达式返回 (context) -> List[Node]
+    def union(self):
+        paths = [self.path()]
+        while self.peek() == '|':
+            self.take('|')
+            paths.append(self.path())
+
+        def evaluate(context: Node) -> List[Node]:
+            result = []
+            for path in paths:
+                result.extend(path(context))
+            return result
+        return evaluate
+
+    def path(self):
+        steps = []
+        absolute = False
+        if self.peek() in ('/', '//'):
+            absolute = True
+        else:
+            steps.append(('/', self.step()))
+        while self.peek() in ('/', '//'):
+            sep = self.take()
+            steps.append((sep, self.step()))
+
+        def evaluate(context: Node) -> List[Node]:
+            nodes = [context.root] if absolute else [context]
+            for sep, step in steps:
+                if sep == '//':
+                    nodes = [d for n in nodes for d in n.iter()]
+                nodes = _unique(r for n in nodes for r in step(n))
+            return nodes
+        return evaluate
+
+    def step(self):
+        token = self.peek()
+        if token == '.':
+            self.take()
+            return lambda node: [node]
+        if token == '..':
+            self.take()
+            return lambda node: [node.parent] if node.parent is not None else []
+        name = self.take()
+        if name != '*' and not re.match(r'^[A-Za-z_][\w\-]*$', name):
+            raise DomError(f"无法解析的XPath: {self.xpath!r}，不支持的步骤 {name!r}")
+        predicates = []
+        while self.peek() == '[':
+            self.take('[')
+            predicates.append(self.or_expr())
+            self.take(']')
+
+        def evaluate(node: Node) -> List[Node]:
+            candidates = [c for c in node.element_children() if name == '*' or c.tag == name]
+            for predicate in predicates:
+                size = len(candidates)
+                kept = []
+                for position, candidate in enumerate(candidates, 1):
+                    value = predicate(candidate, position, size)
+                    if isinstance(value, float) and not isinstance(value, bool):
+                        value = value == position
+                    if _boolean(value):
+                        kept.append(candidate)
+                candidates = kept
+            return candidates
+        return evaluate
+
+    # 谓词表达式返回 (node, position, size) -> 值
+    def or_expr(self):
+        left = self.and_expr()
+        while self.peek() == 'or':
+            self.take()
+            right = self.and_expr()
+            left = (lambda a, b: lambda n, p, s: _boolean(a(n, p, s))
+                    or _boolean(b(n, p, s)))(left, right)
+        return left
+
+    def and_expr(self):
+        left = self.comparison()
+        while self.peek() == 'and':
+            self.take()
+            right = self.comparison()
+            left = (lambda a, b: lambda n, p, s: _boolean(a(n, p, s))
+                    and _boolean(b(n, p, s)))(left, right)
+        return left
+
+    def comparison(self):
+        left = self.operand()
+        if self.peek() in ('=', '!='):
+            op = self.take()
+            right = self.operand()
+
+            def evaluate(n, p, s):
+                equal = _compare(left(n, p, s), right(n, p, s))
+                return equal if op == '=' else not equal
+            return evaluate
+        return left
+
+    def operand(self):
+        token = self.peek()
+        if token is None:
+            raise DomError(f"无法解析的XPath: {self.xpath!r}，表达式不完整")
+        if token[0] in '"\'':
+            self.take()
+            value = token[1:-1]
+            return lambda n, p, s: value
+        if re.match(r'^\d', token):
+            self.take()
+            number = float(token)
+            return lambda n, p, s: number
+        if token == '@':
+            self.take('@')
+            attr = self.take()
+            return lambda n, p, s: [n.attrs[attr]] if attr in n.attrs else []
+        if token == 'text()':
+            self.take()
+            return lambda n, p, s: n.text_nodes()
+        if token == '.':
+            self.take()
+            return lambda n, p, s: [n.string_value()]
+        if token == '(':
+            self.take('(')
+            inner = self.or_expr()
+            self.take(')')
+            return inner
+        if token in ('contains', 'starts-with', 'normalize-space', 'not'):
+            return self.function()
+        if token == 'normalize-space()':
+            self.take()
+            return lambda n, p, s: ' '.join(n.string_value().split())
+        if token in ('last()', 'position()'):
+            self.take()
+            return (lambda n, p, s: float(s)) if token == 'last()' else (lambda n, p, s: float(p))
+        # 相对路径，例如 [span/input]
+        path = self.path()
+        return lambda n, p, s: path(n)
+
+    def function(self):
+        name = self.take()
+        self.take('(')
+        args = []
+        if self.peek() != ')':
+            args.append(self.or_expr())
+            while self.peek() == ',':
+                self.take(',')
+                args.append(self.or_expr())
+        self.take(')')
+        if len(args) != {'contains': 2, 'starts-with': 2, 'not': 1}.get(name, len(args)):
+            raise DomError(f"无法解析的XPath: {self.xpath!r}，{name}() 参数个数错误")
+
+        if name == 'contains':
+            return lambda n, p, s: _string(args[1](n, p, s)) in _string(args[0](n, p, s))
+        if name == 'starts-with':
+            return lambda n, p, s: _string(args[0](n, p, s)).startswith(_string(args[1](n, p, s)))
+        if name == 'not':
+            return lambda n, p, s: not _boolean(args[0](n, p, s))
+        # normalize-space
+        return lambda n, p, s: ' '.join(_string(args[0](n, p, s)).split())
+
+
+def _unique(nodes) -> List[Node]:
+    seen = set()
+    result = []
+    for node in nodes:
+        if id(node) not in seen:
+            seen.add(id(node))
+            result.append(node)
+    return result
+
+
+def _string(value) -> str:
+    """XPath string()：节点集取第一个节点的字符串值"""
+    if isinstance(value, list):
+        if not value:
+            return ''
+        first = value[0]
+        return first.string_value() if isinstance(first, Node) else first
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    return str(value)
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, list):
+        return bool(value)
+    return bool(value)
+
+
+def _compare(left, right) -> bool:
+    """XPath 相等比较：节点集中任一值相等即为真"""
+    def values(v):
+        if isinstance(v, list):
+            return [x.string_value() if isinstance(x, Node) else x for x in v]
+        return [_string(v)]
+    return any(a == b for a in values(left) for b in values(right))
+
+
+_xpath_cache: Dict[str, Callable] = {}
+
+
+def xpath_select(context: Node, xpath: str) -> List[Node]:
+    """按 XPath 查找元素，结果按文档顺序返回"""
+    compiled = _xpath_cache.get(xpath)
+    if compiled is None:
+        compiled = _XPathParser(xpath).parse()
+        _xpath_cache[xpath] = compiled
+    return document_order(context.root, [n for n in compiled(context) if n.tag != '#document'])
+
+
+# ---------------------------------------------------------------------------
+# CSS
+# ---------------------------------------------------------------------------
+
+_CSS_COMPOUND = re.compile(r"""
+    (?P<tag>[A-Za-z][\w\-]*|\*)?
+    (?P<rest>(?:\#[\w\-]+|\.[\w\-]+
+              |\[\s*[\w\-]+\s*(?:[\^\*\$~]?=\s*(?:"[^"]*"|'[^']*'|[^\]\s]+))?\s*\])*)
+    """, re.VERBOSE)
+_CSS_PART = re.compile(r"""
+    \#(?P<id>[\w\-]+)
+  | \.(?P<cls>[\w\-]+)
+  | \[\s*(?P<attr>[\w\-]+)\s*(?:(?P<op>[\^\*\$~]?=)\s*(?P<value>"[^"]*"|'[^']*'|[^\]\s]+))?\s*\]
+    """, re.VERBOSE)
+
+
+def _compile_compound(text: str) -> Callable[[Node], bool]:
+    match = _CSS_COMPOUND.fullmatch(text)
+    if not match or not text:
+        raise DomError(f"无法解析的CSS选择器: {text!r}")
+    tag = match.group('tag')
+    checks: List[Callable[[Node], bool]] = []
+    if tag and tag != '*':
+        checks.append(lambda n, t=tag.lower(): n.tag == t)
+    for part in _CSS_PART.finditer(match.group('rest')):
+        if part.group('id'):
+            checks.append(lambda n, v=part.group('id'): n.attrs.get('id') == v)
+        elif part.group('cls'):
+            checks.append(lambda n, v=part.group('cls'): n.has_class(v))
+        else:
+            attr, op, value = part.group('attr'), part.group('op'), part.group('value')
+            if value and value[0] in '"\'':
+                value = value[1:-1]
+            if op is None:
+                checks.append(lambda n, a=attr: a in n.attrs)
+            elif op == '=':
+                checks.append(lambda n, a=attr, v=value: n.attrs.get(a) == v)
+            elif op == '^=':
+                checks.append(lambda n, a=attr, v=value: a in n.attrs and n.attrs[a].startswith(v))
+            elif op == '*=':
+                checks.append(lambda n, a=attr, v=value: a in n.attrs and v in n.attrs[a])
+            elif op == '$=':
+                checks.append(lambda n, a=attr, v=value: a in n.attrs and n.attrs[a].endswith(v))
+            else:
+                checks.append(lambda n, a=attr, v=value: v in n.attrs.get(a, '').split())
+    return lambda n: n.tag != '#document' and all(check(n) for check in checks)
+
+
+def _compile_complex(selector: str) -> Callable[[Node], bool]:
+    """编译带组合器的选择器，从右向左匹配"""
+    parts = re.findall(r'>|[^\s>]+', selector.strip())
+    if not parts or parts[0] == '>' or parts[-1] == '>':
+        raise DomError(f"无法解析的CSS选择器: {selector!r}")
+    compounds = []
+    combinator = ' '
+    for part in parts:
+        if part == '>':
+            combinator = '>'
+            continue
+        compounds.append((combinator, _compile_compound(part)))
+        combinator = ' '
+
+    def matches(node: Node, index: int) -> bool:
+        combinator, check = compounds[index]
+        if not check(node):
+            return False
+        if index == 0:
+            return True
+        if combinator == '>':
+            return node.parent is not None and matches(node.parent, index - 1)
+        return any(matches(a, index - 1) for a in node.ancestors())
+
+    return lambda node: matches(node, len(compounds) - 1)
+
+
+_css_cache: Dict[str, List[Callable]] = {}
+
+
+def css_select(context: Node, selector: str) -> List[Node]:
+    """按 CSS 选择器查找 context 的后代元素，结果按文档顺序返回"""
+    compiled = _css_cache.get(selector)
+    if compiled is None:
+        compiled = [_compile_complex(group) for group in selector.split(',') if group.strip()]
+        _css_cache[selector] = compiled
+    return [n for n in context.iter() if n is not context and any(match(n) for match in compiled)]
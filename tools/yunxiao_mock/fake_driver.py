@@ -0,0 +1,787 @@
+"""内存版WebDriver
+
+不启动浏览器和HTTP服务，直接在 dom 模块的节点树上模拟云效页面：
+页面结构复用 pages 中的模板，数据复用 MockState，APP_JS 中的交互逻辑
+在这里用Python等价实现。所有等待都基于虚拟时钟，time.sleep 和
+WebDriverWait 会立即推进时钟而不是真正阻塞，
+单元测试因此可以在毫秒级完成。
+
+使用示例:
+    >>> clock = VirtualClock()
+    >>> driver = FakeWebDriver(clock=clock)
+    >>> monkeypatch.setattr(case_manager, 'time', clock)
+    >>> monkeypatch.setattr(selenium.webdriver.support.wait, 'time', clock)
+    >>> TestCaseManager(driver).mark_auto_type('TEST_001', '是')
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import time as _time
+import uuid
+from html import escape
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    InvalidSelectorException,
+    NoSuchElementException,
+    NoSuchFrameException,
+    StaleElementReferenceException,
+    WebDriverException
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from . import dom
+from .pages import (
+    HOME_PAGE,
+    LOGIN_DONE,
+    LOGIN_FRAME,
+    LOGIN_PAGE,
+    STYLE,
+    TESTCASE_PAGE,
+    render_drawer,
+    render_row
+)
+from .server import SESSION_COOKIE, MockConfig, MockState
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = 'https://devops.aliyun.com'
+BLANK_URL = 'data:,'
+
+# Performance.getMetrics 模拟：初始JS堆大小，以及单页应用每次交互泄漏的内存
+INITIAL_JS_HEAP = 8 * 1024 * 1024
+JS_HEAP_PER_INTERACTION = 256 * 1024
+
+# 组合键中按下后保持到本次 send_keys 结束的修饰键
+MODIFIER_KEYS = {Keys.CONTROL, Keys.SHIFT, Keys.ALT, Keys.COMMAND}
+
+
+class VirtualClock:
+    """虚拟时钟
+
+    提供 time 模块中 sleep/time/monotonic/perf_counter 的替身，可直接替换
+    被测模块里的 ``time`` 名字。
+    sleep 只推进时钟并按时间顺序执行到期的定时回调，
+    其他属性委托给真实的 time 模块。
+    """
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+        self._epoch = _time.time() - start
+        self._timers: List[Tuple[float, int, Callable]] = []
+        self._sequence = itertools.count()
+        self.slept = 0.0
+
+    def __getattr__(self, name):
+        return getattr(_time, name)
+
+    def time(self) -> float:
+        return self._epoch + self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept += max(seconds, 0.0)
+        self.advance(seconds)
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> None:
+        """在 delay 秒后执行回调"""
+        heapq.heappush(self._timers, (self.now + max(delay, 0.0), next(self._sequence), callback))
+
+    def next_timer(self) -> Optional[float]:
+        """下一个定时回调的触发时间"""
+        return self._timers[0][0] if self._timers else None
+
+    def advance(self, seconds: float) -> None:
+        """推进时钟并执行期间到期的回调"""
+        target = self.now + max(seconds, 0.0)
+        while self._timers and self._timers[0][0] <= target:
+            when, _, callback = heapq.heappop(self._timers)
+            self.now = max(self.now, when)
+            callback()
+        self.now = target
+
+    def run_pending(self) -> None:
+        """执行所有已到期的回调"""
+        self.advance(0)
+
+
+class FakeYunxiaoSite:
+    """内存中的云效站点，多个 FakeWebDriver 可共享同一份数据
+
+    Args:
+        config: Mock配置，latency/jitter 为虚拟时钟上的服务端延迟
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self.state = MockState(self.config)
+        self.rng = random.Random(self.config.seed)
+
+    def latency(self) -> float:
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self.rng.uniform(-self.config.jitter, self.config.jitter)
+        return max(delay, 0.0)
+
+    def render(self, browser: 'FakeWebDriver', method: str, url: str,
+               form: Optional[Dict[str, str]] = None) -> Tuple[str, dom.Node]:
+        """处理一次页面请求
+
+        Returns:
+            (最终URL, 文档节点)，未登录访问用例页时会重定向到首页
+        """
+        self.state.count_request()
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+
+        if path == '/login/frame' and method == 'POST':
+            user = (form or {}).get('fm-login-id', '')
+            token = self.state.login(user)
+            browser.add_cookie({'name': SESSION_COOKIE, 'value': token, 'path': '/'})
+            return url, self._document(url, LOGIN_DONE.format(user=escape(user)))
+        if path == '/':
+            return url, self._document(url, HOME_PAGE.format(style=STYLE))
+        if path == '/login':
+            return url, self._document(url, LOGIN_PAGE.format(style=STYLE))
+        if path == '/login/frame':
+            return url, self._document(url, LOGIN_FRAME)
+        if path == '/testcase':
+            cookie = browser.get_cookie(SESSION_COOKIE)
+            user = self.state.user_for(cookie['value'] if cookie else None)
+            if user is None:
+                return self.render(browser, 'GET', f"{origin}/")
+            rows = ''.join(render_row(c) for c in self.state.find_cases(''))
+            html = TESTCASE_PAGE.format(style=STYLE, user=escape(user), rows=rows)
+            document = self._document(url, html)
+            _TestcasePage(self, browser, document).bind()
+            return url, document
+        return url, self._document(url, '<html><body><h1>404 Not Found</h1></body></html>')
+
+    @staticmethod
+    def _document(url: str, html: str) -> dom.Node:
+        document = dom.parse_html(html)
+        document.attrs['url'] = url
+        return document
+
+
+class _TestcasePage:
+    """用例库页面的交互逻辑，对应 APP_JS"""
+
+    def __init__(self, site: FakeYunxiaoSite, browser: 'FakeWebDriver', document: dom.Node):
+        self.site = site
+        self.state = site.state
+        self.browser = browser
+        self.document = document
+        self.body = dom.css_select(document, 'body')[0]
+
+    def later(self, callback: Callable[[], None], extra: float = 0.0) -> None:
+        """模拟一次异步接口请求：服务端延迟后页面仍然有效时执行回调"""
+        def run():
+            if self.browser.top_document is self.document:
+                callback()
+        self.browser.clock.call_later(self.site.latency() + extra, run)
+
+    def first(self, selector: str, context: Optional[dom.Node] = None) -> Optional[dom.Node]:
+        found = dom.css_select(context or self.document, selector)
+        return found[0] if found else None
+
+    def remove_all(self, selector: str) -> None:
+        for node in dom.css_select(self.document, selector):
+            node.detach()
+
+    def bind(self) -> None:
+        self.first('.filter-button').add_listener('click', self.on_filter_button)
+        self.first('.filter-submit').add_listener('click', self.on_filter_submit)
+        self.first('tbody').add_listener('click', self.on_table_click)
+
+    def on_filter_button(self, event: dom.Event) -> None:
+        self.first('.filter-panel').attrs['style'] = 'display: block'
+
+    def on_filter_submit(self, event: dom.Event) -> None:
+        keyword = self.first('.filter-input input').attrs.get('value', '')
+        self.later(lambda: self.render_rows(self.state.find_cases(keyword)))
+
+    def render_rows(self, cases: List[Dict]) -> None:
+        self.remove_all('.empty')
+        inner = self.first('.table-inner')
+        tbody = self.first('tbody', inner)
+        tbody.replace_children(dom.parse_fragment(''.join(render_row(c) for c in cases)))
+        if not cases:
+            empty = dom.Node('div', {'class': 'empty'})
+            empty.set_text('暂无内容')
+            inner.append(empty)
+
+    def update_row(self, case: Dict) -> None:
+        for row in dom.css_select(self.document, 'tbody tr'):
+            if row.attrs.get('data-id') == case['id']:
+                index = row.parent.children.index(row)
+                tbody = row.parent
+                row.detach()
+                tbody.insert(index, dom.parse_fragment(render_row(case))[0])
+
+    def save_case(self, case_id: str, changes: Dict,
+                  callback: Optional[Callable[[Dict], None]] = None) -> None:
+        def done():
+            case = self.state.update_case(case_id, changes)
+            if case is None:
+                return
+            self.update_row(case)
+            if callback:
+                callback(case)
+        self.later(done)
+
+    def show_menu(self, class_name: str, items: List[Tuple[str, str]],
+                  on_select: Callable[[str], None]) -> None:
+        # 浮层插在 body 开头，保证 //*[text()="已通过"] 等定位优先命中菜单项
+        self.remove_all('.menu')
+        menu = dom.Node('ul', {'class': f'menu {class_name}'})
+        for html, value in items:
+            li = dom.Node('li')
+            li.replace_children(dom.parse_fragment(html))
+
+            def select(event, value=value):
+                event.stop_propagation()
+                menu.detach()
+                on_select(value)
+            li.add_listener('click', select)
+            menu.append(li)
+        self.body.insert(0, menu)
+
+    def on_table_click(self, event: dom.Event) -> None:
+        row = event.target.closest(lambda n: n.tag == 'tr')
+        if row is None:
+            return
+        case_id = row.attrs.get('data-id')
+        if event.target.has_class('status-trigger'):
+            event.stop_propagation()
+            statuses = [(status, status) for status in ('已通过', '未通过', '暂缓')]
+            self.show_menu('status-menu', statuses,
+                           lambda value: self.save_case(case_id, {'status': value}))
+            return
+        # 切换用例时先收起旧抽屉，与 APP_JS 一致
+        self.close_drawer()
+        self.later(lambda: self.open_drawer(case_id))
+
+    def close_drawer(self, event: Optional[dom.Event] = None) -> None:
+        self.remove_all('.drawer')
+        self.remove_all('.member-picker')
+        self.remove_all('.menu')
+
+    def open_drawer(self, case_id: str) -> None:
+        case = self.state.get_case(case_id)
+        if case is None:
+            return
+        self.close_drawer()
+        drawer = dom.Node('div', {'class': 'drawer'})
+        drawer.replace_children(dom.parse_fragment(render_drawer(case)))
+        self.body.append(drawer)
+        trigger = self.first('.select-trigger', drawer)
+
+        def on_auto_type(value):
+            self.save_case(case_id, {'auto_type': value},
+                           lambda updated: trigger.set_text(updated['auto_type']))
+
+        self.first('.drawer-close', drawer).add_listener('click', self.close_drawer)
+        options = [('<span>是</span>', '是'), ('<span>否</span>', '否')]
+        trigger.add_listener(
+            'click', lambda event: self.show_menu('select-menu', options, on_auto_type))
+        self.first('.member-edit', drawer).add_listener(
+            'click', lambda event: self.toggle_member_picker(case, drawer))
+
+    def toggle_member_picker(self, case: Dict, drawer: dom.Node) -> None:
+        if self.first('.member-picker'):
+            self.remove_all('.member-picker')
+            return
+        picker = dom.Node('div', {'class': 'member-picker'})
+        search = '<input type="text" placeholder="请输入关键字">'
+        picker.replace_children(dom.parse_fragment(search))
+        self.body.append(picker)
+        search = self.first('input', picker)
+
+        def on_input(event):
+            self.remove_all('.uiless-member-mini-v2-members')
+            keyword = search.attrs.get('value', '')
+
+            def show():
+                # 防抖：只展示最后一次输入的搜索结果
+                if search.attrs.get('value', '') != keyword or picker.parent is None:
+                    return
+                self.remove_all('.uiless-member-mini-v2-members')
+                members = dom.Node('div', {'class': 'uiless-member-mini-v2-members'})
+                for name in self.state.search_members(keyword):
+                    item = dom.Node('div')
+                    item.set_text(name)
+                    item.add_listener('click', lambda e, name=name: self.save_case(
+                        case['id'], {'executor': name}, lambda updated: on_saved(updated)))
+                    members.append(item)
+                picker.append(members)
+            self.later(show, extra=0.1)
+
+        def on_saved(updated):
+            picker.detach()
+            self.first('.member-name em', drawer).set_text(updated['executor'])
+
+        search.add_listener('input', on_input)
+
+
+class FakeSwitchTo:
+    """driver.switch_to 的替身，支持 iframe 切换"""
+
+    def __init__(self, driver: 'FakeWebDriver'):
+        self._driver = driver
+
+    def frame(self, frame_reference) -> None:
+        if isinstance(frame_reference, FakeWebElement):
+            node = frame_reference._checked_node()
+        else:
+            frames = dom.css_select(self._driver.current_document, 'iframe')
+            if isinstance(frame_reference, int):
+                node = frames[frame_reference] if frame_reference < len(frames) else None
+            else:
+                node = next((f for f in frames
+                             if frame_reference in (f.attrs.get('id'), f.attrs.get('name'))), None)
+        if node is None or node.tag != 'iframe' or node.content_document is None:
+            raise NoSuchFrameException(f"无法切换到frame: {frame_reference}")
+        self._driver._frames.append(node)
+
+    def default_content(self) -> None:
+        self._driver._frames = []
+
+    def parent_frame(self) -> None:
+        if self._driver._frames:
+            self._driver._frames.pop()
+
+    def window(self, window_name) -> None:
+        if window_name not in self._driver.window_handles:
+            raise WebDriverException(f"no such window: {window_name}")
+
+
+class FakeWebElement:
+    """WebElement 的替身"""
+
+    def __init__(self, driver: 'FakeWebDriver', node: dom.Node):
+        self._driver = driver
+        self._node = node
+        self.id = f"fake-{id(node):x}"
+
+    def __repr__(self) -> str:
+        return f"<FakeWebElement {self._node!r}>"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FakeWebElement) and other._node is self._node
+
+    def __hash__(self) -> int:
+        return hash(id(self._node))
+
+    @property
+    def parent(self) -> 'FakeWebDriver':
+        return self._driver
+
+    def _checked_node(self) -> dom.Node:
+        if not self._driver._is_attached(self._node):
+            raise StaleElementReferenceException(f"stale element reference: {self._node!r}")
+        return self._node
+
+    @property
+    def tag_name(self) -> str:
+        return self._checked_node().tag
+
+    @property
+    def text(self) -> str:
+        return self._checked_node().visible_text()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        node = self._checked_node()
+        if name == 'textContent':
+            return node.string_value()
+        if name == 'innerText':
+            return node.visible_text()
+        if name == 'value' and node.tag == 'input':
+            return node.attrs.get('value', '')
+        return node.attrs.get(name)
+
+    get_dom_attribute = get_attribute
+
+    def get_property(self, name: str):
+        return self.get_attribute(name)
+
+    def is_displayed(self) -> bool:
+        return self._checked_node().is_displayed()
+
+    def is_enabled(self) -> bool:
+        node = self._checked_node()
+        return not any('disabled' in n.attrs for n in [node, *node.ancestors()]
+                       if n.tag in ('button', 'input', 'select', 'fieldset'))
+
+    def is_selected(self) -> bool:
+        return 'checked' in self._checked_node().attrs
+
+    def click(self) -> None:
+        node = self._checked_node()
+        if not node.is_displayed():
+            raise ElementNotInteractableException(f"element not interactable: {node!r}")
+        self._driver._click(node)
+
+    def clear(self) -> None:
+        node = self._checked_node()
+        node.attrs['value'] = ''
+        node.dispatch('input')
+
+    def send_keys(self, *values) -> None:
+        node = self._checked_node()
+        if not node.is_displayed():
+            raise ElementNotInteractableException(f"element not interactable: {node!r}")
+        self._driver._type(node, ''.join(str(v) for v in values))
+
+    def submit(self) -> None:
+        self._driver._submit(self._checked_node())
+
+    def find_element(self, by=By.ID, value=None) -> 'FakeWebElement':
+        return self._driver._find_element(self._checked_node(), by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> List['FakeWebElement']:
+        return self._driver._find_elements(self._checked_node(), by, value)
+
+
+class FakeWebDriver:
+    """内存版 WebDriver
+
+    Args:
+        site: 共享的站点数据，为空时新建一份
+        clock: 虚拟时钟，为空时新建
+        base_url: 站点根地址
+    """
+
+    def __init__(self, site: Optional[FakeYunxiaoSite] = None, clock: Optional[VirtualClock] = None,
+                 base_url: str = BASE_URL):
+        self.site = site or FakeYunxiaoSite()
+        self.clock = clock or VirtualClock()
+        self.base_url = base_url.rstrip('/')
+        self.session_id = uuid.uuid4().hex
+        self.switch_to = FakeSwitchTo(self)
+        self.current_url = BLANK_URL
+        self.top_document = dom.parse_html('<html><head></head><body></body></html>')
+        self.history: List[str] = []
+        self.scripts: List[str] = []
+        self.cdp_commands: List[Tuple[str, Dict]] = []
+        self.implicit_wait = 0.0
+        self.page_load_timeout = 300.0
+        self.window_size = {'width': 1280, 'height': 800}
+        self.quit_called = False
+        self.js_heap_used = INITIAL_JS_HEAP
+        self.layout_count = 0
+        self._frames: List[dom.Node] = []
+        self._cookies: Dict[str, Dict] = {}
+
+    # ---- 导航 ----
+
+    @property
+    def current_document(self) -> dom.Node:
+        if self._frames:
+            return self._frames[-1].content_document
+        return self.top_document
+
+    @property
+    def title(self) -> str:
+        titles = dom.css_select(self.top_document, 'title')
+        return titles[0].string_value() if titles else ''
+
+    @property
+    def page_source(self) -> str:
+        return self.current_document.string_value()
+
+    def _check_alive(self) -> None:
+        if self.quit_called:
+            raise WebDriverException("invalid session id")
+
+    def _request(self, method: str, url: str,
+                 form: Optional[Dict[str, str]] = None) -> Tuple[str, dom.Node]:
+        # 页面加载策略为 normal：等待服务端响应后才返回
+        self.clock.advance(self.site.latency())
+        final_url, document = self.site.render(self, method, url, form)
+        for frame in dom.css_select(document, 'iframe[src]'):
+            _, frame.content_document = self._request('GET', urljoin(final_url, frame.attrs['src']))
+        return final_url, document
+
+    def get(self, url: str) -> None:
+        self._check_alive()
+        target = urljoin(f"{self.base_url}/", url)
+        self.current_url, self.top_document = self._request('GET', target)
+        self._frames = []
+        self.history.append(self.current_url)
+        self.js_heap_used = INITIAL_JS_HEAP
+        self.layout_count += 1
+
+    def refresh(self) -> None:
+        self.get(self.current_url)
+
+    def _is_attached(self, node: dom.Node) -> bool:
+        root = node.root
+        if root is self.top_document:
+            return True
+        return any(frame.content_document is root and self._is_attached(frame)
+                   for frame in dom.css_select(self.top_document, 'iframe'))
+
+    # ---- 元素查找 ----
+
+    def _select(self, context: dom.Node, by: str, value: str) -> List[dom.Node]:
+        try:
+            if by == By.XPATH:
+                return dom.xpath_select(context, value)
+            if by == By.CSS_SELECTOR:
+                return dom.css_select(context, value)
+            if by == By.ID:
+                return [n for n in context.iter()
+                        if n is not context and n.attrs.get('id') == value]
+            if by == By.NAME:
+                return [n for n in context.iter()
+                        if n is not context and n.attrs.get('name') == value]
+            if by == By.CLASS_NAME:
+                return [n for n in context.iter() if n is not context and n.has_class(value)]
+            if by == By.TAG_NAME:
+                return [n for n in context.iter() if n is not context and n.tag == value.lower()]
+            if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+                links = [n for n in context.iter() if n.tag == 'a']
+                if by == By.LINK_TEXT:
+                    return [n for n in links if n.visible_text() == value]
+                return [n for n in links if value in n.visible_text()]
+        except dom.DomError as e:
+            raise InvalidSelectorException(str(e))
+        raise InvalidSelectorException(f"不支持的定位方式: {by}")
+
+    def _find_elements(self, context: Optional[dom.Node], by: str,
+                       value: str) -> List[FakeWebElement]:
+        self._check_alive()
+        # 隐式等待：找不到元素时推进虚拟时钟，直到页面异步更新或超时
+        deadline = self.clock.now + self.implicit_wait
+        while True:
+            self.clock.run_pending()
+            nodes = self._select(context or self.current_document, by, value)
+            next_timer = self.clock.next_timer()
+            if nodes or next_timer is None or next_timer > deadline:
+                break
+            self.clock.advance(next_timer - self.clock.now)
+        if not nodes and self.implicit_wait:
+            self.clock.advance(max(deadline - self.clock.now, 0.0))
+        return [FakeWebElement(self, n) for n in nodes]
+
+    def _find_element(self, context: Optional[dom.Node], by: str, value: str) -> FakeWebElement:
+        elements = self._find_elements(context, by, value)
+        if not elements:
+            raise NoSuchElementException(
+                f"no such element: Unable to locate element: "
+                f"{{\"method\":\"{by}\",\"selector\":\"{value}\"}}")
+        return elements[0]
+
+    def find_element(self, by=By.ID, value=None) -> FakeWebElement:
+        return self._find_element(None, by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> List[FakeWebElement]:
+        # 与真实驱动一致：隐式等待同样作用于 find_elements
+        return self._find_elements(None, by, value)
+
+    # ---- 交互 ----
+
+    def _click(self, node: dom.Node) -> None:
+        self.clock.run_pending()
+        self.js_heap_used += JS_HEAP_PER_INTERACTION
+        self.layout_count += 1
+        node.dispatch('click')
+        link = node.closest(lambda n: n.tag == 'a' and 'href' in n.attrs)
+        if link is not None:
+            self.get(urljoin(self.current_url, link.attrs['href']))
+            return
+        submit = node.closest(
+            lambda n: n.tag in ('button', 'input')
+            and n.attrs.get('type', 'submit' if n.tag == 'button' else '') == 'submit')
+        if submit is not None:
+            self._submit(submit)
+
+    def _submit(self, node: dom.Node) -> None:
+        form = node.closest(lambda n: n.tag == 'form')
+        if form is None:
+            return
+        document = form.root
+        fields = {n.attrs['name']: n.attrs.get('value', '') for n in form.iter()
+                  if n.tag == 'input' and 'name' in n.attrs}
+        action = urljoin(document.attrs.get('url', self.current_url), form.attrs.get('action', ''))
+        url, response = self._request(form.attrs.get('method', 'get').upper(), action, fields)
+        if self._frames and document is self._frames[-1].content_document:
+            self._frames[-1].content_document = response
+        else:
+            self.current_url, self.top_document = url, response
+            self._frames = []
+
+    def _type(self, node: dom.Node, keys: str) -> None:
+        value = node.attrs.get('value', '')
+        selected = node.attrs.pop('data-selected', None) is not None
+        modifiers = set()
+        for key in keys:
+            if key in MODIFIER_KEYS:
+                modifiers.add(key)
+                continue
+            if key == Keys.NULL:
+                modifiers.clear()
+                continue
+            if modifiers & {Keys.CONTROL, Keys.COMMAND} and key.lower() == 'a':
+                selected = True
+                continue
+            if key in (Keys.DELETE, Keys.BACKSPACE):
+                value = '' if selected else value[:-1] if key == Keys.BACKSPACE else value
+            elif key in (Keys.ENTER, Keys.RETURN):
+                node.attrs['value'] = value
+                self._submit(node)
+                return
+            elif key >= '':
+                continue
+            else:
+                value = key if selected else value + key
+            selected = False
+            node.attrs['value'] = value
+            node.dispatch('input')
+        if selected:
+            node.attrs['data-selected'] = ''
+
+    def execute_script(self, script: str, *args):
+        self._check_alive()
+        self.scripts.append(script)
+        if '.click()' in script and args and isinstance(args[0], FakeWebElement):
+            self._click(args[0]._checked_node())
+            return None
+        if 'document.readyState' in script:
+            return 'complete'
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict) -> Dict:
+        self._check_alive()
+        self.cdp_commands.append((cmd, cmd_args))
+        if cmd == 'Performance.getMetrics':
+            frames = dom.css_select(self.top_document, 'iframe')
+            documents = [self.top_document] + [f.content_document for f in frames
+                                               if f.content_document is not None]
+            nodes = sum(1 for d in documents for _ in d.iter()) - len(documents)
+            return {'metrics': [
+                {'name': 'Documents', 'value': len(documents)},
+                {'name': 'Nodes', 'value': nodes},
+                {'name': 'LayoutCount', 'value': self.layout_count},
+                {'name': 'JSHeapUsedSize', 'value': self.js_heap_used},
+                {'name': 'JSHeapTotalSize', 'value': self.js_heap_used * 2}
+            ]}
+        return {}
+
+    # ---- 会话 ----
+
+    def implicitly_wait(self, time_to_wait: float) -> None:
+        self.implicit_wait = float(time_to_wait)
+
+    def set_page_load_timeout(self, time_to_wait: float) -> None:
+        self.page_load_timeout = float(time_to_wait)
+
+    def maximize_window(self) -> None:
+        self.window_size = {'width': 1920, 'height': 1080}
+
+    def set_window_size(self, width: int, height: int, windowHandle: str = 'current') -> None:
+        self.window_size = {'width': width, 'height': height}
+
+    def get_window_size(self, windowHandle: str = 'current') -> Dict[str, int]:
+        return dict(self.window_size)
+
+    @property
+    def window_handles(self) -> List[str]:
+        return [] if self.quit_called else ['main']
+
+    @property
+    def current_window_handle(self) -> str:
+        self._check_alive()
+        return 'main'
+
+    def get_cookies(self) -> List[Dict]:
+        return [dict(c) for c in self._cookies.values()]
+
+    def get_cookie(self, name: str) -> Optional[Dict]:
+        cookie = self._cookies.get(name)
+        return dict(cookie) if cookie else None
+
+    def add_cookie(self, cookie_dict: Dict) -> None:
+        self._cookies[cookie_dict['name']] = dict(cookie_dict)
+
+    def delete_cookie(self, name: str) -> None:
+        self._cookies.pop(name, None)
+
+    def delete_all_cookies(self) -> None:
+        self._cookies.clear()
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+    close = quit
+
+
+class FakeDevToolsChannel:
+    """DevTools直连通道的替身，直接操作 FakeWebDriver 的节点树
+
+    只实现用例管理器使用的方法；commands 记录每次调用的 (方法, XPath)。
+
+    Args:
+        driver: 内存版WebDriver
+    """
+
+    def __init__(self, driver: FakeWebDriver):
+        self.driver = driver
+        self.commands: List[Tuple[str, str]] = []
+
+    def _first(self, xpath: str, visible: bool = False) -> Optional[dom.Node]:
+        self.driver._check_alive()
+        self.driver.clock.run_pending()
+        nodes = dom.xpath_select(self.driver.current_document, xpath)
+        if visible:
+            nodes = [n for n in nodes if n.is_displayed()]
+        return nodes[0] if nodes else None
+
+    def xpath_exists(self, xpath: str) -> bool:
+        self.commands.append(('xpath_exists', xpath))
+        return self._first(xpath) is not None
+
+    def wait_for_xpath(self, xpath: str, timeout: float = 30.0, visible: bool = False,
+                       interval: float = 0.1) -> bool:
+        self.commands.append(('wait_for_xpath', xpath))
+        clock = self.driver.clock
+        deadline = clock.now + timeout
+        while self._first(xpath, visible) is None:
+            next_timer = clock.next_timer()
+            if next_timer is None or next_timer > deadline:
+                clock.advance(max(deadline - clock.now, 0.0))
+                return False
+            clock.advance(next_timer - clock.now)
+        return True
+
+    def click_xpath(self, xpath: str) -> bool:
+        self.commands.append(('click_xpath', xpath))
+        node = self._first(xpath, visible=True)
+        if node is None:
+            return False
+        self.driver._click(node)
+        return True
+
+    def replace_text(self, xpath: str, text: str) -> bool:
+        self.commands.append(('replace_text', xpath))
+        node = self._first(xpath)
+        if node is None:
+            return False
+        node.attrs['value'] = text
+        node.dispatch('input')
+        return True
+
+    def close(self) -> None:
+        pass
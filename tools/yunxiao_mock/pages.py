@@ -0,0 +1,383 @@
+"""Mock云效页面模板
+
+页面结构按照 src/core/test_case/case_manager.py 中的定位器搭建：
+首页登录入口、登录iframe、用例库（筛选面板、用例表格）、
+用例详情抽屉、执行人选择器和状态下拉菜单。
+交互逻辑放在独立的 /static/app.js 中，并以可缓存的方式下发，
+和真实站点的前端资源一样。
+"""
+
+from html import escape
+
+STYLE = """
+body { font-family: Arial, sans-serif; margin: 0; }
+.topbar { height: 40px; padding: 0 16px; line-height: 40px; background: #1b1f23; color: #fff; }
+#container main { padding: 16px; }
+.filter-panel { padding: 12px; border: 1px solid #ddd; margin: 8px 0; }
+.filter-field { display: inline-block; margin-right: 12px; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid #ddd; padding: 4px 8px; }
+tbody tr { cursor: pointer; }
+.status-trigger { width: 16px; height: 16px; margin-left: 4px; }
+.empty { padding: 24px; color: #999; }
+.menu { position: fixed; top: 60px; left: 40%; background: #fff; border: 1px solid #999;
+        list-style: none; margin: 0; padding: 4px; z-index: 20; }
+.menu li { padding: 4px 12px; cursor: pointer; }
+.drawer { position: fixed; top: 40px; right: 0; width: 520px; bottom: 0; background: #fff;
+          border-left: 1px solid #999; padding: 12px; z-index: 10; overflow: auto; }
+.drawer-close { cursor: pointer; width: 24px; height: 24px; }
+.field-grid .field { margin: 4px 0; }
+.select-trigger, .member-edit {
+    cursor: pointer; color: #0366d6; min-width: 40px; min-height: 16px;
+}
+.member-picker { position: fixed; top: 120px; right: 40px; width: 240px; background: #fff;
+                 border: 1px solid #999; padding: 8px; z-index: 30; }
+.uiless-member-mini-v2-members div { padding: 4px; cursor: pointer; }
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>云效 Mock</title><style>{style}</style></head>
+<body>
+<div class="topbar"><a href="/login" style="color: #fff">登录</a></div>
+<main><h1>云效 Mock</h1></main>
+</body>
+</html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>登录 - 云效 Mock</title><style>{style}</style></head>
+<body>
+<main>
+<iframe id="alibaba-login-box" src="/login/frame" width="420" height="320"></iframe>
+</main>
+</body>
+</html>
+"""
+
+LOGIN_FRAME = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body>
+<form id="login-form" method="post" action="/login/frame">
+<div><input id="fm-login-id" name="fm-login-id" type="text" placeholder="账号"></div>
+<div><input id="fm-login-password" name="fm-login-password" type="password"
+            placeholder="密码"></div>
+<div><button class="password-login" type="submit">登录</button></div>
+</form>
+</body>
+</html>
+"""
+
+LOGIN_DONE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"></head>
+<body><div class="user-info">{user}</div></body>
+</html>
+"""
+
+# #container 是 body 的第二个 div，与 case_manager 中 /html/body/div[2]/...
+# 的备用定位一致；用例表格位于 _wait_for_results_list 使用的深层路径下。
+TESTCASE_PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>测试用例 - 云效 Mock</title><style>{style}</style></head>
+<body>
+<div class="topbar"><span class="user-info">{user}</span></div>
+<div id="container">
+<main>
+<header><section><section><section>
+<span class="title">用例库</span>
+<span><button class="filter-button" type="button">筛选</button></span>
+</section></section></section></header>
+<section>
+<section class="filter-panel" style="display: none">
+<div class="filter-field">
+<div class="filter-label"><span>测试用例编号</span></div>
+<span class="filter-input"><input type="text" name="case-id"></span>
+</div>
+<button class="filter-submit" type="button"><span>过滤</span></button>
+</section>
+<section class="case-list">
+<section>
+<div class="list-wrap">
+<div class="list-toolbar"></div>
+<div class="list-body">
+<div class="list-summary"></div>
+<div class="list-table"><div><div>
+<div class="table-header"></div>
+<div class="table-body">
+<div class="table-inner">
+<table>
+<thead><tr>
+<th></th><th>编号</th><th>标题</th><th>自动化</th>
+<th>优先级</th><th>执行人</th><th>状态</th>
+</tr></thead>
+<tbody>{rows}</tbody>
+</table>
+</div>
+</div>
+</div></div></div>
+</div>
+</div>
+</section>
+</section>
+</section>
+</main>
+</div>
+<script src="/static/app.js"></script>
+</body>
+</html>
+"""
+
+DRAWER_FIELDS = ['标题', '编号', '优先级', '类型', '模块', '创建人', '创建时间']
+
+
+def render_row(case: dict) -> str:
+    """渲染用例表格行，与 APP_JS 中的 rowHtml 保持一致"""
+    return (
+        f'<tr data-id="{escape(case["id"])}"><td><input type="checkbox"></td>'
+        f'<td>{escape(case["id"])}</td><td>{escape(case["title"])}</td>'
+        f'<td class="auto-type">{escape(case["auto_type"])}</td><td>{escape(case["priority"])}</td>'
+        f'<td class="executor">{escape(case["executor"])}</td>'
+        f'<td class="status">{escape(case["status"])}'
+        f'<button class="status-trigger" type="button"></button></td></tr>'
+    )
+
+
+def render_drawer(case: dict) -> str:
+    """渲染用例详情抽屉内容，与 APP_JS 中的 drawerHtml 保持一致"""
+    values = [case['title'], case['id'], case['priority'], '功能测试', '默认模块', 'admin',
+              '2024-01-01']
+    fields = ''.join(
+        f'<div class="field"><div class="field-label">{name}</div>'
+        f'<div class="field-value">{escape(value)}</div></div>'
+        for name, value in zip(DRAWER_FIELDS, values)
+    )
+    return (
+        '<div class="drawer-close" title="收起">×</div>'
+        '<div id="drawer-sidebar-workitemDetail">'
+        '<div class="workitem-detail">'
+        f'<div class="workitem-fields"><div class="field-grid">{fields}'
+        '<div class="field"><div class="field-label">自动化</div>'
+        f'<div class="field-value select-trigger">{escape(case["auto_type"])}</div></div>'
+        '</div></div>'
+        '<div class="workitem-people">'
+        '<div class="people-title">人员</div>'
+        '<div class="people-body"><div>执行人</div>'
+        '<div class="people-value"><div><div><span class="member"><span class="member-inner">'
+        f'<span class="member-name"><em>{escape(case["executor"])}</em></span>'
+        '<span class="member-edit">修改</span>'
+        '</span></span></div></div></div>'
+        '</div></div>'
+        '<div class="workitem-precondition"><div class="section-title">前置条件</div>'
+        f'<div>{escape(case["precondition"])}</div></div>'
+        '<div id="workitemAttachment">附件</div>'
+        '</div></div>'
+    )
+
+
+APP_JS = r"""
+(function () {
+  'use strict';
+
+  function request(method, url, body) {
+    var options = { method: method, headers: { 'Content-Type': 'application/json' } };
+    if (body) { options.body = JSON.stringify(body); }
+    return fetch(url, options).then(function (resp) { return resp.json(); });
+  }
+
+  function escapeHtml(text) {
+    var div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML;
+  }
+
+  function removeAll(selector) {
+    document.querySelectorAll(selector).forEach(function (el) { el.remove(); });
+  }
+
+  // 浮层插在 body 开头，保证 //*[text()="已通过"] 等定位优先命中菜单项
+  function showMenu(className, items, onSelect) {
+    removeAll('.menu');
+    var menu = document.createElement('ul');
+    menu.className = 'menu ' + className;
+    items.forEach(function (item) {
+      var li = document.createElement('li');
+      li.innerHTML = item.html;
+      li.addEventListener('click', function (event) {
+        event.stopPropagation();
+        menu.remove();
+        onSelect(item.value);
+      });
+      menu.appendChild(li);
+    });
+    document.body.insertBefore(menu, document.body.firstChild);
+  }
+
+  function rowHtml(c) {
+    return '<tr data-id="' + escapeHtml(c.id) + '">' +
+      '<td><input type="checkbox"></td>' +
+      '<td>' + escapeHtml(c.id) + '</td>' +
+      '<td>' + escapeHtml(c.title) + '</td>' +
+      '<td class="auto-type">' + escapeHtml(c.auto_type) + '</td>' +
+      '<td>' + escapeHtml(c.priority) + '</td>' +
+      '<td class="executor">' + escapeHtml(c.executor) + '</td>' +
+      '<td class="status">' + escapeHtml(c.status) +
+      '<button class="status-trigger" type="button"></button></td>' +
+      '</tr>';
+  }
+
+  function renderRows(cases) {
+    removeAll('.empty');
+    var inner = document.querySelector('.table-inner');
+    var tbody = inner.querySelector('tbody');
+    tbody.innerHTML = cases.map(rowHtml).join('');
+    if (!cases.length) {
+      var empty = document.createElement('div');
+      empty.className = 'empty';
+      empty.textContent = '暂无内容';
+      inner.appendChild(empty);
+    }
+  }
+
+  function updateRow(c) {
+    var row = document.querySelector('tbody tr[data-id="' + CSS.escape(c.id) + '"]');
+    if (row) { row.outerHTML = rowHtml(c); }
+  }
+
+  function closeDrawer() {
+    removeAll('.drawer');
+    removeAll('.member-picker');
+    removeAll('.menu');
+  }
+
+  function drawerHtml(c) {
+    var fields = ['标题', '编号', '优先级', '类型', '模块', '创建人', '创建时间'];
+    var values = [c.title, c.id, c.priority, '功能测试', '默认模块', 'admin', '2024-01-01'];
+    var fieldHtml = fields.map(function (name, i) {
+      return '<div class="field"><div class="field-label">' + name + '</div>' +
+        '<div class="field-value">' + escapeHtml(values[i]) + '</div></div>';
+    }).join('');
+    return '<div class="drawer-close" title="收起">×</div>' +
+      '<div id="drawer-sidebar-workitemDetail">' +
+      '<div class="workitem-detail">' +
+      '<div class="workitem-fields"><div class="field-grid">' + fieldHtml +
+      '<div class="field"><div class="field-label">自动化</div>' +
+      '<div class="field-value select-trigger">' + escapeHtml(c.auto_type) + '</div></div>' +
+      '</div></div>' +
+      '<div class="workitem-people">' +
+      '<div class="people-title">人员</div>' +
+      '<div class="people-body"><div>执行人</div>' +
+      '<div class="people-value"><div><div><span class="member"><span class="member-inner">' +
+      '<span class="member-name"><em>' + escapeHtml(c.executor) + '</em></span>' +
+      '<span class="member-edit">修改</span>' +
+      '</span></span></div></div></div>' +
+      '</div></div>' +
+      '<div class="workitem-precondition"><div class="section-title">前置条件</div>' +
+      '<div>' + escapeHtml(c.precondition) + '</div></div>' +
+      '<div id="workitemAttachment">附件</div>' +
+      '</div></div>';
+  }
+
+  function saveCase(id, changes) {
+    return request('POST', '/api/cases/' + encodeURIComponent(id), changes).then(function (c) {
+      updateRow(c);
+      return c;
+    });
+  }
+
+  function openMemberPicker(c, drawer) {
+    removeAll('.member-picker');
+    var picker = document.createElement('div');
+    picker.className = 'member-picker';
+    picker.innerHTML = '<input type="text" placeholder="请输入关键字">';
+    document.body.appendChild(picker);
+    var input = picker.querySelector('input');
+    var timer = null;
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      removeAll('.uiless-member-mini-v2-members');
+      timer = setTimeout(function () {
+        var keyword = input.value;
+        request('GET', '/api/members?q=' + encodeURIComponent(keyword)).then(function (members) {
+          if (input.value !== keyword) { return; }
+          removeAll('.uiless-member-mini-v2-members');
+          var list = document.createElement('div');
+          list.className = 'uiless-member-mini-v2-members';
+          members.forEach(function (name) {
+            var item = document.createElement('div');
+            item.textContent = name;
+            item.addEventListener('click', function () {
+              saveCase(c.id, { executor: name }).then(function (updated) {
+                picker.remove();
+                drawer.querySelector('.member-name em').textContent = updated.executor;
+              });
+            });
+            list.appendChild(item);
+          });
+          picker.appendChild(list);
+        });
+      }, 100);
+    });
+    input.focus();
+  }
+
+  // 切换用例时先收起旧抽屉，避免旧详情在新详情加载完成前被误操作
+  function openDrawer(id) {
+    closeDrawer();
+    request('GET', '/api/cases/' + encodeURIComponent(id)).then(function (c) {
+      closeDrawer();
+      var drawer = document.createElement('div');
+      drawer.className = 'drawer';
+      drawer.innerHTML = drawerHtml(c);
+      document.body.appendChild(drawer);
+      drawer.querySelector('.drawer-close').addEventListener('click', closeDrawer);
+      drawer.querySelector('.select-trigger').addEventListener('click', function () {
+        showMenu('select-menu', [
+          { html: '<span>是</span>', value: '是' },
+          { html: '<span>否</span>', value: '否' }
+        ], function (value) {
+          saveCase(c.id, { auto_type: value }).then(function (updated) {
+            drawer.querySelector('.select-trigger').textContent = updated.auto_type;
+          });
+        });
+      });
+      drawer.querySelector('.member-edit').addEventListener('click', function () {
+        if (document.querySelector('.member-picker')) {
+          removeAll('.member-picker');
+        } else {
+          openMemberPicker(c, drawer);
+        }
+      });
+    });
+  }
+
+  document.querySelector('.filter-button').addEventListener('click', function () {
+    document.querySelector('.filter-panel').style.display = 'block';
+  });
+
+  document.querySelector('.filter-submit').addEventListener('click', function () {
+    var keyword = document.querySelector('.filter-input input').value;
+    request('GET', '/api/cases?id=' + encodeURIComponent(keyword)).then(renderRows);
+  });
+
+  document.querySelector('tbody').addEventListener('click', function (event) {
+    var row = event.target.closest('tr');
+    if (!row) { return; }
+    var id = row.getAttribute('data-id');
+    if (event.target.classList.contains('status-trigger')) {
+      event.stopPropagation();
+      showMenu('status-menu', [
+        { html: '已通过', value: '已通过' },
+        { html: '未通过', value: '未通过' },
+        { html: '暂缓', value: '暂缓' }
+      ], function (value) {
+        saveCase(id, { status: value });
+      });
+      return;
+    }
+    openDrawer(id);
+  });
+})();
+"""
@@ -0,0 +1,281 @@
+"""Mock云效Web服务
+
+基于标准库 http.server 的本地替身服务，
+提供登录、用例库页面和用例读写接口。
+每个请求都会按配置注入服务端延迟和抖动，
+用于离线衡量自动化流程的吞吐量。
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+from .pages import (
+    APP_JS,
+    HOME_PAGE,
+    LOGIN_DONE,
+    LOGIN_FRAME,
+    LOGIN_PAGE,
+    STYLE,
+    TESTCASE_PAGE,
+    render_row
+)
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = 'yx_mock_session'
+
+
+@dataclass
+class MockConfig:
+    """Mock服务配置
+
+    Attributes:
+        latency: 每个请求的基础延迟（秒）
+        jitter: 延迟抖动幅度（秒），实际延迟在 latency±jitter 内均匀分布
+        case_count: 预置用例数量
+        members: 执行人选择器中可搜索到的成员
+        seed: 随机数种子，便于复现
+    """
+    latency: float = 0.05
+    jitter: float = 0.02
+    case_count: int = 50
+    members: List[str] = field(default_factory=lambda: [
+        '测试用户', '张三', '李四', '王五', '赵六'
+    ])
+    seed: Optional[int] = None
+
+
+def make_case_id(index: int) -> str:
+    """生成预置用例编号"""
+    return f"TEST_{index:03d}"
+
+
+class MockState:
+    """Mock服务的内存数据，线程安全"""
+
+    def __init__(self, config: MockConfig):
+        self._lock = threading.Lock()
+        self.sessions: Dict[str, str] = {}
+        self.request_count = 0
+        self.cases: Dict[str, Dict] = {}
+        for i in range(1, config.case_count + 1):
+            case_id = make_case_id(i)
+            self.cases[case_id] = {
+                'id': case_id,
+                'title': f'用例 {case_id}',
+                'auto_type': '否',
+                'priority': 'P2',
+                'executor': 'admin',
+                'status': '待测试',
+                'precondition': '无'
+            }
+        self.members = list(config.members)
+
+    def find_cases(self, keyword: str) -> List[Dict]:
+        with self._lock:
+            return [dict(c) for c in self.cases.values() if keyword in c['id']]
+
+    def get_case(self, case_id: str) -> Optional[Dict]:
+        with self._lock:
+            case = self.cases.get(case_id)
+            return dict(case) if case else None
+
+    def update_case(self, case_id: str, changes: Dict) -> Optional[Dict]:
+        with self._lock:
+            case = self.cases.get(case_id)
+            if case is None:
+                return None
+            for key in ('auto_type', 'status', 'executor'):
+                if key in changes:
+                    case[key] = changes[key]
+            return dict(case)
+
+    def search_members(self, keyword: str) -> List[str]:
+        return [m for m in self.members if keyword in m]
+
+    def login(self, username: str) -> str:
+        token = f"{username or 'user'}-{random.getrandbits(32):08x}"
+        with self._lock:
+            self.sessions[token] = username or 'user'
+        return token
+
+    def user_for(self, token: Optional[str]) -> Optional[str]:
+        with self._lock:
+            return self.sessions.get(token) if token else None
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.request_count += 1
+
+
+class MockYunxiaoHandler(BaseHTTPRequestHandler):
+    """Mock云效请求处理器"""
+
+    server_version = 'YunxiaoMock/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    # 由 MockYunxiaoServer 在创建服务时注入
+    state: MockState
+    config: MockConfig
+    rng: random.Random
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _delay(self) -> None:
+        """注入服务端延迟和抖动"""
+        self.state.count_request()
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self.rng.uniform(-self.config.jitter, self.config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _send(self, status: int, body: str, content_type: str,
+              headers: Optional[Dict] = None) -> None:
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, payload, status: int = 200) -> None:
+        self._send(status, json.dumps(payload, ensure_ascii=False), 'application/json')
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _session_user(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        morsel = cookie.get(SESSION_COOKIE)
+        return self.state.user_for(morsel.value if morsel else None)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        self._delay()
+        url = urlparse(self.path)
+        path = url.path
+        query = parse_qs(url.query)
+
+        if path == '/':
+            self._send(200, HOME_PAGE.format(style=STYLE), 'text/html')
+        elif path == '/login':
+            self._send(200, LOGIN_PAGE.format(style=STYLE), 'text/html')
+        elif path == '/login/frame':
+            self._send(200, LOGIN_FRAME, 'text/html')
+        elif path == '/testcase':
+            user = self._session_user()
+            if user is None:
+                self._redirect('/')
+                return
+            rows = ''.join(render_row(c) for c in self.state.find_cases(''))
+            page = TESTCASE_PAGE.format(style=STYLE, user=escape(user), rows=rows)
+            self._send(200, page, 'text/html')
+        elif path == '/static/app.js':
+            self._send(200, APP_JS, 'application/javascript',
+                       {'Cache-Control': 'public, max-age=86400'})
+        elif path == '/api/cases':
+            self._send_json(self.state.find_cases(query.get('id', [''])[0]))
+        elif path.startswith('/api/cases/'):
+            case = self.state.get_case(unquote(path[len('/api/cases/'):]))
+            if case is None:
+                self._send_json({'error': 'not found'}, 404)
+            else:
+                self._send_json(case)
+        elif path == '/api/members':
+            self._send_json(self.state.search_members(query.get('q', [''])[0]))
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+    def do_POST(self):
+        self._delay()
+        path = urlparse(self.path).path
+        body = self._read_body()
+
+        if path == '/login/frame':
+            form = parse_qs(body.decode('utf-8'))
+            user = form.get('fm-login-id', [''])[0]
+            token = self.state.login(user)
+            self._send(200, LOGIN_DONE.format(user=escape(user)), 'text/html',
+                       {'Set-Cookie': f'{SESSION_COOKIE}={token}; Path=/; SameSite=Lax'})
+        elif path.startswith('/api/cases/'):
+            try:
+                changes = json.loads(body.decode('utf-8') or '{}')
+            except ValueError:
+                self._send_json({'error': 'invalid json'}, 400)
+                return
+            case = self.state.update_case(unquote(path[len('/api/cases/'):]), changes)
+            if case is None:
+                self._send_json({'error': 'not found'}, 404)
+            else:
+                self._send_json(case)
+        else:
+            self._send_json({'error': 'not found'}, 404)
+
+
+class MockYunxiaoServer:
+    """Mock云效服务，在后台线程中运行
+
+    使用示例:
+        >>> with MockYunxiaoServer(MockConfig(latency=0.1)) as server:
+        ...     manager = TestCaseManager(driver, base_url=server.url)
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = '127.0.0.1', port: int = 0):
+        self.config = config or MockConfig()
+        self.state = MockState(self.config)
+        handler = type('BoundMockYunxiaoHandler', (MockYunxiaoHandler,), {
+            'state': self.state,
+            'config': self.config,
+            'rng': random.Random(self.config.seed)
+        })
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockYunxiaoServer':
+        """在后台线程启动服务"""
+        self._thread = threading.Thread(
+            target=self.httpd.serve_forever, name='yunxiao-mock', daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Mock云效服务已启动: {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """停止服务"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        logger.info("Mock云效服务已停止")
+
+    def __enter__(self) -> 'MockYunxiaoServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()